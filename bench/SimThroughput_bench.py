@@ -0,0 +1,298 @@
+"""
+==========================================================================
+SimThroughput_bench.py
+==========================================================================
+Simulation throughput benchmarks for CgraRTL (2x2/4x4/8x8 tiles) and
+MeshMultiCgraRTL (1x1/2x2/4x4 CGRAs of 2x2 tiles), each under the
+pure-Python PyMTL simulator and under Verilator import.
+
+Every tile runs the same self-looping `INC` kernel (the `default` kernel
+of CgraRTL_test.py) for a fixed number of iterations, so the work scales
+with the fabric and every size point is directly comparable. For each
+point this reports elaboration, translation, Verilator compile and
+simulation-setup time, plus simulated cycles per second.
+
+The file is not picked up by the default `*_test.py` collection; run it
+explicitly from the build directory:
+
+  pytest ../bench/SimThroughput_bench.py -s
+  pytest ../bench/SimThroughput_bench.py -s -k "python and 2x2"
+
+Results are merged into `sim_throughput.json` in the current directory
+(or $VECTORCGRA_BENCH_JSON), keyed by benchmark point and tagged with
+the git commit. Setting $VECTORCGRA_BENCH_BASELINE to a JSON file from
+an earlier commit makes every point fail if its cycles/second dropped by
+more than $VECTORCGRA_BENCH_TOLERANCE (default 0.2, i.e., 20%).
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+from pymtl3 import *
+from pymtl3.passes.backends.verilog import (VerilogPlaceholderPass,
+                                            VerilogTranslationImportPass,
+                                            VerilogVerilatorImportPass)
+from pymtl3.passes.backends.verilog.translation.VerilogTranslationPass import VerilogTranslationPass
+
+from ..cgra.test.CgraRTL_test import init_param
+from ..fu.double.SeqMulAdderRTL import SeqMulAdderRTL
+from ..fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ..fu.single.AdderRTL import AdderRTL
+from ..fu.single.CompRTL import CompRTL
+from ..fu.single.GrantRTL import GrantRTL
+from ..fu.single.LogicRTL import LogicRTL
+from ..fu.single.MemUnitRTL import MemUnitRTL
+from ..fu.single.MulRTL import MulRTL
+from ..fu.single.PhiRTL import PhiRTL
+from ..fu.single.RetRTL import RetRTL
+from ..fu.single.SelRTL import SelRTL
+from ..fu.single.ShifterRTL import ShifterRTL
+from ..lib.cmd_type import *
+from ..lib.messages import *
+from ..lib.opt_type import *
+from ..lib.util.common import *
+from ..multi_cgra.MeshMultiCgraRTL import MeshMultiCgraRTL
+from ..multi_cgra.test.MeshMultiCgraRTL_test import TestHarness as MeshTestHarness
+
+#-------------------------------------------------------------------------
+# Parameters
+#-------------------------------------------------------------------------
+
+BENCH_JSON_ENV = 'VECTORCGRA_BENCH_JSON'
+BENCH_BASELINE_ENV = 'VECTORCGRA_BENCH_BASELINE'
+BENCH_TOLERANCE_ENV = 'VECTORCGRA_BENCH_TOLERANCE'
+BENCH_JSON_DEFAULT = 'sim_throughput.json'
+
+# Number of INC iterations every tile executes before sending COMPLETE.
+kIterations = 100
+kMaxCycles = 100000
+
+FuList = [AdderRTL, MulRTL, LogicRTL, ShifterRTL, PhiRTL, CompRTL,
+          GrantRTL, MemUnitRTL, SelRTL, RetRTL, SeqMulAdderRTL]
+
+VL_WNO_LIST = ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+               'ALWCOMBORDER']
+
+BACKENDS = ['python', 'verilator']
+CGRA_SIZES = [2, 4, 8]
+MESH_SIZES = [1, 2, 4]
+
+#-------------------------------------------------------------------------
+# Harness construction
+#-------------------------------------------------------------------------
+
+def mk_cgra_harness(size):
+  return init_param(MESH, FuList, x_tiles = size, y_tiles = size,
+                    total_execute_ctrl_count = kIterations)
+
+def mk_mesh_harness(size, tiles_per_cgra = 2):
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_fu_inports = 4
+  num_fu_outports = 2
+  num_routing_outports = num_tile_outports + num_fu_inports
+  num_registers_per_reg_bank = 16
+  ctrl_mem_size = 16
+  num_banks_per_cgra = 2
+  data_mem_size_per_bank = 16
+  num_cgras = size * size
+  num_tiles = tiles_per_cgra * tiles_per_cgra
+  data_mem_size_global = data_mem_size_per_bank * num_banks_per_cgra * num_cgras
+  per_cgra_data_size = data_mem_size_global // num_cgras
+  controller2addr_map = {i: [i * per_cgra_data_size, (i + 1) * per_cgra_data_size - 1]
+                         for i in range(num_cgras)}
+
+  TileInType = mk_bits(clog2(num_tile_inports + num_fu_inports + 1))
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  FuOutType = mk_bits(clog2(num_fu_outports + 1))
+  RegIdxType = mk_bits(clog2(num_registers_per_reg_bank))
+  DataType = mk_data(32, 1)
+  DataAddrType = mk_bits(clog2(data_mem_size_global))
+  CtrlType = mk_ctrl(num_fu_inports, num_fu_outports, num_tile_inports,
+                     num_tile_outports, num_registers_per_reg_bank)
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+  CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType,
+                                    CtrlAddrType)
+  IntraCgraPktType = mk_intra_cgra_pkt(size, size, num_tiles,
+                                       CgraPayloadType)
+
+  # Same self-looping INC as the `default` kernel in CgraRTL_test.py.
+  routing_xbar_code = [TileInType(0) for _ in range(num_routing_outports)]
+  fu_in_code = [FuInType(0) for _ in range(num_fu_inports)]
+  fu_in_code[0] = FuInType(1)
+  fu_xbar_code = [FuOutType(0) for _ in range(num_routing_outports)]
+  fu_xbar_code[num_tile_outports] = FuOutType(1)
+  read_reg_towards_code = [b2(0) for _ in range(num_fu_inports)]
+  read_reg_towards_code[0] = b2(1)
+  read_reg_idx_code = [RegIdxType(0) for _ in range(num_fu_inports)]
+  read_reg_idx_code[0] = RegIdxType(2)
+
+  src_ctrl_pkt = []
+  expected_sink_out_pkt = []
+  for cgra_id in range(num_cgras):
+    x, y = cgra_id % size, cgra_id // size
+    for tile_id in range(num_tiles):
+      def pkt(payload):
+        return IntraCgraPktType(0, tile_id, 0, cgra_id, 0, 0, x, y,
+                                payload = payload)
+      src_ctrl_pkt.extend([
+          pkt(CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(kIterations))),
+          pkt(CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(1))),
+          pkt(CgraPayloadType(CMD_CONFIG,
+                              ctrl = CtrlType(OPT_INC, fu_in_code,
+                                              routing_xbar_code, fu_xbar_code,
+                                              read_reg_towards = read_reg_towards_code,
+                                              read_reg_idx = read_reg_idx_code))),
+          pkt(CgraPayloadType(CMD_LAUNCH)),
+      ])
+      expected_sink_out_pkt.append(
+          IntraCgraPktType(tile_id, num_tiles, cgra_id, 0, x, y, 0, 0,
+                           payload = CgraPayloadType(CMD_COMPLETE)))
+
+  # COMPLETE packets of different CGRAs race each other to the CPU, so
+  # only the command is checked.
+  cmp_func = lambda a, b : a.payload.cmd == b.payload.cmd
+  return MeshTestHarness(MeshMultiCgraRTL, FlexibleFuRTL, FuList,
+                         IntraCgraPktType, size, size,
+                         tiles_per_cgra, tiles_per_cgra, ctrl_mem_size,
+                         data_mem_size_global, data_mem_size_per_bank,
+                         num_banks_per_cgra, num_registers_per_reg_bank,
+                         src_ctrl_pkt, [], ctrl_mem_size, ctrl_mem_size,
+                         False, controller2addr_map,
+                         expected_sink_out_pkt, cmp_func)
+
+#-------------------------------------------------------------------------
+# Measurement
+#-------------------------------------------------------------------------
+
+def _verilator_import(th):
+  '''Same steps as VerilogTranslationImportPass, but timing translation
+  and the Verilator import (C++ build) separately.'''
+  th.dut.set_metadata(VerilogTranslationImportPass.enable, True)
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_xinit, 'zeros')
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list, VL_WNO_LIST)
+  th.apply(VerilogPlaceholderPass())
+  import_pass = VerilogTranslationImportPass()
+  import_pass.traverse_hierarchy(th)
+
+  start = time.perf_counter()
+  th.apply(VerilogTranslationPass())
+  translation_time = time.perf_counter() - start
+
+  import_pass.add_placeholder_marks(th)
+  start = time.perf_counter()
+  th = VerilogVerilatorImportPass()(th)
+  compile_time = time.perf_counter() - start
+  return th, translation_time, compile_time
+
+def measure(mk_harness, backend):
+  start = time.perf_counter()
+  th = mk_harness()
+  th.elaborate()
+  elaboration_time = time.perf_counter() - start
+
+  translation_time = compile_time = 0.0
+  if backend == 'verilator':
+    th, translation_time, compile_time = _verilator_import(th)
+
+  start = time.perf_counter()
+  th.apply(DefaultPassGroup())
+  th.sim_reset()
+  setup_time = time.perf_counter() - start
+
+  ncycles = 0
+  start = time.perf_counter()
+  while not th.done() and ncycles < kMaxCycles:
+    th.sim_tick()
+    ncycles += 1
+  sim_time = time.perf_counter() - start
+  assert ncycles < kMaxCycles
+
+  return {
+    'backend'           : backend,
+    'elaboration_time'  : elaboration_time,
+    'translation_time'  : translation_time,
+    'compile_time'      : compile_time,
+    'setup_time'        : setup_time,
+    'sim_time'          : sim_time,
+    'cycles'            : ncycles,
+    'cycles_per_second' : ncycles / sim_time if sim_time > 0 else 0.0,
+  }
+
+#-------------------------------------------------------------------------
+# Result bookkeeping
+#-------------------------------------------------------------------------
+
+def _git_commit():
+  try:
+    return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                          cwd = os.path.dirname(os.path.abspath(__file__)),
+                          stdout = subprocess.PIPE, stderr = subprocess.DEVNULL,
+                          text = True).stdout.strip() or None
+  except OSError:
+    return None
+
+def _load_json(path):
+  try:
+    with open(path) as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+def save_result(path, point, result):
+  results = _load_json(path)
+  result = dict(result, commit = _git_commit(),
+                date = time.strftime('%Y-%m-%d %H:%M:%S'))
+  results[point] = result
+  with open(path + '.tmp', 'w') as f:
+    json.dump(results, f, indent = 2, sort_keys = True)
+  os.replace(path + '.tmp', path)
+
+def check_regression(point, result):
+  baseline_path = os.environ.get(BENCH_BASELINE_ENV)
+  if not baseline_path:
+    return
+  baseline = _load_json(baseline_path).get(point)
+  if baseline is None:
+    return
+  tolerance = float(os.environ.get(BENCH_TOLERANCE_ENV, 0.2))
+  floor = baseline['cycles_per_second'] * (1 - tolerance)
+  assert result['cycles_per_second'] >= floor, \
+      f"{point}: {result['cycles_per_second']:.1f} cycles/s is below " \
+      f"{floor:.1f} ({baseline['cycles_per_second']:.1f} at {baseline.get('commit')})"
+
+def run_point(point, mk_harness, backend, tmp_path, monkeypatch):
+  if backend == 'verilator' and shutil.which('verilator') is None:
+    pytest.skip('verilator is not available')
+  json_path = os.path.abspath(os.environ.get(BENCH_JSON_ENV, BENCH_JSON_DEFAULT))
+  # Builds in a fresh directory so the compile time is never a cache hit.
+  monkeypatch.chdir(tmp_path)
+  result = measure(mk_harness, backend)
+  print(f"\n[{point}] " + ", ".join(
+      f"{k} = {v:.3f}" if isinstance(v, float) else f"{k} = {v}"
+      for k, v in result.items()))
+  save_result(json_path, point, result)
+  check_regression(point, result)
+
+#-------------------------------------------------------------------------
+# Benchmarks
+#-------------------------------------------------------------------------
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('size', CGRA_SIZES)
+def test_cgra_throughput(size, backend, tmp_path, monkeypatch):
+  run_point(f'CgraRTL_{size}x{size}_{backend}',
+            lambda: mk_cgra_harness(size), backend, tmp_path, monkeypatch)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('size', MESH_SIZES)
+def test_mesh_multi_cgra_throughput(size, backend, tmp_path, monkeypatch):
+  run_point(f'MeshMultiCgraRTL_{size}x{size}_{backend}',
+            lambda: mk_mesh_harness(size), backend, tmp_path, monkeypatch)
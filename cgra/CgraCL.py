@@ -0,0 +1,803 @@
+"""
+=========================================================================
+CgraCL.py
+=========================================================================
+Cycle-approximate model of a single CGRA fabric. It consumes exactly the
+same IntraCgraPktType packet stream (config/const/launch/store/load) that
+the CgraRTL tests feed into `recv_from_cpu_pkt`, and produces the packets
+that would show up on `send_to_cpu_pkt` together with the number of
+cycles it takes.
+
+The model is plain Python (no PyMTL simulation) so that it can be used
+for design space sweeps. It captures:
+  - per-tile control memory PC, iteration count and COMPLETE reporting;
+  - routing/FU crossbars (including prologue skipping);
+  - register clusters and constant queues;
+  - banked data SPM with one read and one write port per bank;
+  - inter-tile channels and the ctrl ring latency.
+
+Packets and operations outside of these are rejected with a ValueError
+naming the cmd or opcode, rather than silently mis-modeled.
+
+Each ctrl signal is treated as firing atomically once all its operands
+and output channels are available, which is the main source of timing
+deviation from the RTL (the RTL allows crossbar and FU to proceed
+independently within the same ctrl signal).
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from collections import deque
+
+from pymtl3 import *
+from ..lib.cmd_type import *
+from ..lib.opt_type import *
+from ..lib.util.common import *
+from ..lib.util.data_struct_attr import *
+
+#-------------------------------------------------------------------------
+# Operation table
+#-------------------------------------------------------------------------
+# Maps opcode to (operand slots, needs const). Operand slots index the
+# `fu_in` fields of the ctrl signal. Memory, phi, grant and return
+# operations are handled separately as they carry state.
+
+_BINARY_OPS = {
+  int(OPT_ADD)  : lambda a, b: a + b,
+  int(OPT_SUB)  : lambda a, b: a - b,
+  int(OPT_MUL)  : lambda a, b: a * b,
+  int(OPT_OR)   : lambda a, b: a | b,
+  int(OPT_XOR)  : lambda a, b: a ^ b,
+  int(OPT_AND)  : lambda a, b: a & b,
+  int(OPT_LLS)  : lambda a, b: a << b,
+  int(OPT_LRS)  : lambda a, b: a >> b,
+}
+
+_BINARY_CONST_OPS = {
+  int(OPT_ADD_CONST) : lambda a, c: a + c,
+  int(OPT_SUB_CONST) : lambda a, c: a - c,
+  int(OPT_MUL_CONST) : lambda a, c: a * c,
+  int(OPT_AND_CONST) : lambda a, c: a & c,
+  int(OPT_OR_CONST)  : lambda a, c: a | c,
+  int(OPT_LLS_CONST) : lambda a, c: a << c,
+}
+
+# Comparisons are signed, same as CompRTL.
+_CMP_OPS = {
+  int(OPT_EQ)  : lambda a, b: a == b,
+  int(OPT_NE)  : lambda a, b: a != b,
+  int(OPT_LT)  : lambda a, b: a < b,
+  int(OPT_GTE) : lambda a, b: a >= b,
+  int(OPT_GT)  : lambda a, b: a > b,
+  int(OPT_LTE) : lambda a, b: a <= b,
+}
+
+_CMP_CONST_OPS = {
+  int(OPT_EQ_CONST)  : lambda a, c: a == c,
+  int(OPT_NE_CONST)  : lambda a, c: a != c,
+  int(OPT_LT_CONST)  : lambda a, c: a < c,
+  int(OPT_GTE_CONST) : lambda a, c: a >= c,
+  int(OPT_GT_CONST)  : lambda a, c: a > c,
+}
+
+_USES_CONST = frozenset(int(opt) for opt in OPT_USES_CONST_LIST)
+
+_MEM_OPS = frozenset([int(OPT_LD), int(OPT_LD_CONST), int(OPT_ADD_CONST_LD),
+                      int(OPT_STR), int(OPT_STR_CONST)])
+
+_TILE_CTRL_CMDS = frozenset([
+  CMD_CONFIG,
+  CMD_CONFIG_PROLOGUE_FU,
+  CMD_CONFIG_PROLOGUE_FU_CROSSBAR,
+  CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR,
+  CMD_CONFIG_TOTAL_CTRL_COUNT,
+  CMD_CONFIG_COUNT_PER_ITER,
+  CMD_CONFIG_CTRL_LOWER_BOUND,
+  CMD_LAUNCH,
+  CMD_RESUME,
+  CMD_PAUSE,
+  CMD_TERMINATE,
+  CMD_CONST,
+])
+
+kNahOpt = int(OPT_NAH)
+kStartOpt = int(OPT_START)
+
+#-------------------------------------------------------------------------
+# Decoded ctrl signal
+#-------------------------------------------------------------------------
+
+class _Ctrl:
+
+  __slots__ = ('operation', 'fu_in', 'routing_xbar_outport',
+               'fu_xbar_outport', 'write_reg_from', 'write_reg_idx',
+               'read_reg_towards', 'read_reg_idx')
+
+  def __init__(s, ctrl = None, num_fu_inports = 4, num_routing_outports = 8):
+    if ctrl is None:
+      s.operation = kStartOpt
+      s.fu_in = [0] * num_fu_inports
+      s.routing_xbar_outport = [0] * num_routing_outports
+      s.fu_xbar_outport = [0] * num_routing_outports
+      s.write_reg_from = [0] * num_fu_inports
+      s.write_reg_idx = [0] * num_fu_inports
+      s.read_reg_towards = [0] * num_fu_inports
+      s.read_reg_idx = [0] * num_fu_inports
+    else:
+      s.operation = int(ctrl.operation)
+      s.fu_in = [int(x) for x in ctrl.fu_in]
+      s.routing_xbar_outport = [int(x) for x in ctrl.routing_xbar_outport]
+      s.fu_xbar_outport = [int(x) for x in ctrl.fu_xbar_outport]
+      s.write_reg_from = [int(x) for x in ctrl.write_reg_from]
+      s.write_reg_idx = [int(x) for x in ctrl.write_reg_idx]
+      s.read_reg_towards = [int(x) for x in ctrl.read_reg_towards]
+      s.read_reg_idx = [int(x) for x in ctrl.read_reg_idx]
+
+#-------------------------------------------------------------------------
+# Per-tile state
+#-------------------------------------------------------------------------
+
+class _TileCL:
+
+  def __init__(s, tile_id, ctrl_mem_size, num_fu_inports,
+               num_tile_inports, num_tile_outports,
+               num_registers_per_reg_bank, num_ctrl, total_steps):
+    num_routing_inports = num_tile_inports + num_fu_inports
+    num_routing_outports = num_tile_outports + num_fu_inports
+    s.tile_id = tile_id
+    s.ctrl_mem_size = ctrl_mem_size
+    s.ctrl = [_Ctrl(None, num_fu_inports, num_routing_outports)
+              for _ in range(ctrl_mem_size)]
+    s.pc = 0
+    s.times = 0
+    s.total_ctrl_steps = total_steps
+    s.ctrl_count_per_iter = num_ctrl
+    s.ctrl_count_lower_bound = 0
+    s.launched = False
+    s.sent_complete = False
+    s.prologue_fu = [0] * ctrl_mem_size
+    s.prologue_routing = [[0] * num_routing_inports for _ in range(ctrl_mem_size)]
+    s.prologue_routing_count = [[0] * num_routing_inports for _ in range(ctrl_mem_size)]
+    s.prologue_fu_xbar = [[0] * 2 for _ in range(ctrl_mem_size)]
+    s.prologue_fu_xbar_count = [[0] * 2 for _ in range(ctrl_mem_size)]
+    s.consts = []
+    s.const_rd_cur = 0
+    s.regs = [[(0, 0)] * num_registers_per_reg_bank for _ in range(num_fu_inports)]
+    s.in_chan = [deque() for _ in range(num_tile_inports)]
+    s.ctrl_pkts = deque()
+    s.phi_first = [True] * ctrl_mem_size
+    s.already_grt_once = False
+    s.already_ret = [False] * ctrl_mem_size
+    s.pending_plan = None
+    s.stall = 0
+    s.fire_count = 0
+
+  def done(s):
+    return (not s.launched) or s.sent_complete
+
+#-------------------------------------------------------------------------
+# CgraCL
+#-------------------------------------------------------------------------
+
+class CgraCL:
+
+  def __init__(s, CtrlPktType, width, height, ctrl_mem_size,
+               data_mem_size_global, data_mem_size_per_bank,
+               num_banks_per_cgra, num_registers_per_reg_bank,
+               num_ctrl, total_steps, topology, controller2addr_map,
+               cgra_id = 0, num_fu_inports = 4, num_fu_outports = 2,
+               channel_depth = 2, link_latency = 1, mem_latency = 1,
+               ctrl_ring_latency = 1):
+
+    assert topology == MESH or topology == KING_MESH
+    CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
+
+    s.CtrlPktType = CtrlPktType
+    s.CgraPayloadType = CgraPayloadType
+    s.DataType = CgraPayloadType.get_field_type(kAttrData)
+    s.data_bitwidth = s.DataType.get_field_type(kAttrPayload).nbits
+    s.data_mask = (1 << s.data_bitwidth) - 1
+    s.addr_mask = (1 << clog2(data_mem_size_global)) - 1
+
+    s.width = width
+    s.height = height
+    s.num_tiles = width * height
+    s.num_tile_ports = 4 if topology == MESH else 8
+    s.num_fu_inports = num_fu_inports
+    s.num_fu_outports = num_fu_outports
+    s.ctrl_mem_size = ctrl_mem_size
+    s.cgra_id = cgra_id
+    s.channel_depth = channel_depth
+    s.link_latency = link_latency
+    s.mem_latency = mem_latency
+    s.ctrl_ring_latency = ctrl_ring_latency
+
+    s.address_lower = controller2addr_map[cgra_id][0]
+    s.address_upper = controller2addr_map[cgra_id][1]
+    s.data_mem_size_per_bank = data_mem_size_per_bank
+    s.num_banks_per_cgra = num_banks_per_cgra
+    s.data_mem_size_global = data_mem_size_global
+
+    s.tiles = [_TileCL(i, ctrl_mem_size, num_fu_inports,
+                       s.num_tile_ports, s.num_tile_ports,
+                       num_registers_per_reg_bank, num_ctrl, total_steps)
+               for i in range(s.num_tiles)]
+
+    # Neighbour table: s.links[tile][outport] -> (tile, inport) or None.
+    s.links = [[None] * s.num_tile_ports for _ in range(s.num_tiles)]
+    for i in range(s.num_tiles):
+      x, y = i % width, i // width
+      s._connect(i, x, y + 1, PORT_INDEX_NORTH, PORT_INDEX_SOUTH)
+      s._connect(i, x, y - 1, PORT_INDEX_SOUTH, PORT_INDEX_NORTH)
+      s._connect(i, x - 1, y, PORT_INDEX_WEST, PORT_INDEX_EAST)
+      s._connect(i, x + 1, y, PORT_INDEX_EAST, PORT_INDEX_WEST)
+      if topology == KING_MESH:
+        s._connect(i, x - 1, y + 1, PORT_INDEX_NORTHWEST, PORT_INDEX_SOUTHEAST)
+        s._connect(i, x + 1, y + 1, PORT_INDEX_NORTHEAST, PORT_INDEX_SOUTHWEST)
+        s._connect(i, x + 1, y - 1, PORT_INDEX_SOUTHEAST, PORT_INDEX_NORTHWEST)
+        s._connect(i, x - 1, y - 1, PORT_INDEX_SOUTHWEST, PORT_INDEX_NORTHEAST)
+
+    # Only the left column and bottom row tiles are connected to the SPM.
+    s.has_mem_port = [(i % width == 0) or (i // width == 0)
+                      for i in range(s.num_tiles)]
+
+    # Data SPM, indexed by global address.
+    s.data_mem = [(0, 0)] * data_mem_size_global
+    s.boundary_out = []
+    s.cpu_out = []
+    s.cycle = 0
+
+  def _connect(s, tile_id, x, y, outport, inport):
+    if 0 <= x < s.width and 0 <= y < s.height:
+      s.links[tile_id][outport] = (y * s.width + x, inport)
+
+  #-----------------------------------------------------------------------
+  # Helpers
+  #-----------------------------------------------------------------------
+
+  def _signed(s, value):
+    value &= s.data_mask
+    if value >> (s.data_bitwidth - 1):
+      return value - (1 << s.data_bitwidth)
+    return value
+
+  def _bank_of(s, addr):
+    if s.address_lower <= addr <= s.address_upper:
+      return (addr - s.address_lower) // s.data_mem_size_per_bank
+    # Out-of-range accesses go through the NoC port of the data memory.
+    return s.num_banks_per_cgra
+
+  def _ring_hops(s, tile_id):
+    num_stops = s.num_tiles + 1
+    dist = abs(s.num_tiles - tile_id)
+    return min(dist, num_stops - dist)
+
+  def _mk_cpu_pkt(s, src, cmd, data = (0, 0), data_addr = 0):
+    payload = s.CgraPayloadType(cmd, s.DataType(data[0], data[1]), data_addr, 0, 0)
+    return s.CtrlPktType(src, s.num_tiles, s.cgra_id, s.cgra_id,
+                         0, 0, 0, 0, 0, 0, payload)
+
+  #-----------------------------------------------------------------------
+  # Preloading
+  #-----------------------------------------------------------------------
+
+  def preload_data(s, addr, data):
+    '''Preloads a list of DataType (or (payload, predicate) tuples) into
+       the SPM starting at `addr`.'''
+    for i, item in enumerate(data):
+      if isinstance(item, tuple):
+        s.data_mem[addr + i] = (item[0] & s.data_mask, item[1])
+      else:
+        s.data_mem[addr + i] = (int(item.payload), int(item.predicate))
+
+  #-----------------------------------------------------------------------
+  # Controller
+  #-----------------------------------------------------------------------
+
+  def _recv_from_cpu(s, pkt, mem_ports):
+    payload = pkt.payload
+    cmd = int(payload.cmd)
+    if cmd == CMD_STORE_REQUEST:
+      addr = int(payload.data_addr)
+      bank = s._bank_of(addr)
+      if ('w', bank) in mem_ports:
+        return False
+      mem_ports.add(('w', bank))
+      s.data_mem[addr] = (int(payload.data.payload), int(payload.data.predicate))
+      return True
+    if cmd == CMD_LOAD_REQUEST:
+      addr = int(payload.data_addr)
+      bank = s._bank_of(addr)
+      if ('r', bank) in mem_ports:
+        return False
+      mem_ports.add(('r', bank))
+      s.cpu_out.append((s.cycle + s.mem_latency + 1,
+                        s._mk_cpu_pkt(0, CMD_LOAD_RESPONSE,
+                                      s.data_mem[addr], addr)))
+      return True
+    if cmd in _TILE_CTRL_CMDS:
+      dst = int(pkt.dst)
+      assert dst < s.num_tiles, f"ctrl packet targets invalid tile {dst}"
+      arrival = s.cycle + s.ctrl_ring_latency * (s._ring_hops(dst) + 1)
+      s.tiles[dst].ctrl_pkts.append((arrival, cmd, payload))
+      return True
+    raise ValueError(
+        f"CgraCL does not model {CMD_SYMBOL_DICT.get(cmd, cmd)} from CPU")
+
+  def _send_to_cpu(s, tile_id, cmd, data = (0, 0)):
+    arrival = s.cycle + s.ctrl_ring_latency * (s._ring_hops(tile_id) + 1)
+    s.cpu_out.append((arrival, s._mk_cpu_pkt(tile_id, cmd, data)))
+
+  #-----------------------------------------------------------------------
+  # Tile ctrl packet handling (CtrlMemDynamicRTL + ConstQueueDynamicRTL)
+  #-----------------------------------------------------------------------
+
+  def _tile_recv_ctrl(s, tile):
+    if not tile.ctrl_pkts or tile.ctrl_pkts[0][0] > s.cycle:
+      return
+    _, cmd, payload = tile.ctrl_pkts[0]
+    if cmd == CMD_CONST:
+      if len(tile.consts) >= s.ctrl_mem_size:
+        return
+      tile.consts.append((int(payload.data.payload), int(payload.data.predicate)))
+    elif cmd == CMD_CONFIG:
+      tile.ctrl[int(payload.ctrl_addr)] = \
+          _Ctrl(payload.ctrl, s.num_fu_inports, s.num_tile_ports + s.num_fu_inports)
+    elif cmd == CMD_CONFIG_TOTAL_CTRL_COUNT:
+      tile.total_ctrl_steps = int(payload.data.payload)
+    elif cmd == CMD_CONFIG_COUNT_PER_ITER:
+      tile.ctrl_count_per_iter = int(payload.data.payload)
+    elif cmd == CMD_CONFIG_CTRL_LOWER_BOUND:
+      tile.ctrl_count_lower_bound = int(payload.data.payload) % s.ctrl_mem_size
+      tile.pc = tile.ctrl_count_lower_bound
+    elif cmd == CMD_CONFIG_PROLOGUE_FU:
+      tile.prologue_fu[int(payload.ctrl_addr)] = int(payload.data.payload)
+    elif cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR:
+      inport = int(payload.ctrl.routing_xbar_outport[0])
+      if inport > 0:
+        tile.prologue_routing[int(payload.ctrl_addr)][inport - 1] = \
+            int(payload.data.payload)
+    elif cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR:
+      inport = int(payload.ctrl.fu_xbar_outport[0])
+      tile.prologue_fu_xbar[int(payload.ctrl_addr)][inport] = \
+          int(payload.data.payload)
+    elif (cmd == CMD_LAUNCH) | (cmd == CMD_RESUME):
+      tile.launched = True
+      tile.sent_complete = False
+    elif cmd == CMD_TERMINATE:
+      tile.launched = False
+      tile.times = 0
+    tile.ctrl_pkts.popleft()
+
+  #-----------------------------------------------------------------------
+  # Tile execution (crossbars + register cluster + FU)
+  #-----------------------------------------------------------------------
+
+  def _fu_compute(s, tile, addr, op, operands, const):
+    '''Returns (fu_out list, consumes const, extra action) or None if the
+       operands are not ready.'''
+    in0, in1, in2 = operands[0], operands[1], operands[2]
+    if op == kNahOpt:
+      return [None, None], None
+    if op in _BINARY_OPS:
+      if in0 is None or in1 is None:
+        return None
+      return [(_BINARY_OPS[op](in0[0], in1[0]) & s.data_mask,
+               in0[1] & in1[1]), None], None
+    if op in _BINARY_CONST_OPS:
+      if in0 is None or const is None:
+        return None
+      return [(_BINARY_CONST_OPS[op](in0[0], const[0]) & s.data_mask,
+               in0[1] & const[1]), None], None
+    if op in _CMP_OPS:
+      if in0 is None or in1 is None:
+        return None
+      return [(int(_CMP_OPS[op](s._signed(in0[0]), s._signed(in1[0]))),
+               in0[1] & in1[1]), None], None
+    if op in _CMP_CONST_OPS:
+      if in0 is None or const is None:
+        return None
+      return [(int(_CMP_CONST_OPS[op](s._signed(in0[0]), s._signed(const[0]))),
+               in0[1] & const[1]), None], None
+    if op == int(OPT_INC):
+      if in0 is None:
+        return None
+      return [((in0[0] + 1) & s.data_mask, in0[1]), None], None
+    if op == int(OPT_PAS):
+      if in0 is None:
+        return None
+      return [in0, None], None
+    if op == int(OPT_NOT):
+      if in0 is None:
+        return None
+      return [(int(in0[0] == 0), in0[1]), None], None
+    if op == int(OPT_BIT_NOT):
+      if in0 is None:
+        return None
+      return [(~in0[0] & s.data_mask, in0[1]), None], None
+    if (op == int(OPT_MUL_ADD)) | (op == int(OPT_MUL_SUB)):
+      if in0 is None or in1 is None or in2 is None:
+        return None
+      product = in0[0] * in1[0]
+      result = product + in2[0] if op == int(OPT_MUL_ADD) else product - in2[0]
+      return [(result & s.data_mask, in0[1] & in1[1] & in2[1]), None], None
+    if op == int(OPT_MUL_CONST_ADD):
+      if in0 is None or in2 is None or const is None:
+        return None
+      return [((in0[0] * const[0] + in2[0]) & s.data_mask,
+               in0[1] & const[1] & in2[1]), None], None
+    if op == int(OPT_PHI):
+      if in0 is None or in1 is None:
+        return None
+      if in0[1]:
+        return [(in0[0], 1), None], None
+      if in1[1]:
+        return [(in1[0], 1), None], None
+      return [(in0[0], 0), None], None
+    if op == int(OPT_PHI_START):
+      if tile.phi_first[addr]:
+        if in0 is None:
+          return None
+        return [(in0[0], 1), None], 'phi_first'
+      if in0 is None or in1 is None:
+        return None
+      if in0[1]:
+        return [(in0[0], 1), None], 'phi_first'
+      if in1[1]:
+        return [(in1[0], 1), None], 'phi_first'
+      return [(in0[0], 0), None], 'phi_first'
+    if op == int(OPT_PHI_CONST):
+      if tile.phi_first[addr]:
+        if const is None:
+          return None
+        return [const, None], 'phi_first'
+      if in0 is None:
+        return None
+      return [in0, None], 'phi_first'
+    if op == int(OPT_SEL):
+      if in0 is None or in1 is None or in2 is None:
+        return None
+      chosen = in1 if in0[0] == 1 else in2
+      return [(chosen[0], in0[1] & in1[1] & in2[1]), None], None
+    if op == int(OPT_GRT_PRED):
+      if in0 is None or in1 is None:
+        return None
+      pred = in0[1] & in1[1] if in1[0] != 0 else 0
+      return [(in0[0], pred), None], None
+    if op == int(OPT_GRT_ALWAYS):
+      if in0 is None:
+        return None
+      return [(in0[0], 1), None], None
+    if op == int(OPT_GRT_ONCE):
+      if in0 is None:
+        return None
+      return [(in0[0], int(not tile.already_grt_once)), None], 'grt_once'
+    if (op == int(OPT_RET)) | (op == int(OPT_RET_VOID)):
+      if in0 is None:
+        return None
+      if in0[1] and not tile.already_ret[addr]:
+        return [None, None], 'ret'
+      return [None, None], None
+    raise ValueError(
+        f"CgraCL does not model {OPT_SYMBOL_DICT.get(OpCodeType(op), op)} "
+        f"on tile {tile.tile_id}")
+
+  def _mem_access(s, tile, op, operands, const, mem_ports):
+    '''Returns (fu_out list, extra action) or None if blocked. The
+       memory is actually read/written when the plan commits.'''
+    in0, in1 = operands[0], operands[1]
+    if not s.has_mem_port[tile.tile_id]:
+      return None
+    if op == int(OPT_LD) or op == int(OPT_ADD_CONST_LD) or op == int(OPT_LD_CONST):
+      if op == int(OPT_LD):
+        if in0 is None:
+          return None
+        addr, pred = in0[0] & s.addr_mask, in0[1]
+      elif op == int(OPT_ADD_CONST_LD):
+        if in0 is None or const is None:
+          return None
+        addr, pred = (in0[0] + const[0]) & s.addr_mask, in0[1]
+      else:
+        if const is None:
+          return None
+        addr, pred = const[0] & s.addr_mask, const[1]
+      # A false predicate on the address returns fake data without
+      # touching the memory (see MemUnitRTL).
+      if not pred and op != int(OPT_LD_CONST):
+        return [(0, 0), None], None
+      bank = s._bank_of(addr)
+      if ('r', bank) in mem_ports:
+        return None
+      mem_ports.add(('r', bank))
+      return [None, None], ('ld', addr, pred)
+    # Stores.
+    if op == int(OPT_STR):
+      if in0 is None or in1 is None:
+        return None
+      addr, data, pred = in0[0] & s.addr_mask, in1[0], in0[1] & in1[1]
+    else:
+      if in0 is None or const is None:
+        return None
+      addr, data, pred = const[0] & s.addr_mask, in0[0], in0[1] & const[1]
+      if not pred:
+        return [None, None], None
+    bank = s._bank_of(addr)
+    if ('w', bank) in mem_ports:
+      return None
+    mem_ports.add(('w', bank))
+    return [None, None], ('st', addr, (data, pred))
+
+  def _tile_plan(s, tile, mem_ports):
+    '''Checks whether the current ctrl signal of the tile can fire in
+       this cycle and returns the plan to commit, or None.'''
+    if not tile.launched or tile.sent_complete:
+      return None
+    if (tile.total_ctrl_steps > 0) and (tile.times == tile.total_ctrl_steps):
+      return None
+    addr = tile.pc
+    ctrl = tile.ctrl[addr]
+    if ctrl.operation == kStartOpt:
+      return None
+    op = kNahOpt if tile.prologue_fu[addr] > 0 else ctrl.operation
+    num_tile_ports = s.num_tile_ports
+
+    # Routing crossbar.
+    route_vals = {}
+    pops = set()
+    prologue_routing = []
+    for j, code in enumerate(ctrl.routing_xbar_outport):
+      if code == 0:
+        continue
+      src = code - 1
+      if tile.prologue_routing_count[addr][src] < tile.prologue_routing[addr][src]:
+        prologue_routing.append(src)
+        continue
+      if src < num_tile_ports:
+        chan = tile.in_chan[src]
+        if not chan or chan[0][0] > s.cycle:
+          return None
+        route_vals[j] = chan[0][1]
+        pops.add(src)
+      else:
+        bank = src - num_tile_ports
+        if ctrl.read_reg_towards[bank] & READ_TOWARDS_ROUTING_XBAR == 0:
+          return None
+        route_vals[j] = tile.regs[bank][ctrl.read_reg_idx[bank]]
+
+    # Register cluster towards FU.
+    fu_inport_vals = []
+    for i in range(s.num_fu_inports):
+      if ctrl.read_reg_towards[i] & READ_TOWARDS_FU:
+        fu_inport_vals.append(tile.regs[i][ctrl.read_reg_idx[i]])
+      else:
+        fu_inport_vals.append(route_vals.get(num_tile_ports + i))
+    operands = [fu_inport_vals[code - 1] if code else fu_inport_vals[0]
+                for code in ctrl.fu_in[:3]]
+    while len(operands) < 3:
+      operands.append(None)
+    const = tile.consts[tile.const_rd_cur] \
+            if tile.const_rd_cur < len(tile.consts) else None
+
+    if op in _MEM_OPS:
+      result = s._mem_access(tile, op, operands, const, mem_ports)
+    else:
+      result = s._fu_compute(tile, addr, op, operands, const)
+    if result is None:
+      return None
+    fu_out, action = result
+    is_load = isinstance(action, tuple) and action[0] == 'ld'
+
+    # FU crossbar.
+    fu_xbar_vals = {}
+    prologue_fu_xbar = []
+    for j, code in enumerate(ctrl.fu_xbar_outport):
+      if code == 0:
+        continue
+      src = code - 1
+      if tile.prologue_fu_xbar_count[addr][src] < tile.prologue_fu_xbar[addr][src]:
+        prologue_fu_xbar.append(src)
+        continue
+      if fu_out[src] is None and not (is_load and src == 0):
+        return None
+      fu_xbar_vals[j] = src
+
+    # Tile outports need room in the downstream channel.
+    sends = []
+    for j in range(num_tile_ports):
+      if (j not in route_vals) and (j not in fu_xbar_vals):
+        continue
+      link = s.links[tile.tile_id][j]
+      if link is not None:
+        dst_tile, dst_port = link
+        if len(s.tiles[dst_tile].in_chan[dst_port]) >= s.channel_depth:
+          return None
+      sends.append(j)
+
+    return (addr, op, route_vals, pops, fu_out, fu_xbar_vals, sends,
+            prologue_routing, prologue_fu_xbar, action)
+
+  def _tile_commit(s, tile, plan, staged):
+    (addr, op, route_vals, pops, fu_out, fu_xbar_vals, sends,
+     prologue_routing, prologue_fu_xbar, action) = plan
+    ctrl = tile.ctrl[addr]
+    num_tile_ports = s.num_tile_ports
+
+    if isinstance(action, tuple):
+      if action[0] == 'ld':
+        _, mem_addr, pred = action
+        data = s.data_mem[mem_addr]
+        fu_out = [(data[0], data[1] & pred), None]
+      else:
+        _, mem_addr, data = action
+        s.data_mem[mem_addr] = data
+    elif action == 'phi_first':
+      tile.phi_first[addr] = False
+    elif action == 'grt_once':
+      tile.already_grt_once = True
+    elif action == 'ret':
+      tile.already_ret[addr] = True
+      data = (0, 0) if op == int(OPT_RET_VOID) else \
+             s._fu_ret_value(tile, ctrl, route_vals)
+      s._send_to_cpu(tile.tile_id, CMD_COMPLETE, data)
+
+    def xbar_out(j):
+      if j in route_vals:
+        return route_vals[j]
+      return fu_out[fu_xbar_vals[j]]
+
+    for j in sends:
+      link = s.links[tile.tile_id][j]
+      value = xbar_out(j)
+      if link is None:
+        s.boundary_out.append((s.cycle, tile.tile_id, j, value))
+      else:
+        staged.append((link, (s.cycle + s.link_latency, value)))
+
+    for i in range(s.num_fu_inports):
+      wfrom = ctrl.write_reg_from[i]
+      j = num_tile_ports + i
+      if (wfrom == PORT_ROUTING_CROSSBAR) and (j in route_vals):
+        tile.regs[i][ctrl.write_reg_idx[i]] = route_vals[j]
+      elif (wfrom == PORT_FU_CROSSBAR) and (j in fu_xbar_vals):
+        tile.regs[i][ctrl.write_reg_idx[i]] = fu_out[fu_xbar_vals[j]]
+
+    for src in pops:
+      tile.in_chan[src].popleft()
+    for src in prologue_routing:
+      tile.prologue_routing_count[addr][src] += 1
+    for src in prologue_fu_xbar:
+      tile.prologue_fu_xbar_count[addr][src] += 1
+
+    if (op in _USES_CONST) and tile.consts:
+      if tile.const_rd_cur < len(tile.consts) - 1:
+        tile.const_rd_cur += 1
+      else:
+        tile.const_rd_cur = 0
+
+    # Control memory proceeds.
+    tile.fire_count += 1
+    if (tile.total_ctrl_steps == 0) or (tile.times < tile.total_ctrl_steps):
+      tile.times += 1
+    if tile.prologue_fu[addr] > 0:
+      tile.prologue_fu[addr] -= 1
+    upper_bound = tile.ctrl_count_lower_bound + tile.ctrl_count_per_iter
+    if tile.pc == upper_bound - 1:
+      tile.pc = tile.ctrl_count_lower_bound
+    else:
+      tile.pc = (tile.pc + 1) % s.ctrl_mem_size
+
+    if (tile.total_ctrl_steps > 0) and (tile.times == tile.total_ctrl_steps):
+      tile.sent_complete = True
+      s._send_to_cpu(tile.tile_id, CMD_COMPLETE)
+
+  def _fu_ret_value(s, tile, ctrl, route_vals):
+    code = ctrl.fu_in[0]
+    i = code - 1 if code else 0
+    if ctrl.read_reg_towards[i] & READ_TOWARDS_FU:
+      return tile.regs[i][ctrl.read_reg_idx[i]]
+    return route_vals[s.num_tile_ports + i]
+
+  #-----------------------------------------------------------------------
+  # Simulation
+  #-----------------------------------------------------------------------
+
+  def tick(s, cpu_pkt = None):
+    '''Advances one cycle. Returns True if `cpu_pkt` was accepted.'''
+    mem_ports = set()
+    accepted = False
+    if cpu_pkt is not None:
+      accepted = s._recv_from_cpu(cpu_pkt, mem_ports)
+
+    staged = []
+    for tile in s.tiles:
+      s._tile_recv_ctrl(tile)
+      if tile.stall > 0:
+        tile.stall -= 1
+        if tile.stall == 0:
+          s._tile_commit(tile, tile.pending_plan, staged)
+          tile.pending_plan = None
+        continue
+      plan = s._tile_plan(tile, mem_ports)
+      if plan is None:
+        continue
+      action = plan[-1]
+      if isinstance(action, tuple) and s.mem_latency > 0:
+        tile.pending_plan = plan
+        tile.stall = s.mem_latency
+      else:
+        s._tile_commit(tile, plan, staged)
+
+    for (dst_tile, dst_port), entry in staged:
+      s.tiles[dst_tile].in_chan[dst_port].append(entry)
+
+    s.cycle += 1
+    return accepted
+
+  def idle(s):
+    if any(arrival >= s.cycle for arrival, _ in s.cpu_out):
+      return False
+    for tile in s.tiles:
+      if tile.ctrl_pkts or tile.stall > 0:
+        return False
+    return True
+
+  def run(s, src_ctrl_pkt, src_query_pkt = None, complete_count = None,
+          max_cycles = 100000):
+    '''Feeds `src_ctrl_pkt` into the fabric, then `src_query_pkt` once
+       `complete_count` CMD_COMPLETE packets have been sent to the CPU
+       (mirrors the CgraRTL test harness). Returns the packets sent to
+       the CPU, in order, and the number of simulated cycles.'''
+    ctrl_pkts = deque(src_ctrl_pkt)
+    query_pkts = deque(src_query_pkt or [])
+    if complete_count is None:
+      complete_count = sum(1 for pkt in src_ctrl_pkt
+                           if int(pkt.payload.cmd) == CMD_LAUNCH)
+
+    while s.cycle < max_cycles:
+      num_completes = sum(1 for arrival, pkt in s.cpu_out
+                          if (arrival <= s.cycle) and
+                             (int(pkt.payload.cmd) == CMD_COMPLETE))
+      if ctrl_pkts:
+        if s.tick(ctrl_pkts[0]):
+          ctrl_pkts.popleft()
+      elif query_pkts and (num_completes >= complete_count):
+        if s.tick(query_pkts[0]):
+          query_pkts.popleft()
+      else:
+        s.tick()
+        if not query_pkts and \
+           (num_completes >= complete_count or
+            all(tile.done() for tile in s.tiles)) and s.idle():
+          break
+
+    cpu_pkts = [pkt for _, pkt in sorted(s.cpu_out, key = lambda x: x[0])]
+    return cpu_pkts, s.cycle
+
+#-------------------------------------------------------------------------
+# Cross-checking against the RTL sink stream
+#-------------------------------------------------------------------------
+
+def cross_check_with_rtl(model_pkts, rtl_pkts,
+                         cmp_fn = lambda a, b: (a.payload.cmd == b.payload.cmd) &
+                                               (a.payload.data == b.payload.data),
+                         ordered = False):
+  '''Compares the packets produced by CgraCL with the packets observed
+     (or expected) on the RTL `send_to_cpu_pkt` port. As CMD_COMPLETE
+     from different tiles may arrive in a different order than the RTL,
+     packets are only matched per command unless `ordered` is set.'''
+  assert len(model_pkts) == len(rtl_pkts), \
+      f"CgraCL sent {len(model_pkts)} packets, RTL sent {len(rtl_pkts)}"
+  if ordered:
+    for i, (model_pkt, rtl_pkt) in enumerate(zip(model_pkts, rtl_pkts)):
+      assert cmp_fn(model_pkt, rtl_pkt), \
+          f"Mismatch at packet {i}:\nCgraCL: {model_pkt}RTL   : {rtl_pkt}"
+    return
+  remaining = list(rtl_pkts)
+  for model_pkt in model_pkts:
+    for i, rtl_pkt in enumerate(remaining):
+      if cmp_fn(model_pkt, rtl_pkt):
+        remaining.pop(i)
+        break
+    else:
+      assert False, f"CgraCL packet has no RTL counterpart:\n{model_pkt}"
@@ -11,6 +11,7 @@ from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ..lib.basic.val_rdy.queues import BypassQueueRTL
 from ..lib.opt_type import *
+from ..lib.util import backdoor_config
 from ..lib.util.common import *
 from ..mem.data.DataMemControllerRTL import DataMemControllerRTL
 from ..noc.PyOCN.pymtl3_net.ocnlib.ifcs.positions import mk_ring_pos
@@ -35,7 +36,18 @@ class CgraRTL(Component):
                 controller2addr_map, idTo2d_map,
                 is_multi_cgra = True,
                 has_ctrl_ring = True,
-                has_im2col_engine = False):
+                has_im2col_engine = False,
+                has_perf_counters = False,
+                bank_mapping = BANK_MAPPING_BLOCK,
+                bank_storage = BANK_STORAGE_REGISTER_FILE,
+                sram_macro = None,
+                has_non_blocking_loads = False,
+                has_remote_load_cache = False,
+                has_request_coalescing = False,
+                noc_arbitration = NOC_ARBITRATION_ROUND_ROBIN,
+                has_shadow_ctrl_mem = False,
+                has_launch_queue = False,
+                has_global_barrier = False):
 
     # Derives all types from CgraPayloadType.
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -109,7 +121,9 @@ class CgraRTL(Component):
                       total_steps, 4, 2, s.num_mesh_ports,
                       s.num_mesh_ports, num_cgras, s.num_tiles,
                       num_registers_per_reg_bank,
-                      FuList = FuList)
+                      FuList = FuList,
+                      has_perf_counters = has_perf_counters,
+                      has_shadow_ctrl_mem = has_shadow_ctrl_mem)
               for i in range(s.num_tiles)]
     s.data_mem = DataMemControllerRTL(NocPktType,
                                       data_mem_size_global,
@@ -121,11 +135,22 @@ class CgraRTL(Component):
                                       multi_cgra_columns,
                                       s.num_tiles,
                                       mem_access_is_combinational,
-                                      idTo2d_map)
+                                      idTo2d_map,
+                                      has_perf_counters = has_perf_counters,
+                                      bank_mapping = bank_mapping,
+                                      bank_storage = bank_storage,
+                                      sram_macro = sram_macro,
+                                      has_non_blocking_loads = has_non_blocking_loads,
+                                      has_request_coalescing = has_request_coalescing)
     s.controller = ControllerRTL(NocPktType,
                                   multi_cgra_rows, multi_cgra_columns,
                                   s.num_tiles, controller2addr_map, idTo2d_map,
-                                  has_im2col_engine = has_im2col_engine)
+                                  has_im2col_engine = has_im2col_engine,
+                                  has_perf_counters = has_perf_counters,
+                                  has_remote_load_cache = has_remote_load_cache,
+                                  noc_arbitration = noc_arbitration,
+                                  has_launch_queue = has_launch_queue,
+                                  has_global_barrier = has_global_barrier)
     # An additional router for controller to receive CMD_COMPLETE signal from Ring to CPU.
     # The last argument of 1 is for the latency per hop.
     if has_ctrl_ring:
@@ -145,6 +170,13 @@ class CgraRTL(Component):
     s.data_mem.address_lower //= s.address_lower
     s.data_mem.address_upper //= s.address_upper
 
+    # Performance counters of the data memory, returned by the controller.
+    for i in range(NUM_DATA_MEM_PERF_COUNTERS):
+      s.controller.recv_from_data_mem_perf[i] //= s.data_mem.perf_counters[i]
+
+    # Ping-pong SPM half of the tiles, flipped by the controller.
+    s.data_mem.spm_buffer_sel //= s.controller.spm_buffer_sel
+
     # Connects data memory with controller.
     s.data_mem.recv_from_noc_load_request //= s.controller.send_to_sram_load_request_from_noc
     s.data_mem.recv_from_noc_store_request //= s.controller.send_to_sram_store_request_from_noc
@@ -277,6 +309,14 @@ class CgraRTL(Component):
         s.tile[i].to_mem_waddr.rdy   //= 0
         s.tile[i].to_mem_wdata.rdy   //= 0
 
+  # Backdoor configuration, see lib/util/backdoor_config.py. Only valid
+  # for the Python simulation, right after reset.
+  def backdoor_tiles(s):
+    return dict(enumerate(s.tile))
+
+  def backdoor_configure(s, pkts):
+    return backdoor_config.backdoor_configure(s.backdoor_tiles(), pkts)
+
   # Line trace
   def line_trace(s):
     res = "||\n".join([(("\n[cgra"+str(s.cgra_id)+"_tile"+str(i)+"]: ") + x.line_trace() + x.ctrl_mem.line_trace())
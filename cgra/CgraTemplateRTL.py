@@ -11,6 +11,7 @@ from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ..lib.basic.val_rdy.queues import BypassQueueRTL
 from ..lib.opt_type import *
+from ..lib.util import backdoor_config
 from ..lib.util.common import *
 from ..mem.data.DataMemControllerRTL import DataMemControllerRTL
 from ..noc.PyOCN.pymtl3_net.ocnlib.ifcs.positions import mk_ring_pos
@@ -86,7 +87,14 @@ class CgraTemplateRTL(Component):
                 provided_max_num_wr_tiles = None,
                 has_dma_ports = False,
                 DmaDataType = mk_dma_data(),
-                DmaCmdType = mk_dma_cmd()):
+                DmaCmdType = mk_dma_cmd(),
+                has_perf_counters = False,
+                num_dma_lanes = 1,
+                dma_cmd_queue_depth = 4,
+                has_spm_double_buffer = False,
+                bank_mapping = BANK_MAPPING_BLOCK,
+                bank_storage = BANK_STORAGE_REGISTER_FILE,
+                sram_macro = None):
     """
     provided_max_per_cgra_rows: the row number of the largest cgra in the multi heterogeneous cgra architecture. None for single cgra arch or Homogeneous multi-cgra arch.
     provided_max_per_cgra_cols: the column number of the largest cgra in the multi heterogeneous cgra architecture. None for single cgra arch or Homogeneous multi-cgra arch.
@@ -153,12 +161,13 @@ class CgraTemplateRTL(Component):
 
       s.dma_done = RecvIfcRTL(DmaDoneType)
 
+      # One port of each kind per DMA lane.
       # Receive the request of writing into SPM from the DMA.
-      s.recv_from_dma_spm_wr_req = RecvIfcRTL(DmaSpmWriteReqType)
+      s.recv_from_dma_spm_wr_req = [RecvIfcRTL(DmaSpmWriteReqType) for _ in range(num_dma_lanes)]
       # Receive the request of reading from SPM from the DMA.
-      s.recv_from_dma_spm_rd_req  = RecvIfcRTL(DmaSpmReadReqType)
+      s.recv_from_dma_spm_rd_req  = [RecvIfcRTL(DmaSpmReadReqType) for _ in range(num_dma_lanes)]
       # Send the response of reading from SPM to the DMA.
-      s.send_to_dma_spm_rd_resp   = SendIfcRTL(DmaSpmReadRespType)
+      s.send_to_dma_spm_rd_resp   = [SendIfcRTL(DmaSpmReadRespType) for _ in range(num_dma_lanes)]
 
 
     if is_multi_cgra:
@@ -181,7 +190,8 @@ class CgraTemplateRTL(Component):
                       total_steps, 4, 2, s.num_mesh_ports,
                       s.num_mesh_ports, num_cgras, s.num_tiles,
                       num_registers_per_reg_bank,
-                      FuList = map_fu2rtl(TileList[i].getAllValidFuTypes()))
+                      FuList = map_fu2rtl(TileList[i].getAllValidFuTypes()),
+                      has_perf_counters = has_perf_counters)
               for i in range(s.num_tiles)]
     # FIXME: Need to enrish data-SPM-related user-controlled parameters, e.g., number of banks.
     s.data_mem = DataMemControllerRTL(NocPktType,
@@ -197,14 +207,24 @@ class CgraTemplateRTL(Component):
                                       idTo2d_map,
                                       has_dma_ports,
                                       DmaCmdType,
-                                      DmaDataType)
+                                      DmaDataType,
+                                      has_perf_counters = has_perf_counters,
+                                      num_dma_lanes = num_dma_lanes,
+                                      has_spm_double_buffer = has_spm_double_buffer,
+                                      bank_mapping = bank_mapping,
+                                      bank_storage = bank_storage,
+                                      sram_macro = sram_macro)
     s.cgra_id = InPort(CgraIdType)
     s.controller = ControllerRTL(NocPktType,
                                   multi_cgra_rows, multi_cgra_columns,
                                   max_num_tiles, controller2addr_map, idTo2d_map,
                                   has_dma_ports,
                                   DmaDataType,
-                                  DmaCmdType)
+                                  DmaCmdType,
+                                  has_perf_counters = has_perf_counters,
+                                  num_dma_lanes = num_dma_lanes,
+                                  dma_cmd_queue_depth = dma_cmd_queue_depth,
+                                  has_spm_double_buffer = has_spm_double_buffer)
     # Connects controller id.
     s.controller.cgra_id //= s.cgra_id
     # Tie off the controller's im2col ports (no engine attached here).
@@ -226,14 +246,22 @@ class CgraTemplateRTL(Component):
     s.data_mem.address_lower //= s.address_lower
     s.data_mem.address_upper //= s.address_upper
 
+    # Performance counters of the data memory, returned by the controller.
+    for i in range(NUM_DATA_MEM_PERF_COUNTERS):
+      s.controller.recv_from_data_mem_perf[i] //= s.data_mem.perf_counters[i]
+
+    # Ping-pong SPM half of the tiles, flipped by the controller.
+    s.data_mem.spm_buffer_sel //= s.controller.spm_buffer_sel
+
     if has_dma_ports:
       # CPU packets are decoded by the controller before becoming DMA commands.
       s.dma_cmd  //= s.controller.dma_cmd
       s.dma_done //= s.controller.dma_done
 
-      s.recv_from_dma_spm_wr_req //= s.controller.recv_from_dma_spm_wr_req
-      s.recv_from_dma_spm_rd_req  //= s.controller.recv_from_dma_spm_rd_req
-      s.send_to_dma_spm_rd_resp   //= s.controller.send_to_dma_spm_rd_resp
+      for i in range(num_dma_lanes):
+        s.recv_from_dma_spm_wr_req[i] //= s.controller.recv_from_dma_spm_wr_req[i]
+        s.recv_from_dma_spm_rd_req[i]  //= s.controller.recv_from_dma_spm_rd_req[i]
+        s.send_to_dma_spm_rd_resp[i]   //= s.controller.send_to_dma_spm_rd_resp[i]
 
     else:
       # Grounds the DMA ports when no DMA engine is attached.
@@ -241,16 +269,18 @@ class CgraTemplateRTL(Component):
       s.controller.dma_done.val //= 0
       s.controller.dma_done.msg //= DmaDoneType()
 
-      s.controller.recv_from_dma_spm_wr_req.val //= 0
-      s.controller.recv_from_dma_spm_wr_req.msg //= DmaSpmWriteReqType()
-      s.controller.recv_from_dma_spm_rd_req.val //= 0
-      s.controller.recv_from_dma_spm_rd_req.msg //= DmaSpmReadReqType()
-      s.controller.send_to_dma_spm_rd_resp.rdy //= 0
+      for i in range(num_dma_lanes):
+        s.controller.recv_from_dma_spm_wr_req[i].val //= 0
+        s.controller.recv_from_dma_spm_wr_req[i].msg //= DmaSpmWriteReqType()
+        s.controller.recv_from_dma_spm_rd_req[i].val //= 0
+        s.controller.recv_from_dma_spm_rd_req[i].msg //= DmaSpmReadReqType()
+        s.controller.send_to_dma_spm_rd_resp[i].rdy //= 0
 
     # Controller <-> SPM/data_mem
-    s.controller.send_to_sram_store_request_from_dma   //= s.data_mem.recv_from_controller_spm_wr_req
-    s.controller.send_to_sram_load_request_from_dma    //= s.data_mem.recv_from_controller_spm_rd_req
-    s.controller.recv_from_sram_load_response //= s.data_mem.send_to_controller_spm_rd_resp
+    for i in range(num_dma_lanes):
+      s.controller.send_to_sram_store_request_from_dma[i]   //= s.data_mem.recv_from_controller_spm_wr_req[i]
+      s.controller.send_to_sram_load_request_from_dma[i]    //= s.data_mem.recv_from_controller_spm_rd_req[i]
+      s.controller.recv_from_sram_load_response[i] //= s.data_mem.send_to_controller_spm_rd_resp[i]
     
     # Connects data memory with controller.
     s.data_mem.recv_from_noc_load_request //= s.controller.send_to_sram_load_request_from_noc
@@ -434,6 +464,14 @@ class CgraTemplateRTL(Component):
           s.tile[i].to_mem_waddr.rdy //= 0
           s.tile[i].to_mem_wdata.rdy //= 0
 
+  # Backdoor configuration, see lib/util/backdoor_config.py. Only valid
+  # for the Python simulation, right after reset.
+  def backdoor_tiles(s):
+    return dict(enumerate(s.tile))
+
+  def backdoor_configure(s, pkts):
+    return backdoor_config.backdoor_configure(s.backdoor_tiles(), pkts)
+
   # Line trace
   def line_trace(s):
     res = "||\n".join([(("[tile"+str(i)+"]: ") + x.line_trace() + x.ctrl_mem.line_trace())
@@ -134,6 +134,13 @@ class CgraWithContextSwitchRTL(Component):
     s.data_mem.address_lower //= s.address_lower
     s.data_mem.address_upper //= s.address_upper
 
+    # Performance counters of the data memory, returned by the controller.
+    for i in range(NUM_DATA_MEM_PERF_COUNTERS):
+      s.controller.recv_from_data_mem_perf[i] //= s.data_mem.perf_counters[i]
+
+    # Ping-pong SPM half of the tiles, flipped by the controller.
+    s.data_mem.spm_buffer_sel //= s.controller.spm_buffer_sel
+
     # Connects data memory with controller.
     s.data_mem.recv_from_noc_load_request //= s.controller.send_to_sram_load_request_from_noc
     s.data_mem.recv_from_noc_store_request //= s.controller.send_to_sram_store_request_from_noc
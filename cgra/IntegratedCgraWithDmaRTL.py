@@ -13,6 +13,7 @@ from .CgraTemplateRTL import CgraTemplateRTL
 from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ..lib.messages import *
+from ..lib.util.common import BANK_MAPPING_BLOCK, BANK_STORAGE_REGISTER_FILE
 from ..lib.util.data_struct_attr import *
 from ..mem.dma.DmaEngineRTL import DmaEngineRTL
 
@@ -29,6 +30,15 @@ class IntegratedCgraWithDmaRTL( Component ):
     DMA commands are decoded there.
   - The DMA engine accesses the CGRA's internal data SPM through controller-
     forwarded ports; it is not connected directly to `DataMemControllerRTL`.
+    `num_dma_lanes` > 1 enables the wide DMA mode, in which each lane has
+    its own forwarded ports and data memory crossbar inport.
+  - DMA commands are queued (`dma_cmd_queue_depth` descriptors in the
+    controller, a few more in the engine), so the CPU can enqueue several
+    transfers and match the CMD_DMA_DONE packets by their dma_tag.
+  - With `has_spm_double_buffer`, the DMA works on the half of the SPM
+    that the tiles don't see, and CMD_SPM_SWAP exchanges the halves once
+    the kernel has completed and the DMA is idle, so the next inputs can
+    be moved in while the current kernel runs.
   - External memory requests from the DMA engine are exposed at the top level
     to be connected to a DRAM model or an AXI adapter.
   - Boundary data ports for multi-CGRA configurations are also passed through
@@ -50,7 +60,13 @@ class IntegratedCgraWithDmaRTL( Component ):
                 provided_max_per_cgra_rows = None,
                 provided_max_per_cgra_cols = None,
                 provided_max_num_rd_tiles = None,
-                provided_max_num_wr_tiles = None):
+                provided_max_num_wr_tiles = None,
+                num_dma_lanes = 1,
+                dma_cmd_queue_depth = 4,
+                has_spm_double_buffer = False,
+                bank_mapping = BANK_MAPPING_BLOCK,
+                bank_storage = BANK_STORAGE_REGISTER_FILE,
+                sram_macro = None):
 
     DataType = CgraPayloadType.get_field_type(kAttrData)
     data_bitwidth = DataType.get_field_type(kAttrPayload).nbits
@@ -134,18 +150,27 @@ class IntegratedCgraWithDmaRTL( Component ):
                              provided_max_num_wr_tiles,
                              has_dma_ports = True,
                              DmaDataType = DmaDataType,
-                             DmaCmdType = DmaCmdType)
+                             DmaCmdType = DmaCmdType,
+                             num_dma_lanes = num_dma_lanes,
+                             dma_cmd_queue_depth = dma_cmd_queue_depth,
+                             has_spm_double_buffer = has_spm_double_buffer,
+                             bank_mapping = bank_mapping,
+                             bank_storage = bank_storage,
+                             sram_macro = sram_macro)
 
     DmaSpmDataType = DmaDataType.get_field_type(kAttrSpmData)
     DmaSpmAddrType = DmaCmdType.get_field_type(kAttrSpmAddr)
     DmaBytesType = DmaCmdType.get_field_type(kAttrNBytes)
     DmaTagType = DmaCmdType.get_field_type(kAttrDmaTag)
+    DmaCountType = DmaCmdType.get_field_type(kAttrRowCount)
     s.dma = DmaEngineRTL(spm_data_nbits = DmaSpmDataType.nbits,
                          dram_data_nbits = DmaMemDataType.nbits,
                          dram_addr_nbits = DmaDramAddrType.nbits,
                          spm_addr_nbits = DmaSpmAddrType.nbits,
                          bytes_nbits = DmaBytesType.nbits,
-                         tag_nbits = DmaTagType.nbits)
+                         tag_nbits = DmaTagType.nbits,
+                         num_dma_lanes = num_dma_lanes,
+                         count_nbits = DmaCountType.nbits)
 
     # CGRA passthrough connections.
 
@@ -186,9 +211,10 @@ class IntegratedCgraWithDmaRTL( Component ):
 
     # DMA to controller-forwarded SPM connections.
 
-    s.dma.send_to_spm_wr_req //= s.cgra.recv_from_dma_spm_wr_req
-    s.dma.send_to_spm_rd_req  //= s.cgra.recv_from_dma_spm_rd_req
-    s.dma.recv_from_spm_rd_resp //= s.cgra.send_to_dma_spm_rd_resp
+    for i in range(num_dma_lanes):
+      s.dma.send_to_spm_wr_req[i] //= s.cgra.recv_from_dma_spm_wr_req[i]
+      s.dma.send_to_spm_rd_req[i]  //= s.cgra.recv_from_dma_spm_rd_req[i]
+      s.dma.recv_from_spm_rd_resp[i] //= s.cgra.send_to_dma_spm_rd_resp[i]
 
   def line_trace(s):
     return f"{s.dma.line_trace()} || {s.cgra.line_trace()}"
@@ -0,0 +1,182 @@
+"""
+==========================================================================
+CgraCL_test.py
+==========================================================================
+Test cases for the cycle-approximate CGRA fabric model. The packet
+streams mirror the ones used in CgraRTL_test.py.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+from ..CgraCL import CgraCL, cross_check_with_rtl
+from ...lib.cmd_type import *
+from ...lib.messages import *
+from ...lib.opt_type import *
+from ...lib.util.common import *
+
+#-------------------------------------------------------------------------
+# Parameters
+#-------------------------------------------------------------------------
+
+def init_types(x_tiles, y_tiles, topology = MESH, data_bitwidth = 32):
+  tile_ports = 4 if topology == MESH else 8
+  num_fu_inports = 4
+  num_fu_outports = 2
+  num_registers_per_reg_bank = 16
+  ctrl_mem_size = 6
+  data_mem_size_global = 128
+  num_cgra_columns = 4
+  num_cgra_rows = 1
+  num_tiles = x_tiles * y_tiles
+
+  DataType = mk_data(data_bitwidth, 1)
+  DataAddrType = mk_bits(clog2(data_mem_size_global))
+  CtrlType = mk_ctrl(num_fu_inports, num_fu_outports, tile_ports,
+                     tile_ports, num_registers_per_reg_bank)
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+  CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType,
+                                    CtrlAddrType)
+  IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns, num_cgra_rows,
+                                       num_tiles, CgraPayloadType)
+  per_cgra_data_size = data_mem_size_global // (num_cgra_columns * num_cgra_rows)
+  controller2addr_map = {i: [i * per_cgra_data_size, (i + 1) * per_cgra_data_size - 1]
+                         for i in range(num_cgra_columns * num_cgra_rows)}
+  return (IntraCgraPktType, CgraPayloadType, CtrlType, DataType,
+          controller2addr_map)
+
+def mk_model(IntraCgraPktType, x_tiles, y_tiles, controller2addr_map,
+             topology = MESH, ctrl_steps = 6, mem_latency = 1):
+  return CgraCL(IntraCgraPktType, x_tiles, y_tiles, 6, 128, 16, 2, 16,
+                ctrl_steps, ctrl_steps, topology, controller2addr_map,
+                mem_latency = mem_latency)
+
+#-------------------------------------------------------------------------
+# Tests
+#-------------------------------------------------------------------------
+
+@pytest.mark.parametrize('total_execute_ctrl_count', [1, 2, 5])
+def test_independent_inc_2x2(total_execute_ctrl_count):
+  IntraCgraPktType, CgraPayloadType, CtrlType, DataType, controller2addr_map = \
+      init_types(2, 2)
+  TileInType = mk_bits(clog2(4 + 4 + 1))
+  FuInType = mk_bits(clog2(4 + 1))
+  FuOutType = mk_bits(clog2(2 + 1))
+  routing_xbar_code = [TileInType(0) for _ in range(8)]
+  fu_in_code = [FuInType(1), FuInType(0), FuInType(0), FuInType(0)]
+  fu_xbar_code = [FuOutType(0) for _ in range(8)]
+  fu_xbar_code[4] = FuOutType(1)
+  read_reg_towards_code = [b2(1), b2(0), b2(0), b2(0)]
+  RegIdxType = mk_bits(clog2(16))
+  read_reg_idx_code = [RegIdxType(2), RegIdxType(0), RegIdxType(0), RegIdxType(0)]
+
+  src_ctrl_pkt = []
+  for i in range(4):
+    src_ctrl_pkt.extend([
+        IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT,
+                                                         data = DataType(total_execute_ctrl_count))),
+        IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER,
+                                                         data = DataType(1))),
+        IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG,
+                                                         ctrl = CtrlType(OPT_INC,
+                                                                         fu_in_code,
+                                                                         routing_xbar_code,
+                                                                         fu_xbar_code,
+                                                                         read_reg_towards = read_reg_towards_code,
+                                                                         read_reg_idx = read_reg_idx_code))),
+        IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_LAUNCH)),
+    ])
+
+  expected = [IntraCgraPktType(i, 4, payload = CgraPayloadType(CMD_COMPLETE))
+              for i in range(4)]
+
+  model = mk_model(IntraCgraPktType, 2, 2, controller2addr_map)
+  cpu_pkts, cycles = model.run(src_ctrl_pkt)
+  cross_check_with_rtl(cpu_pkts, expected)
+  for tile in model.tiles:
+    assert tile.fire_count == total_execute_ctrl_count
+  # Packets are fed one per cycle, so the run can't be shorter than that.
+  assert cycles >= len(src_ctrl_pkt)
+
+def test_systolic_3x3():
+  IntraCgraPktType, CgraPayloadType, CtrlType, DataType, controller2addr_map = \
+      init_types(3, 3)
+  TileInType = mk_bits(clog2(4 + 4 + 1))
+  FuInType = mk_bits(clog2(4 + 1))
+  FuOutType = mk_bits(clog2(2 + 1))
+  fu_in_code = [FuInType(x + 1) for x in range(4)]
+  ctrl_steps = 2
+
+  def routing(*codes):
+    return [TileInType(c) for c in codes]
+
+  def fu_xbar(*codes):
+    return [FuOutType(c) for c in codes]
+
+  def tile_pkts(tile_id, consts, opt, routing_code, fu_xbar_code):
+    pkts = [IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONST, data = DataType(c, 1)))
+            for c in consts]
+    pkts += [
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(1, 1))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(ctrl_steps, 1))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 0,
+                                                               ctrl = CtrlType(opt, fu_in_code, routing_code, fu_xbar_code))),
+        IntraCgraPktType(0, tile_id, payload = CgraPayloadType(CMD_LAUNCH)),
+    ]
+    return pkts
+
+  src_ctrl_pkt = [
+      IntraCgraPktType(0, 6, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(1, 1), data_addr = 0)),
+      IntraCgraPktType(0, 6, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(2, 1), data_addr = 1)),
+      IntraCgraPktType(0, 3, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(3, 1), data_addr = 2)),
+      IntraCgraPktType(0, 3, payload = CgraPayloadType(CMD_STORE_REQUEST, data = DataType(4, 1), data_addr = 3)),
+  ]
+  no_routing = routing(0, 0, 0, 0, 0, 0, 0, 0)
+  to_east = fu_xbar(0, 0, 0, 1, 0, 0, 0, 0)
+  to_south = fu_xbar(0, 1, 0, 0, 0, 0, 0, 0)
+  src_ctrl_pkt += tile_pkts(6, [0, 1], OPT_LD_CONST, no_routing, to_east)
+  src_ctrl_pkt += tile_pkts(3, [2, 3], OPT_LD_CONST, no_routing, to_east)
+  src_ctrl_pkt += tile_pkts(7, [2], OPT_MUL_CONST, routing(0, 0, 0, 3, 3, 0, 0, 0), to_south)
+  src_ctrl_pkt += tile_pkts(4, [4], OPT_MUL_CONST_ADD, routing(0, 0, 0, 3, 3, 0, 1, 0), to_south)
+  src_ctrl_pkt += tile_pkts(1, [4, 5], OPT_STR_CONST, routing(0, 0, 0, 0, 1, 0, 0, 0), fu_xbar(0, 0, 0, 0, 0, 0, 0, 0))
+  src_ctrl_pkt += tile_pkts(8, [6], OPT_MUL_CONST, routing(0, 0, 0, 0, 3, 0, 0, 0), to_south)
+  src_ctrl_pkt += tile_pkts(5, [8], OPT_MUL_CONST_ADD, routing(0, 0, 0, 0, 3, 0, 1, 0), to_south)
+  src_ctrl_pkt += tile_pkts(2, [6, 7], OPT_STR_CONST, routing(0, 0, 0, 0, 1, 0, 0, 0), fu_xbar(0, 0, 0, 0, 0, 0, 0, 0))
+
+  src_query_pkt = [IntraCgraPktType(payload = CgraPayloadType(CMD_LOAD_REQUEST, data_addr = addr))
+                   for addr in [4, 5, 6, 7]]
+
+  expected = [IntraCgraPktType(payload = CgraPayloadType(CMD_COMPLETE)) for _ in range(8)]
+  expected += [IntraCgraPktType(payload = CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(value, 1), data_addr = addr))
+               for addr, value in [(4, 0x0e), (5, 0x14), (6, 0x1e), (7, 0x2c)]]
+
+  model = mk_model(IntraCgraPktType, 3, 3, controller2addr_map, ctrl_steps = ctrl_steps)
+  cpu_pkts, cycles = model.run(src_ctrl_pkt, src_query_pkt)
+  cross_check_with_rtl(cpu_pkts, expected)
+  # The load responses come after all the COMPLETE signals.
+  cross_check_with_rtl(cpu_pkts[8:], expected[8:], ordered = True)
+
+  # Longer memory latency should only slow things down.
+  slow_model = mk_model(IntraCgraPktType, 3, 3, controller2addr_map,
+                        ctrl_steps = ctrl_steps, mem_latency = 4)
+  slow_pkts, slow_cycles = slow_model.run(src_ctrl_pkt, src_query_pkt)
+  cross_check_with_rtl(slow_pkts, expected)
+  assert slow_cycles > cycles
+
+def test_cross_check_reports_mismatch():
+  IntraCgraPktType, CgraPayloadType, CtrlType, DataType, _ = init_types(2, 2)
+  model_pkts = [IntraCgraPktType(payload = CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(1, 1)))]
+  rtl_pkts = [IntraCgraPktType(payload = CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(2, 1)))]
+  with pytest.raises(AssertionError):
+    cross_check_with_rtl(model_pkts, rtl_pkts)
+  with pytest.raises(AssertionError):
+    cross_check_with_rtl(model_pkts, [])
+
+def test_unmodeled_cmd_and_opt_are_rejected():
+  IntraCgraPktType, CgraPayloadType, CtrlType, DataType, controller2addr_map = \
+      init_types(2, 2)
+  model = mk_model(IntraCgraPktType, 2, 2, controller2addr_map)
+  with pytest.raises(ValueError, match = "SPM_SWAP"):
+    model.run([IntraCgraPktType(0, 4, payload = CgraPayloadType(CMD_SPM_SWAP))])
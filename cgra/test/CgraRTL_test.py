@@ -10,9 +10,9 @@ Author : Cheng Tan
 """
 
 from pymtl3.passes.backends.verilog import (VerilogVerilatorImportPass)
-from pymtl3.stdlib.test_utils import (run_sim,
-                                      config_model_with_cmdline_opts)
+from pymtl3.stdlib.test_utils import run_sim
 
+from ..CgraCL import CgraCL, cross_check_with_rtl
 from ..CgraRTL import CgraRTL
 from ...fu.double.SeqMulAdderRTL import SeqMulAdderRTL
 from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
@@ -35,6 +35,8 @@ from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.backdoor_config import run_sim_with_backdoor_config
+from ...lib.util.build_cache import config_model_with_build_cache
 from ...lib.util.common import *
 
 
@@ -54,7 +56,8 @@ class TestHarness(Component):
                 mem_access_is_combinational,
                 topology, controller2addr_map,
                 idTo2d_map, complete_signal_sink_out,
-                multi_cgra_rows, multi_cgra_columns, src_query_pkt):
+                multi_cgra_rows, multi_cgra_columns, src_query_pkt,
+                probe_dut = False):
 
     CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -83,6 +86,29 @@ class TestHarness(Component):
     s.dut.cgra_id //= cgra_id
     s.complete_signal_sink_out.recv //= s.dut.send_to_cpu_pkt
 
+    # Packets actually taken by the sink, in order.
+    s.received_pkts = []
+
+    @update_ff
+    def record_received_pkts():
+      if ~s.reset & s.complete_signal_sink_out.recv.val & \
+         s.complete_signal_sink_out.recv.rdy:
+        msg = s.complete_signal_sink_out.recv.msg
+        s.received_pkts.append(msg.clone())
+
+    # CMD_CONFIG_MULTICAST packets put on the ctrl ring by the controller.
+    # Only with probe_dut, as the internal signals are gone once the DUT is
+    # imported from Verilog.
+    s.multicast_ring_pkts = 0
+
+    if probe_dut:
+      @update_ff
+      def record_multicast_ring_pkts():
+        if ~s.reset & s.dut.controller.send_to_ctrl_ring_pkt.val & \
+           s.dut.controller.send_to_ctrl_ring_pkt.rdy & \
+           (s.dut.controller.send_to_ctrl_ring_pkt.msg.payload.cmd == CMD_CONFIG_MULTICAST):
+          s.multicast_ring_pkts += 1
+
     complete_count_value = \
             sum(1 for pkt in complete_signal_sink_out \
                 if pkt.payload.cmd == CMD_COMPLETE)
@@ -579,6 +605,88 @@ def init_param(topology, FuList = [MemUnitRTL, AdderRTL],
       complete_signal_sink_out.extend(expected_complete_sink_out_pkg)
       complete_signal_sink_out.extend(expected_mem_sink_out_pkt)
 
+  elif test_name == 'launch_queue':
+      '''
+      Two kernels chained by the launch queue of the controller: each
+      tile runs INC once, then twice. The configuration goes to the shadow
+      ctrl memory, which the queued launches swap in, and each kernel
+      reports its completion.
+      '''
+      def kernel_config(total_ctrl_count):
+          pkts = []
+          for i in range(num_tiles):
+              pkts.extend([
+                  IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT,
+                                                                   data = DataType(total_ctrl_count))),
+                  IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER,
+                                                                   data = DataType(1))),
+                  IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG,
+                                                                   ctrl = CtrlType(OPT_INC,
+                                                                                   fu_in_code,
+                                                                                   routing_xbar_code,
+                                                                                   fu_xbar_code,
+                                                                                   read_reg_towards = read_reg_towards_code,
+                                                                                   read_reg_idx = read_reg_idx_code))),
+              ])
+          return pkts
+
+      # Packets addressed to the controller (dst = num_tiles).
+      def push_launch(flags):
+          return [
+              IntraCgraPktType(0, num_tiles, payload = CgraPayloadType(CMD_LAUNCH_QUEUE_CONFIG_COMPLETES,
+                                                                       data = DataType(num_tiles))),
+              IntraCgraPktType(0, num_tiles, payload = CgraPayloadType(CMD_LAUNCH_QUEUE_CONFIG_FLAGS,
+                                                                       data = DataType(flags))),
+              IntraCgraPktType(0, num_tiles, payload = CgraPayloadType(CMD_LAUNCH_QUEUE_PUSH,
+                                                                       data = DataType((1 << num_tiles) - 1))),
+          ]
+
+      src_ctrl_pkt.extend(kernel_config(1))
+      src_ctrl_pkt.extend(push_launch(LAUNCH_DESC_SWAP_CONFIG | LAUNCH_DESC_NOTIFY))
+      # Held back by the controller until the first kernel is launched.
+      src_ctrl_pkt.extend(kernel_config(2))
+      src_ctrl_pkt.extend(push_launch(LAUNCH_DESC_SWAP_CONFIG | LAUNCH_DESC_NOTIFY))
+      complete_signal_sink_out = [IntraCgraPktType(payload = CgraPayloadType(CMD_COMPLETE)),
+                                  IntraCgraPktType(payload = CgraPayloadType(CMD_COMPLETE))]
+      ctrl_steps = ctrl_mem_size
+
+  elif test_name == 'config_multicast':
+      '''
+      The INC kernel of 'default', with its ctrl word multicast to every
+      tile, and another ctrl word (never executed) multicast to tiles 0
+      and 2 only.
+      '''
+      src_ctrl_pkt.extend([
+          IntraCgraPktType(0, num_tiles,
+                           payload = CgraPayloadType(CMD_CONFIG_MULTICAST, ctrl_addr = 0,
+                                                     data = DataType((1 << num_tiles) - 1),
+                                                     ctrl = CtrlType(OPT_INC,
+                                                                     fu_in_code,
+                                                                     routing_xbar_code,
+                                                                     fu_xbar_code,
+                                                                     read_reg_towards = read_reg_towards_code,
+                                                                     read_reg_idx = read_reg_idx_code))),
+          IntraCgraPktType(0, num_tiles,
+                           payload = CgraPayloadType(CMD_CONFIG_MULTICAST, ctrl_addr = 1,
+                                                     data = DataType(0b0101),
+                                                     ctrl = CtrlType(OPT_ADD,
+                                                                     fu_in_code,
+                                                                     routing_xbar_code,
+                                                                     fu_xbar_code))),
+      ])
+      for i in range(num_tiles):
+        src_ctrl_pkt.extend([
+            IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT,
+                                                             data = DataType(total_execute_ctrl_count))),
+            IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER,
+                                                             data = DataType(1))),
+        ])
+      src_ctrl_pkt.extend([IntraCgraPktType(0, i, payload = CgraPayloadType(CMD_LAUNCH))
+                           for i in range(num_tiles)])
+      complete_signal_sink_out = [IntraCgraPktType(payload = CgraPayloadType(CMD_COMPLETE))
+                                  for _ in range(num_tiles)]
+      ctrl_steps = ctrl_mem_size
+
   mem_access_is_combinational = True
   th = TestHarness(DUT, FunctionUnit, FuList,
                    IntraCgraPktType,
@@ -612,7 +720,7 @@ def test_homogeneous_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                        ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                         'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_homogeneous_2x2_ctrl_count_2(cmdline_opts):
@@ -634,9 +742,47 @@ def test_homogeneous_2x2_ctrl_count_2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                        ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                         'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
+def test_launch_queue_2x2(cmdline_opts):
+  topology = "Mesh"
+  th = init_param(topology, test_name = 'launch_queue')
+  th.set_param("top.dut.construct", has_shadow_ctrl_mem = True,
+               has_launch_queue = True)
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
+  run_sim(th)
+  # Both kernels ran to completion, one after the other.
+  completes = [pkt for pkt in th.received_pkts
+               if pkt.payload.cmd == CMD_COMPLETE]
+  assert len(completes) == 2
+
+def test_config_multicast_2x2(cmdline_opts):
+  topology = "Mesh"
+  th = init_param(topology, test_name = 'config_multicast')
+  # The ring and the ctrl memories are only visible in the Python DUT; the
+  # completes of the kernel, run on the multicast word, are checked anyway.
+  probe_dut = not cmdline_opts['test_verilog']
+  th.set_param("top.construct", probe_dut = probe_dut)
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
+  run_sim(th)
+  if not probe_dut:
+    return
+  # One ring packet per ctrl word, whatever the number of tiles it configures.
+  assert th.multicast_ring_pkts == 2
+  for i in range(th.num_tiles):
+    regs = th.dut.tile[i].ctrl_mem.reg_file.regs
+    assert regs[0].operation == OPT_INC
+    assert (regs[1].operation == OPT_ADD) == (i in [0, 2])
+
 def test_heterogeneous_king_mesh_2x2(cmdline_opts):
   topology = "KingMesh"
   th = init_param(topology)
@@ -645,7 +791,7 @@ def test_heterogeneous_king_mesh_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_heterogeneous_with_loop_control(cmdline_opts):
@@ -656,7 +802,7 @@ def test_heterogeneous_with_loop_control(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_vector_king_mesh_2x2(cmdline_opts):
@@ -678,7 +824,7 @@ def test_vector_king_mesh_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_vector_mesh_4x4(cmdline_opts):
@@ -701,7 +847,7 @@ def test_vector_mesh_4x4(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_systolic_3x3(cmdline_opts):
@@ -728,5 +874,52 @@ def test_systolic_3x3(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
+  run_sim(th)
+
+def test_systolic_3x3_backdoor_config(cmdline_opts):
+  topology = "Mesh"
+  FuList = [AdderRTL,
+            MulRTL,
+            MemUnitRTL,
+            SeqMulAdderRTL]
+  th = init_param(topology, FuList, x_tiles = 3, y_tiles = 3,
+                  test_name = 'systolic')
+  # Same harness, configured through the packet path for parity.
+  reference = init_param(topology, FuList, x_tiles = 3, y_tiles = 3,
+                         test_name = 'systolic')
+  th.elaborate()
+  reference.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
+  cycles = run_sim_with_backdoor_config(th, reference = reference)
+  if not cmdline_opts['test_verilog']:
+    assert cycles < reference.sim_cycle_count()
+
+def test_systolic_3x3_cl_cross_check(cmdline_opts):
+  topology = "Mesh"
+  FuList = [AdderRTL,
+            MulRTL,
+            MemUnitRTL,
+            SeqMulAdderRTL]
+  th = init_param(topology, FuList, x_tiles = 3, y_tiles = 3,
+                  test_name = 'systolic')
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
+
+  # Runs the cycle-approximate model on exactly the same packet stream
+  # and checks it against what the RTL actually sent to the CPU.
+  rtl_pkts = th.received_pkts
+  model = CgraCL(type(th.src_ctrl_pkt.msgs[0]), 3, 3, 6, 128, 16, 2, 16,
+                 2, 2, topology, {i: [i * 32, (i + 1) * 32 - 1] for i in range(4)})
+  complete_count = sum(1 for pkt in rtl_pkts
+                       if pkt.payload.cmd == CMD_COMPLETE)
+  model_pkts, _ = model.run(th.src_ctrl_pkt.msgs, th.src_query_pkt.msgs,
+                            complete_count)
+  cross_check_with_rtl(model_pkts, rtl_pkts, ordered = True)
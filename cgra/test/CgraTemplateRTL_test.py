@@ -11,8 +11,7 @@ Author : Cheng Tan
 
 from pymtl3.passes.backends.verilog import (VerilogTranslationPass,
                                             VerilogVerilatorImportPass)
-from pymtl3.stdlib.test_utils import (run_sim,
-                                      config_model_with_cmdline_opts)
+from pymtl3.stdlib.test_utils import run_sim
 
 from ..CgraTemplateRTL import CgraTemplateRTL
 from ...fu.double.SeqMulAdderRTL import SeqMulAdderRTL
@@ -32,6 +31,7 @@ from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.build_cache import config_model_with_build_cache
 from ...lib.util.common import *
 from ...lib.util.cgra.Tile import Tile
 from ...lib.util.cgra.DataSPM import DataSPM
@@ -307,7 +307,7 @@ def test_cgra_universal(cmdline_opts, arch_yaml_path = "arch.yaml", cgra_param =
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER', 'CMPCONST'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
 
 
   run_sim(th)
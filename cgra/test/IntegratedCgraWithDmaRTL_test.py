@@ -38,7 +38,7 @@ CtrlPktType = mk_intra_cgra_pkt(1, 1, 4, CgraPayloadType)
 WordType = mk_bits(32)
 
 
-def make_dut():
+def make_dut(num_dma_lanes = 1, has_spm_double_buffer = False):
   # 2x2 tiles with add/mem/return functional units
   tiles_2d = [[Tile(x, y, num_registers_per_reg_bank, ["add", "mem", "return"])
                for x in range(2)] for y in range(2)]
@@ -58,7 +58,9 @@ def make_dut():
     TileList, LinkList, dataSPM,
     {0: [0, 15]},  # controller to address map
     {0: [0, 0]},   # cgra id to 2D coordinate
-    is_multi_cgra=False)
+    is_multi_cgra=False,
+    num_dma_lanes=num_dma_lanes,
+    has_spm_double_buffer=has_spm_double_buffer)
 
   return dut
 
@@ -82,7 +84,7 @@ def issue_cpu_pkt(dut, pkt, max_cycles = 20):
 
 
 def issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
-                  dma_cmd, dram_addr, spm_addr, nbytes, tag):
+                  dma_cmd, dram_addr, spm_addr, nbytes, tag, shape = {}):
 
   """
   Issues a DMA command to the CGRA.
@@ -97,7 +99,8 @@ def issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
     dram_addr: The DRAM address to transfer data from or to.(64 bits)
     spm_addr: The SPM address to transfer data from or to.(32 bits)
     nbytes: The number of bytes to transfer.
-    tag: The tag of the DMA command. This tag isn't used now. We may use it to distinguish different DMA commands.
+    tag: The tag of the DMA command, returned by its CMD_DMA_DONE.
+    shape: {CMD_DMA_CONFIG_<count or stride>: value} of a strided command.
   """
   # NOTE nbytes is the number of bytes to transfer.
   # Currently, only nbytes that are multiples of 4 are supported.
@@ -129,8 +132,12 @@ def issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
     CtrlPktType(0, 0, payload = CgraPayloadType(
       CMD_DMA_CONFIG_TAG,
       data = DataType(tag, 1))),
-    CtrlPktType(0, 0, payload = CgraPayloadType(dma_cmd)),
   ]
+  # The shape of strided commands.
+  for config_cmd, value in shape.items():
+    config_pkts.append(CtrlPktType(0, 0, payload = CgraPayloadType(
+      config_cmd, data = DataType(value, 1))))
+  config_pkts.append(CtrlPktType(0, 0, payload = CgraPayloadType(dma_cmd)))
 
   for pkt in config_pkts:
     issue_cpu_pkt(dut, pkt)
@@ -204,6 +211,241 @@ def test_cgra_dma_mvin_to_local_spm():
   assert dut.cgra.data_mem.memory_wrapper[0].memory.regs[3] == DataType(0x44444444, 1, 0, 0)
 
 
+def test_cgra_wide_dma_mvin_to_local_spm():
+  """
+  Same MVIN as above in the wide DMA mode, where the 4 words of the beat
+  are written through 4 DMA lanes. They all target bank 0 here, so the
+  data memory crossbar serializes them.
+  """
+  dut = make_dut(num_dma_lanes = 4)
+
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+
+  dut.cgra_id @= 0
+  dut.address_lower @= DataAddrType(0)
+  dut.address_upper @= DataAddrType(15)
+
+  dut.recv_from_cpu_pkt.val @= 0
+  dut.recv_from_cpu_pkt.msg @= CtrlPktType()
+  dut.send_to_cpu_pkt.rdy @= 1
+  dut.send_to_dram_rd_req.rdy @= 1
+  dut.recv_from_dram_rd_resp.val @= 0
+  dut.recv_from_dram_rd_resp.msg @= 0
+  dut.send_to_dram_wr_req.rdy @= 1
+  dut.recv_from_dram_wr_resp.val @= 0
+  dut.recv_from_dram_wr_resp.msg @= 0
+
+  issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
+                CMD_DMA_MVIN, 0x1000, 0, 16, 0x35)
+
+  beat = concat(WordType(0x44444444), WordType(0x33333333),
+                WordType(0x22222222), WordType(0x11111111))
+  pending_resp = False
+
+  for _ in range(40):
+    dut.recv_from_dram_rd_resp.val @= 0
+    if pending_resp:
+      dut.recv_from_dram_rd_resp.val @= 1
+      dut.recv_from_dram_rd_resp.msg @= beat
+
+    dut.sim_eval_combinational()
+
+    pending_resp = bool(dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy)
+
+    if observed_dma_done(dut, 0x35):
+      break
+
+    dut.sim_tick()
+
+  assert observed_dma_done(dut, 0x35)
+  for i, word in enumerate([0x11111111, 0x22222222, 0x33333333, 0x44444444]):
+    assert dut.cgra.data_mem.memory_wrapper[0].memory.regs[i] == DataType(word, 1, 0, 0)
+
+
+def test_cgra_dma_queued_cmds_done_by_tag():
+  """
+  Issues two MVINs back to back, the second one before the first one has
+  moved any data, and checks that both complete with their own tags.
+  """
+  dut = make_dut()
+
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+
+  dut.cgra_id @= 0
+  dut.address_lower @= DataAddrType(0)
+  dut.address_upper @= DataAddrType(15)
+
+  dut.recv_from_cpu_pkt.val @= 0
+  dut.recv_from_cpu_pkt.msg @= CtrlPktType()
+  dut.send_to_cpu_pkt.rdy @= 1
+  # Holds the DRAM reads until both commands are queued.
+  dut.send_to_dram_rd_req.rdy @= 0
+  dut.recv_from_dram_rd_resp.val @= 0
+  dut.recv_from_dram_rd_resp.msg @= 0
+  dut.send_to_dram_wr_req.rdy @= 1
+  dut.recv_from_dram_wr_resp.val @= 0
+  dut.recv_from_dram_wr_resp.msg @= 0
+
+  issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
+                CMD_DMA_MVIN, 0x1000, 0, 16, 0x51)
+  issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
+                CMD_DMA_MVIN, 0x1010, 4, 16, 0x52)
+  dut.send_to_dram_rd_req.rdy @= 1
+
+  dram = {
+    0x1000: concat(WordType(4), WordType(3), WordType(2), WordType(1)),
+    0x1010: concat(WordType(8), WordType(7), WordType(6), WordType(5)),
+  }
+  pending_resp = None
+  dones = []
+
+  for _ in range(60):
+    dut.recv_from_dram_rd_resp.val @= 0
+    if pending_resp is not None:
+      dut.recv_from_dram_rd_resp.val @= 1
+      dut.recv_from_dram_rd_resp.msg @= pending_resp
+
+    dut.sim_eval_combinational()
+
+    pending_resp = None
+    if dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy:
+      pending_resp = dram[int(dut.send_to_dram_rd_req.msg)]
+
+    if dut.send_to_cpu_pkt.val and dut.send_to_cpu_pkt.msg.payload.cmd == CMD_DMA_DONE:
+      dones.append(int(dut.send_to_cpu_pkt.msg.opaque))
+      if len(dones) == 2:
+        break
+
+    dut.sim_tick()
+
+  assert dones == [0x51, 0x52]
+  for i in range(8):
+    assert dut.cgra.data_mem.memory_wrapper[0].memory.regs[i] == DataType(i + 1, 1, 0, 0)
+
+
+def test_cgra_ping_pong_spm_swap_waits_for_dma():
+  """
+  With the ping-pong SPM, an MVIN lands in the half of the banks the tiles
+  don't see, and a CMD_SPM_SWAP queued behind it only hands that half to
+  the tiles once the transfer is done.
+  """
+  dut = make_dut(has_spm_double_buffer = True)
+
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+
+  dut.cgra_id @= 0
+  dut.address_lower @= DataAddrType(0)
+  dut.address_upper @= DataAddrType(15)
+
+  dut.recv_from_cpu_pkt.val @= 0
+  dut.recv_from_cpu_pkt.msg @= CtrlPktType()
+  dut.send_to_cpu_pkt.rdy @= 1
+  # Holds the DRAM read until the swap is queued.
+  dut.send_to_dram_rd_req.rdy @= 0
+  dut.recv_from_dram_rd_resp.val @= 0
+  dut.recv_from_dram_rd_resp.msg @= 0
+  dut.send_to_dram_wr_req.rdy @= 1
+  dut.recv_from_dram_wr_resp.val @= 0
+  dut.recv_from_dram_wr_resp.msg @= 0
+
+  issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
+                CMD_DMA_MVIN, 0x1000, 0, 16, 0x61)
+  issue_cpu_pkt(dut, CtrlPktType(0, 0, payload = CgraPayloadType(CMD_SPM_SWAP)))
+  for _ in range(4):
+    dut.sim_tick()
+  assert dut.cgra.controller.spm_buffer_sel == 0
+
+  dut.send_to_dram_rd_req.rdy @= 1
+  beat = concat(WordType(4), WordType(3), WordType(2), WordType(1))
+  pending_resp = False
+  done = False
+  for _ in range(40):
+    dut.recv_from_dram_rd_resp.val @= 0
+    if pending_resp:
+      dut.recv_from_dram_rd_resp.val @= 1
+      dut.recv_from_dram_rd_resp.msg @= beat
+
+    dut.sim_eval_combinational()
+
+    pending_resp = bool(dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy)
+    done = done or observed_dma_done(dut, 0x61)
+    if done and dut.cgra.controller.spm_buffer_sel == 1:
+      break
+
+    dut.sim_tick()
+
+  assert done
+  assert dut.cgra.controller.spm_buffer_sel == 1
+  # Banks 0-1 were the tiles' half during the transfer, banks 2-3 the DMA's.
+  for i in range(4):
+    assert dut.cgra.data_mem.memory_wrapper[2].memory.regs[i] == DataType(i + 1, 1, 0, 0)
+    assert dut.cgra.data_mem.memory_wrapper[0].memory.regs[i] == DataType(0, 0, 0, 0)
+
+
+def test_cgra_2d_dma_mvin_to_local_spm():
+  """
+  Moves 2 rows of 2 words, 32 bytes apart in DRAM, into SPM rows 4 words
+  apart with a single strided command.
+  """
+  dut = make_dut()
+
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+
+  dut.cgra_id @= 0
+  dut.address_lower @= DataAddrType(0)
+  dut.address_upper @= DataAddrType(15)
+
+  dut.recv_from_cpu_pkt.val @= 0
+  dut.recv_from_cpu_pkt.msg @= CtrlPktType()
+  dut.send_to_cpu_pkt.rdy @= 1
+  dut.send_to_dram_rd_req.rdy @= 1
+  dut.recv_from_dram_rd_resp.val @= 0
+  dut.recv_from_dram_rd_resp.msg @= 0
+  dut.send_to_dram_wr_req.rdy @= 1
+  dut.recv_from_dram_wr_resp.val @= 0
+  dut.recv_from_dram_wr_resp.msg @= 0
+
+  issue_dma_cmd(dut, CtrlPktType, CgraPayloadType, DataType, DataAddrType,
+                CMD_DMA_MVIN, 0x1000, 1, 8, 0x53,
+                {CMD_DMA_CONFIG_ROW_COUNT: 2,
+                 CMD_DMA_CONFIG_DRAM_ROW_STRIDE: 32,
+                 CMD_DMA_CONFIG_SPM_ROW_STRIDE: 4})
+
+  dram = {
+    0x1000: concat(WordType(0), WordType(0), WordType(0x12), WordType(0x11)),
+    0x1020: concat(WordType(0), WordType(0), WordType(0x22), WordType(0x21)),
+  }
+  pending_resp = None
+
+  for _ in range(60):
+    dut.recv_from_dram_rd_resp.val @= 0
+    if pending_resp is not None:
+      dut.recv_from_dram_rd_resp.val @= 1
+      dut.recv_from_dram_rd_resp.msg @= pending_resp
+
+    dut.sim_eval_combinational()
+
+    pending_resp = None
+    if dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy:
+      pending_resp = dram[int(dut.send_to_dram_rd_req.msg)]
+
+    if observed_dma_done(dut, 0x53):
+      break
+
+    dut.sim_tick()
+
+  assert observed_dma_done(dut, 0x53)
+  regs = dut.cgra.data_mem.memory_wrapper[0].memory.regs
+  assert regs[1] == DataType(0x11, 1, 0, 0)
+  assert regs[2] == DataType(0x12, 1, 0, 0)
+  assert regs[5] == DataType(0x21, 1, 0, 0)
+  assert regs[6] == DataType(0x22, 1, 0, 0)
+
+
 def test_cgra_dma_mvout_from_local_spm():
   """
   Integration test for the IntegratedCgraWithDmaRTL wrapper.
@@ -0,0 +1,94 @@
+"""
+==========================================================================
+conftest.py
+==========================================================================
+Repo-wide pytest options.
+
+  --profile-upblks : profiles every @update/@update_ff block of the
+                     simulated models and prints a per-test hot spot
+                     table (see lib/util/upblk_profiler.py). Can be
+                     combined with --test-verilog.
+
+  --trace-ring N   : instead of printing the line trace every cycle, keeps
+                     the last N traced cycles in a ring buffer and shows
+                     them only for failing tests. --trace-cycles and
+                     --trace-components restrict which cycles/components
+                     are traced at all (see lib/util/line_trace.py).
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+from .lib.util import line_trace, upblk_profiler
+
+# (test node id, hot spot table) of every profiled test.
+_profiles = []
+
+def pytest_addoption(parser):
+  parser.addoption("--profile-upblks", dest = "profile_upblks",
+                   action = "store_true", default = False,
+                   help = "profile call counts and wall time of each update block")
+  parser.addoption("--profile-upblks-limit", dest = "profile_upblks_limit",
+                   action = "store", type = int, default = 30,
+                   help = "number of hottest update blocks to report per test")
+  parser.addoption("--trace-ring", dest = "trace_ring", action = "store",
+                   type = int, default = 0,
+                   help = "keep the last N line traces, dumped on failure")
+  parser.addoption("--trace-cycles", dest = "trace_cycles", action = "store",
+                   default = "",
+                   help = "cycles to trace with --trace-ring, e.g., 10-20,35,100-")
+  parser.addoption("--trace-components", dest = "trace_components",
+                   action = "store", default = "",
+                   help = "comma-separated components (relative to the top, "
+                          "e.g., dut.tile[0]) to trace with --trace-ring")
+
+def pytest_configure(config):
+  if config.getoption("profile_upblks"):
+    upblk_profiler.enable()
+  if config.getoption("trace_ring") > 0:
+    components = [c for c in config.getoption("trace_components").split(",") if c]
+    line_trace.enable(depth = config.getoption("trace_ring"),
+                      cycles = config.getoption("trace_cycles"),
+                      components = components)
+
+def pytest_unconfigure(config):
+  upblk_profiler.disable()
+  line_trace.disable()
+
+@pytest.hookimpl(hookwrapper = True)
+def pytest_runtest_makereport(item, call):
+  outcome = yield
+  report = outcome.get_result()
+  if report.failed and line_trace.is_enabled():
+    trace = line_trace.dump_all()
+    if trace:
+      report.sections.append(("line trace (ring buffer)", trace))
+
+@pytest.fixture(autouse = True)
+def _reset_line_trace():
+  line_trace.reset()
+  yield
+
+@pytest.fixture(autouse = True)
+def _profile_upblks(request):
+  if not upblk_profiler.is_enabled():
+    yield
+    return
+  upblk_profiler.reset()
+  yield
+  if upblk_profiler.hot_spots():
+    table = upblk_profiler.format_table(
+        request.config.getoption("profile_upblks_limit"))
+    print(f"\nUpdate block hot spots of {request.node.nodeid}:\n{table}")
+    _profiles.append((request.node.nodeid, table))
+
+def pytest_terminal_summary(terminalreporter):
+  if not _profiles:
+    return
+  terminalreporter.section("update block hot spots")
+  for nodeid, table in _profiles:
+    terminalreporter.write_line(nodeid)
+    terminalreporter.write_line(table)
+    terminalreporter.write_line("")
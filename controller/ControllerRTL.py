@@ -18,7 +18,9 @@ from ..lib.util.common import *
 from ..noc.PyOCN.pymtl3_net.channel.ChannelRTL import ChannelRTL
 from ..noc.PyOCN.pymtl3_net.xbar.XbarRTL import XbarRTL
 
+from .GlobalBarrierUnitRTL import GlobalBarrierUnitRTL
 from .GlobalReduceUnitRTL import GlobalReduceUnitRTL
+from .RemoteLoadCacheRTL import RemoteLoadCacheRTL
 from ..lib.util.data_struct_attr import *
 
 class ControllerRTL(Component):
@@ -33,7 +35,19 @@ class ControllerRTL(Component):
                 has_dma_ports = False,
                 DmaDataType = mk_dma_data(),
                 DmaCmdType = mk_dma_cmd(),
-                has_im2col_engine = False):
+                has_im2col_engine = False,
+                has_perf_counters = False,
+                num_dma_lanes = 1,
+                dma_cmd_queue_depth = 4,
+                has_spm_double_buffer = False,
+                has_remote_load_cache = False,
+                remote_load_cache_num_sets = 4,
+                remote_load_cache_num_ways = 2,
+                noc_arbitration = NOC_ARBITRATION_ROUND_ROBIN,
+                noc_response_max_burst = 4,
+                has_launch_queue = False,
+                launch_queue_depth = 4,
+                has_global_barrier = False):
 
     # Derives types from InterCgraPktType.
     CgraPayloadType = InterCgraPktType.get_field_type(kAttrPayload)
@@ -56,12 +70,14 @@ class ControllerRTL(Component):
     XType = mk_bits(max(clog2(multi_cgra_columns), 1))
     YType = mk_bits(max(clog2(multi_cgra_rows), 1))
     TileIdType = mk_bits(clog2(num_tiles + 1))
+    TileMaskType = mk_bits(num_tiles)
     ControllerXbarPktType = mk_controller_noc_xbar_pkt(InterCgraPktType)
     DmaOpcodeType = DmaCmdType.get_field_type(kAttrOpcode)
     DmaDramAddrType = DmaCmdType.get_field_type(kAttrDramAddr)
     DmaSpmAddrType = DmaCmdType.get_field_type(kAttrSpmAddr)
     DmaBytesType = DmaCmdType.get_field_type(kAttrNBytes)
     DmaTagType = DmaCmdType.get_field_type(kAttrDmaTag)
+    DmaCountType = DmaCmdType.get_field_type(kAttrRowCount)
     DmaSpmDataType = DmaDataType.get_field_type(kAttrSpmData)
     # Lower and higher 32 bits of the DRAM address.
     DmaDramAddrPartType = mk_bits(DmaDramAddrType.nbits // 2)
@@ -70,9 +86,22 @@ class ControllerRTL(Component):
                                               DmaSpmDataType.nbits)
     DmaSpmReadReqType = mk_dma_spm_read_req(DmaSpmAddrType.nbits)
     DmaSpmReadRespType = mk_dma_spm_read_resp(DmaSpmDataType.nbits)
+    XbarPerfIdxType = mk_bits(clog2(CONTROLLER_CROSSBAR_INPORTS))
+    DataMemPerfIdxType = mk_bits(max(1, clog2(NUM_DATA_MEM_PERF_COUNTERS)))
 
     if has_dma_ports:
       assert DmaSpmDataType.nbits == 32
+    assert noc_arbitration in [NOC_ARBITRATION_ROUND_ROBIN, NOC_ARBITRATION_RESPONSE_FIRST], \
+        f"Unknown noc_arbitration {noc_arbitration}."
+    assert noc_response_max_burst > 0
+    NocBurstType = mk_bits(clog2(noc_response_max_burst + 1))
+    response_first = noc_arbitration == NOC_ARBITRATION_RESPONSE_FIRST
+    LaunchDescType = mk_launch_desc(multi_cgra_columns * multi_cgra_rows, num_tiles,
+                                    min(16, DataPayloadType.nbits))
+    LaunchCountType = LaunchDescType.get_field_type('complete_count')
+    # Bit 0 is LAUNCH_DESC_SWAP_CONFIG, bit 1 LAUNCH_DESC_WAIT_DMA and bit 2
+    # LAUNCH_DESC_NOTIFY.
+    LaunchFlagsType = mk_bits(3)
 
     # Interface
     s.cgra_id = InPort(CgraIdType)
@@ -124,23 +153,34 @@ class ControllerRTL(Component):
     # The DMA and the inter-cgra NoC (above) each have their own
     # dedicated SPM access interfaces to the data memory controller.
     # They are kept separate because the DMA can perform burst data
-    # movement.
+    # movement. There is one port of each kind per DMA lane.
     # -------------------------------------------------------
     # Receive the request of writing into SPM from the DMA.
-    s.recv_from_dma_spm_wr_req = RecvIfcRTL(DmaSpmWriteReqType)
+    s.recv_from_dma_spm_wr_req = [RecvIfcRTL(DmaSpmWriteReqType) for _ in range(num_dma_lanes)]
     # Receive the request of reading from SPM from the DMA.
-    s.recv_from_dma_spm_rd_req  = RecvIfcRTL(DmaSpmReadReqType)
+    s.recv_from_dma_spm_rd_req  = [RecvIfcRTL(DmaSpmReadReqType) for _ in range(num_dma_lanes)]
     # Send the response of reading from SPM to the DMA.
-    s.send_to_dma_spm_rd_resp   = SendIfcRTL(DmaSpmReadRespType)
+    s.send_to_dma_spm_rd_resp   = [SendIfcRTL(DmaSpmReadRespType) for _ in range(num_dma_lanes)]
 
     # SRAM data memory side of the SPM access path (DMA).
     # Send the request of writing into SPM to the data_mem controller.
-    s.send_to_sram_store_request_from_dma   = SendIfcRTL(DmaSpmWriteReqType)
+    s.send_to_sram_store_request_from_dma   = [SendIfcRTL(DmaSpmWriteReqType) for _ in range(num_dma_lanes)]
     # Send the request of reading from SPM to the data_mem controller.
-    s.send_to_sram_load_request_from_dma    = SendIfcRTL(DmaSpmReadReqType)
+    s.send_to_sram_load_request_from_dma    = [SendIfcRTL(DmaSpmReadReqType) for _ in range(num_dma_lanes)]
     # Receive the response of reading from SPM from the data_mem controller.
-    s.recv_from_sram_load_response = RecvIfcRTL(DmaSpmReadRespType)
+    s.recv_from_sram_load_response = [RecvIfcRTL(DmaSpmReadRespType) for _ in range(num_dma_lanes)]
 
+    # Performance counters of the data memory controller of this CGRA,
+    # returned together with the controller's own counters (see
+    # PERF_CONTROLLER_DATA_MEM_BASE). Unconditionally declared like the
+    # im2col ports, so the enclosing module has to drive them.
+    s.recv_from_data_mem_perf = [InPort(DataPayloadType)
+                                 for _ in range(NUM_DATA_MEM_PERF_COUNTERS)]
+
+    # Half of the local SPM that the tiles currently see (the DMA sees the
+    # other one), flipped by CMD_SPM_SWAP. Stays 0 without
+    # has_spm_double_buffer.
+    s.spm_buffer_sel = OutPort(b1)
 
     # Component
     s.recv_from_tile_load_request_pkt_queue = ChannelRTL(InterCgraPktType, latency = 1)
@@ -154,7 +194,9 @@ class ControllerRTL(Component):
     # Crossbar with 4 inports (load and store requests towards remote
     # memory, load response from local memory, ctrl&data packet from cpu,
     # and command signal from inter-tile, i.e., intra-cgra, ring) and 1 
-    # outport (only allow one request be sent out per cycle).
+    # outport (only allow one request be sent out per cycle). The inports
+    # take turns, or the load responses go first with
+    # NOC_ARBITRATION_RESPONSE_FIRST (see noc_requests_held).
     s.crossbar = XbarRTL(ControllerXbarPktType, CONTROLLER_CROSSBAR_INPORTS, 1)
     s.recv_from_cpu_pkt_queue = NormalQueueRTL(IntraCgraPktType)
     # Use ChannelRTL for the im2col preload path -- matches how tile
@@ -164,7 +206,19 @@ class ControllerRTL(Component):
     # crossbar contention).
     s.recv_from_im2col_pkt_queue = ChannelRTL(IntraCgraPktType, latency = 1)
     s.send_to_cpu_pkt_queue = NormalQueueRTL(IntraCgraPktType)
-
+    # DMA descriptors waiting for the engine. A descriptor snapshots the
+    # config registers when CMD_DMA_MVIN/MVOUT is accepted, so the CPU can
+    # configure and enqueue the next transfer without waiting for the
+    # current one (completions are reported per dma_tag).
+    s.dma_cmd_queue = NormalQueueRTL(DmaCmdType, dma_cmd_queue_depth)
+    # Without DMA ports the enclosing module may leave dma_cmd alone, so
+    # the queue is tied off here (see the im2col queue below).
+    if has_dma_ports:
+      s.dma_cmd_queue.send //= s.dma_cmd
+    else:
+      s.dma_cmd_queue.send.rdy //= 0
+      s.dma_cmd.val //= 0
+      s.dma_cmd.msg //= DmaCmdType()
     # Global reduce unit.
     # TODO: We need multiple GlobalReduceUnitRTL to enable more than 1 reduction
     # across the fabric: https://github.com/tancheng/VectorCGRA/issues/184.
@@ -201,6 +255,157 @@ class ControllerRTL(Component):
     s.dma_spm_addr     = Wire(DmaSpmAddrType)
     s.dma_bytes        = Wire(DmaBytesType)
     s.dma_tag          = Wire(DmaTagType)
+    # Shape of strided transfers.
+    s.dma_row_count         = Wire(DmaCountType)
+    s.dma_plane_count       = Wire(DmaCountType)
+    s.dma_dram_row_stride   = Wire(DmaBytesType)
+    s.dma_dram_plane_stride = Wire(DmaBytesType)
+    s.dma_spm_row_stride    = Wire(DmaSpmAddrType)
+    s.dma_spm_plane_stride  = Wire(DmaSpmAddrType)
+    # Descriptor queued by CMD_DMA_MVIN/MVOUT(_LIST).
+    s.dma_desc         = Wire(DmaCmdType)
+
+    # Ping-pong SPM: CMD_SPM_SWAP waits until the running kernel has
+    # completed and every queued DMA transfer is done. A kernel launched
+    # by the CPU runs from its first CMD_LAUNCH leaving through the
+    # crossbar until kernel_complete_count (CMD_SPM_CONFIG_KERNEL_COMPLETES)
+    # CMD_COMPLETEs have been taken from the NoC, whether they are
+    # returned to the CPU or not, as not every launched tile reports one.
+    # The queued kernels are counted by the launch queue itself.
+    # Transfers are counted from the descriptor queue to the completion,
+    # which bounds them by the queues here and in the engine.
+    DmaInflightType = mk_bits(8)
+    KernelCompleteCountType = mk_bits(clog2(multi_cgra_columns * multi_cgra_rows * num_tiles + 1))
+    s.spm_buffer_sel_reg = Wire(b1)
+    s.kernel_running = Wire(b1)
+    s.kernel_complete_count = Wire(KernelCompleteCountType)
+    s.kernel_completes_left = Wire(KernelCompleteCountType)
+    s.dma_inflight = Wire(DmaInflightType)
+    s.spm_buffer_sel //= s.spm_buffer_sel_reg
+
+    # Load responses sent in a row by NOC_ARBITRATION_RESPONSE_FIRST while
+    # requests were waiting; the requests get a turn once it reaches
+    # noc_response_max_burst, so they can't starve.
+    s.noc_response_burst = Wire(NocBurstType)
+    s.noc_requests_held = Wire(b1)
+
+    # CMD_CONFIG_MULTICAST: mask of the packet at the head of the NoC port
+    # and its lowest tile, which the packet goes to on the ring (the ctrl
+    # memories forward it to the others).
+    s.config_multicast_mask = Wire(TileMaskType)
+    s.config_multicast_dst = Wire(TileIdType)
+    s.config_multicast_found = Wire(b1)
+    mask_nbits = min(num_tiles, DataPayloadType.nbits)
+    s.config_multicast_mask[0:mask_nbits] //= \
+        s.recv_from_inter_cgra_noc.msg.payload.data.payload[0:mask_nbits]
+    if mask_nbits < num_tiles:
+      s.config_multicast_mask[mask_nbits:num_tiles] //= 0
+
+    # Kernel launch queue: the descriptor being launched is launch_cur,
+    # whose CMD_SWAP_CONFIGs (if any) and then CMD_LAUNCHs go to the tiles
+    # in its mask, lowest tile first, through the CPU's crossbar inport.
+    # The CMD_COMPLETEs coming from those tiles are counted down here, and
+    # only the last one of a kernel with the notify flag is returned to the
+    # CPU.
+    s.launch_complete_count = Wire(LaunchCountType)
+    s.launch_flags = Wire(LaunchFlagsType)
+    s.launch_push_mask = Wire(TileMaskType)
+    s.launch_desc = Wire(LaunchDescType)
+    s.launch_cur = Wire(LaunchDescType)
+    s.launch_start = Wire(b1)
+    s.launch_issuing = Wire(b1)
+    s.launch_swap_phase = Wire(b1)
+    s.launch_sent = Wire(TileMaskType)
+    s.launch_left = Wire(TileMaskType)
+    s.launch_dst = Wire(TileIdType)
+    s.launch_last = Wire(b1)
+    s.launch_completes_left = Wire(LaunchCountType)
+    s.launch_complete_match = Wire(b1)
+    s.launch_complete_hidden = Wire(b1)
+    s.launch_push_mask[0:mask_nbits] //= \
+        s.recv_from_cpu_pkt_queue.send.msg.payload.data.payload[0:mask_nbits]
+    if mask_nbits < num_tiles:
+      s.launch_push_mask[mask_nbits:num_tiles] //= 0
+
+    # Kernel launches queued by CMD_LAUNCH_QUEUE_PUSH, started one after
+    # another once the previous kernel has completed. The queue only
+    # exists with has_launch_queue, so the logic goes through its
+    # launch_queue_* wires.
+    s.launch_queue_push_val = Wire(b1)
+    s.launch_queue_push_rdy = Wire(b1)
+    s.launch_queue_head_val = Wire(b1)
+    s.launch_queue_head = Wire(LaunchDescType)
+    if has_launch_queue:
+      s.launch_queue = NormalQueueRTL(LaunchDescType, launch_queue_depth)
+      s.launch_queue.recv.val //= s.launch_queue_push_val
+      s.launch_queue.recv.msg //= s.launch_desc
+      s.launch_queue_push_rdy //= s.launch_queue.recv.rdy
+      s.launch_queue_head_val //= s.launch_queue.send.val
+      s.launch_queue_head //= s.launch_queue.send.msg
+      s.launch_queue.send.rdy //= s.launch_start
+    else:
+      s.launch_queue_push_rdy //= 0
+      s.launch_queue_head_val //= 0
+      s.launch_queue_head //= LaunchDescType()
+
+    # Read-only cache of the remote data loaded by the tiles. Remote loads
+    # that hit are answered here instead of crossing the NoC, and the
+    # responses of the others fill it. Only built with
+    # has_remote_load_cache; the wires below never hit otherwise.
+    s.remote_load_hit = Wire(b1)
+    s.remote_load_data = Wire(DataType)
+    s.remote_load_hit_count = Wire(DataPayloadType)
+    s.remote_load_miss_count = Wire(DataPayloadType)
+    s.remote_load_pending_full = Wire(b1)
+    if has_remote_load_cache:
+      s.remote_load_cache = RemoteLoadCacheRTL(DataType, DataAddrType,
+                                               remote_load_cache_num_sets,
+                                               remote_load_cache_num_ways)
+      s.remote_load_hit //= s.remote_load_cache.lookup_hit
+      s.remote_load_data //= s.remote_load_cache.lookup_data
+      s.remote_load_hit_count //= s.remote_load_cache.hit_count
+      s.remote_load_miss_count //= s.remote_load_cache.miss_count
+      s.remote_load_pending_full //= s.remote_load_cache.pending_full
+    else:
+      s.remote_load_hit //= 0
+      s.remote_load_data //= DataType()
+      s.remote_load_hit_count //= 0
+      s.remote_load_miss_count //= 0
+      s.remote_load_pending_full //= 0
+
+    # Global barrier across the CGRAs, combined over the NoC. Its packets
+    # share the crossbar inport of the reduce unit. Only built with
+    # has_global_barrier; the wires below stay idle otherwise.
+    s.barrier_recv_val = Wire(b1)
+    s.barrier_recv_rdy = Wire(b1)
+    s.barrier_complete_val = Wire(b1)
+    s.barrier_complete_rdy = Wire(b1)
+    s.barrier_send_val = Wire(b1)
+    s.barrier_send_rdy = Wire(b1)
+    s.barrier_send_msg = Wire(InterCgraPktType)
+    if has_global_barrier:
+      s.global_barrier_unit = GlobalBarrierUnitRTL(InterCgraPktType,
+                                                   multi_cgra_columns * multi_cgra_rows,
+                                                   num_tiles)
+      s.global_barrier_unit.cgra_id //= s.cgra_id
+      s.global_barrier_unit.recv.val //= s.barrier_recv_val
+      s.global_barrier_unit.recv.msg //= s.recv_from_inter_cgra_noc.msg
+      s.barrier_recv_rdy //= s.global_barrier_unit.recv.rdy
+      # The CMD_COMPLETEs of the barrier tiles are their arrival instead.
+      s.global_barrier_unit.recv_complete.val //= s.barrier_complete_val
+      s.global_barrier_unit.recv_complete.msg //= s.recv_from_ctrl_ring_pkt.msg.src
+      s.barrier_complete_rdy //= s.global_barrier_unit.recv_complete.rdy
+      s.barrier_send_val //= s.global_barrier_unit.send.val
+      s.barrier_send_msg //= s.global_barrier_unit.send.msg
+      s.global_barrier_unit.send.rdy //= s.barrier_send_rdy
+    else:
+      s.barrier_recv_rdy //= 0
+      s.barrier_complete_rdy //= 0
+      s.barrier_send_val //= 0
+      s.barrier_send_msg //= InterCgraPktType()
+
+    # Packets accepted on each controller xbar inport.
+    s.perf_xbar_counters = [Wire(DataPayloadType) for _ in range(CONTROLLER_CROSSBAR_INPORTS)]
 
     # Connections.
     # Requests towards others, 1 cycle delay to improve timing.
@@ -239,6 +444,12 @@ class ControllerRTL(Component):
         s.dma_spm_addr     <<= DmaSpmAddrType(0)
         s.dma_bytes        <<= DmaBytesType(0)
         s.dma_tag          <<= DmaTagType(0)
+        s.dma_row_count         <<= DmaCountType(0)
+        s.dma_plane_count       <<= DmaCountType(0)
+        s.dma_dram_row_stride   <<= DmaBytesType(0)
+        s.dma_dram_plane_stride <<= DmaBytesType(0)
+        s.dma_spm_row_stride    <<= DmaSpmAddrType(0)
+        s.dma_spm_plane_stride  <<= DmaSpmAddrType(0)
       elif has_dma_ports:
         cpu_payload = s.recv_from_cpu_pkt_queue.send.msg.payload
         cpu_cmd = cpu_payload.cmd
@@ -254,30 +465,76 @@ class ControllerRTL(Component):
             s.dma_bytes <<= DmaBytesType(cpu_data)
           elif cpu_cmd == CMD_DMA_CONFIG_TAG:
             s.dma_tag <<= trunc(cpu_data, DmaTagType)
+          elif cpu_cmd == CMD_DMA_CONFIG_ROW_COUNT:
+            s.dma_row_count <<= trunc(cpu_data, DmaCountType)
+          elif cpu_cmd == CMD_DMA_CONFIG_PLANE_COUNT:
+            s.dma_plane_count <<= trunc(cpu_data, DmaCountType)
+          elif cpu_cmd == CMD_DMA_CONFIG_DRAM_ROW_STRIDE:
+            s.dma_dram_row_stride <<= DmaBytesType(cpu_data)
+          elif cpu_cmd == CMD_DMA_CONFIG_DRAM_PLANE_STRIDE:
+            s.dma_dram_plane_stride <<= DmaBytesType(cpu_data)
+          elif cpu_cmd == CMD_DMA_CONFIG_SPM_ROW_STRIDE:
+            s.dma_spm_row_stride <<= DmaSpmAddrType(cpu_data)
+          elif cpu_cmd == CMD_DMA_CONFIG_SPM_PLANE_STRIDE:
+            s.dma_spm_plane_stride <<= DmaSpmAddrType(cpu_data)
+
+    @update
+    def update_dma_desc():
+      cpu_cmd = s.recv_from_cpu_pkt_queue.send.msg.payload.cmd
+      opcode = DmaOpcodeType(DMA_MVIN)
+      if cpu_cmd == CMD_DMA_MVOUT:
+        opcode = DmaOpcodeType(DMA_MVOUT)
+      elif cpu_cmd == CMD_DMA_MVIN_LIST:
+        opcode = DmaOpcodeType(DMA_MVIN_LIST)
+      elif cpu_cmd == CMD_DMA_MVOUT_LIST:
+        opcode = DmaOpcodeType(DMA_MVOUT_LIST)
+      s.dma_desc @= DmaCmdType(
+        opcode,
+        concat(s.dma_dram_addr_hi, s.dma_dram_addr_lo),
+        s.dma_spm_addr,
+        s.dma_bytes,
+        s.dma_tag,
+        s.dma_row_count,
+        s.dma_plane_count,
+        s.dma_dram_row_stride,
+        s.dma_dram_plane_stride,
+        s.dma_spm_row_stride,
+        s.dma_spm_plane_stride)
+
+    @update
+    def update_launch_desc():
+      s.launch_desc @= LaunchDescType(
+        s.recv_from_cpu_pkt_queue.send.msg.dst_cgra_id,
+        s.launch_push_mask,
+        s.launch_complete_count,
+        s.launch_flags[0],
+        s.launch_flags[1],
+        s.launch_flags[2])
 
     @update
     def update_dma_spm_forwarding():
-      if has_dma_ports:
-        s.send_to_sram_store_request_from_dma.val @= s.recv_from_dma_spm_wr_req.val
-        s.recv_from_dma_spm_wr_req.rdy @= s.send_to_sram_store_request_from_dma.rdy
-        s.send_to_sram_store_request_from_dma.msg @= s.recv_from_dma_spm_wr_req.msg
-
-        s.send_to_sram_load_request_from_dma.val     @= s.recv_from_dma_spm_rd_req.val
-        s.recv_from_dma_spm_rd_req.rdy   @= s.send_to_sram_load_request_from_dma.rdy
-        s.send_to_sram_load_request_from_dma.msg     @= s.recv_from_dma_spm_rd_req.msg
-        s.send_to_dma_spm_rd_resp.val @= s.recv_from_sram_load_response.val
-        s.recv_from_sram_load_response.rdy   @= s.send_to_dma_spm_rd_resp.rdy
-        s.send_to_dma_spm_rd_resp.msg @= s.recv_from_sram_load_response.msg
-      else:
-        s.send_to_sram_store_request_from_dma.val @= 0
-        s.send_to_sram_store_request_from_dma.msg @= DmaSpmWriteReqType()
-        s.send_to_sram_load_request_from_dma.val @= 0
-        s.send_to_sram_load_request_from_dma.msg @= DmaSpmReadReqType()
-        s.recv_from_sram_load_response.rdy @= 0
-        s.recv_from_dma_spm_wr_req.rdy @= 0
-        s.recv_from_dma_spm_rd_req.rdy @= 0
-        s.send_to_dma_spm_rd_resp.val @= 0
-        s.send_to_dma_spm_rd_resp.msg @= DmaSpmReadRespType()
+      for i in range(num_dma_lanes):
+        if has_dma_ports:
+          s.send_to_sram_store_request_from_dma[i].val @= s.recv_from_dma_spm_wr_req[i].val
+          s.recv_from_dma_spm_wr_req[i].rdy @= s.send_to_sram_store_request_from_dma[i].rdy
+          s.send_to_sram_store_request_from_dma[i].msg @= s.recv_from_dma_spm_wr_req[i].msg
+
+          s.send_to_sram_load_request_from_dma[i].val     @= s.recv_from_dma_spm_rd_req[i].val
+          s.recv_from_dma_spm_rd_req[i].rdy   @= s.send_to_sram_load_request_from_dma[i].rdy
+          s.send_to_sram_load_request_from_dma[i].msg     @= s.recv_from_dma_spm_rd_req[i].msg
+          s.send_to_dma_spm_rd_resp[i].val @= s.recv_from_sram_load_response[i].val
+          s.recv_from_sram_load_response[i].rdy   @= s.send_to_dma_spm_rd_resp[i].rdy
+          s.send_to_dma_spm_rd_resp[i].msg @= s.recv_from_sram_load_response[i].msg
+        else:
+          s.send_to_sram_store_request_from_dma[i].val @= 0
+          s.send_to_sram_store_request_from_dma[i].msg @= DmaSpmWriteReqType()
+          s.send_to_sram_load_request_from_dma[i].val @= 0
+          s.send_to_sram_load_request_from_dma[i].msg @= DmaSpmReadReqType()
+          s.recv_from_sram_load_response[i].rdy @= 0
+          s.recv_from_dma_spm_wr_req[i].rdy @= 0
+          s.recv_from_dma_spm_rd_req[i].rdy @= 0
+          s.send_to_dma_spm_rd_resp[i].val @= 0
+          s.send_to_dma_spm_rd_resp[i].msg @= DmaSpmReadRespType()
 
     @update
     def update_received_msg():
@@ -285,13 +542,9 @@ class ControllerRTL(Component):
       s.send_to_cpu_pkt_queue.recv.msg @= IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
       s.recv_from_ctrl_ring_pkt.rdy @= 0
 
-      s.dma_cmd.val       @= 0
-      s.dma_cmd.msg       @= DmaCmdType(
-        DmaOpcodeType(DMA_MVIN),
-        concat(s.dma_dram_addr_hi, s.dma_dram_addr_lo),
-        s.dma_spm_addr,
-        s.dma_bytes,
-        s.dma_tag)
+      s.dma_cmd_queue.recv.val @= 0
+      s.dma_cmd_queue.recv.msg @= s.dma_desc
+      s.launch_queue_push_val @= 0
       s.dma_done.rdy      @= 0
 
       s.send_to_im2col_engine_pkt.val @= 0
@@ -321,6 +574,13 @@ class ControllerRTL(Component):
                                                  0, # vc_id. No need to specify vc_id for self produce-consume pkt thanks to the additional VC buffer.
                                                  s.recv_from_ctrl_ring_pkt.msg.payload))
 
+      # The CMD_COMPLETEs of the barrier tiles are their arrival instead.
+      s.barrier_complete_val @= 0
+      if (s.recv_from_ctrl_ring_pkt.msg.payload.cmd == CMD_COMPLETE) & s.barrier_complete_rdy:
+        s.crossbar.recv[kFromInterTileRingIdx].val @= 0
+        s.barrier_complete_val @= s.recv_from_ctrl_ring_pkt.val
+        s.recv_from_ctrl_ring_pkt.rdy @= 1
+
       # For the load request from local tiles.
       s.crossbar.recv[kLoadRequestInportIdx].val @= s.recv_from_tile_load_request_pkt_queue.send.val
       s.recv_from_tile_load_request_pkt_queue.send.rdy @= s.crossbar.recv[kLoadRequestInportIdx].rdy
@@ -349,6 +609,21 @@ class ControllerRTL(Component):
       s.global_reduce_unit.send.rdy @= s.crossbar.recv[kFromReduceUnitIdx].rdy
       s.crossbar.recv[kFromReduceUnitIdx].msg @= s.global_reduce_unit.send.msg
 
+      # The barrier packets go when the reduce unit has nothing to send.
+      s.barrier_send_rdy @= 0
+      if s.barrier_send_val & ~s.global_reduce_unit.send.val:
+        s.crossbar.recv[kFromReduceUnitIdx].val @= 1
+        s.barrier_send_rdy @= s.crossbar.recv[kFromReduceUnitIdx].rdy
+        s.crossbar.recv[kFromReduceUnitIdx].msg @= \
+            ControllerXbarPktType(0, # dst (always 0 to align with the single outport of the crossbar, i.e., NoC)
+                                  s.barrier_send_msg)
+        s.crossbar.recv[kFromReduceUnitIdx].msg.inter_cgra_pkt.src_x @= s.idTo2d_x_lut[s.cgra_id]
+        s.crossbar.recv[kFromReduceUnitIdx].msg.inter_cgra_pkt.src_y @= s.idTo2d_y_lut[s.cgra_id]
+        s.crossbar.recv[kFromReduceUnitIdx].msg.inter_cgra_pkt.dst_x @= \
+            s.idTo2d_x_lut[s.barrier_send_msg.dst]
+        s.crossbar.recv[kFromReduceUnitIdx].msg.inter_cgra_pkt.dst_y @= \
+            s.idTo2d_y_lut[s.barrier_send_msg.dst]
+
       # For the preload packets from the Im2col engine. The engine
       # produces CMD_STORE_REQUEST packets that carry the lowered
       # activation values; they enter the crossbar the same way a
@@ -376,28 +651,46 @@ class ControllerRTL(Component):
           (cpu_cmd == CMD_DMA_CONFIG_DRAM_ADDR_HI) |
           (cpu_cmd == CMD_DMA_CONFIG_SPM_ADDR) |
           (cpu_cmd == CMD_DMA_CONFIG_BYTES) |
-          (cpu_cmd == CMD_DMA_CONFIG_TAG)):
+          (cpu_cmd == CMD_DMA_CONFIG_TAG) |
+          (cpu_cmd == CMD_DMA_CONFIG_ROW_COUNT) |
+          (cpu_cmd == CMD_DMA_CONFIG_PLANE_COUNT) |
+          (cpu_cmd == CMD_DMA_CONFIG_DRAM_ROW_STRIDE) |
+          (cpu_cmd == CMD_DMA_CONFIG_DRAM_PLANE_STRIDE) |
+          (cpu_cmd == CMD_DMA_CONFIG_SPM_ROW_STRIDE) |
+          (cpu_cmd == CMD_DMA_CONFIG_SPM_PLANE_STRIDE)):
         s.recv_from_cpu_pkt_queue.send.rdy @= 1
 
       elif has_dma_ports & (
           (cpu_cmd == CMD_DMA_MVIN) |
-          (cpu_cmd == CMD_DMA_MVOUT)):
-        s.dma_cmd.val @= s.recv_from_cpu_pkt_queue.send.val
-        if cpu_cmd == CMD_DMA_MVIN:
-          s.dma_cmd.msg @= DmaCmdType(
-            DmaOpcodeType(DMA_MVIN),
-            concat(s.dma_dram_addr_hi, s.dma_dram_addr_lo),
-            s.dma_spm_addr,
-            s.dma_bytes,
-            s.dma_tag)
-        else:
-          s.dma_cmd.msg @= DmaCmdType(
-            DmaOpcodeType(DMA_MVOUT),
-            concat(s.dma_dram_addr_hi, s.dma_dram_addr_lo),
-            s.dma_spm_addr,
-            s.dma_bytes,
-            s.dma_tag)
-        s.recv_from_cpu_pkt_queue.send.rdy @= s.dma_cmd.rdy
+          (cpu_cmd == CMD_DMA_MVOUT) |
+          (cpu_cmd == CMD_DMA_MVIN_LIST) |
+          (cpu_cmd == CMD_DMA_MVOUT_LIST)):
+        s.dma_cmd_queue.recv.val @= s.recv_from_cpu_pkt_queue.send.val
+        s.recv_from_cpu_pkt_queue.send.rdy @= s.dma_cmd_queue.recv.rdy
+
+      elif has_launch_queue & (
+          (cpu_cmd == CMD_LAUNCH_QUEUE_CONFIG_COMPLETES) |
+          (cpu_cmd == CMD_LAUNCH_QUEUE_CONFIG_FLAGS)):
+        s.recv_from_cpu_pkt_queue.send.rdy @= 1
+
+      elif has_launch_queue & (cpu_cmd == CMD_LAUNCH_QUEUE_PUSH):
+        s.launch_queue_push_val @= s.recv_from_cpu_pkt_queue.send.val
+        s.recv_from_cpu_pkt_queue.send.rdy @= s.launch_queue_push_rdy
+
+      elif has_spm_double_buffer & (cpu_cmd == CMD_SPM_CONFIG_KERNEL_COMPLETES):
+        s.recv_from_cpu_pkt_queue.send.rdy @= 1
+
+      elif has_spm_double_buffer & (cpu_cmd == CMD_SPM_SWAP):
+        # Consumed here, once neither the kernel nor the DMA can still
+        # access the halves being swapped.
+        s.recv_from_cpu_pkt_queue.send.rdy @= \
+            ~s.kernel_running & (s.dma_inflight == DmaInflightType(0))
+
+      elif has_perf_counters & (cpu_cmd == CMD_PERF_COUNTER_READ) & \
+           (s.recv_from_cpu_pkt_queue.send.msg.dst == num_tiles):
+        # Reads of the controller's own counters are answered below, once
+        # nothing else is returned to the CPU in this cycle.
+        s.recv_from_cpu_pkt_queue.send.rdy @= 0
 
       elif has_im2col_engine & (cpu_cmd == CMD_IM2COL_LAUNCH):
         # Fork the launch packet to the Im2col engine outport (DMA-style)
@@ -406,6 +699,12 @@ class ControllerRTL(Component):
         s.send_to_im2col_engine_pkt.msg @= s.recv_from_cpu_pkt_queue.send.msg
         s.recv_from_cpu_pkt_queue.send.rdy @= s.send_to_im2col_engine_pkt.rdy
 
+      elif has_launch_queue & (s.launch_issuing | s.launch_queue_head_val):
+        # The packets the CPU sends after a push (e.g., the configuration
+        # of the next kernel) wait until the queued kernels have been sent
+        # to the tiles.
+        s.recv_from_cpu_pkt_queue.send.rdy @= 0
+
       else:
         # For the ctrl and data preloading.
         s.crossbar.recv[kFromCpuCtrlAndDataIdx].val @= \
@@ -426,6 +725,27 @@ class ControllerRTL(Component):
                                                    0, # vc_id
                                                    s.recv_from_cpu_pkt_queue.send.msg.payload))
 
+      # The packets of the queued kernel take the CPU's crossbar inport,
+      # which is free as long as the CPU is held back above.
+      if has_launch_queue & s.launch_issuing:
+        s.crossbar.recv[kFromCpuCtrlAndDataIdx].val @= s.launch_left != TileMaskType(0)
+        s.crossbar.recv[kFromCpuCtrlAndDataIdx].msg @= \
+            ControllerXbarPktType(0, # dst (always 0 to align with the single outport of the crossbar, i.e., NoC)
+                                  InterCgraPktType(s.cgra_id, # src
+                                                   s.launch_cur.dst_cgra_id, # dst
+                                                   0, # src_x
+                                                   0, # src_y
+                                                   s.idTo2d_x_lut[s.launch_cur.dst_cgra_id], # dst_x
+                                                   s.idTo2d_y_lut[s.launch_cur.dst_cgra_id], # dst_y
+                                                   num_tiles, # src_tile_id
+                                                   s.launch_dst, # dst_tile_id
+                                                   0, # remote_src_port
+                                                   0, # opaque
+                                                   0, # vc_id
+                                                   CgraPayloadType(CMD_LAUNCH, 0, 0, 0, 0)))
+        if s.launch_swap_phase:
+          s.crossbar.recv[kFromCpuCtrlAndDataIdx].msg.inter_cgra_pkt.payload.cmd @= CMD_SWAP_CONFIG
+
       # TODO: For the other cmd types.
 
 
@@ -448,6 +768,7 @@ class ControllerRTL(Component):
       s.global_reduce_unit.recv_count.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
       s.global_reduce_unit.recv_data.val @= 0
       s.global_reduce_unit.recv_data.msg @= InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+      s.barrier_recv_val @= 0
 
       # For the load request from NoC.
       received_pkt = s.recv_from_inter_cgra_noc.msg
@@ -492,7 +813,13 @@ class ControllerRTL(Component):
             s.send_to_tile_load_response_queue.recv.msg @= received_pkt
             s.send_to_tile_load_response_queue.recv.val @= 1
 
-        elif s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE:
+        # The queued kernels only report their last CMD_COMPLETE, if they
+        # have the notify flag.
+        elif has_launch_queue & s.launch_complete_hidden:
+          s.recv_from_inter_cgra_noc.rdy @= 1
+
+        elif (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_PERF_COUNTER_RESPONSE):
           s.recv_from_inter_cgra_noc.rdy @= s.send_to_cpu_pkt_queue.recv.rdy
           s.send_to_cpu_pkt_queue.recv.val @= 1
           s.send_to_cpu_pkt_queue.recv.msg @= \
@@ -508,6 +835,11 @@ class ControllerRTL(Component):
                                0, # vc_id
                                s.recv_from_inter_cgra_noc.msg.payload)
 
+        # The CPU sends the invalidation to every CGRA through the NoC,
+        # like the other commands, so it can't overtake them.
+        elif s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_REMOTE_CACHE_INVALIDATE:
+          s.recv_from_inter_cgra_noc.rdy @= 1
+
         # Consume and discard the leaf counter complete signal (loop termination
         # notification from LoopCounter FU) to avoid blocking the NoC.
         elif s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_LEAF_COUNTER_COMPLETE:
@@ -523,6 +855,36 @@ class ControllerRTL(Component):
           s.global_reduce_unit.recv_count.val @= 1
           s.global_reduce_unit.recv_count.msg @= s.recv_from_inter_cgra_noc.msg
 
+        elif has_global_barrier & (
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_BARRIER_CONFIG_PARTICIPANTS) |
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_BARRIER_CONFIG_TILES) |
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_BARRIER_CONFIG_GENERATIONS) |
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_BARRIER_ARRIVE) |
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_BARRIER_COMBINE) |
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_BARRIER_RELEASE)):
+          s.recv_from_inter_cgra_noc.rdy @= s.barrier_recv_rdy
+          s.barrier_recv_val @= 1
+
+        # A single packet goes on the ring, to the lowest tile of the mask.
+        elif s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_MULTICAST:
+          if ~s.config_multicast_found:
+            s.recv_from_inter_cgra_noc.rdy @= 1
+          else:
+            s.recv_from_inter_cgra_noc.rdy @= s.send_to_ctrl_ring_pkt.rdy
+            s.send_to_ctrl_ring_pkt.val @= 1
+            s.send_to_ctrl_ring_pkt.msg @= \
+                IntraCgraPktType(s.recv_from_inter_cgra_noc.msg.src_tile_id, # src
+                                 s.config_multicast_dst, # dst
+                                 s.recv_from_inter_cgra_noc.msg.src, # src_cgra_id
+                                 s.recv_from_inter_cgra_noc.msg.dst, # src_cgra_id
+                                 s.recv_from_inter_cgra_noc.msg.src_x, # src_cgra_x
+                                 s.recv_from_inter_cgra_noc.msg.src_y, # src_cgra_y
+                                 s.recv_from_inter_cgra_noc.msg.dst_x, # dst_cgra_x
+                                 s.recv_from_inter_cgra_noc.msg.dst_y, # dst_cgra_y
+                                 0, # opaque
+                                 0, # vc_id
+                                 s.recv_from_inter_cgra_noc.msg.payload)
+
         elif (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
@@ -544,7 +906,9 @@ class ControllerRTL(Component):
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_LAUNCH) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_LOOP_LOWER) | \
              (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_LOOP_UPPER) | \
-             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_LOOP_STEP) :
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_CONFIG_LOOP_STEP) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_PERF_COUNTER_READ) | \
+             (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_SWAP_CONFIG) :
           s.recv_from_inter_cgra_noc.rdy @= s.send_to_ctrl_ring_pkt.rdy
           s.send_to_ctrl_ring_pkt.val @= s.recv_from_inter_cgra_noc.val
           s.send_to_ctrl_ring_pkt.msg @= \
@@ -564,6 +928,49 @@ class ControllerRTL(Component):
         #   # TODO: Handle other cmd types.
         #   assert(False)
 
+      # Holds the requests of the tiles and the im2col engine back while a
+      # load response is waiting, as the remote tiles stall on the latter.
+      if s.noc_requests_held:
+        s.crossbar.recv[kLoadRequestInportIdx].val @= 0
+        s.recv_from_tile_load_request_pkt_queue.send.rdy @= 0
+        s.crossbar.recv[kStoreRequestInportIdx].val @= 0
+        s.recv_from_tile_store_request_pkt_queue.send.rdy @= 0
+        s.crossbar.recv[kFromIm2colIdx].val @= 0
+        s.recv_from_im2col_pkt_queue.send.rdy @= 0
+      # Gives the requests their turn after a burst of responses.
+      elif response_first & (s.noc_response_burst == NocBurstType(noc_response_max_burst)):
+        s.crossbar.recv[kLoadResponseInportIdx].val @= 0
+        s.recv_from_tile_load_response_pkt_queue.send.rdy @= 0
+
+      # Remote loads hitting the cache are answered locally, when no load
+      # response from the NoC is returned to the tiles in this cycle.
+      if s.remote_load_hit:
+        s.crossbar.recv[kLoadRequestInportIdx].val @= 0
+        s.recv_from_tile_load_request_pkt_queue.send.rdy @= 0
+        if ~s.send_to_tile_load_response_queue.recv.val:
+          s.send_to_tile_load_response_queue.recv.val @= s.recv_from_tile_load_request_pkt_queue.send.val
+          s.recv_from_tile_load_request_pkt_queue.send.rdy @= s.send_to_tile_load_response_queue.recv.rdy
+          s.send_to_tile_load_response_queue.recv.msg @= \
+              InterCgraPktType(s.cgra_id, # src
+                               s.cgra_id, # dst
+                               s.idTo2d_x_lut[s.cgra_id], # src_x
+                               s.idTo2d_y_lut[s.cgra_id], # src_y
+                               s.idTo2d_x_lut[s.cgra_id], # dst_x
+                               s.idTo2d_y_lut[s.cgra_id], # dst_y
+                               0, # src_tile_id
+                               s.recv_from_tile_load_request_pkt_queue.send.msg.src_tile_id, # dst_tile_id
+                               s.recv_from_tile_load_request_pkt_queue.send.msg.remote_src_port, # remote_src_port
+                               0, # opaque
+                               0, # vc_id
+                               CgraPayloadType(CMD_LOAD_RESPONSE,
+                                               s.remote_load_data,
+                                               s.recv_from_tile_load_request_pkt_queue.send.msg.payload.data_addr,
+                                               0, 0))
+      # Misses wait for an entry of the cache to track their response.
+      elif s.remote_load_pending_full:
+        s.crossbar.recv[kLoadRequestInportIdx].val @= 0
+        s.recv_from_tile_load_request_pkt_queue.send.rdy @= 0
+
       # WARNING
       # A possible conflict occurs when dma_done.valis True and the received message is CMD_COMPLETEat the same time,
       # that is, when a DMA command and CMD_COMPLETE appear in the same clock cycle.
@@ -588,6 +995,231 @@ class ControllerRTL(Component):
                               DataType(zext(s.dma_done.msg.dma_tag, DataPayloadType), 1, 0, 0),
                                0, 0, 0))
 
+      if has_perf_counters & s.recv_from_cpu_pkt_queue.send.val & \
+         (cpu_cmd == CMD_PERF_COUNTER_READ) & \
+         (s.recv_from_cpu_pkt_queue.send.msg.dst == num_tiles) & \
+         ~s.send_to_cpu_pkt_queue.recv.val:
+        s.recv_from_cpu_pkt_queue.send.rdy @= s.send_to_cpu_pkt_queue.recv.rdy
+        s.send_to_cpu_pkt_queue.recv.val @= 1
+        s.send_to_cpu_pkt_queue.recv.msg @= \
+            IntraCgraPktType(num_tiles, # src
+                             num_tiles, # dst
+                             s.cgra_id, # src_cgra_id
+                             s.cgra_id, # dst_cgra_id
+                             s.idTo2d_x_lut[s.cgra_id], # src_cgra_x
+                             s.idTo2d_y_lut[s.cgra_id], # src_cgra_y
+                             s.idTo2d_x_lut[s.cgra_id], # dst_cgra_x
+                             s.idTo2d_y_lut[s.cgra_id], # dst_cgra_y
+                             0, # opaque
+                             0, # vc_id
+                             CgraPayloadType(CMD_PERF_COUNTER_RESPONSE,
+                                             DataType(0, 1, 0, 0),
+                                             cpu_payload.data_addr, 0, 0))
+        if cpu_payload.data.payload < PERF_CONTROLLER_DATA_MEM_BASE:
+          s.send_to_cpu_pkt_queue.recv.msg.payload.data.payload @= \
+              s.perf_xbar_counters[trunc(cpu_payload.data.payload, XbarPerfIdxType)]
+        elif cpu_payload.data.payload < PERF_CONTROLLER_REMOTE_CACHE_HIT:
+          s.send_to_cpu_pkt_queue.recv.msg.payload.data.payload @= \
+              s.recv_from_data_mem_perf[trunc(cpu_payload.data.payload - PERF_CONTROLLER_DATA_MEM_BASE,
+                                              DataMemPerfIdxType)]
+        elif cpu_payload.data.payload == PERF_CONTROLLER_REMOTE_CACHE_HIT:
+          s.send_to_cpu_pkt_queue.recv.msg.payload.data.payload @= s.remote_load_hit_count
+        elif cpu_payload.data.payload == PERF_CONTROLLER_REMOTE_CACHE_MISS:
+          s.send_to_cpu_pkt_queue.recv.msg.payload.data.payload @= s.remote_load_miss_count
+
+    if has_remote_load_cache:
+      @update
+      def update_remote_load_cache():
+        s.remote_load_cache.lookup_addr @= \
+            s.recv_from_tile_load_request_pkt_queue.send.msg.payload.data_addr
+        s.remote_load_cache.lookup_fire @= \
+            s.recv_from_tile_load_request_pkt_queue.send.val & \
+            s.recv_from_tile_load_request_pkt_queue.send.rdy
+        # Responses to the remote loads of the tiles fill the cache.
+        s.remote_load_cache.fill_en @= \
+            s.recv_from_inter_cgra_noc.val & s.recv_from_inter_cgra_noc.rdy & \
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_LOAD_RESPONSE) & \
+            (s.recv_from_inter_cgra_noc.msg.dst_tile_id != num_tiles)
+        s.remote_load_cache.fill_addr @= s.recv_from_inter_cgra_noc.msg.payload.data_addr
+        s.remote_load_cache.fill_data @= s.recv_from_inter_cgra_noc.msg.payload.data
+        # Remote stores of the tiles drop their line.
+        s.remote_load_cache.inval_en @= \
+            s.recv_from_tile_store_request_pkt_queue.send.val & \
+            s.recv_from_tile_store_request_pkt_queue.send.rdy
+        s.remote_load_cache.inval_addr @= \
+            s.recv_from_tile_store_request_pkt_queue.send.msg.payload.data_addr
+        s.remote_load_cache.flush @= \
+            s.recv_from_inter_cgra_noc.val & s.recv_from_inter_cgra_noc.rdy & \
+            (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_REMOTE_CACHE_INVALIDATE)
+
+    # Lowest tile of the multicast mask.
+    @update
+    def update_config_multicast():
+      s.config_multicast_dst @= TileIdType(0)
+      s.config_multicast_found @= 0
+      for i in range(num_tiles):
+        if s.config_multicast_mask[i] & ~s.config_multicast_found:
+          s.config_multicast_dst @= TileIdType(i)
+          s.config_multicast_found @= 1
+
+    # Lowest tile of launch_cur still to be sent the current command.
+    @update
+    def update_launch_tiles():
+      s.launch_left @= s.launch_cur.tile_mask & ~s.launch_sent
+      s.launch_dst @= TileIdType(0)
+      s.launch_last @= 0
+      for i in range(num_tiles):
+        if s.launch_left[i] & ~s.launch_last:
+          s.launch_dst @= TileIdType(i)
+          s.launch_last @= 1
+      # Set above as a found flag.
+      s.launch_last @= \
+          s.launch_left == (TileMaskType(1) << zext(s.launch_dst, TileMaskType))
+
+    @update
+    def update_launch_start():
+      # The next kernel starts once the previous one has completed (and
+      # the DMA transfers queued before it are done, if it waits for them).
+      s.launch_start @= \
+          has_launch_queue & s.launch_queue_head_val & ~s.launch_issuing & \
+          (s.launch_completes_left == LaunchCountType(0)) & \
+          (~s.launch_queue_head.wait_dma | (s.dma_inflight == DmaInflightType(0)))
+      # Only the CMD_COMPLETEs of the tiles of launch_cur are counted, the
+      # others (e.g., of the kernels launched by the CPU itself) are
+      # returned to the CPU as usual.
+      s.launch_complete_match @= \
+          (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE) & \
+          (s.recv_from_inter_cgra_noc.msg.src == s.launch_cur.dst_cgra_id) & \
+          ((s.launch_cur.tile_mask & \
+            (TileMaskType(1) << zext(s.recv_from_inter_cgra_noc.msg.src_tile_id, TileMaskType))) != \
+           TileMaskType(0)) & \
+          (s.launch_completes_left != LaunchCountType(0))
+      s.launch_complete_hidden @= \
+          s.launch_complete_match & \
+          ((s.launch_completes_left > LaunchCountType(1)) | ~s.launch_cur.notify)
+
+    @update_ff
+    def update_launch_queue():
+      if s.reset:
+        s.launch_complete_count <<= LaunchCountType(0)
+        s.launch_flags <<= LaunchFlagsType(0)
+        s.launch_cur <<= LaunchDescType()
+        s.launch_issuing <<= 0
+        s.launch_swap_phase <<= 0
+        s.launch_sent <<= TileMaskType(0)
+        s.launch_completes_left <<= LaunchCountType(0)
+      elif has_launch_queue:
+        cpu_cmd = s.recv_from_cpu_pkt_queue.send.msg.payload.cmd
+        cpu_data = s.recv_from_cpu_pkt_queue.send.msg.payload.data.payload
+        if s.recv_from_cpu_pkt_queue.send.val & s.recv_from_cpu_pkt_queue.send.rdy:
+          if cpu_cmd == CMD_LAUNCH_QUEUE_CONFIG_COMPLETES:
+            s.launch_complete_count <<= trunc(cpu_data, LaunchCountType)
+          elif cpu_cmd == CMD_LAUNCH_QUEUE_CONFIG_FLAGS:
+            s.launch_flags <<= trunc(cpu_data, LaunchFlagsType)
+
+        if s.launch_start:
+          s.launch_cur <<= s.launch_queue_head
+          s.launch_issuing <<= 1
+          s.launch_swap_phase <<= s.launch_queue_head.swap_config
+          s.launch_completes_left <<= s.launch_queue_head.complete_count
+        else:
+          if s.launch_issuing:
+            launch_fire = s.crossbar.recv[kFromCpuCtrlAndDataIdx].val & \
+                          s.crossbar.recv[kFromCpuCtrlAndDataIdx].rdy
+            if (s.launch_left == TileMaskType(0)) | (launch_fire & s.launch_last):
+              s.launch_sent <<= TileMaskType(0)
+              if s.launch_swap_phase:
+                s.launch_swap_phase <<= 0
+              else:
+                s.launch_issuing <<= 0
+            elif launch_fire:
+              s.launch_sent <<= s.launch_sent | \
+                  (TileMaskType(1) << zext(s.launch_dst, TileMaskType))
+          if s.recv_from_inter_cgra_noc.val & s.recv_from_inter_cgra_noc.rdy & \
+             s.launch_complete_match:
+            s.launch_completes_left <<= s.launch_completes_left - LaunchCountType(1)
+
+    @update
+    def update_noc_requests_held():
+      s.noc_requests_held @= \
+          response_first & s.recv_from_tile_load_response_pkt_queue.send.val & \
+          (s.noc_response_burst < NocBurstType(noc_response_max_burst))
+
+    @update_ff
+    def update_noc_response_burst():
+      if s.reset:
+        s.noc_response_burst <<= NocBurstType(0)
+      elif response_first:
+        request_waiting = s.recv_from_tile_load_request_pkt_queue.send.val | \
+                          s.recv_from_tile_store_request_pkt_queue.send.val | \
+                          s.recv_from_im2col_pkt_queue.send.val
+        if ~s.noc_requests_held | ~request_waiting:
+          s.noc_response_burst <<= NocBurstType(0)
+        elif s.crossbar.recv[kLoadResponseInportIdx].val & s.crossbar.recv[kLoadResponseInportIdx].rdy:
+          s.noc_response_burst <<= s.noc_response_burst + NocBurstType(1)
+
+    @update_ff
+    def update_perf_counters():
+      if s.reset:
+        for i in range(CONTROLLER_CROSSBAR_INPORTS):
+          s.perf_xbar_counters[i] <<= DataPayloadType(0)
+      elif has_perf_counters:
+        for i in range(CONTROLLER_CROSSBAR_INPORTS):
+          if s.crossbar.recv[i].val & s.crossbar.recv[i].rdy:
+            s.perf_xbar_counters[i] <<= s.perf_xbar_counters[i] + DataPayloadType(1)
+
+    # The queued kernels also count as running from their push until
+    # their last CMD_COMPLETE.
+    @update
+    def update_kernel_running():
+      s.kernel_running @= \
+          (s.kernel_completes_left != KernelCompleteCountType(0)) | \
+          (has_launch_queue & (s.launch_issuing | s.launch_queue_head_val | \
+                               (s.launch_completes_left != LaunchCountType(0))))
+
+    @update_ff
+    def update_spm_buffer_sel():
+      if s.reset:
+        s.spm_buffer_sel_reg <<= 0
+        s.kernel_complete_count <<= KernelCompleteCountType(1)
+        s.kernel_completes_left <<= KernelCompleteCountType(0)
+        s.dma_inflight <<= DmaInflightType(0)
+      elif has_spm_double_buffer | has_launch_queue:
+        cpu_fire = s.recv_from_cpu_pkt_queue.send.val & s.recv_from_cpu_pkt_queue.send.rdy
+        cpu_cmd = s.recv_from_cpu_pkt_queue.send.msg.payload.cmd
+        if has_spm_double_buffer & cpu_fire & (cpu_cmd == CMD_SPM_SWAP):
+          s.spm_buffer_sel_reg <<= ~s.spm_buffer_sel_reg
+        if has_spm_double_buffer & cpu_fire & (cpu_cmd == CMD_SPM_CONFIG_KERNEL_COMPLETES):
+          s.kernel_complete_count <<= \
+              trunc(s.recv_from_cpu_pkt_queue.send.msg.payload.data.payload, KernelCompleteCountType)
+        # The launch is taken from the CPU queue (rather than the ctrl
+        # ring) so that a following CMD_SPM_SWAP can't overtake it. The
+        # launches of the queued kernels take the same crossbar inport.
+        launch_fire = s.crossbar.recv[kFromCpuCtrlAndDataIdx].val & \
+                      s.crossbar.recv[kFromCpuCtrlAndDataIdx].rdy & \
+                      (s.crossbar.recv[kFromCpuCtrlAndDataIdx].msg.inter_cgra_pkt.payload.cmd == CMD_LAUNCH)
+        complete_fire = s.recv_from_inter_cgra_noc.val & s.recv_from_inter_cgra_noc.rdy & \
+                        (s.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE)
+        # Only the kernels launched by the CPU itself are counted here. A
+        # launch while none is running starts the next kernel, also in the
+        # cycle the previous one completes.
+        cpu_launch = launch_fire & ~(has_launch_queue & s.launch_issuing)
+        cpu_complete = complete_fire & ~(has_launch_queue & s.launch_complete_match)
+        if cpu_complete & (s.kernel_completes_left != KernelCompleteCountType(0)):
+          if cpu_launch & (s.kernel_completes_left == KernelCompleteCountType(1)):
+            s.kernel_completes_left <<= s.kernel_complete_count
+          else:
+            s.kernel_completes_left <<= s.kernel_completes_left - KernelCompleteCountType(1)
+        elif cpu_launch & (s.kernel_completes_left == KernelCompleteCountType(0)):
+          s.kernel_completes_left <<= s.kernel_complete_count
+        if has_dma_ports:
+          dma_issue = s.dma_cmd_queue.recv.val & s.dma_cmd_queue.recv.rdy
+          dma_retire = s.dma_done.val & s.dma_done.rdy
+          if dma_issue & ~dma_retire:
+            s.dma_inflight <<= s.dma_inflight + DmaInflightType(1)
+          elif dma_retire & ~dma_issue:
+            s.dma_inflight <<= s.dma_inflight - DmaInflightType(1)
+
     @update
     def update_sending_to_noc_msg():
       s.send_to_inter_cgra_noc.val @= s.crossbar.send[0].val
@@ -0,0 +1,251 @@
+'''
+==========================================================================
+GlobalBarrierUnitRTL.py
+==========================================================================
+A global barrier across the CGRAs. The barrier units of the controllers
+form a binary combining tree over the CGRA ids: CGRA i has the children
+2i+1 and 2i+2, and CGRA 0 is the root.
+
+A CGRA arrives at the current generation with CMD_BARRIER_ARRIVE, or once
+every tile of the barrier tile mask has reported CMD_COMPLETE (those are
+absorbed here instead of being returned to the CPU). CGRAs outside the
+participant mask arrive right away, so they only relay. A unit whose
+subtree has arrived sends CMD_BARRIER_COMBINE to its parent, and the root
+then releases the generation, which goes down the tree with
+CMD_BARRIER_RELEASE. On release, the barrier tiles of the participants
+are relaunched, until the configured number of generations is reached,
+where the root reports a single CMD_COMPLETE (carrying the number of
+generations) to CGRA 0 instead.
+
+Author : agent
+  Date : Oct 18, 2026
+'''
+
+from ..lib.basic.val_rdy.ifcs import RecvIfcRTL
+from ..lib.basic.val_rdy.ifcs import SendIfcRTL
+from ..lib.cmd_type import *
+
+from pymtl3 import *
+from ..lib.util.data_struct_attr import *
+
+class GlobalBarrierUnitRTL(Component):
+
+  def construct(s, InterCgraPktType, num_cgras, num_tiles):
+
+    CgraPayloadType = InterCgraPktType.get_field_type(kAttrPayload)
+    DataType = CgraPayloadType.get_field_type(kAttrData)
+    DataPayloadType = DataType.get_field_type(kAttrPayload)
+    CgraIdType = InterCgraPktType.get_field_type(kAttrSrc)
+    TileIdType = InterCgraPktType.get_field_type(kAttrDstTileId)
+    CgraMaskType = mk_bits(num_cgras)
+    TileMaskType = mk_bits(num_tiles)
+    # Wide enough for the id of the children, 2 * (num_cgras - 1) + 2.
+    TreeIdType = mk_bits(CgraIdType.nbits + 2)
+    ChildMaskType = mk_bits(2)
+    cgra_mask_nbits = min(num_cgras, DataPayloadType.nbits)
+    tile_mask_nbits = min(num_tiles, DataPayloadType.nbits)
+
+    # Interfaces.
+    s.cgra_id = InPort(CgraIdType)
+    # Barrier commands received from the NoC.
+    s.recv = RecvIfcRTL(InterCgraPktType)
+    # Tiles whose CMD_COMPLETE reaches the controller; only the ones
+    # taken as an arrival are accepted.
+    s.recv_complete = RecvIfcRTL(TileIdType)
+    # Combines, releases, relaunches and the final CMD_COMPLETE, towards
+    # the NoC (the controller fills in the coordinates).
+    s.send = SendIfcRTL(InterCgraPktType)
+
+    # Configuration.
+    s.participants = Wire(CgraMaskType)
+    s.tiles = Wire(TileMaskType)
+    s.generations = Wire(DataPayloadType)
+    s.recv_mask_cgras = Wire(CgraMaskType)
+    s.recv_mask_tiles = Wire(TileMaskType)
+    s.recv_mask_cgras[0:cgra_mask_nbits] //= s.recv.msg.payload.data.payload[0:cgra_mask_nbits]
+    if cgra_mask_nbits < num_cgras:
+      s.recv_mask_cgras[cgra_mask_nbits:num_cgras] //= 0
+    s.recv_mask_tiles[0:tile_mask_nbits] //= s.recv.msg.payload.data.payload[0:tile_mask_nbits]
+    if tile_mask_nbits < num_tiles:
+      s.recv_mask_tiles[tile_mask_nbits:num_tiles] //= 0
+
+    # Generation being synchronized and what has arrived at it so far. An
+    # arrival at the next generation is kept until the release.
+    s.generation = Wire(DataPayloadType)
+    s.local_arrived = Wire(b1)
+    s.local_arrived_next = Wire(b1)
+    s.completed = Wire(TileMaskType)
+    s.children_arrived = Wire(ChildMaskType)
+    s.combine_sent = Wire(b1)
+
+    # Packets left to send for the last release.
+    s.release_left = Wire(ChildMaskType)
+    s.relaunch_sent = Wire(TileMaskType)
+    s.relaunching = Wire(b1)
+    s.report_pending = Wire(b1)
+
+    # Position in the tree.
+    s.child_ids = [Wire(TreeIdType) for _ in range(2)]
+    s.children = Wire(ChildMaskType)
+    s.parent_id = Wire(CgraIdType)
+    s.is_root = Wire(b1)
+    s.is_participant = Wire(b1)
+
+    s.active = Wire(b1)
+    s.arrived = Wire(b1)
+    s.release = Wire(b1)
+    s.relaunch_left = Wire(TileMaskType)
+    s.relaunch_dst = Wire(TileIdType)
+    s.relaunch_found = Wire(b1)
+
+    # Connections.
+    s.recv.rdy //= 1
+
+    @update
+    def update_tree():
+      cgra_id = zext(s.cgra_id, TreeIdType)
+      s.child_ids[0] @= (cgra_id << 1) + TreeIdType(1)
+      s.child_ids[1] @= (cgra_id << 1) + TreeIdType(2)
+      s.children[0] @= s.child_ids[0] < TreeIdType(num_cgras)
+      s.children[1] @= s.child_ids[1] < TreeIdType(num_cgras)
+      s.parent_id @= trunc((cgra_id - TreeIdType(1)) >> 1, CgraIdType)
+      s.is_root @= s.cgra_id == CgraIdType(0)
+      s.is_participant @= \
+          (s.participants & (CgraMaskType(1) << zext(s.cgra_id, CgraMaskType))) != CgraMaskType(0)
+
+    @update
+    def update_arrived():
+      s.active @= (s.participants != CgraMaskType(0)) & (s.generation < s.generations)
+      s.arrived @= \
+          s.active & ~s.combine_sent & \
+          (~s.is_participant | s.local_arrived | \
+           ((s.tiles != TileMaskType(0)) & ((s.completed & s.tiles) == s.tiles))) & \
+          ((s.children_arrived & s.children) == s.children) & \
+          (s.release_left == ChildMaskType(0)) & ~s.relaunching & ~s.report_pending
+      s.release @= \
+          (s.is_root & s.arrived) | \
+          (s.recv.val & (s.recv.msg.payload.cmd == CMD_BARRIER_RELEASE))
+      s.recv_complete.rdy @= \
+          s.active & s.is_participant & \
+          ((s.tiles & (TileMaskType(1) << zext(s.recv_complete.msg, TileMaskType))) != TileMaskType(0))
+
+    # Lowest barrier tile still to be relaunched.
+    @update
+    def update_relaunch_dst():
+      s.relaunch_left @= s.tiles & ~s.relaunch_sent
+      s.relaunch_dst @= TileIdType(0)
+      s.relaunch_found @= 0
+      for i in range(num_tiles):
+        if s.relaunch_left[i] & ~s.relaunch_found:
+          s.relaunch_dst @= TileIdType(i)
+          s.relaunch_found @= 1
+
+    @update
+    def update_send():
+      s.send.val @= 0
+      s.send.msg @= InterCgraPktType(s.cgra_id, s.cgra_id, 0, 0, 0, 0, num_tiles, num_tiles, 0, 0, 0,
+                                     CgraPayloadType(CMD_BARRIER_COMBINE,
+                                                     DataType(s.generation, 1, 0, 0),
+                                                     0, 0, 0))
+      if s.release_left != ChildMaskType(0):
+        s.send.val @= 1
+        s.send.msg.payload.cmd @= CMD_BARRIER_RELEASE
+        if s.release_left[0]:
+          s.send.msg.dst @= trunc(s.child_ids[0], CgraIdType)
+        else:
+          s.send.msg.dst @= trunc(s.child_ids[1], CgraIdType)
+      elif s.relaunching:
+        # Goes to this CGRA's tiles through the NoC like the CPU's.
+        s.send.val @= s.relaunch_found
+        s.send.msg.dst_tile_id @= s.relaunch_dst
+        s.send.msg.payload.cmd @= CMD_LAUNCH
+      elif s.report_pending:
+        s.send.val @= 1
+        s.send.msg.dst @= CgraIdType(0)
+        s.send.msg.payload.cmd @= CMD_COMPLETE
+      elif s.arrived & ~s.is_root:
+        s.send.val @= 1
+        s.send.msg.dst @= s.parent_id
+
+    @update_ff
+    def update_config():
+      if s.reset:
+        s.participants <<= CgraMaskType(0)
+        s.tiles <<= TileMaskType(0)
+        s.generations <<= DataPayloadType(0)
+      elif s.recv.val:
+        if s.recv.msg.payload.cmd == CMD_BARRIER_CONFIG_PARTICIPANTS:
+          s.participants <<= s.recv_mask_cgras
+        elif s.recv.msg.payload.cmd == CMD_BARRIER_CONFIG_TILES:
+          s.tiles <<= s.recv_mask_tiles
+        elif s.recv.msg.payload.cmd == CMD_BARRIER_CONFIG_GENERATIONS:
+          s.generations <<= s.recv.msg.payload.data.payload
+
+    @update_ff
+    def update_generation():
+      arrive = s.recv.val & (s.recv.msg.payload.cmd == CMD_BARRIER_ARRIVE)
+      combine = s.recv.val & (s.recv.msg.payload.cmd == CMD_BARRIER_COMBINE)
+      arrive_gen = s.recv.msg.payload.data.payload
+      send_fire = s.send.val & s.send.rdy
+      if s.reset | (s.recv.val & (s.recv.msg.payload.cmd == CMD_BARRIER_CONFIG_PARTICIPANTS)):
+        s.generation <<= DataPayloadType(0)
+        s.local_arrived <<= 0
+        s.local_arrived_next <<= 0
+        s.completed <<= TileMaskType(0)
+        s.children_arrived <<= ChildMaskType(0)
+        s.combine_sent <<= 0
+        s.release_left <<= ChildMaskType(0)
+        s.relaunch_sent <<= TileMaskType(0)
+        s.relaunching <<= 0
+        s.report_pending <<= 0
+      elif s.release:
+        # The root moves on by itself, the others take the generation
+        # carried by the release.
+        next_generation = s.generation + DataPayloadType(1)
+        if ~s.is_root:
+          next_generation = s.recv.msg.payload.data.payload
+        s.generation <<= next_generation
+        s.local_arrived <<= s.local_arrived_next | (arrive & (arrive_gen == next_generation))
+        s.local_arrived_next <<= 0
+        s.completed <<= TileMaskType(0)
+        s.children_arrived <<= ChildMaskType(0)
+        s.combine_sent <<= 0
+        s.release_left <<= s.children
+        s.relaunch_sent <<= TileMaskType(0)
+        if next_generation < s.generations:
+          s.relaunching <<= s.is_participant & (s.tiles != TileMaskType(0))
+        else:
+          s.report_pending <<= s.is_root
+      else:
+        if arrive & (arrive_gen == s.generation):
+          s.local_arrived <<= 1
+        elif arrive & (arrive_gen == s.generation + DataPayloadType(1)):
+          s.local_arrived_next <<= 1
+        if s.recv_complete.val & s.recv_complete.rdy:
+          s.completed <<= s.completed | \
+              (TileMaskType(1) << zext(s.recv_complete.msg, TileMaskType))
+        if combine & (arrive_gen == s.generation):
+          if s.recv.msg.src == trunc(s.child_ids[0], CgraIdType):
+            s.children_arrived <<= s.children_arrived | ChildMaskType(1)
+          elif s.recv.msg.src == trunc(s.child_ids[1], CgraIdType):
+            s.children_arrived <<= s.children_arrived | ChildMaskType(2)
+        if send_fire:
+          if s.release_left != ChildMaskType(0):
+            if s.release_left[0]:
+              s.release_left <<= s.release_left & ChildMaskType(2)
+            else:
+              s.release_left <<= ChildMaskType(0)
+          elif s.relaunching:
+            if s.relaunch_left == (TileMaskType(1) << zext(s.relaunch_dst, TileMaskType)):
+              s.relaunching <<= 0
+            s.relaunch_sent <<= s.relaunch_sent | \
+                (TileMaskType(1) << zext(s.relaunch_dst, TileMaskType))
+          elif s.report_pending:
+            s.report_pending <<= 0
+          else:
+            s.combine_sent <<= 1
+
+  def line_trace(s):
+    return f'gen:{s.generation}/{s.generations}|local:{s.local_arrived}|' \
+           f'completed:{s.completed}|children:{s.children_arrived}|' \
+           f'recv:{s.recv}|out:{s.send}'
@@ -0,0 +1,210 @@
+'''
+==========================================================================
+RemoteLoadCacheRTL.py
+==========================================================================
+A small set-associative read-only cache of remote data, i.e., the words
+that the tiles load from the SPMs of the other CGRAs. The controller
+looks up every outgoing remote load and answers the hits itself; the
+misses go out through the NoC and their responses fill the cache.
+
+The cache is never written by the tiles: a store of this CGRA to a
+cached address drops the line (`inval_en`), and the whole cache is
+invalidated explicitly by CMD_REMOTE_CACHE_INVALIDATE (`flush`), e.g.,
+once the remote data is rewritten by another CGRA or the DMA. Lines are
+replaced round-robin within a set. Hits and misses are counted on
+`hit_count`/`miss_count`.
+
+The addresses of the misses still in flight are kept in a small table.
+A store to one of them, or a flush, poisons its entry, so that the late
+response (read before the store) doesn't fill the cache. Once the table
+is full, `pending_full` tells the controller to hold back new misses.
+
+Author : agent
+  Date : Oct 18, 2026
+'''
+
+from pymtl3 import *
+from ..lib.util.data_struct_attr import *
+
+class RemoteLoadCacheRTL(Component):
+
+  def construct(s, DataType, AddrType, num_sets = 4, num_ways = 2,
+                num_pending = 4):
+
+    assert 2 ** clog2(num_sets) == num_sets, f"{num_sets} sets is not a power of 2."
+    assert 2 ** clog2(num_ways) == num_ways, f"{num_ways} ways is not a power of 2."
+
+    # Constants.
+    # The whole address is kept as the tag.
+    SetType = mk_bits(max(1, clog2(num_sets)))
+    WayType = mk_bits(max(1, clog2(num_ways)))
+    CountType = DataType.get_field_type(kAttrPayload)
+    PendingIdxType = mk_bits(max(1, clog2(num_pending)))
+
+    # Interfaces.
+    # Lookup of the remote load leaving the controller; `lookup_fire`
+    # tells that it is consumed (answered on a hit, sent out otherwise).
+    s.lookup_addr = InPort(AddrType)
+    s.lookup_fire = InPort(b1)
+    s.lookup_hit = OutPort(b1)
+    s.lookup_data = OutPort(DataType)
+    # No entry left to track a miss of `lookup_addr`.
+    s.pending_full = OutPort(b1)
+
+    # Response of a missed load.
+    s.fill_en = InPort(b1)
+    s.fill_addr = InPort(AddrType)
+    s.fill_data = InPort(DataType)
+
+    # Store of this CGRA towards a remote address.
+    s.inval_en = InPort(b1)
+    s.inval_addr = InPort(AddrType)
+
+    # Invalidates the whole cache.
+    s.flush = InPort(b1)
+
+    s.hit_count = OutPort(CountType)
+    s.miss_count = OutPort(CountType)
+
+    # Storage, indexed as [way][set].
+    s.valid = [[Wire(b1) for _ in range(num_sets)] for _ in range(num_ways)]
+    s.tag = [[Wire(AddrType) for _ in range(num_sets)] for _ in range(num_ways)]
+    s.data = [[Wire(DataType) for _ in range(num_sets)] for _ in range(num_ways)]
+    s.victim = [Wire(WayType) for _ in range(num_sets)]
+
+    s.lookup_set = Wire(SetType)
+    s.fill_set = Wire(SetType)
+    s.fill_way = Wire(WayType)
+    s.fill_present = Wire(b1)
+    s.fill_set_full = Wire(b1)
+    s.inval_set = Wire(SetType)
+    s.fill_poisoned = Wire(b1)
+
+    # Misses in flight, with the number of responses still expected for
+    # each address.
+    s.pending_addr = [Wire(AddrType) for _ in range(num_pending)]
+    s.pending_count = [Wire(CountType) for _ in range(num_pending)]
+    s.pending_poisoned = [Wire(b1) for _ in range(num_pending)]
+
+    s.lookup_pending = Wire(b1)
+    s.lookup_pending_idx = Wire(PendingIdxType)
+    s.free_pending = Wire(b1)
+    s.free_pending_idx = Wire(PendingIdxType)
+
+    @update
+    def update_lookup():
+      s.lookup_set @= trunc(s.lookup_addr, SetType) & SetType(num_sets - 1)
+      s.lookup_hit @= 0
+      s.lookup_data @= DataType()
+      for w in range(num_ways):
+        if s.valid[w][s.lookup_set] & (s.tag[w][s.lookup_set] == s.lookup_addr):
+          s.lookup_hit @= 1
+          s.lookup_data @= s.data[w][s.lookup_set]
+
+    # Way to fill: the line already holding the address, else the first
+    # invalid one, else the victim of the set.
+    @update
+    def update_fill_way():
+      s.fill_set @= trunc(s.fill_addr, SetType) & SetType(num_sets - 1)
+      s.inval_set @= trunc(s.inval_addr, SetType) & SetType(num_sets - 1)
+      s.fill_way @= s.victim[s.fill_set]
+      s.fill_present @= 0
+      s.fill_set_full @= 1
+      for w in range(num_ways):
+        if s.fill_set_full & ~s.valid[w][s.fill_set]:
+          s.fill_way @= WayType(w)
+          s.fill_set_full @= 0
+      for w in range(num_ways):
+        if s.valid[w][s.fill_set] & (s.tag[w][s.fill_set] == s.fill_addr):
+          s.fill_way @= WayType(w)
+          s.fill_present @= 1
+
+    # Entry of the missed address (else a free one), and whether the
+    # response being filled was poisoned meanwhile.
+    @update
+    def update_pending():
+      s.lookup_pending @= 0
+      s.lookup_pending_idx @= PendingIdxType(0)
+      s.free_pending @= 0
+      s.free_pending_idx @= PendingIdxType(0)
+      s.fill_poisoned @= 0
+      for i in range(num_pending):
+        if s.pending_count[i] != CountType(0):
+          if s.pending_addr[i] == s.lookup_addr:
+            s.lookup_pending @= 1
+            s.lookup_pending_idx @= PendingIdxType(i)
+          if s.pending_poisoned[i] & (s.pending_addr[i] == s.fill_addr):
+            s.fill_poisoned @= 1
+        elif ~s.free_pending:
+          s.free_pending @= 1
+          s.free_pending_idx @= PendingIdxType(i)
+      s.pending_full @= ~s.lookup_pending & ~s.free_pending
+
+    @update_ff
+    def update_pending_entries():
+      if s.reset:
+        for i in range(num_pending):
+          s.pending_count[i] <<= CountType(0)
+          s.pending_poisoned[i] <<= 0
+      else:
+        for i in range(num_pending):
+          miss = s.lookup_fire & ~s.lookup_hit & \
+                 ((s.lookup_pending & (s.lookup_pending_idx == PendingIdxType(i))) | \
+                  (~s.lookup_pending & s.free_pending & (s.free_pending_idx == PendingIdxType(i))))
+          response = s.fill_en & (s.pending_count[i] != CountType(0)) & \
+                     (s.pending_addr[i] == s.fill_addr)
+          if miss & ~response:
+            s.pending_count[i] <<= s.pending_count[i] + CountType(1)
+          elif response & ~miss:
+            s.pending_count[i] <<= s.pending_count[i] - CountType(1)
+          if miss & (s.pending_count[i] == CountType(0)):
+            s.pending_addr[i] <<= s.lookup_addr
+            s.pending_poisoned[i] <<= 0
+          elif response & ~miss & (s.pending_count[i] == CountType(1)):
+            s.pending_poisoned[i] <<= 0
+          # A store leaving in the same cycle as the miss may overtake it
+          # as well.
+          if s.flush | \
+             (s.inval_en & (s.pending_count[i] != CountType(0)) & (s.pending_addr[i] == s.inval_addr)) | \
+             (s.inval_en & miss & (s.lookup_addr == s.inval_addr)):
+            s.pending_poisoned[i] <<= 1
+
+    @update_ff
+    def update_lines():
+      if s.reset | s.flush:
+        for w in range(num_ways):
+          for i in range(num_sets):
+            s.valid[w][i] <<= 0
+        for i in range(num_sets):
+          s.victim[i] <<= WayType(0)
+      else:
+        if s.fill_en & ~s.fill_poisoned:
+          for w in range(num_ways):
+            if s.fill_way == WayType(w):
+              s.valid[w][s.fill_set] <<= 1
+              s.tag[w][s.fill_set] <<= s.fill_addr
+              s.data[w][s.fill_set] <<= s.fill_data
+          if (num_ways > 1) & ~s.fill_present & s.fill_set_full:
+            s.victim[s.fill_set] <<= s.victim[s.fill_set] + WayType(1)
+        # Comes after the fill, so that a store racing with the response
+        # of the same address leaves no stale line.
+        if s.inval_en:
+          for w in range(num_ways):
+            if (s.valid[w][s.inval_set] & (s.tag[w][s.inval_set] == s.inval_addr)) | \
+               (s.fill_en & ~s.fill_poisoned & (s.fill_way == WayType(w)) & \
+                (s.fill_addr == s.inval_addr)):
+              s.valid[w][s.inval_set] <<= 0
+
+    @update_ff
+    def update_counters():
+      if s.reset:
+        s.hit_count <<= CountType(0)
+        s.miss_count <<= CountType(0)
+      elif s.lookup_fire:
+        if s.lookup_hit:
+          s.hit_count <<= s.hit_count + CountType(1)
+        else:
+          s.miss_count <<= s.miss_count + CountType(1)
+
+  def line_trace(s):
+    return f"{'hit' if s.lookup_hit else 'miss'}:{s.lookup_addr}|hits:{s.hit_count}|misses:{s.miss_count}"
@@ -15,6 +15,7 @@ from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.common import *
 
 
 #-------------------------------------------------------------------------
@@ -39,7 +40,20 @@ class TestHarness(Component):
                 num_rd_tiles,
                 num_cgra_columns,
                 num_cgra_rows,
-                num_tiles):
+                num_tiles,
+                from_cpu_pkts = None,
+                expected_to_cpu_pkts = None,
+                noc_initial_delay = 0,
+                noc_interval_delay = 0,
+                has_spm_double_buffer = False,
+                has_launch_queue = False,
+                noc_arbitration = NOC_ARBITRATION_ROUND_ROBIN,
+                noc_response_max_burst = 4):
+
+    if from_cpu_pkts is None:
+      from_cpu_pkts = []
+    if expected_to_cpu_pkts is None:
+      expected_to_cpu_pkts = []
 
     num_cgras = num_cgra_columns * num_cgra_rows
     PktType = mk_inter_cgra_pkt(num_cgra_columns,
@@ -62,15 +76,24 @@ class TestHarness(Component):
     s.sink_to_mem_load_response = TestSinkRTL(PktType, expected_to_mem_load_response, cmp_fn = cmp_fn)
     s.sink_to_mem_store_request = TestSinkRTL(PktType, expected_to_mem_store_request_msgs, cmp_fn = cmp_fn)
 
-    s.src_from_noc = TestSrcRTL(PktType, from_noc_pkts)
+    s.src_from_noc = TestSrcRTL(PktType, from_noc_pkts,
+                                initial_delay = noc_initial_delay,
+                                interval_delay = noc_interval_delay)
     s.sink_to_noc = TestSinkRTL(PktType, expected_to_noc_pkts)
 
+    s.src_from_cpu = TestSrcRTL(CpuPktType, from_cpu_pkts)
+    s.sink_to_cpu = TestSinkRTL(CpuPktType, expected_to_cpu_pkts)
+
     s.dut = ControllerRTL(PktType,
                           1, # Number of controllers globally (x/y dimension).
                           num_cgras,
                           num_tiles,
                           controller2addr_map,
-                          idTo2d_map)
+                          idTo2d_map,
+                          has_spm_double_buffer = has_spm_double_buffer,
+                          has_launch_queue = has_launch_queue,
+                          noc_arbitration = noc_arbitration,
+                          noc_response_max_burst = noc_response_max_burst)
 
     # Connections
     s.dut.cgra_id //= cgra_id
@@ -85,16 +108,31 @@ class TestHarness(Component):
     s.src_from_noc.send //= s.dut.recv_from_inter_cgra_noc
     s.dut.send_to_inter_cgra_noc //= s.sink_to_noc.recv
 
-    s.dut.recv_from_cpu_pkt.val //= 0
-    s.dut.recv_from_cpu_pkt.msg //= CpuPktType()
+    s.src_from_cpu.send //= s.dut.recv_from_cpu_pkt
+    s.dut.send_to_cpu_pkt //= s.sink_to_cpu.recv
     s.dut.send_to_ctrl_ring_pkt.rdy //= 0
-    s.dut.send_to_cpu_pkt.rdy //= 0
     s.dut.recv_from_ctrl_ring_pkt.val //= 0
     s.dut.recv_from_ctrl_ring_pkt.msg //= CpuPktType()
     # Im2col engine ports are unused in this test.
     s.dut.send_to_im2col_engine_pkt.rdy //= 0
     s.dut.recv_from_im2col_pkt.val      //= 0
     s.dut.recv_from_im2col_pkt.msg      //= CpuPktType()
+    for i in range(NUM_DATA_MEM_PERF_COUNTERS):
+      s.dut.recv_from_data_mem_perf[i] //= 0
+
+    # CMD_COMPLETEs taken from the NoC so far, and their number when the
+    # SPM halves got swapped.
+    s.noc_completes = []
+    s.noc_completes_at_swap = []
+
+    @update_ff
+    def record_noc_completes():
+      if ~s.reset & s.dut.recv_from_inter_cgra_noc.val & s.dut.recv_from_inter_cgra_noc.rdy & \
+         (s.dut.recv_from_inter_cgra_noc.msg.payload.cmd == CMD_COMPLETE):
+        msg = s.dut.recv_from_inter_cgra_noc.msg
+        s.noc_completes.append(msg.clone())
+      if ~s.reset & s.dut.spm_buffer_sel & (len(s.noc_completes_at_swap) == 0):
+        s.noc_completes_at_swap.append(len(s.noc_completes))
 
   def done(s):
     return s.src_from_tile_load_request_pkt.done()  and \
@@ -104,7 +142,9 @@ class TestHarness(Component):
            s.sink_to_mem_load_response.done() and \
            s.sink_to_mem_store_request.done() and \
            s.src_from_noc.done() and \
-           s.sink_to_noc.done()
+           s.sink_to_noc.done() and \
+           s.src_from_cpu.done() and \
+           s.sink_to_cpu.done()
 
   def line_trace(s):
     return s.dut.line_trace()
@@ -287,3 +327,198 @@ def test_simple(cmdline_opts):
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
+# Tiles launched by the CPU complete at different cycles, and the
+# CMD_SPM_SWAP sent right after the launches waits for the last one.
+def test_spm_swap_waits_for_every_tile(cmdline_opts):
+  launched_tiles = [0, 1, 2]
+  # The CPU is attached to CGRA 0.
+  cpu_pkts = [
+    IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0,
+                     CgraPayloadType(CMD_SPM_CONFIG_KERNEL_COMPLETES,
+                                     data = DataType(len(launched_tiles), 1)))
+  ] + [
+                     # src dst src_cgra dst_cgra src_x src_y dst_x dst_y opq vc
+    IntraCgraPktType(0,  tile, 0,       0,       0,    0,    0,    0,    0,  0, CgraPayloadType(CMD_LAUNCH))
+    for tile in launched_tiles
+  ] + [IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_SPM_SWAP))]
+
+  expected_to_noc = [
+                     # src dst src_x src_y dst_x dst_y src_tile   dst_tile opq vc
+    InterCgraPktType(0,   0,  0,    0,    0,    0,    num_tiles,  tile,    0, 0, 0, CgraPayloadType(CMD_LAUNCH))
+    for tile in launched_tiles
+  ]
+
+  # Spaced out by the NoC source, all of them after the swap got to the
+  # head of the CPU queue.
+  completes = [
+    InterCgraPktType(0, 0, 0, 0, 0, 0, tile, num_tiles, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))
+    for tile in launched_tiles
+  ]
+
+  expected_to_cpu = [
+    IntraCgraPktType(tile, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))
+    for tile in launched_tiles
+  ]
+
+  th = TestHarness(CgraPayloadType,
+                   cgra_id,
+                   [], [], [], [], [], [],
+                   completes,
+                   expected_to_noc,
+                   controller2addr_map,
+                   idTo2d_map,
+                   num_rd_tiles,
+                   num_cgra_columns,
+                   num_cgra_rows,
+                   num_tiles,
+                   from_cpu_pkts = cpu_pkts,
+                   expected_to_cpu_pkts = expected_to_cpu,
+                   noc_initial_delay = 8,
+                   noc_interval_delay = 4,
+                   has_spm_double_buffer = True)
+  th.elaborate()
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th, max_cycles = 40)
+  assert th.noc_completes_at_swap == [len(launched_tiles)]
+
+# A kernel whose only CMD_COMPLETE comes from its OPT_RET tile (the
+# default count) ends with it, though three tiles were launched.
+def test_spm_swap_after_single_complete_kernel(cmdline_opts):
+  launched_tiles = [0, 1, 2]
+  ret_tile = 2
+  cpu_pkts = [
+    IntraCgraPktType(0, tile, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_LAUNCH))
+    for tile in launched_tiles
+  ] + [IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_SPM_SWAP))]
+
+  expected_to_noc = [
+    InterCgraPktType(0, 0, 0, 0, 0, 0, num_tiles, tile, 0, 0, 0, CgraPayloadType(CMD_LAUNCH))
+    for tile in launched_tiles
+  ]
+
+  completes = [
+    InterCgraPktType(0, 0, 0, 0, 0, 0, ret_tile, num_tiles, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))
+  ]
+
+  expected_to_cpu = [
+    IntraCgraPktType(ret_tile, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))
+  ]
+
+  th = TestHarness(CgraPayloadType,
+                   cgra_id,
+                   [], [], [], [], [], [],
+                   completes,
+                   expected_to_noc,
+                   controller2addr_map,
+                   idTo2d_map,
+                   num_rd_tiles,
+                   num_cgra_columns,
+                   num_cgra_rows,
+                   num_tiles,
+                   from_cpu_pkts = cpu_pkts,
+                   expected_to_cpu_pkts = expected_to_cpu,
+                   noc_initial_delay = 8,
+                   has_spm_double_buffer = True)
+  th.elaborate()
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th, max_cycles = 40)
+  assert th.noc_completes_at_swap == [1]
+
+# A kernel queued for tiles 0 and 1 only takes their CMD_COMPLETEs, and
+# returns the last one to the CPU. The one of tile 3, launched by the CPU
+# itself, arrives first and goes to the CPU as usual.
+def test_launch_queue_counts_its_own_tiles(cmdline_opts):
+  # Packets addressed to the controller (dst = num_tiles).
+  def controller_pkt(cmd, data):
+    return IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0,
+                            CgraPayloadType(cmd, data = DataType(data, 1)))
+
+  cpu_pkts = [
+    IntraCgraPktType(0, 3, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_LAUNCH)),
+    controller_pkt(CMD_LAUNCH_QUEUE_CONFIG_COMPLETES, 2),
+    controller_pkt(CMD_LAUNCH_QUEUE_CONFIG_FLAGS, LAUNCH_DESC_NOTIFY),
+    controller_pkt(CMD_LAUNCH_QUEUE_PUSH, 0b0011),
+  ]
+
+  expected_to_noc = [
+                     # src dst src_x src_y dst_x dst_y src_tile   dst_tile opq vc
+    InterCgraPktType(0,   0,  0,    0,    0,    0,    num_tiles,  tile,    0, 0, 0, CgraPayloadType(CMD_LAUNCH))
+    for tile in [3, 0, 1]
+  ]
+
+  completes = [
+    InterCgraPktType(0, 0, 0, 0, 0, 0, tile, num_tiles, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))
+    for tile in [3, 0, 1]
+  ]
+
+  expected_to_cpu = [
+    IntraCgraPktType(tile, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))
+    for tile in [3, 1]
+  ]
+
+  th = TestHarness(CgraPayloadType,
+                   cgra_id,
+                   [], [], [], [], [], [],
+                   completes,
+                   expected_to_noc,
+                   controller2addr_map,
+                   idTo2d_map,
+                   num_rd_tiles,
+                   num_cgra_columns,
+                   num_cgra_rows,
+                   num_tiles,
+                   from_cpu_pkts = cpu_pkts,
+                   expected_to_cpu_pkts = expected_to_cpu,
+                   noc_initial_delay = 10,
+                   noc_interval_delay = 4,
+                   has_launch_queue = True)
+  th.elaborate()
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th, max_cycles = 40)
+
+# The load responses waiting along with the stores go to the NoC first,
+# but only two in a row, so the stores still get through.
+def test_noc_response_first_burst(cmdline_opts):
+  store_pkts = [
+    InterCgraPktType(payload = CgraPayloadType(cmd = CMD_STORE_REQUEST, data = DataType(data, 1), data_addr = 5))
+    for data in [50, 60, 70]
+  ]
+
+  response_pkts = [
+    InterCgraPktType(payload = CgraPayloadType(cmd = CMD_LOAD_RESPONSE, data = DataType(data, 1), data_addr = 11))
+    for data in [11, 12, 13, 14]
+  ]
+
+  def store(data):
+                           # src dst src_x src_y dst_x dst_y src_tile dst_tile opq vc
+    return InterCgraPktType(0,   1,  0,    0,    1,    0,    0,       0,       0,  0, 0,
+                            CgraPayloadType(CMD_STORE_REQUEST, data = DataType(data, 1), data_addr = 5))
+
+  def response(data):
+    return InterCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                            CgraPayloadType(CMD_LOAD_RESPONSE, data = DataType(data, 1), data_addr = 11))
+
+  expected_to_noc = [
+    response(11), response(12), store(50),
+    response(13), response(14), store(60),
+    store(70),
+  ]
+
+  th = TestHarness(CgraPayloadType,
+                   cgra_id,
+                   [],
+                   response_pkts,
+                   store_pkts,
+                   [], [], [], [],
+                   expected_to_noc,
+                   controller2addr_map,
+                   idTo2d_map,
+                   num_rd_tiles,
+                   num_cgra_columns,
+                   num_cgra_rows,
+                   num_tiles,
+                   noc_arbitration = NOC_ARBITRATION_RESPONSE_FIRST,
+                   noc_response_max_burst = 2)
+  th.elaborate()
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)
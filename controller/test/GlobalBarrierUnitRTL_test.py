@@ -0,0 +1,188 @@
+'''
+=========================================================================
+GlobalBarrierUnitRTL_test.py
+=========================================================================
+Simple test for GlobalBarrierUnitRTL.
+
+Author : agent
+  Date : Oct 18, 2026
+'''
+
+from pymtl3.stdlib.test_utils import config_model_with_cmdline_opts
+
+from ..GlobalBarrierUnitRTL import GlobalBarrierUnitRTL
+from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
+from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
+from ...lib.cmd_type import *
+from ...lib.messages import *
+from ...lib.opt_type import *
+from ...lib.util.data_struct_attr import *
+
+#-------------------------------------------------------------------------
+# TestHarness
+#-------------------------------------------------------------------------
+
+class TestHarness(Component):
+
+  def construct(s, InterCgraPktType, num_cgras, num_tiles, cgra_id,
+                input_pkts, input_completes, expected_output):
+
+    TileIdType = InterCgraPktType.get_field_type(kAttrDstTileId)
+    # Spaced out, so that each packet sees the effect of the previous one.
+    s.src_pkt = TestSrcRTL(InterCgraPktType, input_pkts, interval_delay = 4)
+    s.src_complete = TestSrcRTL(TileIdType, input_completes,
+                                initial_delay = 16, interval_delay = 4)
+
+    s.sink = TestSinkRTL(InterCgraPktType, expected_output)
+
+    s.dut = GlobalBarrierUnitRTL(InterCgraPktType, num_cgras, num_tiles)
+
+    # Connections
+    s.dut.cgra_id //= cgra_id
+    s.dut.recv //= s.src_pkt.send
+    s.dut.recv_complete //= s.src_complete.send
+    s.dut.send //= s.sink.recv
+
+  def done(s):
+    return s.src_pkt.done() and \
+           s.src_complete.done() and \
+           s.sink.done()
+
+  def line_trace(s):
+    return s.dut.line_trace()
+
+#-------------------------------------------------------------------------
+# run_rtl_sim
+#-------------------------------------------------------------------------
+
+def run_sim(test_harness, max_cycles = 200):
+
+  # Creates a simulator.
+  test_harness.elaborate()
+  test_harness.apply(DefaultPassGroup())
+  test_harness.sim_reset()
+
+  # Runs simulation.
+  ncycles = 0
+  print()
+  print("{}:{}".format(ncycles, test_harness.line_trace()))
+  while not test_harness.done() and ncycles < max_cycles:
+    test_harness.sim_tick()
+    ncycles += 1
+    print("{}:{}".format(ncycles, test_harness.line_trace()))
+
+  # Checks timeout.
+  assert ncycles < max_cycles
+
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+  test_harness.sim_tick()
+
+#-------------------------------------------------------------------------
+# Test cases
+#-------------------------------------------------------------------------
+
+def mk_types(num_cgra_columns, num_cgra_rows, num_tiles):
+  data_nbits = 32
+  predicate_nbits = 1
+  num_rd_tiles = 3
+  ctrl_mem_size = 16
+  num_fu_inports = 2
+  num_fu_outports = 2
+  num_tile_inports = 4
+  num_tile_outports = 4
+  data_mem_size_global = 16
+  addr_nbits = clog2(data_mem_size_global)
+  num_registers_per_reg_bank = 16
+
+  DataType = mk_data(data_nbits, predicate_nbits)
+  DataAddrType = mk_bits(addr_nbits)
+
+  CtrlType = mk_ctrl(num_fu_inports,
+                     num_fu_outports,
+                     num_tile_inports,
+                     num_tile_outports,
+                     num_registers_per_reg_bank)
+
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    CtrlAddrType)
+
+  InterCgraPktType = mk_inter_cgra_pkt(num_cgra_columns,
+                                       num_cgra_rows,
+                                       num_tiles,
+                                       num_rd_tiles,
+                                       CgraPayloadType)
+  return DataType, CgraPayloadType, InterCgraPktType
+
+# CGRA 1 of 4 relays between its child 3 and the root, arriving by
+# CMD_BARRIER_ARRIVE (early for the second generation).
+def test_tree_node(cmdline_opts):
+  num_cgras = 4
+  num_tiles = 4
+  cgra_id = 1
+  DataType, CgraPayloadType, InterCgraPktType = mk_types(4, 1, num_tiles)
+
+  def pkt(src, dst, cmd, data, dst_tile_id = num_tiles):
+                           # src dst src_x src_y dst_x dst_y src_tile_id dst_tile_id
+    return InterCgraPktType(src, dst, 0, 0, 0, 0, num_tiles, dst_tile_id,
+                            payload = CgraPayloadType(cmd, data = DataType(data, 1, 0, 0)))
+
+  input_pkts = [
+    pkt(0, 1, CMD_BARRIER_CONFIG_GENERATIONS, 2),
+    pkt(0, 1, CMD_BARRIER_CONFIG_PARTICIPANTS, 0b0110),
+    pkt(0, 1, CMD_BARRIER_ARRIVE, 0),
+    pkt(3, 1, CMD_BARRIER_COMBINE, 0),
+    pkt(0, 1, CMD_BARRIER_ARRIVE, 1),
+    pkt(0, 1, CMD_BARRIER_RELEASE, 1),
+    pkt(3, 1, CMD_BARRIER_COMBINE, 1),
+    pkt(0, 1, CMD_BARRIER_RELEASE, 2),
+  ]
+
+  expected_output = [
+    pkt(1, 0, CMD_BARRIER_COMBINE, 0),
+    pkt(1, 3, CMD_BARRIER_RELEASE, 1),
+    pkt(1, 0, CMD_BARRIER_COMBINE, 1),
+    pkt(1, 3, CMD_BARRIER_RELEASE, 2),
+  ]
+
+  th = TestHarness(InterCgraPktType, num_cgras, num_tiles, cgra_id,
+                   input_pkts, [], expected_output)
+  th.elaborate()
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)
+
+# A single CGRA whose tiles 0 and 1 arrive by CMD_COMPLETE, relaunched
+# once before the run is reported.
+def test_tile_completes(cmdline_opts):
+  num_cgras = 1
+  num_tiles = 4
+  cgra_id = 0
+  DataType, CgraPayloadType, InterCgraPktType = mk_types(1, 1, num_tiles)
+
+  def pkt(src, dst, cmd, data, dst_tile_id = num_tiles):
+    return InterCgraPktType(src, dst, 0, 0, 0, 0, num_tiles, dst_tile_id,
+                            payload = CgraPayloadType(cmd, data = DataType(data, 1, 0, 0)))
+
+  input_pkts = [
+    pkt(0, 0, CMD_BARRIER_CONFIG_TILES, 0b0011),
+    pkt(0, 0, CMD_BARRIER_CONFIG_GENERATIONS, 2),
+    pkt(0, 0, CMD_BARRIER_CONFIG_PARTICIPANTS, 0b1),
+  ]
+
+  input_completes = [0, 1, 1, 0]
+
+  expected_output = [
+    pkt(0, 0, CMD_LAUNCH, 1, dst_tile_id = 0),
+    pkt(0, 0, CMD_LAUNCH, 1, dst_tile_id = 1),
+    pkt(0, 0, CMD_COMPLETE, 2),
+  ]
+
+  th = TestHarness(InterCgraPktType, num_cgras, num_tiles, cgra_id,
+                   input_pkts, input_completes, expected_output)
+  th.elaborate()
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)
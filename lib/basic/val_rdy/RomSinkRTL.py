@@ -0,0 +1,169 @@
+"""
+========================================================================
+RomSinkRTL
+========================================================================
+Translatable test sink. The expected messages are baked into a ROM and
+compared in hardware, under a constant mask that selects the checked
+fields (the translatable counterpart of SinkRTL's cmp_fn). The outcome
+is reported on a single `status` port carrying done, failed and the
+index of the first mismatching message, so a harness built out of
+RomSourceRTL/RomSinkRTL can be verilated as a whole and checked with
+run_rom_sim().
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from pymtl3.datatypes.bitstructs import is_bitstruct_inst
+from pymtl3.stdlib.test_utils import config_model_with_cmdline_opts
+from pymtl3.stdlib.test_utils.test_helpers import finalize_verilator
+from .ifcs import RecvIfcRTL
+
+
+#-------------------------------------------------------------------------
+# Status and compare mask
+#-------------------------------------------------------------------------
+
+def mk_sink_status( num_msgs, prefix="RomSinkStatus" ):
+
+  IdxType = mk_bits( max( 1, clog2( num_msgs + 1 ) ) )
+
+  new_name = f"{prefix}_{IdxType.nbits}"
+
+  def str_func( s ):
+    if not s.done:
+      return "...."
+    return f"FAIL@{int(s.mismatch_idx)}" if s.failed else "PASS"
+
+  return mk_bitstruct( new_name, {
+      'done'        : Bits1,
+      'failed'      : Bits1,
+      'mismatch_idx': IdxType,
+    },
+    namespace = { '__str__': str_func }
+  )
+
+def _ones( value ):
+  if isinstance( value, list ):
+    return [ _ones( v ) for v in value ]
+  nbits = value.nbits
+  ones = mk_bits( nbits )( ( 1 << nbits ) - 1 )
+  return type( value ).from_bits( ones ) if is_bitstruct_inst( value ) else ones
+
+def mk_cmp_mask( Type, fields=None ):
+  '''Returns a Bits mask of `Type` that selects the given fields, given
+  as dotted paths (e.g., ['payload.cmd', 'payload.data']), or every bit
+  if `fields` is None.'''
+  if fields is None:
+    return mk_bits( Type.nbits )( ( 1 << Type.nbits ) - 1 )
+  msg = Type()
+  for path in fields:
+    *parents, name = path.split( '.' )
+    obj = msg
+    for parent in parents:
+      obj = getattr( obj, parent )
+    setattr( obj, name, _ones( getattr( obj, name ) ) )
+  return msg.to_bits()
+
+#-------------------------------------------------------------------------
+# RomSinkRTL
+#-------------------------------------------------------------------------
+
+class RomSinkRTL( Component ):
+
+  def construct( s, Type, msgs, initial_delay=0, interval_delay=0,
+                 cmp_fields=None ):
+
+    num_msgs = len( msgs )
+    BitsType  = mk_bits( Type.nbits )
+    IdxType   = mk_bits( max( 1, clog2( num_msgs + 1 ) ) )
+    AddrType  = mk_bits( max( 1, clog2( max( 1, num_msgs ) ) ) )
+    CountType = mk_bits( max( 1, clog2( max( initial_delay, interval_delay ) + 1 ) ) )
+    StatusType = mk_sink_status( num_msgs )
+    mask = mk_cmp_mask( Type, cmp_fields )
+
+    # Interface
+
+    s.recv = RecvIfcRTL( Type )
+    s.status = OutPort( StatusType )
+
+    # ROM of the masked expected messages
+
+    s.msgs = list( msgs )
+    s.rom = [ Wire( BitsType ) for _ in range( max( 1, num_msgs ) ) ]
+    for i, msg in enumerate( msgs ):
+      s.rom[i] //= msg.to_bits() & mask
+    if num_msgs == 0:
+      s.rom[0] //= BitsType( 0 )
+
+    s.idx          = Wire( IdxType )
+    s.count        = Wire( CountType )
+    s.failed       = Wire( Bits1 )
+    s.mismatch_idx = Wire( IdxType )
+    s.recv_bits    = Wire( BitsType )
+
+    @update
+    def up_sink_recv():
+      s.recv_bits @= s.recv.msg
+      # Stops accepting after the first mismatch.
+      s.recv.rdy @= ~s.reset & ( s.idx < IdxType( num_msgs ) ) & \
+                    ( s.count == CountType( 0 ) ) & ~s.failed
+      s.status.done @= s.failed | ( s.idx == IdxType( num_msgs ) )
+      s.status.failed @= s.failed
+      s.status.mismatch_idx @= s.mismatch_idx
+
+    @update_ff
+    def up_sink_check():
+      if s.reset:
+        s.idx          <<= IdxType( 0 )
+        s.count        <<= CountType( initial_delay )
+        s.failed       <<= 0
+        s.mismatch_idx <<= IdxType( 0 )
+      elif s.recv.val & s.recv.rdy:
+        if ( s.recv_bits & mask ) != s.rom[ trunc( s.idx, AddrType ) ]:
+          s.failed       <<= 1
+          s.mismatch_idx <<= s.idx
+        s.idx   <<= s.idx + IdxType( 1 )
+        s.count <<= CountType( interval_delay )
+      elif s.count > CountType( 0 ):
+        s.count <<= s.count - CountType( 1 )
+
+  def done( s ):
+    return bool( s.status.done )
+
+  # Line trace
+
+  def line_trace( s ):
+    return f"{s.recv}({s.status})"
+
+#-------------------------------------------------------------------------
+# run_rom_sim
+#-------------------------------------------------------------------------
+
+def run_rom_sim( model, cmdline_opts=None, duts=None, expected=None,
+                 max_cycles=10000, print_line_trace=True ):
+  '''Runs `model`, a harness whose `status` port reports its sinks as a
+  RomSinkRTL does, until it is done. With duts=None and --test-verilog
+  the whole harness is verilated. `expected` (the messages of the sink)
+  only improves the failure message. Returns the cycle count.'''
+
+  model = config_model_with_cmdline_opts( model, cmdline_opts or {}, duts )
+  try:
+    model.apply( DefaultPassGroup( linetrace=print_line_trace ) )
+    model.sim_reset()
+
+    while not model.status.done and model.sim_cycle_count() < max_cycles:
+      model.sim_tick()
+
+    assert model.sim_cycle_count() < max_cycles, "Timed out"
+
+    if model.status.failed:
+      idx = int( model.status.mismatch_idx )
+      detail = f"\nExpected : {expected[idx]}" if expected else ""
+      raise AssertionError( f"Test sink received WRONG message #{idx}!{detail}" )
+
+    return model.sim_cycle_count()
+
+  finally:
+    finalize_verilator( model )
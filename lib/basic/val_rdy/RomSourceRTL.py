@@ -0,0 +1,69 @@
+"""
+========================================================================
+RomSourceRTL
+========================================================================
+Translatable test source. The messages are baked into a ROM of wires
+tied to constants, and only an index and a delay counter are stepped,
+so a harness built out of RomSourceRTL/RomSinkRTL can be verilated as a
+whole instead of calling back into Python every cycle.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from .ifcs import SendIfcRTL
+
+
+class RomSourceRTL( Component ):
+
+  def construct( s, Type, msgs, initial_delay=0, interval_delay=0 ):
+
+    num_msgs = len( msgs )
+    IdxType   = mk_bits( max( 1, clog2( num_msgs + 1 ) ) )
+    AddrType  = mk_bits( max( 1, clog2( max( 1, num_msgs ) ) ) )
+    CountType = mk_bits( max( 1, clog2( max( initial_delay, interval_delay ) + 1 ) ) )
+
+    # Interface
+
+    s.send = SendIfcRTL( Type )
+    s.all_sent = OutPort()
+
+    # ROM
+
+    s.rom = [ Wire( Type ) for _ in range( max( 1, num_msgs ) ) ]
+    for i, msg in enumerate( msgs ):
+      s.rom[i] //= msg
+    if num_msgs == 0:
+      s.rom[0] //= Type()
+
+    s.idx   = Wire( IdxType )
+    s.count = Wire( CountType )
+
+    @update
+    def up_src_send():
+      s.all_sent @= s.idx == IdxType( num_msgs )
+      s.send.val @= ~s.reset & ( s.idx < IdxType( num_msgs ) ) & \
+                    ( s.count == CountType( 0 ) )
+      s.send.msg @= Type()
+      if s.idx < IdxType( num_msgs ):
+        s.send.msg @= s.rom[ trunc( s.idx, AddrType ) ]
+
+    @update_ff
+    def up_src_idx():
+      if s.reset:
+        s.idx   <<= IdxType( 0 )
+        s.count <<= CountType( initial_delay )
+      elif s.send.val & s.send.rdy:
+        s.idx   <<= s.idx + IdxType( 1 )
+        s.count <<= CountType( interval_delay )
+      elif s.count > CountType( 0 ):
+        s.count <<= s.count - CountType( 1 )
+
+  def done( s ):
+    return bool( s.all_sent )
+
+  # Line trace
+
+  def line_trace( s ):
+    return f"{s.send}"
@@ -27,7 +27,7 @@ class SourceRTL( Component ):
 
     s.msgs = deepcopy(msgs)
 
-    # TODO: use wires and ROM to make it translatable
+    # Not translatable, see RomSourceRTL for a ROM-based source.
     s.idx = 0
     s.count = 0
 
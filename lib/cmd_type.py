@@ -14,7 +14,7 @@ from pymtl3 import *
 
 # Total number of commands that are supported/recognized by controller.
 # Needs to be updated once more commands are added/supported.
-NUM_CMDS = 53
+NUM_CMDS = 77
 
 CMD_LAUNCH                           = 0
 CMD_PAUSE                            = 1
@@ -70,7 +70,9 @@ CMD_LC_ALL_COMPLETE                  = 42  # LC -> Controller: all outer loops c
 CMD_CONFIG_GEP_STRIDE                = 43  # Controller -> GEP FU: Configures stride for 2D GEP
 
 # DMA commands. The CPU configures the controller-side command registers
-# before issuing CMD_DMA_MVIN/CMD_DMA_MVOUT.
+# before issuing CMD_DMA_MVIN/CMD_DMA_MVOUT, which queues a descriptor of
+# the current configuration. Several commands can be queued, each one is
+# reported by a CMD_DMA_DONE carrying its tag.
 CMD_DMA_CONFIG_DRAM_ADDR_LO          = 44  # Configures lower 32 bits of DRAM address
 CMD_DMA_CONFIG_DRAM_ADDR_HI          = 45  # Configures higher 32 bits of DRAM address
 CMD_DMA_CONFIG_SPM_ADDR              = 46  # Configures SPM address
@@ -78,11 +80,83 @@ CMD_DMA_CONFIG_BYTES                 = 47  # Configures number of bytes to trans
 CMD_DMA_CONFIG_TAG                   = 48  # Configures tag of the DMA command
 CMD_DMA_MVIN                         = 49  # Issues a DMA_MVIN command
 CMD_DMA_MVOUT                        = 50  # Issues a DMA_MVOUT command
-CMD_DMA_DONE                         = 51  # Signals that the DMA command is complete
+CMD_DMA_DONE                         = 51  # Signals that the DMA command of the tag is complete
 
 # Im2col Engine Command.
 CMD_IM2COL_LAUNCH                    = 52  # CPU -> Controller -> Im2col engine: trigger DMA-style preload
 
+# Performance counter commands. The counter index (see PERF_* in
+# lib/util/common.py) is carried in data.payload; a request with dst ==
+# num_tiles reads the controller/data memory counters instead of a tile's.
+CMD_PERF_COUNTER_READ                = 53  # CPU -> Tile/Controller: reads one performance counter
+CMD_PERF_COUNTER_RESPONSE            = 54  # Tile/Controller -> CPU: counter value in data.payload
+
+# Strided and linked-list DMA. The shape registers stay configured for
+# the following CMD_DMA_MVIN/CMD_DMA_MVOUT; counts of 0 or 1 keep them 1D.
+# Strides are in bytes on the DRAM side and in words on the SPM side.
+CMD_DMA_CONFIG_ROW_COUNT             = 55  # Configures rows per plane (data.payload)
+CMD_DMA_CONFIG_PLANE_COUNT           = 56  # Configures planes (data.payload)
+CMD_DMA_CONFIG_DRAM_ROW_STRIDE       = 57  # Configures DRAM distance between rows
+CMD_DMA_CONFIG_DRAM_PLANE_STRIDE     = 58  # Configures DRAM distance between planes
+CMD_DMA_CONFIG_SPM_ROW_STRIDE        = 59  # Configures SPM distance between rows
+CMD_DMA_CONFIG_SPM_PLANE_STRIDE      = 60  # Configures SPM distance between planes
+CMD_DMA_MVIN_LIST                    = 61  # Issues a DMA_MVIN_LIST from the list at the DRAM address
+CMD_DMA_MVOUT_LIST                   = 62  # Issues a DMA_MVOUT_LIST from the list at the DRAM address
+
+# Ping-pong SPM (has_spm_double_buffer). The tiles and the DMA each own
+# one half of the local SPM; the controller holds the swap back until the
+# launched kernel has completed and the queued DMA transfers are done.
+CMD_SPM_SWAP                         = 63  # Swaps the SPM halves of the tiles and the DMA
+
+# Remote load cache (has_remote_load_cache). Sent to every CGRA whose
+# cache may hold data that is rewritten, e.g., before launching a kernel
+# on new weights.
+CMD_REMOTE_CACHE_INVALIDATE          = 64  # Invalidates the remote load cache of the dst CGRA
+
+# Same ctrl word (payload.ctrl at payload.ctrl_addr) for the tiles whose
+# bits are set in payload.data, e.g., the PEs of a systolic array. The
+# CPU sends one packet per CGRA instead of one per tile, and the
+# controller puts it on the ring once: the ctrl memory of each tile in the
+# mask writes it like a CMD_CONFIG and passes it on to the next one.
+CMD_CONFIG_MULTICAST                 = 65  # Configures the tiles in the mask of payload.data
+
+# Shadow ctrl memory (has_shadow_ctrl_mem). The configuration packets of
+# the next kernel fill the shadow ctrl memory and const queue of the
+# tiles while the current kernel runs; the swap makes them active once
+# the current kernel has completed.
+CMD_SWAP_CONFIG                      = 66  # Activates the shadow configuration of the dst tile
+
+# Kernel launch queue (has_launch_queue). The CPU configures a launch
+# descriptor (see mk_launch_desc) like a DMA command and pushes it; the
+# controller launches the queued kernels one after another and only
+# returns the CMD_COMPLETE of the ones flagged with LAUNCH_DESC_NOTIFY,
+# e.g., the last kernel of a chain. The packets the CPU sends after a
+# push wait until the queued kernels have been sent to the tiles.
+CMD_LAUNCH_QUEUE_CONFIG_COMPLETES    = 67  # Configures the CMD_COMPLETEs ending the kernel (data.payload)
+CMD_LAUNCH_QUEUE_CONFIG_FLAGS        = 68  # Configures the LAUNCH_DESC_* flags (data.payload)
+CMD_LAUNCH_QUEUE_PUSH                = 69  # Queues a launch on the tiles in the mask of payload.data
+
+# Global barrier across CGRAs (has_global_barrier). Every controller is
+# configured with the same participant mask and number of generations.
+# The controllers form a binary combining tree over the CGRA ids (CGRA 0
+# being the root): a CGRA arrives with CMD_BARRIER_ARRIVE or once all its
+# barrier tiles reported CMD_COMPLETE, the arrivals of a subtree are
+# combined towards the root, and the root broadcasts the release down the
+# tree, which relaunches the barrier tiles. The CMD_COMPLETE of the whole
+# run is returned once the last generation is released.
+CMD_BARRIER_CONFIG_PARTICIPANTS      = 70  # Configures the mask of participating CGRAs (data.payload), restarts at generation 0
+CMD_BARRIER_CONFIG_TILES             = 71  # Configures the mask of the tiles arriving/relaunched (data.payload)
+CMD_BARRIER_CONFIG_GENERATIONS       = 72  # Configures the number of generations (data.payload)
+CMD_BARRIER_ARRIVE                   = 73  # Arrives at the generation in data.payload
+CMD_BARRIER_COMBINE                  = 74  # The subtree of the src CGRA arrived, sent to the parent
+CMD_BARRIER_RELEASE                  = 75  # Releases the generation, broadcast to the children
+
+# Ping-pong SPM, continued. A kernel launched by the CPU runs until the
+# configured number of CMD_COMPLETEs has come back (1 after reset, e.g.,
+# the one of the OPT_RET tile); the CMD_LAUNCHs sent meanwhile belong to
+# the same kernel.
+CMD_SPM_CONFIG_KERNEL_COMPLETES      = 76  # Configures the CMD_COMPLETEs ending a kernel (data.payload)
+
 CMD_SYMBOL_DICT = {
   CMD_LAUNCH:                           "(LAUNCH_KERNEL)",
   CMD_PAUSE:                            "(PAUSE_EXECUTION)",
@@ -137,5 +211,29 @@ CMD_SYMBOL_DICT = {
   CMD_DMA_MVOUT:                        "(DMA_MVOUT)",
   CMD_DMA_DONE:                         "(DMA_DONE)",
   CMD_IM2COL_LAUNCH:                    "(IM2COL_LAUNCH)",
+  CMD_PERF_COUNTER_READ:                "(PERF_COUNTER_READ)",
+  CMD_PERF_COUNTER_RESPONSE:            "(PERF_COUNTER_RESPONSE)",
+  CMD_DMA_CONFIG_ROW_COUNT:             "(DMA_CONFIG_ROW_COUNT)",
+  CMD_DMA_CONFIG_PLANE_COUNT:           "(DMA_CONFIG_PLANE_COUNT)",
+  CMD_DMA_CONFIG_DRAM_ROW_STRIDE:       "(DMA_CONFIG_DRAM_ROW_STRIDE)",
+  CMD_DMA_CONFIG_DRAM_PLANE_STRIDE:     "(DMA_CONFIG_DRAM_PLANE_STRIDE)",
+  CMD_DMA_CONFIG_SPM_ROW_STRIDE:        "(DMA_CONFIG_SPM_ROW_STRIDE)",
+  CMD_DMA_CONFIG_SPM_PLANE_STRIDE:      "(DMA_CONFIG_SPM_PLANE_STRIDE)",
+  CMD_DMA_MVIN_LIST:                    "(DMA_MVIN_LIST)",
+  CMD_DMA_MVOUT_LIST:                   "(DMA_MVOUT_LIST)",
+  CMD_SPM_SWAP:                         "(SPM_SWAP)",
+  CMD_REMOTE_CACHE_INVALIDATE:          "(REMOTE_CACHE_INVALIDATE)",
+  CMD_CONFIG_MULTICAST:                 "(CONFIG_MULTICAST)",
+  CMD_SWAP_CONFIG:                      "(SWAP_CONFIG)",
+  CMD_LAUNCH_QUEUE_CONFIG_COMPLETES:    "(LAUNCH_QUEUE_CONFIG_COMPLETES)",
+  CMD_LAUNCH_QUEUE_CONFIG_FLAGS:        "(LAUNCH_QUEUE_CONFIG_FLAGS)",
+  CMD_LAUNCH_QUEUE_PUSH:                "(LAUNCH_QUEUE_PUSH)",
+  CMD_BARRIER_CONFIG_PARTICIPANTS:      "(BARRIER_CONFIG_PARTICIPANTS)",
+  CMD_BARRIER_CONFIG_TILES:             "(BARRIER_CONFIG_TILES)",
+  CMD_BARRIER_CONFIG_GENERATIONS:       "(BARRIER_CONFIG_GENERATIONS)",
+  CMD_BARRIER_ARRIVE:                   "(BARRIER_ARRIVE)",
+  CMD_BARRIER_COMBINE:                  "(BARRIER_COMBINE)",
+  CMD_BARRIER_RELEASE:                  "(BARRIER_RELEASE)",
+  CMD_SPM_CONFIG_KERNEL_COMPLETES:      "(SPM_CONFIG_KERNEL_COMPLETES)",
 }
 
@@ -97,55 +97,20 @@ def mk_ctrl(num_fu_inports = 4,
              f"{num_tile_outports}_{vector_factor_power_nbits}_{tile_in_type_nbits}"
 
   def str_func(s):
-    out_str = '(fu_in)'
-    for i in range(num_fu_inports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.fu_in[i]))
-
-    out_str += '|(routing_xbar_out)'
-    for i in range(num_routing_outports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.routing_xbar_outport[i]))
-
-    out_str += '|(fu_xbar_out)'
-    for i in range(num_routing_outports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.fu_xbar_outport[i]))
-
-    out_str += '|(vector_factor_power)'
-    out_str += str(int(s.vector_factor_power))
-
-    out_str += '|(is_last_ctrl)'
-    out_str += str(int(s.is_last_ctrl))
-
-    out_str += '|(read_reg_towards)'
-    for i in range(num_fu_inports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.read_reg_towards[i]))
-
-    out_str += '|(write_reg_from)'
-    for i in range(num_fu_inports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.write_reg_from[i]))
-
-    out_str += '|(write_reg_idx)'
-    for i in range(num_fu_inports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.write_reg_idx[i]))
-
-    out_str += '|(read_reg_idx)'
-    for i in range(num_fu_inports):
-      if i != 0:
-        out_str += '-'
-      out_str += str(int(s.read_reg_idx[i]))
-
-    return f"(opt){s.operation}|{out_str}"
+    # Called for every ctrl word of every traced memory, so joins are used
+    # instead of building the string piece by piece.
+    def join(values):
+      return '-'.join([str(int(v)) for v in values])
+
+    return f"(opt){s.operation}|(fu_in){join(s.fu_in)}" \
+           f"|(routing_xbar_out){join(s.routing_xbar_outport)}" \
+           f"|(fu_xbar_out){join(s.fu_xbar_outport)}" \
+           f"|(vector_factor_power){int(s.vector_factor_power)}" \
+           f"|(is_last_ctrl){int(s.is_last_ctrl)}" \
+           f"|(read_reg_towards){join(s.read_reg_towards)}" \
+           f"|(write_reg_from){join(s.write_reg_from)}" \
+           f"|(write_reg_idx){join(s.write_reg_idx)}" \
+           f"|(read_reg_idx){join(s.read_reg_idx)}"
 
   field_dict = {}
   field_dict[kAttrOperation] = OperationType
@@ -207,6 +172,7 @@ def mk_dma_cmd(dram_addr_nbits = 64,
                spm_addr_nbits = 32,
                bytes_nbits = 32,
                tag_nbits = 8,
+               count_nbits = 16,
                prefix = "DmaCmd"):
 
   OpcodeType   = mk_bits(3)
@@ -214,11 +180,13 @@ def mk_dma_cmd(dram_addr_nbits = 64,
   SpmAddrType  = mk_bits(spm_addr_nbits)
   BytesType    = mk_bits(bytes_nbits)
   TagType      = mk_bits(tag_nbits)
+  CountType    = mk_bits(count_nbits)
 
-  new_name = f"{prefix}_{dram_addr_nbits}_{spm_addr_nbits}_{bytes_nbits}_{tag_nbits}"
+  new_name = f"{prefix}_{dram_addr_nbits}_{spm_addr_nbits}_{bytes_nbits}_{tag_nbits}_{count_nbits}"
 
   def str_func(s):
-    return f"dma_cmd(op={s.opcode},dram={s.dram_addr},spm={s.spm_addr},bytes={s.nbytes},tag={s.dma_tag})"
+    return f"dma_cmd(op={s.opcode},dram={s.dram_addr},spm={s.spm_addr},bytes={s.nbytes},tag={s.dma_tag}," \
+           f"rows={s.row_count},planes={s.plane_count})"
 
   return mk_bitstruct(new_name, {
       'opcode'   : OpcodeType,
@@ -227,8 +195,45 @@ def mk_dma_cmd(dram_addr_nbits = 64,
       # NOTE nbytes is the number of bytes to transfer.
       # Currently, only nbytes that are multiples of 4 are supported.
       'nbytes'   : BytesType,
-      # This dma_tag isn't used now. We may use it to distinguish different DMA commands.
+      # Returned with the completion (CMD_DMA_DONE) of the command, so the
+      # CPU can tell apart the commands it has queued.
       'dma_tag'  : TagType,
+      # Strided transfers: `nbytes` is one contiguous row, repeated
+      # `row_count` times per plane and `plane_count` times in total (0
+      # counts as 1, i.e., a plain 1D transfer). The strides are the
+      # distances between the first bytes (DRAM) or words (SPM) of
+      # consecutive rows and planes.
+      'row_count'        : CountType,
+      'plane_count'      : CountType,
+      'dram_row_stride'  : BytesType,
+      'dram_plane_stride': BytesType,
+      'spm_row_stride'   : SpmAddrType,
+      'spm_plane_stride' : SpmAddrType,
+    },
+    namespace = {'__str__': str_func}
+  )
+
+# An element of a linked list of DMA transfers (DMA_MVIN_LIST and
+# DMA_MVOUT_LIST), stored as one DRAM beat. Each element is transferred
+# with the row/plane shape of the command, from/to `dram_addr` and
+# `spm_addr`, and `next` is the address of the next element (0 ends the
+# list). Both DRAM addresses only hold the low bits, the upper ones are
+# the same as the address of the list given by the command.
+def mk_dma_list_elem(word_nbits = 32, prefix = "DmaListElem"):
+
+  WordType = mk_bits(word_nbits)
+
+  new_name = f"{prefix}_{word_nbits}"
+
+  def str_func(s):
+    return f"dma_elem(dram={s.dram_addr},spm={s.spm_addr},bytes={s.nbytes},next={s.next})"
+
+  # The first field is the most significant word of the beat.
+  return mk_bitstruct(new_name, {
+      'next'     : WordType,
+      'nbytes'   : WordType,
+      'spm_addr' : WordType,
+      'dram_addr': WordType,
     },
     namespace = {'__str__': str_func}
   )
@@ -617,6 +622,43 @@ def mk_controller_noc_xbar_pkt(InterCgraPktType,
     namespace = {'__str__': str_func}
   )
 
+#=========================================================================
+# Kernel launch descriptor
+#=========================================================================
+
+def mk_launch_desc(num_cgras,
+                   num_tiles,
+                   count_nbits = 16,
+                   prefix = "LaunchDesc"):
+
+  CgraIdType = mk_bits(max(1, clog2(num_cgras)))
+  TileMaskType = mk_bits(num_tiles)
+  CountType = mk_bits(count_nbits)
+
+  new_name = f"{prefix}_{num_cgras}_{num_tiles}_{count_nbits}"
+
+  def str_func(s):
+    return f"launch(cgra={s.dst_cgra_id},tiles={s.tile_mask},completes={s.complete_count}," \
+           f"swap={s.swap_config},wait_dma={s.wait_dma},notify={s.notify})"
+
+  return mk_bitstruct(new_name, {
+      # CGRA and tiles that get the CMD_LAUNCH.
+      'dst_cgra_id'   : CgraIdType,
+      'tile_mask'     : TileMaskType,
+      # Number of CMD_COMPLETEs that end the kernel.
+      'complete_count': CountType,
+      # Sends CMD_SWAP_CONFIG to the tiles before launching, i.e., runs
+      # the configuration preloaded into their shadow ctrl memory.
+      'swap_config'   : b1,
+      # Holds the launch until the queued DMA transfers are done.
+      'wait_dma'      : b1,
+      # Returns the last CMD_COMPLETE of the kernel to the CPU, the others
+      # are dropped by the controller.
+      'notify'        : b1,
+    },
+    namespace = {'__str__': str_func}
+  )
+
 #=========================================================================
 # CGRA ID type
 #=========================================================================
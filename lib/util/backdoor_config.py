@@ -0,0 +1,213 @@
+"""
+=========================================================================
+backdoor_config.py
+=========================================================================
+Backdoor (fast) configuration of the tiles of a CGRA.
+
+Instead of streaming every CMD_CONFIG/CMD_CONFIG_PROLOGUE_*/
+CMD_CONFIG_*_COUNT*/CMD_CONST packet from the CPU through the controller
+and the ctrl ring, the state these packets would leave behind is written
+directly into each tile's ctrl memory, const queue and prologue registers
+right after reset. Only the packets that precede any other command for
+the same tile (e.g., CMD_LAUNCH) are taken over, so the remaining packets
+are streamed as usual and see exactly the same tile state.
+
+The DUTs expose this as `backdoor_configure(pkts)` (CgraRTL,
+CgraTemplateRTL, MeshMultiCgraRTL), and test harnesses use
+`run_sim_with_backdoor_config()` in place of `run_sim()`. Passing a
+second, identically constructed harness as `reference` replays the packet
+path on it and checks that both end up in the same tile state.
+
+The backdoor only works for the Python simulation; Verilator-imported
+DUTs keep streaming all packets.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from pymtl3.stdlib.test_utils.test_helpers import finalize_verilator
+
+from ..cmd_type import *
+
+# Commands whose whole effect is captured by the tile state written here.
+BACKDOOR_CMDS = {
+  CMD_CONFIG,
+  CMD_CONFIG_PROLOGUE_FU,
+  CMD_CONFIG_PROLOGUE_FU_CROSSBAR,
+  CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR,
+  CMD_CONFIG_TOTAL_CTRL_COUNT,
+  CMD_CONFIG_COUNT_PER_ITER,
+  CMD_CONST,
+}
+
+# Commands that address a tile but are served by the data memory, so they
+# don't order against the tile's configuration.
+DATA_MEM_CMDS = {
+  CMD_LOAD_REQUEST,
+  CMD_STORE_REQUEST,
+}
+
+#-------------------------------------------------------------------------
+# Packet splitting
+#-------------------------------------------------------------------------
+
+def tile_key(pkt):
+  return int(pkt.dst)
+
+def cgra_tile_key(pkt):
+  return (int(pkt.dst_cgra_id), int(pkt.dst))
+
+def split_backdoor_pkts(pkts, tiles, key = tile_key):
+  '''Splits `pkts` into ({key: [payload]}, remaining pkts). The payloads
+  of a tile are the leading backdoor-able packets addressed to it, in
+  order; `tiles` holds the keys of the tiles that can be configured.'''
+  hoisted = {}
+  blocked = set()
+  remaining = []
+  for pkt in pkts:
+    dst = key(pkt)
+    cmd = int(pkt.payload.cmd)
+    if dst in tiles and dst not in blocked:
+      if cmd in BACKDOOR_CMDS:
+        hoisted.setdefault(dst, []).append(pkt.payload)
+        continue
+      if cmd not in DATA_MEM_CMDS:
+        blocked.add(dst)
+    remaining.append(pkt)
+  return hoisted, remaining
+
+#-------------------------------------------------------------------------
+# Tile state
+#-------------------------------------------------------------------------
+
+def _poke(signals, idx, value):
+  # Sets both the current and the next value, otherwise the flip at the
+  # end of the next cycle restores the stale next value of a register.
+  if isinstance(value, int):
+    value = type(signals[idx])(value)
+  signals[idx] @= value
+  signals[idx] <<= value
+
+def _poke_attr(component, name, value):
+  signal = getattr(component, name)
+  signal @= type(signal)(value)
+  signal <<= type(signal)(value)
+
+def write_tile_config(tile, payloads):
+  '''Writes the state left by `payloads` into `tile` (a TileRTL after
+  reset).'''
+  ctrl_mem = tile.ctrl_mem
+  const_mem = tile.const_mem
+  # The packets would fill the shadow copies instead.
+  assert not getattr(ctrl_mem, 'has_shadow_ctrl_mem', False), \
+      f"the backdoor can't configure the shadow ctrl memory of {tile}"
+  consts = int(const_mem.wr_cur)
+  for payload in payloads:
+    cmd = int(payload.cmd)
+    addr = int(payload.ctrl_addr)
+    data = int(payload.data.payload)
+    if cmd == CMD_CONST:
+      # The packet path would stall forever on a full const queue.
+      assert consts < len(const_mem.reg_file.regs), \
+          f"more CMD_CONSTs than the const queue of {tile} can hold"
+      _poke(const_mem.reg_file.regs, consts, payload.data)
+      consts += 1
+      _poke_attr(const_mem, 'wr_cur', consts)
+    elif cmd == CMD_CONFIG:
+      _poke(ctrl_mem.reg_file.regs, addr, payload.ctrl)
+    elif cmd == CMD_CONFIG_TOTAL_CTRL_COUNT:
+      _poke_attr(ctrl_mem, 'total_ctrl_steps_val', data)
+    elif cmd == CMD_CONFIG_COUNT_PER_ITER:
+      _poke_attr(ctrl_mem, 'ctrl_count_per_iter_val', data)
+    elif cmd == CMD_CONFIG_PROLOGUE_FU:
+      _poke(ctrl_mem.prologue_count_reg_fu, addr, data)
+    elif cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR:
+      # Same TileInType(1-8) to index (0-7) conversion as the RTL.
+      inport = int(payload.ctrl.routing_xbar_outport[0])
+      if inport > 0:
+        _poke(ctrl_mem.prologue_count_reg_routing_crossbar[addr], inport - 1, data)
+    elif cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR:
+      inport = int(payload.ctrl.fu_xbar_outport[0])
+      _poke(ctrl_mem.prologue_count_reg_fu_crossbar[addr], inport, data)
+
+def tile_config_state(tile):
+  '''Returns the configuration state of `tile` as plain integers, used to
+  compare the backdoor against the packet path.'''
+  ctrl_mem = tile.ctrl_mem
+  const_mem = tile.const_mem
+  ints = lambda signals: [int(x.to_bits() if hasattr(x, 'to_bits') else x)
+                          for x in signals]
+  return {
+    'ctrl'                  : ints(ctrl_mem.reg_file.regs),
+    'const'                 : ints(const_mem.reg_file.regs),
+    'const_count'           : int(const_mem.wr_cur),
+    'total_ctrl_steps'      : int(ctrl_mem.total_ctrl_steps_val),
+    'ctrl_count_per_iter'   : int(ctrl_mem.ctrl_count_per_iter_val),
+    'prologue_fu'           : ints(ctrl_mem.prologue_count_reg_fu),
+    'prologue_fu_xbar'      : [ints(regs) for regs in ctrl_mem.prologue_count_reg_fu_crossbar],
+    'prologue_routing_xbar' : [ints(regs) for regs in ctrl_mem.prologue_count_reg_routing_crossbar],
+  }
+
+#-------------------------------------------------------------------------
+# DUT level
+#-------------------------------------------------------------------------
+
+def backdoor_configure(tiles, pkts, key = tile_key):
+  '''Configures `tiles` ({key: tile}) with the packets it can take over
+  from `pkts` and returns the packets that still need to be streamed.'''
+  hoisted, remaining = split_backdoor_pkts(pkts, tiles, key)
+  for dst, payloads in hoisted.items():
+    write_tile_config(tiles[dst], payloads)
+  return remaining
+
+def dut_config_state(dut):
+  return {dst: tile_config_state(tile)
+          for dst, tile in dut.backdoor_tiles().items()}
+
+#-------------------------------------------------------------------------
+# Harness level
+#-------------------------------------------------------------------------
+
+def _run(model, max_cycles):
+  while not model.done() and model.sim_cycle_count() < max_cycles:
+    model.sim_tick()
+  # Force a test failure if we timed out
+  assert model.sim_cycle_count() < max_cycles
+  # Extra ticks to make VCD easier to read
+  model.sim_tick()
+  model.sim_tick()
+  model.sim_tick()
+
+def run_sim_with_backdoor_config(model, src = 'src_ctrl_pkt', dut = 'dut',
+                                 reference = None, print_line_trace = True,
+                                 max_cycles = 10000):
+  '''Same as pymtl3's run_sim() on an already configured `model`, but the
+  packets of the `model.<src>` source that configure `model.<dut>` are
+  written through the backdoor after reset. If `reference` (an elaborated
+  harness built like `model`) is given, it is simulated through the
+  packet path and the final tile states must match. Returns the number
+  of simulated cycles.'''
+  try:
+    model.apply(DefaultPassGroup(linetrace = print_line_trace))
+    model.sim_reset()
+    top_dut = getattr(model, dut)
+    if hasattr(top_dut, 'backdoor_configure'):
+      source = getattr(model, src)
+      source.msgs = top_dut.backdoor_configure(source.msgs)
+    _run(model, max_cycles)
+  finally:
+    finalize_verilator(model)
+
+  if reference is not None and hasattr(top_dut, 'backdoor_configure'):
+    reference.apply(DefaultPassGroup(linetrace = False))
+    reference.sim_reset()
+    _run(reference, max_cycles)
+    expected = dut_config_state(getattr(reference, dut))
+    actual = dut_config_state(top_dut)
+    for dst in expected:
+      assert actual[dst] == expected[dst], \
+          f"backdoor config of tile {dst} diverges from the packet path:\n" \
+          f"  backdoor: {actual[dst]}\n  packets : {expected[dst]}"
+
+  return model.sim_cycle_count()
@@ -0,0 +1,311 @@
+"""
+=========================================================================
+build_cache.py
+=========================================================================
+Content-addressed on-disk cache for Verilog translation and Verilator
+builds. Each distinct DUT configuration gets its own directory under the
+cache root, keyed by a stable hash of the DUT's constructor arguments,
+the parameters applied to it with set_param(), and the RTL sources.
+
+On a hit, the Verilog in the entry is imported as it is: translation is
+skipped, and PyMTL3's Verilator import finds the compiled shared library
+of the same Verilog there and skips the Verilator/C++ build as well.
+
+The cache root defaults to `build_cache/` under the current working
+directory and can be moved with the VECTORCGRA_BUILD_CACHE environment
+variable.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from pymtl3 import Bits, MetadataKey
+from pymtl3.datatypes import is_bitstruct_class
+from pymtl3.passes.backends.verilog import (VerilogPlaceholderPass,
+                                            VerilogTBGenPass,
+                                            VerilogTranslationImportPass,
+                                            VerilogTranslationPass,
+                                            VerilogVerilatorImportPass)
+from pymtl3.passes.tracing import VcdGenerationPass
+from pymtl3.stdlib.test_utils import config_model_with_cmdline_opts
+
+BUILD_CACHE_ENV = 'VECTORCGRA_BUILD_CACHE'
+BUILD_CACHE_DEFAULT_DIR = 'build_cache'
+MANIFEST_FILE = 'manifest.json'
+LOCK_FILE = '.lock'
+
+# Root of the VectorCGRA package, whose sources are folded into every key.
+_PKG_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+_source_digest = None
+
+#-------------------------------------------------------------------------
+# Stable hashing
+#-------------------------------------------------------------------------
+
+def _canonical(obj):
+  '''Returns a process-independent string describing `obj`. Types are
+  described by name and layout rather than by identity, so two calls to
+  mk_bitstruct() with the same fields produce the same description.'''
+  if obj is None or isinstance(obj, (bool, int, float, str)):
+    return repr(obj)
+  if isinstance(obj, Bits):
+    return f'b{obj.nbits}:{int(obj)}'
+  if isinstance(obj, type):
+    if is_bitstruct_class(obj):
+      fields = ','.join(f'{name}={_canonical(field_type)}'
+                        for name, field_type in obj.__bitstruct_fields__.items())
+      return f'struct {obj.__name__}({fields})'
+    if issubclass(obj, Bits):
+      return f'Bits{obj.nbits}'
+    return f'class {obj.__module__}.{obj.__qualname__}'
+  if isinstance(obj, dict):
+    items = sorted((_canonical(k), _canonical(v)) for k, v in obj.items())
+    return '{' + ','.join(f'{k}:{v}' for k, v in items) + '}'
+  if isinstance(obj, (list, tuple)):
+    return '[' + ','.join(_canonical(x) for x in obj) + ']'
+  if isinstance(obj, (set, frozenset)):
+    return '{' + ','.join(sorted(_canonical(x) for x in obj)) + '}'
+  if callable(obj) and hasattr(obj, '__qualname__'):
+    return f'func {obj.__module__}.{obj.__qualname__}'
+  # Tiles, links and other template descriptors: hash their attributes.
+  if hasattr(obj, '__dict__'):
+    attrs = {k: v for k, v in vars(obj).items() if not k.startswith('_')}
+    return f'{type(obj).__qualname__}' + _canonical(attrs)
+  return repr(obj)
+
+def rtl_source_digest():
+  '''Hash of every non-test Python source in the package, computed once
+  per process, so that editing any RTL invalidates all cache entries.'''
+  global _source_digest
+  if _source_digest is None:
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(_PKG_ROOT):
+      dirs[:] = sorted(d for d in dirs
+                       if d not in ('test', '__pycache__', '.git')
+                       and not d.startswith(BUILD_CACHE_DEFAULT_DIR))
+      for name in sorted(files):
+        if name.endswith('.py'):
+          path = os.path.join(root, name)
+          h.update(os.path.relpath(path, _PKG_ROOT).encode())
+          with open(path, 'rb') as f:
+            h.update(f.read())
+    _source_digest = h.hexdigest()
+  return _source_digest
+
+def stable_param_hash(component_name, params, include_sources = True):
+  '''Returns a hex key for `component_name` built with `params`.'''
+  h = hashlib.sha256()
+  h.update(component_name.encode())
+  h.update(_canonical(params).encode())
+  if include_sources:
+    h.update(rtl_source_digest().encode())
+  return h.hexdigest()[:24]
+
+#-------------------------------------------------------------------------
+# Cache directory management
+#-------------------------------------------------------------------------
+
+def build_cache_root():
+  return os.path.abspath(os.environ.get(BUILD_CACHE_ENV,
+                                        BUILD_CACHE_DEFAULT_DIR))
+
+@contextlib.contextmanager
+def _locked_entry(path):
+  '''Creates the entry directory and holds an exclusive lock on it, so
+  concurrent test workers building the same key wait for each other
+  instead of racing on the same Verilator obj_dir.'''
+  os.makedirs(path, exist_ok = True)
+  with open(os.path.join(path, LOCK_FILE), 'w') as lock:
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    try:
+      yield
+    finally:
+      fcntl.flock(lock, fcntl.LOCK_UN)
+
+@contextlib.contextmanager
+def _chdir(path):
+  cwd = os.getcwd()
+  os.chdir(path)
+  try:
+    yield
+  finally:
+    os.chdir(cwd)
+
+def _read_manifest(path):
+  try:
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return None
+
+def _write_manifest(path, key, component_name, params, **extra):
+  # Translation-only and simulation runs may share an entry, so what one
+  # recorded is kept by the other.
+  manifest = _read_manifest(path) or {}
+  manifest.update({
+    'key'       : key,
+    'component' : component_name,
+    'params'    : _canonical(params),
+    'created'   : time.strftime('%Y-%m-%d %H:%M:%S'),
+  })
+  manifest.update(extra)
+  tmp = os.path.join(path, MANIFEST_FILE + '.tmp')
+  with open(tmp, 'w') as f:
+    json.dump(manifest, f, indent = 2)
+  os.replace(tmp, os.path.join(path, MANIFEST_FILE))
+
+def dut_params(dut):
+  '''Everything `dut` was constructed with: its positional and keyword
+  arguments, including the ones given with set_param(), and the
+  set_param() overrides of its subcomponents.'''
+  return (dut._dsl.args, dut._dsl.kwargs, dut._dsl.param_tree)
+
+def _entry_path(dut):
+  component_name = type(dut).__name__
+  params = dut_params(dut)
+  # Explicit module/file names change the generated Verilog, so they are
+  # part of the key as well.
+  names = [dut.get_metadata(k) if dut.has_metadata(k) else None
+           for k in (VerilogTranslationPass.explicit_module_name,
+                     VerilogTranslationPass.explicit_file_name)]
+  key = stable_param_hash(component_name, (params, names))
+  return component_name, params, key, os.path.join(build_cache_root(), key)
+
+#-------------------------------------------------------------------------
+# Translation reusing the cached Verilog
+#-------------------------------------------------------------------------
+
+class CachedVerilogTranslationPass(VerilogTranslationPass):
+  '''Translates like VerilogTranslationPass, except for the components
+  carrying `cached_source`, whose Verilog is taken from the cache.'''
+
+  #: (Verilog file, top module name) of a cache hit.
+  #:
+  #: Type: ``tuple``; input
+  cached_source = MetadataKey(tuple)
+
+  def traverse_hierarchy(s, m):
+    c = VerilogTranslationPass
+    if m.has_metadata(s.cached_source) and m.has_metadata(c.enable) and \
+       m.get_metadata(c.enable):
+      filename, top_module = m.get_metadata(s.cached_source)
+      # What the import pass needs from a translation whose Verilog did
+      # not change.
+      m.set_metadata(c.is_same, True)
+      m.set_metadata(c.translated, True)
+      m.set_metadata(c.translated_filename, filename)
+      m.set_metadata(c.translated_top_module, top_module)
+      return
+    super().traverse_hierarchy(m)
+
+class CachedVerilogTranslationImportPass(VerilogTranslationImportPass):
+
+  @staticmethod
+  def get_translation_pass():
+    return CachedVerilogTranslationPass
+
+#-------------------------------------------------------------------------
+# Entry points used by the tests
+#-------------------------------------------------------------------------
+
+def _cached_source(path, manifest):
+  if not manifest or 'top_module' not in manifest:
+    return None
+  files = manifest.get('verilog', [])
+  if not files or not all(os.path.exists(os.path.join(path, f))
+                          for f in files):
+    return None
+  return (files[0], manifest['top_module'])
+
+def config_model_with_build_cache(top, cmdline_opts, duts):
+  '''Drop-in replacement for config_model_with_cmdline_opts(). When
+  --test-verilog is set, `duts` is translated and imported inside its
+  cache entry, and on a hit its cached Verilog and shared library are
+  imported without translating or building again. Either way the Verilog
+  is copied into the current working directory, as the plain translation
+  would have left it there. Elaboration still happens because the
+  Python-side harness needs the component hierarchy.'''
+  if not cmdline_opts.get('test_verilog') or len(duts) != 1:
+    return config_model_with_cmdline_opts(top, cmdline_opts, duts)
+  dump_vcd = cmdline_opts.get('dump_vcd')
+  top.elaborate()
+  dut = getattr(top, duts[0])
+  component_name, params, key, path = _entry_path(dut)
+  cwd = os.getcwd()
+  with _locked_entry(path), _chdir(path):
+    manifest = _read_manifest(path)
+    source = _cached_source(path, manifest)
+
+    # Same settings as config_model_with_cmdline_opts().
+    dut.set_metadata(VerilogTranslationImportPass.enable, True)
+    dut.set_metadata(VerilogVerilatorImportPass.vl_xinit,
+                     cmdline_opts['test_verilog'])
+    if dump_vcd:
+      dut.set_metadata(VerilogVerilatorImportPass.vl_trace, True)
+      dut.set_metadata(VerilogVerilatorImportPass.vl_trace_filename, dump_vcd)
+    if cmdline_opts.get('on_demand_vcd_portname'):
+      dut.set_metadata(VerilogVerilatorImportPass.vl_trace_on_demand, True)
+      dut.set_metadata(VerilogVerilatorImportPass.vl_trace_on_demand_portname,
+                       cmdline_opts['on_demand_vcd_portname'])
+    if source:
+      dut.set_metadata(CachedVerilogTranslationPass.cached_source, source)
+
+    top.apply(VerilogPlaceholderPass())
+    top = CachedVerilogTranslationImportPass()(top)
+
+    if source:
+      files = manifest['verilog']
+    else:
+      filename = dut.get_metadata(VerilogTranslationPass.translated_filename)
+      files = [os.path.basename(filename)]
+      _write_manifest(path, key, component_name, params,
+                      verilog = files,
+                      top_module = dut.get_metadata(
+                          VerilogTranslationPass.translated_top_module))
+    for f in files:
+      shutil.copy(os.path.join(path, f), os.path.join(cwd, f))
+
+  if cmdline_opts.get('dump_vtb'):
+    getattr(top, duts[0]).set_metadata(VerilogTBGenPass.case_name,
+                                       cmdline_opts['dump_vtb'])
+    top.apply(VerilogTBGenPass())
+  if dump_vcd:
+    top.set_metadata(VcdGenerationPass.vcd_file_name, dump_vcd)
+  return top
+
+def translate_with_build_cache(top, dut_name, translate):
+  '''Translates `top.<dut_name>` by calling `translate(top)` inside the
+  cache entry and copies the generated Verilog into the current working
+  directory. On a warm run the cached Verilog is copied out directly and
+  translation is skipped. Returns True on a cache hit.'''
+  dut = getattr(top, dut_name)
+  component_name, params, key, path = _entry_path(dut)
+  cwd = os.getcwd()
+  with _locked_entry(path):
+    manifest = _read_manifest(path)
+    files = manifest.get('verilog', []) if manifest else []
+    hit = bool(files) and all(os.path.exists(os.path.join(path, f))
+                              for f in files)
+    if not hit:
+      with _chdir(path):
+        before = set(os.listdir(path))
+        translate(top)
+        files = sorted(f for f in set(os.listdir(path)) - before
+                       if f.endswith('.v'))
+        if not files:
+          # The Verilog was regenerated over an existing entry's file.
+          filename = dut.get_metadata(VerilogTranslationPass.translated_filename)
+          files = [os.path.basename(filename)]
+      _write_manifest(path, key, component_name, params, verilog = files)
+    for f in files:
+      shutil.copy(os.path.join(path, f), os.path.join(cwd, f))
+  return hit
@@ -65,12 +65,55 @@ kFromInterTileRingIdx    = 4
 kFromReduceUnitIdx       = 5
 kFromIm2colIdx           = 6
 
+# Arbitration between the inports of the controller xbar
+# (ControllerRTL's noc_arbitration). The mesh has a single injection
+# port per CGRA, so the classes of packets share it by priority.
+NOC_ARBITRATION_ROUND_ROBIN    = "RoundRobin"    # All inports take turns.
+NOC_ARBITRATION_RESPONSE_FIRST = "ResponseFirst" # Load responses go before the tile/im2col requests.
+
 GLOBAL_REDUCE_MAX_COUNT = 4
 
+# Indices of the performance counters read by CMD_PERF_COUNTER_READ.
+# Tile counters (TileRTL with has_perf_counters).
+PERF_TILE_FU_BUSY          = 0 # Cycles the FU fires a non-NAH operation.
+PERF_TILE_FU_STALL         = 1 # Cycles the FU holds its recv_opt without firing.
+PERF_TILE_XBAR_STALL       = 2 # Cycles a crossbar waits on a not-ready outport.
+PERF_TILE_REG_READS        = 3 # Register bank reads by the issued ctrl signals.
+PERF_TILE_REG_WRITES       = 4 # Register bank writes.
+NUM_TILE_PERF_COUNTERS     = 5
+# Data memory counters (DataMemControllerRTL with has_perf_counters).
+PERF_DATA_MEM_BANK_CONFLICT = 0 # Local bank requests held back at the xbars, per port and cycle.
+PERF_DATA_MEM_NOC_STALL     = 1 # Cycles a request/response towards the NoC is not accepted.
+NUM_DATA_MEM_PERF_COUNTERS  = 2
+# Controller counters (ControllerRTL with has_perf_counters): packets
+# accepted on each controller xbar inport (indexed as k*Idx above),
+# followed by the counters of the data memory of the same CGRA and by
+# the ones of the remote load cache (has_remote_load_cache).
+PERF_CONTROLLER_DATA_MEM_BASE     = CONTROLLER_CROSSBAR_INPORTS
+PERF_CONTROLLER_REMOTE_CACHE_HIT  = PERF_CONTROLLER_DATA_MEM_BASE + NUM_DATA_MEM_PERF_COUNTERS # Remote loads answered by the cache.
+PERF_CONTROLLER_REMOTE_CACHE_MISS = PERF_CONTROLLER_REMOTE_CACHE_HIT + 1 # Remote loads sent to the NoC.
+NUM_CONTROLLER_PERF_COUNTERS      = PERF_CONTROLLER_REMOTE_CACHE_MISS + 1
+
 # Cgra Topology
 MESH = "Mesh"
 KING_MESH = "KingMesh"
 
+# Mapping of the local SPM addresses onto the banks of a CGRA
+# (DataMemControllerRTL's bank_mapping).
+BANK_MAPPING_BLOCK      = "Block"      # Contiguous blocks of data_mem_size_per_bank words per bank.
+BANK_MAPPING_INTERLEAVE = "Interleave" # Consecutive words in consecutive banks.
+BANK_MAPPING_XOR        = "Xor"        # Interleaved, bank index XOR-ed with the next address bits.
+
+# Storage of each data SPM bank (DataMemControllerRTL's bank_storage).
+BANK_STORAGE_REGISTER_FILE = "RegisterFile" # Flops, read in the same cycle (or the next one, see mem_access_is_combinational).
+BANK_STORAGE_SRAM_1RW      = "Sram1RW"      # Single-port SRAM, pipelined 1-cycle reads, writes first.
+BANK_STORAGE_SRAM_1R1W     = "Sram1R1W"     # Dual-port SRAM, one pipelined read and one write per cycle.
+
+# Flags of a kernel launch descriptor (CMD_LAUNCH_QUEUE_CONFIG_FLAGS).
+LAUNCH_DESC_SWAP_CONFIG = 1 # Sends CMD_SWAP_CONFIG to the tiles before launching.
+LAUNCH_DESC_WAIT_DMA    = 2 # Launches once the queued DMA transfers are done.
+LAUNCH_DESC_NOTIFY      = 4 # Returns the last CMD_COMPLETE of the kernel to the CPU.
+
 # Register cluster read direction enums
 READ_TOWARDS_NOTHING      = 0
 READ_TOWARDS_FU           = 1
@@ -83,8 +126,13 @@ READ_TOWARDS_BOTH         = 3
 # DMA Move In and Out
 # DMA_MVIN  : DRAM -> DMA Engine -> SPM
 # DMA_MVOUT : SPM -> DMA Engine -> DRAM
-DMA_MVIN  = 0
-DMA_MVOUT = 1
+# The *_LIST variants walk a linked list of transfers (see
+# mk_dma_list_elem) starting at the DRAM address of the command. Bit 0 of
+# the opcode is the direction, bit 1 the list mode.
+DMA_MVIN       = 0
+DMA_MVOUT      = 1
+DMA_MVIN_LIST  = 2
+DMA_MVOUT_LIST = 3
 
 # 1 byte = 8 bits
 CHAR_BIT = 8
@@ -92,12 +140,8 @@ CHAR_BIT = 8
 # State machine definitions of DMA engine.
 from pymtl3 import mk_bits
 StateType = mk_bits( 4 )
-STATE_DMA_IDLE          = StateType( 0 ) # Waiting for a new DMA command
-STATE_DMA_MVIN_REQ      = StateType( 1 ) # MVIN: Issuing DRAM read request
-STATE_DMA_MVIN_RESP     = StateType( 2 ) # MVIN: Waiting for DRAM read response
-STATE_DMA_MVIN_WRITE    = StateType( 3 ) # MVIN: Writing unpacked words to SPM
-STATE_DMA_MVOUT_READ    = StateType( 4 ) # MVOUT: Issuing SPM read request
-STATE_DMA_MVOUT_RESP    = StateType( 5 ) # MVOUT: Receiving SPM read response and packing
-STATE_DMA_MVOUT_WRITE   = StateType( 6 ) # MVOUT: Issuing DRAM write request
-STATE_DMA_MVOUT_WAIT    = StateType( 7 ) # MVOUT: Waiting for DRAM write response
-STATE_DMA_DONE          = StateType( 8 ) # Signaling command completion
+STATE_DMA_IDLE          = StateType( 0 ) # Waiting for a queued DMA command
+STATE_DMA_MVIN          = StateType( 1 ) # MVIN: DRAM reads, beat buffering and SPM writes overlap
+STATE_DMA_MVOUT         = StateType( 2 ) # MVOUT: SPM reads, beat packing and DRAM writes overlap
+STATE_DMA_DONE          = StateType( 3 ) # Queuing the tag of the finished command
+STATE_DMA_FETCH         = StateType( 4 ) # Reading the next element of a transfer list
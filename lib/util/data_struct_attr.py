@@ -51,4 +51,6 @@ kAttrSpmAddr = 'spm_addr'
 kAttrSpmData = 'spm_data'
 kAttrSpmMask = 'spm_mask'
 kAttrDramData = 'dram_data'
-kAttrDramMask = 'dram_mask'
\ No newline at end of file
+kAttrDramMask = 'dram_mask'
+kAttrRowCount = 'row_count'
+kAttrPlaneCount = 'plane_count'
\ No newline at end of file
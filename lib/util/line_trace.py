@@ -0,0 +1,174 @@
+"""
+=========================================================================
+line_trace.py
+=========================================================================
+Helpers for cheap line tracing.
+
+MemDiffTrace renders a memory as the words that changed since the
+previous call. With --trace-ring, memories show that instead of every
+word, as the buffered traces are read a long way from where they were
+taken.
+
+LineTraceRecorder replaces the per-cycle line trace printing of a PyMTL3
+simulator. Traces are only materialized for the cycles and components
+selected by its filters, and the last `depth` of them are kept in a ring
+buffer that is dumped only when a test fails. `enable()` installs it on
+every simulator built by DefaultPassGroup; from pytest use
+`--trace-ring N` (see conftest.py).
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from collections import deque
+
+from pymtl3.passes.sim.PrepareSimPass import PrepareSimPass
+
+#-------------------------------------------------------------------------
+# Memory diffs
+#-------------------------------------------------------------------------
+
+# Recorder whose trace is being materialized, if any.
+_recording = None
+
+class MemDiffTrace:
+  '''Tracks the integer value of each word and reports only the words
+  that changed since the last call as `addr:value` pairs. The first call
+  reports the non-zero words.'''
+
+  def __init__(s):
+    s.prev = None
+
+  def __call__(s, words):
+    if s.prev is None or len(s.prev) != len(words):
+      s.prev = [0] * len(words)
+    changed = []
+    for addr, word in enumerate(words):
+      # Bitstructs (e.g., data and ctrl words) are compared as raw bits.
+      value = int(word.to_bits() if hasattr(word, 'to_bits') else word)
+      if value != s.prev[addr]:
+        s.prev[addr] = value
+        changed.append(f'{addr}:{word}')
+    return '|'.join(changed)
+
+def is_recording():
+  '''True while a LineTraceRecorder materializes a trace, i.e., only with
+  --trace-ring. Memories then show mem_diff_trace() instead of every
+  word.'''
+  return _recording is not None
+
+def mem_diff_trace(component, words):
+  '''Returns MemDiffTrace output for `words`, relative to the previous
+  trace recorded for `component`. The trackers belong to the recorder,
+  so must only be called when is_recording().'''
+  trackers = _recording.mem_traces
+  if id(component) not in trackers:
+    trackers[id(component)] = (component, MemDiffTrace())
+  return trackers[id(component)][1](words)
+
+#-------------------------------------------------------------------------
+# Cycle filter
+#-------------------------------------------------------------------------
+
+def parse_cycles(spec):
+  '''Parses "10-20,35,100-" into a predicate on the cycle number. An
+  empty spec selects every cycle.'''
+  if not spec:
+    return lambda cycle: True
+  ranges = []
+  for part in spec.split(','):
+    lo, sep, hi = part.strip().partition('-')
+    lo = int(lo) if lo else 0
+    hi = (int(hi) if hi else None) if sep else lo
+    ranges.append((lo, hi))
+  return lambda cycle: any(lo <= cycle and (hi is None or cycle <= hi)
+                           for lo, hi in ranges)
+
+#-------------------------------------------------------------------------
+# Recorder
+#-------------------------------------------------------------------------
+
+class LineTraceRecorder:
+
+  def __init__(s, top, depth = 64, cycles = None, components = None,
+               live = False):
+    s.top = top
+    s.buffer = deque(maxlen = depth)
+    s.select_cycle = cycles if callable(cycles) else parse_cycles(cycles)
+    s.component_names = list(components or [])
+    s.components = None
+    s.live = live
+    # MemDiffTrace of each traced memory, keyed by the id of the memory.
+    s.mem_traces = {}
+
+  def _materialize(s):
+    if not s.component_names:
+      return s.top.line_trace()
+    if s.components is None:
+      # Resolved lazily, as import passes may replace subcomponents.
+      s.components = [(name, eval(f'top.{name}', {'top': s.top}))
+                      for name in s.component_names]
+    return ' || '.join(f'{name}: {m.line_trace()}'
+                       for name, m in s.components)
+
+  def record(s):
+    cycle = s.top._sim.simulated_cycles
+    if not s.select_cycle(cycle):
+      return
+    global _recording
+    _recording = s
+    try:
+      trace = f'{cycle:3}: {s._materialize()}'
+    finally:
+      _recording = None
+    s.buffer.append(trace)
+    if s.live:
+      print(trace)
+
+  def dump(s):
+    return '\n'.join(s.buffer)
+
+#-------------------------------------------------------------------------
+# Installation into PrepareSimPass
+#-------------------------------------------------------------------------
+
+_config = None
+_orig_create_sim_tick = None
+
+# Recorders created since the last reset(), i.e., by the current test.
+recorders = []
+
+def _create_sim_tick_with_recorder(self, top):
+  if not hasattr(top, 'line_trace'):
+    return _orig_create_sim_tick(self, top)
+  recorder = LineTraceRecorder(top, **_config)
+  recorders.append(recorder)
+  top.print_line_trace = recorder.record
+  self.print_line_trace = True
+  _orig_create_sim_tick(self, top)
+  # create_sim_reset() runs next and would print the reset cycles.
+  self.print_line_trace = False
+
+def enable(depth = 64, cycles = None, components = None, live = False):
+  global _config, _orig_create_sim_tick
+  _config = dict(depth = depth, cycles = cycles, components = components,
+                 live = live)
+  if _orig_create_sim_tick is None:
+    _orig_create_sim_tick = PrepareSimPass.create_sim_tick
+    PrepareSimPass.create_sim_tick = _create_sim_tick_with_recorder
+
+def disable():
+  global _config, _orig_create_sim_tick
+  if _orig_create_sim_tick is not None:
+    PrepareSimPass.create_sim_tick = _orig_create_sim_tick
+    _orig_create_sim_tick = None
+  _config = None
+
+def is_enabled():
+  return _config is not None
+
+def reset():
+  recorders.clear()
+
+def dump_all():
+  return '\n\n'.join(r.dump() for r in recorders if r.buffer)
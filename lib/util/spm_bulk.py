@@ -0,0 +1,185 @@
+"""
+=========================================================================
+spm_bulk.py
+=========================================================================
+NumPy-backed bulk preload and dump of the banked data SPM.
+
+`preload_spm()` writes a whole tensor (a NumPy array or a `.npy` file,
+which is memory-mapped) into the banks of every DataMemControllerRTL of
+a DUT in one call, and `dump_spm()` reads an address range back into an
+array (or straight into a memory-mapped `.npy` file). Addresses are
+global, so a multi-CGRA DUT sees one flat SPM split across its CGRAs by
+their address_lower/address_upper, and `spm_locations()` maps them onto
+(bank, offset) exactly like the crossbar routing of DataMemControllerRTL,
+following its bank_mapping and, with a ping-pong SPM, the half currently
+seen by the tiles.
+
+Payloads are written as raw bits: negative integers are stored in two's
+complement and floating point arrays are reinterpreted bitwise (e.g.,
+float32 for FpAddRTL/FpMulRTL). Predicates come from a scalar or from an
+array of the same shape.
+
+Only the Python simulation can be accessed this way; call these after
+sim_reset().
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import os
+
+import numpy as np
+
+from .common import BANK_MAPPING_BLOCK, BANK_MAPPING_XOR
+
+# Elements converted per batch, which bounds the memory used when
+# streaming a memory-mapped file.
+CHUNK_SIZE = 1 << 16
+
+#-------------------------------------------------------------------------
+# SPM layout
+#-------------------------------------------------------------------------
+
+def data_mems(dut):
+  '''Returns the DataMemControllerRTLs of `dut`, which can be one itself,
+  a CGRA or a multi-CGRA.'''
+  if hasattr(dut, 'memory_wrapper'):
+    return [dut]
+  if hasattr(dut, 'data_mem'):
+    return [dut.data_mem]
+  if hasattr(dut, 'cgra'):
+    cgras = dut.cgra if isinstance(dut.cgra, list) else [dut.cgra]
+    return [data_mem for cgra in cgras for data_mem in data_mems(cgra)]
+  raise TypeError(f"{type(dut).__name__} has no data SPM")
+
+def address_range(data_mem):
+  '''Returns the [lower, upper] global addresses held by `data_mem`.'''
+  return int(data_mem.address_lower), int(data_mem.address_upper)
+
+def spm_locations(data_mem, addrs):
+  '''Maps the global addresses `addrs` (inside the range of `data_mem`)
+  onto arrays of (bank index, offset inside the bank).'''
+  lower, _ = address_range(data_mem)
+  per_bank_size = len(data_mem.memory_wrapper[0].memory.regs)
+  num_banks = len(data_mem.memory_wrapper)
+  bank_mapping = getattr(data_mem, 'bank_mapping', BANK_MAPPING_BLOCK)
+  local = addrs - lower
+  if hasattr(data_mem, 'tile_addr_flip'):
+    local = local ^ int(data_mem.tile_addr_flip)
+  # Addresses sent to the banks, see DataMemControllerRTL.
+  addrs = local + lower
+  if bank_mapping == BANK_MAPPING_BLOCK:
+    return local // per_bank_size, addrs % per_bank_size
+  banks = local % num_banks
+  if bank_mapping == BANK_MAPPING_XOR:
+    banks = banks ^ ((local // num_banks) % num_banks)
+  return banks, (addrs // num_banks) % per_bank_size
+
+def _spans(dut, addr, size):
+  '''Returns [(data_mem, first, last)] such that elements [first, last)
+  of an array placed at global address `addr` live in data_mem.'''
+  spans = []
+  for data_mem in data_mems(dut):
+    lower, upper = address_range(data_mem)
+    first = max(lower - addr, 0)
+    last = min(upper - addr + 1, size)
+    if first < last:
+      spans.append((data_mem, first, last))
+  if sum(last - first for _, first, last in spans) != size:
+    raise ValueError(f"[{addr}, {addr + size - 1}] is not fully inside the "
+                     f"SPM of {type(dut).__name__}")
+  return spans
+
+def _payload_nbits(data_mem):
+  return data_mem.memory_wrapper[0].memory.regs[0].payload.nbits
+
+#-------------------------------------------------------------------------
+# Arrays
+#-------------------------------------------------------------------------
+
+def _as_array(values):
+  if isinstance(values, (str, os.PathLike)):
+    values = np.load(values, mmap_mode = 'r')
+  return np.asarray(values).reshape(-1)
+
+def _to_raw(values, nbits):
+  '''Converts a chunk of values into Python ints of `nbits` raw bits.'''
+  if values.dtype.kind == 'f':
+    assert values.dtype.itemsize * 8 <= nbits, \
+        f"{values.dtype} does not fit into {nbits}-bit SPM words"
+    values = values.view(f'u{values.dtype.itemsize}')
+  mask = (1 << nbits) - 1
+  if nbits < 64:
+    return (values.astype(np.int64) & mask).tolist()
+  # Python ints don't overflow for wide payloads.
+  return [int(v) & mask for v in values.tolist()]
+
+def _poke(field, value):
+  # Sets both the current and the next value, see backdoor_config.py.
+  field @= value
+  field <<= value
+
+#-------------------------------------------------------------------------
+# Preload / dump
+#-------------------------------------------------------------------------
+
+def preload_spm(dut, values, addr = 0, predicate = 1):
+  '''Writes `values` (an array of any shape, flattened in C order, or the
+  path of a `.npy` file) into the SPM of `dut` starting at global
+  address `addr`. `predicate` is a scalar or an array of `values`'s
+  shape. Returns the number of words written.'''
+  values = _as_array(values)
+  predicates = np.asarray(predicate)
+  predicates = np.broadcast_to(predicates.reshape(-1) if predicates.ndim
+                               else predicates, values.shape)
+  for data_mem, first, last in _spans(dut, addr, len(values)):
+    nbits = _payload_nbits(data_mem)
+    banks = [wrapper.memory.regs for wrapper in data_mem.memory_wrapper]
+    for start in range(first, last, CHUNK_SIZE):
+      stop = min(start + CHUNK_SIZE, last)
+      bank_ids, offsets = spm_locations(data_mem, np.arange(addr + start, addr + stop))
+      payloads = _to_raw(values[start:stop], nbits)
+      preds = (np.asarray(predicates[start:stop]) != 0).astype(np.int64).tolist()
+      for bank, offset, payload, pred in zip(bank_ids.tolist(), offsets.tolist(),
+                                             payloads, preds):
+        word = banks[bank][offset]
+        _poke(word.payload, payload)
+        _poke(word.predicate, pred)
+        _poke(word.bypass, 0)
+        _poke(word.delay, 0)
+  return len(values)
+
+def dump_spm(dut, addr = 0, size = None, out = None, signed = False,
+             with_predicate = False):
+  '''Reads `size` words (by default up to the end of the SPM) starting at
+  global address `addr`. The payloads are returned as an int64 (signed)
+  or uint64 array, which is a memory-mapped `.npy` file if `out` is a
+  path. With `with_predicate`, returns (payloads, predicates).'''
+  if size is None:
+    size = max(address_range(data_mem)[1] for data_mem in data_mems(dut)) + 1 - addr
+  spans = _spans(dut, addr, size)
+  dtype = np.int64 if signed else np.uint64
+  if out is None:
+    payloads = np.zeros(size, dtype = dtype)
+  else:
+    payloads = np.lib.format.open_memmap(out, mode = 'w+', dtype = dtype,
+                                         shape = (size,))
+  predicates = np.zeros(size, dtype = np.uint8)
+  for data_mem, first, last in spans:
+    nbits = _payload_nbits(data_mem)
+    assert nbits <= 64, f"{nbits}-bit payloads do not fit into {dtype.__name__}"
+    banks = [wrapper.memory.regs for wrapper in data_mem.memory_wrapper]
+    for start in range(first, last, CHUNK_SIZE):
+      stop = min(start + CHUNK_SIZE, last)
+      bank_ids, offsets = spm_locations(data_mem, np.arange(addr + start, addr + stop))
+      words = [banks[bank][offset]
+               for bank, offset in zip(bank_ids.tolist(), offsets.tolist())]
+      raw = np.array([int(word.payload) for word in words], dtype = np.uint64)
+      if signed and nbits < 64:
+        # Sign-extends the two's complement payloads.
+        raw = (raw.astype(np.int64) ^ (1 << (nbits - 1))) - (1 << (nbits - 1))
+      payloads[start:stop] = raw.astype(dtype)
+      predicates[start:stop] = [int(word.predicate) for word in words]
+  if out is not None:
+    payloads.flush()
+  return (payloads, predicates) if with_predicate else payloads
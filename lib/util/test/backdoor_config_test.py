@@ -0,0 +1,142 @@
+"""
+==========================================================================
+backdoor_config_test.py
+==========================================================================
+Test cases for the packet splitting and register poking of the backdoor
+configuration. The end-to-end parity with the packet path is checked by
+test_systolic_3x3_backdoor_config in cgra/test/CgraRTL_test.py.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+
+from ..backdoor_config import (cgra_tile_key, split_backdoor_pkts,
+                               tile_config_state, write_tile_config)
+from ...cmd_type import *
+from ...messages import *
+
+#-------------------------------------------------------------------------
+# Types
+#-------------------------------------------------------------------------
+
+num_tiles = 4
+ctrl_mem_size = 4
+DataType = mk_data(32, 1)
+CtrlType = mk_ctrl(4, 2, 4, 4, 16)
+CgraPayloadType = mk_cgra_payload(DataType, mk_bits(7), CtrlType,
+                                  mk_bits(clog2(ctrl_mem_size)))
+PktType = mk_intra_cgra_pkt(2, 1, num_tiles, CgraPayloadType)
+
+def pkt(dst, cmd, data = 0, ctrl_addr = 0, ctrl = None, dst_cgra_id = 0):
+  return PktType(0, dst, 0, dst_cgra_id, 0, 0, 0, 0, 0, 0,
+                 CgraPayloadType(cmd, data = DataType(data, 1),
+                                 ctrl = ctrl or CtrlType(),
+                                 ctrl_addr = ctrl_addr))
+
+#-------------------------------------------------------------------------
+# Tile with the registers written by the backdoor
+#-------------------------------------------------------------------------
+
+class RegisterFile(Component):
+
+  def construct(s, Type, nregs):
+    s.regs = [Wire(Type) for _ in range(nregs)]
+
+class CtrlMem(Component):
+
+  def construct(s):
+    s.reg_file = RegisterFile(CtrlType, ctrl_mem_size)
+    s.total_ctrl_steps_val = Wire(16)
+    s.ctrl_count_per_iter_val = Wire(8)
+    s.prologue_count_reg_fu = [Wire(3) for _ in range(ctrl_mem_size)]
+    s.prologue_count_reg_fu_crossbar = [[Wire(3) for _ in range(2)]
+                                        for _ in range(ctrl_mem_size)]
+    s.prologue_count_reg_routing_crossbar = [[Wire(3) for _ in range(8)]
+                                             for _ in range(ctrl_mem_size)]
+
+    @update_ff
+    def ff_ctrl_mem():
+      if s.reset:
+        s.total_ctrl_steps_val <<= 0
+        s.ctrl_count_per_iter_val <<= 0
+        for addr in range(ctrl_mem_size):
+          s.prologue_count_reg_fu[addr] <<= 0
+          for i in range(8):
+            s.prologue_count_reg_routing_crossbar[addr][i] <<= 0
+
+class ConstQueue(Component):
+
+  def construct(s):
+    s.reg_file = RegisterFile(DataType, 2)
+    s.wr_cur = Wire(2)
+
+    @update_ff
+    def ff_const_queue():
+      if s.reset:
+        s.wr_cur <<= 0
+
+class Tile(Component):
+
+  def construct(s):
+    s.ctrl_mem = CtrlMem()
+    s.const_mem = ConstQueue()
+
+#-------------------------------------------------------------------------
+# Test cases
+#-------------------------------------------------------------------------
+
+def test_split_stops_at_first_other_cmd():
+  pkts = [pkt(0, CMD_CONST, 7),
+          pkt(1, CMD_CONFIG_COUNT_PER_ITER, 1),
+          pkt(0, CMD_STORE_REQUEST, 3),
+          pkt(0, CMD_CONFIG, ctrl_addr = 1),
+          pkt(0, CMD_LAUNCH),
+          pkt(1, CMD_LAUNCH),
+          pkt(0, CMD_CONFIG, ctrl_addr = 2),
+          pkt(num_tiles, CMD_CONST, 5)]
+  hoisted, remaining = split_backdoor_pkts(pkts, range(num_tiles))
+  assert [int(p.cmd) for p in hoisted[0]] == [CMD_CONST, CMD_CONFIG]
+  assert [int(p.cmd) for p in hoisted[1]] == [CMD_CONFIG_COUNT_PER_ITER]
+  # Data memory requests don't end the configuration of a tile, anything
+  # else (and everything after it) keeps going through the packet path.
+  assert remaining == [pkts[2], pkts[4], pkts[5], pkts[6], pkts[7]]
+
+def test_split_by_cgra():
+  pkts = [pkt(0, CMD_CONST, 1, dst_cgra_id = 1),
+          pkt(0, CMD_CONST, 2, dst_cgra_id = 0)]
+  hoisted, remaining = split_backdoor_pkts(pkts, {(1, 0)}, cgra_tile_key)
+  assert list(hoisted) == [(1, 0)]
+  assert remaining == [pkts[1]]
+
+def test_write_tile_config_survives_ticks():
+  tile = Tile()
+  tile.apply(DefaultPassGroup())
+  tile.sim_reset()
+
+  ctrl = CtrlType(5)
+  routing = [0] * 8
+  routing[0] = 3
+  write_tile_config(tile, [p.payload for p in [
+      pkt(0, CMD_CONST, 11),
+      pkt(0, CMD_CONST, 12),
+      pkt(0, CMD_CONFIG, ctrl_addr = 2, ctrl = ctrl),
+      pkt(0, CMD_CONFIG_TOTAL_CTRL_COUNT, 9),
+      pkt(0, CMD_CONFIG_COUNT_PER_ITER, 2),
+      pkt(0, CMD_CONFIG_PROLOGUE_FU, 1, ctrl_addr = 3),
+      pkt(0, CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR, 2, ctrl_addr = 1,
+          ctrl = CtrlType(0, [0] * 4, routing, [0] * 8)),
+  ]])
+  # The next value is written too, so the registers keep the state.
+  tile.sim_tick()
+  tile.sim_tick()
+
+  state = tile_config_state(tile)
+  assert state['const'] == [int(DataType(11, 1).to_bits()), int(DataType(12, 1).to_bits())]
+  assert state['const_count'] == 2
+  assert state['ctrl'][2] == int(ctrl.to_bits())
+  assert state['total_ctrl_steps'] == 9
+  assert state['ctrl_count_per_iter'] == 2
+  assert state['prologue_fu'] == [0, 0, 0, 1]
+  assert state['prologue_routing_xbar'][1] == [0, 0, 2, 0, 0, 0, 0, 0]
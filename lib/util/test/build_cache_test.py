@@ -0,0 +1,157 @@
+"""
+==========================================================================
+build_cache_test.py
+==========================================================================
+Test cases for the content-addressed build cache.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import os
+
+from pymtl3 import *
+from pymtl3.passes.backends.verilog import VerilogTranslationPass
+
+from .. import build_cache
+from ..build_cache import (BUILD_CACHE_ENV, MANIFEST_FILE,
+                           CachedVerilogTranslationPass, _entry_path,
+                           config_model_with_build_cache,
+                           stable_param_hash, translate_with_build_cache)
+from ...messages import *
+
+#-------------------------------------------------------------------------
+# Helpers
+#-------------------------------------------------------------------------
+
+class Incr(Component):
+
+  def construct(s, DataType):
+    s.in_ = InPort(DataType)
+    s.out = OutPort(DataType)
+
+    @update
+    def comb():
+      s.out @= s.in_ + 1
+
+class TestHarness(Component):
+
+  def construct(s, DataType):
+    s.dut = Incr(DataType = DataType)
+
+def mk_payload_type(data_nbits):
+  DataType = mk_data(data_nbits, 1)
+  CtrlType = mk_ctrl(4, 2, 4, 4, 16)
+  return mk_cgra_payload(DataType, mk_bits(7), CtrlType, mk_bits(3))
+
+def translate(top):
+  top.dut.set_metadata(VerilogTranslationPass.enable, True)
+  top.apply(VerilogTranslationPass())
+
+#-------------------------------------------------------------------------
+# Tests
+#-------------------------------------------------------------------------
+
+def test_hash_is_stable_and_sensitive():
+  # Separately created but identical types map to the same key.
+  params = (mk_payload_type(32), 2, 2, {0: [0, 31], 1: [32, 63]}, [Incr])
+  same = (mk_payload_type(32), 2, 2, {1: [32, 63], 0: [0, 31]}, [Incr])
+  assert stable_param_hash('CgraRTL', params) == \
+         stable_param_hash('CgraRTL', same)
+  # Any parameter change leads to a different key.
+  for other in [(mk_payload_type(64), 2, 2, {0: [0, 31], 1: [32, 63]}, [Incr]),
+                (mk_payload_type(32), 2, 4, {0: [0, 31], 1: [32, 63]}, [Incr]),
+                (mk_payload_type(32), 2, 2, {0: [0, 15], 1: [16, 63]}, [Incr]),
+                (mk_payload_type(32), 2, 2, {0: [0, 31], 1: [32, 63]}, [])]:
+    assert stable_param_hash('CgraRTL', params) != \
+           stable_param_hash('CgraRTL', other)
+  assert stable_param_hash('CgraRTL', params) != \
+         stable_param_hash('CgraTemplateRTL', params)
+
+def test_translation_reused_on_warm_run(tmp_path, monkeypatch):
+  monkeypatch.setenv(BUILD_CACHE_ENV, str(tmp_path / 'cache'))
+  monkeypatch.chdir(tmp_path)
+
+  calls = []
+  def counting_translate(top):
+    calls.append(top)
+    translate(top)
+
+  for expect_hit in [False, True]:
+    th = TestHarness(Bits8)
+    th.elaborate()
+    assert translate_with_build_cache(th, 'dut', counting_translate) == expect_hit
+  assert len(calls) == 1
+
+  verilog = [f for f in os.listdir(tmp_path) if f.endswith('.v')]
+  assert len(verilog) == 1
+  assert 'Incr' in open(tmp_path / verilog[0]).read()
+
+  # A different parameter set gets its own entry.
+  th = TestHarness(Bits16)
+  th.elaborate()
+  assert not translate_with_build_cache(th, 'dut', counting_translate)
+  entries = os.listdir(tmp_path / 'cache')
+  assert len(entries) == 2
+  for entry in entries:
+    assert os.path.exists(tmp_path / 'cache' / entry / MANIFEST_FILE)
+
+def test_key_follows_dut_args_and_set_param():
+  def key(data_type, **overrides):
+    th = TestHarness(data_type)
+    if overrides:
+      th.set_param("top.dut.construct", **overrides)
+    th.elaborate()
+    return _entry_path(th.dut)[2]
+
+  assert key(Bits8) == key(Bits8)
+  assert key(Bits8) != key(Bits16)
+  # Overrides given with set_param() are part of the key.
+  assert key(Bits8) != key(Bits8, DataType = Bits16)
+  assert key(Bits8, DataType = Bits16) == key(Bits8, DataType = Bits16)
+
+def test_cached_source_is_not_translated_again(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  th = TestHarness(Bits8)
+  th.elaborate()
+  th.dut.set_metadata(VerilogTranslationPass.enable, True)
+  th.dut.set_metadata(CachedVerilogTranslationPass.cached_source,
+                      ('Incr__pickled.v', 'Incr_noparam'))
+  th.apply(CachedVerilogTranslationPass())
+  assert os.listdir(tmp_path) == []
+  assert th.dut.get_metadata(VerilogTranslationPass.is_same)
+  assert th.dut.get_metadata(VerilogTranslationPass.translated_filename) == \
+         'Incr__pickled.v'
+  assert th.dut.get_metadata(VerilogTranslationPass.translated_top_module) == \
+         'Incr_noparam'
+
+  # Without it, the component is translated as usual.
+  th = TestHarness(Bits8)
+  th.elaborate()
+  th.dut.set_metadata(VerilogTranslationPass.enable, True)
+  th.apply(CachedVerilogTranslationPass())
+  assert [f for f in os.listdir(tmp_path) if f.endswith('.v')]
+
+def test_simulated_verilog_copied_to_cwd(tmp_path, monkeypatch):
+  monkeypatch.setenv(BUILD_CACHE_ENV, str(tmp_path / 'cache'))
+  monkeypatch.chdir(tmp_path)
+  # Translation only: building with Verilator is not what is checked here.
+  def translation_import_pass():
+    def apply(top):
+      top.dut.set_metadata(VerilogTranslationPass.enable, True)
+      top.apply(CachedVerilogTranslationPass())
+      return top
+    return apply
+  monkeypatch.setattr(build_cache, 'CachedVerilogTranslationImportPass',
+                      translation_import_pass)
+
+  # On a miss and on a hit alike, e.g., for the synthesis flow.
+  for _ in range(2):
+    for f in os.listdir(tmp_path):
+      if f.endswith('.v'):
+        os.remove(tmp_path / f)
+    th = TestHarness(Bits8)
+    config_model_with_build_cache(th, {'test_verilog': 'zeros'}, ['dut'])
+    verilog = [f for f in os.listdir(tmp_path) if f.endswith('.v')]
+    assert len(verilog) == 1
+    assert 'Incr' in open(tmp_path / verilog[0]).read()
@@ -0,0 +1,131 @@
+"""
+==========================================================================
+line_trace_test.py
+==========================================================================
+Test cases for memory diff traces and the ring-buffer line tracer.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+
+from .. import line_trace
+from ..line_trace import MemDiffTrace, parse_cycles
+
+#-------------------------------------------------------------------------
+# Helpers
+#-------------------------------------------------------------------------
+
+class Counter(Component):
+
+  def construct(s):
+    s.count = OutPort(8)
+
+    @update_ff
+    def ff_count():
+      if s.reset:
+        s.count <<= 0
+      else:
+        s.count <<= s.count + 1
+
+  def line_trace(s):
+    return f'count:{s.count}'
+
+class Memory(Component):
+
+  def construct(s):
+    s.words = [Bits8(0) for _ in range(4)]
+
+    @update_once
+    def write():
+      if ~s.reset:
+        s.words[1] = s.words[1] + Bits8(1)
+
+  def line_trace(s):
+    if line_trace.is_recording():
+      return line_trace.mem_diff_trace(s, s.words)
+    return '|'.join([str(word) for word in s.words])
+
+class TestHarness(Component):
+
+  def construct(s):
+    s.counter0 = Counter()
+    s.counter1 = Counter()
+
+  def line_trace(s):
+    return f'{s.counter0.line_trace()} {s.counter1.line_trace()}'
+
+def run(ncycles, top = TestHarness):
+  th = top()
+  th.elaborate()
+  th.apply(DefaultPassGroup(linetrace = True))
+  th.sim_reset()
+  for _ in range(ncycles):
+    th.sim_tick()
+  return th
+
+#-------------------------------------------------------------------------
+# Tests
+#-------------------------------------------------------------------------
+
+def test_mem_diff_trace():
+  trace = MemDiffTrace()
+  mem = [Bits8(0), Bits8(3), Bits8(0)]
+  assert trace(mem) == '1:03'
+  assert trace(mem) == ''
+  mem[2] = Bits8(5)
+  mem[1] = Bits8(4)
+  assert trace(mem) == '1:04|2:05'
+
+def test_parse_cycles():
+  select = parse_cycles('2-4,7,10-')
+  assert [c for c in range(13) if select(c)] == [2, 3, 4, 7, 10, 11, 12]
+  assert parse_cycles('')(123)
+
+def test_ring_buffer_keeps_last_cycles(capsys):
+  was_enabled = line_trace.is_enabled()
+  line_trace.enable(depth = 4)
+  try:
+    line_trace.reset()
+    run(10)
+    # Nothing is printed per cycle, only kept.
+    assert 'count:' not in capsys.readouterr().out
+    assert len(line_trace.recorders) == 1
+    buffered = list(line_trace.recorders[0].buffer)
+    assert len(buffered) == 4
+    # The trace is taken before the last clock edge of the run.
+    assert buffered[-1].endswith('count:09 count:09')
+
+    # Only the selected cycles and components are materialized.
+    line_trace.enable(depth = 16, cycles = '5-6', components = ['counter1'])
+    line_trace.reset()
+    run(10)
+    buffered = list(line_trace.recorders[0].buffer)
+    assert len(buffered) == 2
+    assert all('counter1: count:' in trace and 'counter0' not in trace
+               for trace in buffered)
+    assert 'counter1' in line_trace.dump_all()
+  finally:
+    line_trace.disable()
+    line_trace.reset()
+    assert not line_trace.is_enabled() or was_enabled
+
+def test_mem_diff_trace_only_when_recording():
+  # The default line trace shows every word and keeps no state.
+  mem = run(3, Memory)
+  assert mem.line_trace() == '00|04|00|00'
+  assert mem.line_trace() == '00|04|00|00'
+
+  was_enabled = line_trace.is_enabled()
+  line_trace.enable(depth = 4)
+  try:
+    line_trace.reset()
+    mem = run(3, Memory)
+    assert [trace.split(': ')[1] for trace in line_trace.recorders[0].buffer] == \
+           ['1:01', '1:02', '1:03']
+    assert mem.line_trace() == '00|04|00|00'
+  finally:
+    line_trace.disable()
+    line_trace.reset()
+    assert not line_trace.is_enabled() or was_enabled
@@ -0,0 +1,122 @@
+"""
+==========================================================================
+spm_bulk_test.py
+==========================================================================
+Test cases for the NumPy-backed bulk preload and dump of the data SPM.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pymtl3 import *
+
+from ..common import BANK_MAPPING_BLOCK, BANK_MAPPING_INTERLEAVE, BANK_MAPPING_XOR
+from ..spm_bulk import dump_spm, preload_spm, spm_locations
+from ...messages import *
+
+#-------------------------------------------------------------------------
+# SPM with the bank layout of DataMemControllerRTL
+#-------------------------------------------------------------------------
+
+DataType = mk_data(16, 1)
+per_bank_size = 4
+num_banks = 2
+
+class Memory(Component):
+
+  def construct(s):
+    s.regs = [Wire(DataType) for _ in range(per_bank_size)]
+
+class MemoryWrapper(Component):
+
+  def construct(s):
+    s.memory = Memory()
+
+class DataMem(Component):
+
+  def construct(s, bank_mapping = BANK_MAPPING_BLOCK):
+    s.bank_mapping = bank_mapping
+    s.memory_wrapper = [MemoryWrapper() for _ in range(num_banks)]
+    s.address_lower = InPort(8)
+    s.address_upper = InPort(8)
+
+class Cgra(Component):
+
+  def construct(s, lower, bank_mapping = BANK_MAPPING_BLOCK):
+    s.data_mem = DataMem(bank_mapping)
+    s.data_mem.address_lower //= lower
+    s.data_mem.address_upper //= lower + per_bank_size * num_banks - 1
+
+class MultiCgra(Component):
+
+  def construct(s, bank_mapping = BANK_MAPPING_BLOCK):
+    s.cgra = [Cgra(cgra_id * per_bank_size * num_banks, bank_mapping)
+              for cgra_id in range(2)]
+
+def mk_dut(bank_mapping = BANK_MAPPING_BLOCK):
+  dut = MultiCgra(bank_mapping)
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+  return dut
+
+#-------------------------------------------------------------------------
+# Test cases
+#-------------------------------------------------------------------------
+
+def test_layout_matches_crossbar_routing():
+  dut = mk_dut()
+  banks, offsets = spm_locations(dut.cgra[1].data_mem, np.arange(8, 16))
+  assert banks.tolist() == [0, 0, 0, 0, 1, 1, 1, 1]
+  assert offsets.tolist() == [0, 1, 2, 3, 0, 1, 2, 3]
+
+def test_layout_interleaved_and_xor_banks():
+  dut = mk_dut(BANK_MAPPING_INTERLEAVE)
+  banks, offsets = spm_locations(dut.cgra[1].data_mem, np.arange(8, 16))
+  assert banks.tolist() == [0, 1, 0, 1, 0, 1, 0, 1]
+  assert offsets.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+
+  dut = mk_dut(BANK_MAPPING_XOR)
+  banks, offsets = spm_locations(dut.cgra[1].data_mem, np.arange(8, 16))
+  assert banks.tolist() == [0, 1, 1, 0, 0, 1, 1, 0]
+  assert offsets.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+  values = np.arange(8, dtype = np.int32)
+  preload_spm(dut, values, addr = 8)
+  assert dump_spm(dut, addr = 8, size = 8).tolist() == values.tolist()
+
+def test_preload_dump_across_cgras():
+  dut = mk_dut()
+  values = np.arange(12, dtype = np.int32).reshape(3, 4) - 4
+  predicates = np.ones(12, dtype = bool)
+  predicates[5] = False
+  assert preload_spm(dut, values, addr = 2, predicate = predicates) == 12
+  dut.sim_tick()
+
+  # Address 9 is the second word of the first bank of CGRA 1.
+  word = dut.cgra[1].data_mem.memory_wrapper[0].memory.regs[1]
+  assert int(word.payload) == 3 and int(word.predicate) == 1
+
+  payloads, preds = dump_spm(dut, addr = 2, size = 12, signed = True,
+                             with_predicate = True)
+  assert payloads.tolist() == values.reshape(-1).tolist()
+  assert preds.tolist() == predicates.astype(int).tolist()
+  assert dump_spm(dut)[2] == 2 ** 16 - 4
+
+def test_float_and_npy_file(tmp_path):
+  dut = mk_dut()
+  values = np.array([1.5, -2.0], dtype = np.float16)
+  np.save(tmp_path / 'in.npy', values)
+  preload_spm(dut, str(tmp_path / 'in.npy'), addr = 14)
+  out = dump_spm(dut, addr = 14, size = 2, out = str(tmp_path / 'out.npy'))
+  assert np.load(tmp_path / 'out.npy').astype(np.uint16).view(np.float16).tolist() == [1.5, -2.0]
+  assert out.tolist() == values.view(np.uint16).tolist()
+
+def test_out_of_range():
+  dut = mk_dut()
+  with pytest.raises(ValueError):
+    preload_spm(dut, np.zeros(4, dtype = np.int32) + 1, addr = 14)
+  # Nothing is written when the range does not fit.
+  assert not dump_spm(dut).any()
@@ -0,0 +1,124 @@
+"""
+=========================================================================
+upblk_profiler.py
+=========================================================================
+Opt-in per-update-block profiler for PyMTL3 simulations. Once enabled,
+every simulator built by DefaultPassGroup (e.g., in run_sim) gets each
+@update/@update_ff block in its schedule wrapped by a timer, and call
+counts plus wall time are accumulated per (component class, block name).
+
+Enabled from pytest with `--profile-upblks`, see conftest.py; the hot
+spot table of each test is printed in the terminal summary.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+import sys
+import time
+
+from pymtl3.passes.sim.PrepareSimPass import PrepareSimPass
+
+# Label used for scheduler-generated functions that are not update blocks
+# (signal double buffering, clock/reset propagation, SCC super blocks).
+SIM_INTERNAL = '<sim>'
+
+_enabled = False
+_orig_prepare_sim = None
+
+# (component class name, block name) -> [number of calls, seconds]
+_stats = {}
+
+#-------------------------------------------------------------------------
+# Instrumentation
+#-------------------------------------------------------------------------
+
+def _label(top, blk):
+  try:
+    host = top.get_update_block_host_component(blk)
+    return type(host).__name__, blk.__name__
+  except KeyError:
+    return SIM_INTERNAL, getattr(blk, '__name__', repr(blk))
+
+def _wrap(blk, key):
+  entry = _stats.setdefault(key, [0, 0.0])
+  perf_counter = time.perf_counter
+
+  def profiled():
+    start = perf_counter()
+    blk()
+    entry[1] += perf_counter() - start
+    entry[0] += 1
+
+  profiled.__name__ = getattr(blk, '__name__', 'profiled')
+  profiled._profiled_blk = blk
+  return profiled
+
+def instrument(top):
+  '''Wraps all scheduled blocks of `top` in place. Must run after the
+  scheduling passes and before PrepareSimPass generates the tick.'''
+  for name in ['update_schedule', 'schedule_ff', 'schedule_posedge_flip']:
+    schedule = getattr(top._sched, name, None)
+    if schedule is None:
+      continue
+    for i, blk in enumerate(schedule):
+      if not hasattr(blk, '_profiled_blk'):
+        schedule[i] = _wrap(blk, _label(top, blk))
+
+def _prepare_sim_with_profiling(self, top):
+  instrument(top)
+  return _orig_prepare_sim(self, top)
+
+def enable():
+  global _enabled, _orig_prepare_sim
+  if not _enabled:
+    _orig_prepare_sim = PrepareSimPass.__call__
+    PrepareSimPass.__call__ = _prepare_sim_with_profiling
+    _enabled = True
+
+def disable():
+  global _enabled
+  if _enabled:
+    PrepareSimPass.__call__ = _orig_prepare_sim
+    _enabled = False
+
+def is_enabled():
+  return _enabled
+
+#-------------------------------------------------------------------------
+# Reporting
+#-------------------------------------------------------------------------
+
+def reset():
+  # Entries are captured by the wrappers, so clear them in place.
+  for entry in _stats.values():
+    entry[0] = 0
+    entry[1] = 0.0
+
+def hot_spots():
+  '''Returns [(component class, block name, calls, seconds)] sorted by
+  total time, hottest first.'''
+  rows = [(cls, blk, calls, secs)
+          for (cls, blk), (calls, secs) in _stats.items() if calls]
+  return sorted(rows, key = lambda row: row[3], reverse = True)
+
+def format_table(limit = 30):
+  rows = hot_spots()
+  total = sum(row[3] for row in rows)
+  if not rows:
+    return 'No update blocks were executed.'
+  lines = [f"{'component':<32} {'block':<40} {'calls':>10} "
+           f"{'time (s)':>10} {'us/call':>9} {'%':>6}"]
+  lines.append('-' * len(lines[0]))
+  for cls, blk, calls, secs in rows[:limit]:
+    lines.append(f"{cls[:32]:<32} {blk[:40]:<40} {calls:>10} {secs:>10.4f} "
+                 f"{secs / calls * 1e6:>9.2f} {100 * secs / total:>6.2f}")
+  if len(rows) > limit:
+    rest = sum(row[3] for row in rows[limit:])
+    lines.append(f"{f'... {len(rows) - limit} more blocks':<73} "
+                 f"{'':>10} {rest:>10.4f} {'':>9} {100 * rest / total:>6.2f}")
+  lines.append(f"{'total':<84} {total:>10.4f}")
+  return '\n'.join(lines)
+
+def report(file = sys.stdout, limit = 30):
+  print(format_table(limit), file = file)
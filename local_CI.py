@@ -4,74 +4,271 @@ Usage:
 ```shell
 cd /path/to/VectorCGRA/
 mkdir -p build && cd build
-python3 local_CI.py
+python3 ../local_CI.py [-j JOBS]
 ```
-The log will be saved to the `local_CI.log` file.
+Each CI command below is expanded into its individual test items, which
+are grouped into shards and run by a pool of worker processes, one pytest
+per shard. Items are sharded by test file until every one of them has a
+wall time recorded by a previous run; from then on they are packed into
+balanced chunks, one per worker. Shards are scheduled longest-first, so
+the total run time approaches that of the slowest shard rather than the
+sum of all of them.
+
+Every worker runs its items inside its own scratch directory under
+`local_CI_workers/`, so concurrent Verilator builds never share an
+`obj_dir`. Generated Verilog is copied back into the build directory
+afterwards (later CI steps expect it there). Tests that go through
+`lib/util/build_cache.py` additionally share one locked, content-addressed
+build cache in `build_cache/`.
+
+The log will be saved to the `local_CI.log` file, and per-test timings to
+`local_CI_timing.json` (which also drives the scheduling of the next run).
 """
-import subprocess
+import argparse
+import json
 import os
+import queue
+import re
+import shutil
+import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+COMMANDS = [
+    ["pytest", "..", "-v", "--tb=short"],
+    ["pytest", "../mem/ctrl/test/CtrlMemDynamicRTL_test.py", "-xvs"],
+    ["pytest", "../tile/test/TileRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../controller/test/ControllerRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../cgra/test/CgraTemplateRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../cgra/test/CgraRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../noc/PyOCN/pymtl3_net/ringnet/test/RingNetworkRTL_test.py"],
+    ["pytest", "../multi_cgra/test/RingMultiCgraRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_verilog_homo_2x2_4x4", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../mem/const/test/ConstQueueDynamicRTL_test.py", "-xvs"],
+    ["pytest", "../mem/data/test/DataMemControllerRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../multi_cgra/test/MeshMultiCgraTemplateRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_multi_CGRA_fir_scalar_translation", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_multi_CGRA_fir_vector_global_reduce_translation", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
+    ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_multi_CGRA_systolic_2x2_2x2_translation", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"]
+]
+
+LOG_FILE = "local_CI.log"
+TIMING_FILE = "local_CI_timing.json"
+WORKER_DIR = "local_CI_workers"
+BUILD_CACHE_DIR = "build_cache"
+
+
+class Job:
+    """A single pytest invocation: a shard of collected test items of one
+    CI command (or the whole target if it could not be collected),
+    together with the command's flags."""
+
+    def __init__(self, targets, flags, nodeids=()):
+        self.targets = targets
+        self.flags = flags
+        # Rootdir-relative node ids of the items, for per-item timing.
+        self.nodeids = list(nodeids)
+        self.key = " ".join(targets[:1] + flags)
+        if len(targets) > 1:
+            self.key = f"{self.key} (+{len(targets) - 1} more)"
+
+    def cmd(self):
+        return ([sys.executable, "-m", "pytest"] + self.targets + self.flags +
+                ["--durations=0", "--durations-min=0"])
+
+
+def item_key(nodeid, flags):
+    return " ".join([nodeid] + flags)
+
+
+def split_command(cmd, build_dir):
+    """Splits a CI command into an absolute target path and its flags."""
+    target = cmd[1]
+    path, sep, node = target.partition("::")
+    target = os.path.abspath(os.path.join(build_dir, path)) + sep + node
+    return target, cmd[2:]
+
+
+def collect_items(cmd, build_dir):
+    """Returns the target, flags and collected node ids of a CI command."""
+    target, flags = split_command(cmd, build_dir)
+    # Collection happens in the build directory so that it honours the
+    # same options (e.g., --ignore from pytest.ini) as the serial run.
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", target, "--collect-only", "-q"],
+        cwd=build_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True)
+    nodeids = [line.strip() for line in result.stdout.splitlines()
+               if "::" in line and not line.startswith(("ERROR", "FAILED"))]
+    return target, flags, nodeids
+
+
+def shard_items(nodeids, flags, timing, shards_count):
+    """Groups the node ids of one CI command into shards. Once every item
+    has a recorded wall time, they are packed longest-first into up to
+    `shards_count` balanced chunks; otherwise there is one shard per test
+    file."""
+    keys = [item_key(nodeid, flags) for nodeid in nodeids]
+    if not all(key in timing for key in keys):
+        by_file = {}
+        for nodeid in nodeids:
+            by_file.setdefault(nodeid.partition("::")[0], []).append(nodeid)
+        return list(by_file.values())
+    cost = {nodeid: timing[key]["wall_time"] for nodeid, key in zip(nodeids, keys)}
+    shards = [[] for _ in range(min(shards_count, len(nodeids)))]
+    loads = [0.0] * len(shards)
+    for nodeid in sorted(nodeids, key=cost.get, reverse=True):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(nodeid)
+        loads[lightest] += cost[nodeid]
+    # Keeps the collection order inside a shard, as in the serial run.
+    order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+    return [sorted(shard, key=order.get) for shard in shards]
+
+
+def collect_jobs(cmd, build_dir, timing, shards_count):
+    """Expands a CI command into shards of its collected test items."""
+    target, flags, nodeids = collect_items(cmd, build_dir)
+    if not nodeids:
+        # Nothing collectable (e.g., import errors); run the whole target
+        # so that the failure still shows up in the log.
+        return [Job([target], flags)]
+    # Node ids are reported relative to the rootdir, i.e., where pytest.ini is.
+    rootdir = os.path.dirname(os.path.abspath(__file__))
+    return [Job([os.path.join(rootdir, nodeid) for nodeid in shard], flags, shard)
+            for shard in shard_items(nodeids, flags, timing, shards_count)]
+
+
+def load_timing(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def estimate(job, timing):
+    """Historical wall time of a shard. Items never timed before are
+    assumed to be as expensive as the slowest known one, so that new
+    (possibly long) tests are not left for the end of the run."""
+    known = [entry["wall_time"] for entry in timing.values()]
+    default = max(known) if known else 0.0
+    if not job.nodeids:
+        return default
+    return sum(timing.get(item_key(nodeid, job.flags), {}).get("wall_time", default)
+               for nodeid in job.nodeids)
+
+
+def order_jobs(jobs, timing):
+    """Longest-first by historical wall time."""
+    return sorted(jobs, key=lambda job: estimate(job, timing), reverse=True)
+
+
+DURATION_LINE = re.compile(r"^\s*([0-9.]+)s (?:setup|call|teardown)\s+(\S.*)$")
+
+
+def parse_durations(output):
+    """Sums the setup, call and teardown times that `--durations=0`
+    reports for each node id."""
+    durations = {}
+    for line in output.splitlines():
+        match = DURATION_LINE.match(line)
+        if match:
+            nodeid = match.group(2).strip()
+            durations[nodeid] = durations.get(nodeid, 0.0) + float(match.group(1))
+    return durations
+
+
+def collect_verilog(src_dir, dst_dir, since):
+    for name in os.listdir(src_dir):
+        path = os.path.join(src_dir, name)
+        if name.endswith(".v") and os.path.getmtime(path) >= since:
+            shutil.copy(path, os.path.join(dst_dir, name))
+
+
+def run_job(job, free_workers, build_dir, env):
+    worker_dir = free_workers.get()
+    try:
+        start = time.time()
+        result = subprocess.run(job.cmd(), cwd=worker_dir, env=env,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True)
+        wall_time = time.time() - start
+        collect_verilog(worker_dir, build_dir, start)
+        return job, result.returncode, wall_time, result.stdout, worker_dir
+    finally:
+        free_workers.put(worker_dir)
+
+
+def run_tests(jobs_count):
+    build_dir = os.getcwd()
+    log_file = os.path.join(build_dir, LOG_FILE)
+    timing_file = os.path.join(build_dir, TIMING_FILE)
+
+    env = dict(os.environ)
+    env.setdefault("VECTORCGRA_BUILD_CACHE", os.path.join(build_dir, BUILD_CACHE_DIR))
+
+    timing = load_timing(timing_file)
+    jobs = []
+    for cmd in COMMANDS:
+        jobs.extend(collect_jobs(cmd, build_dir, timing, jobs_count))
+    jobs = order_jobs(jobs, timing)
+
+    free_workers = queue.Queue()
+    for i in range(jobs_count):
+        worker_dir = os.path.join(build_dir, WORKER_DIR, f"w{i}")
+        os.makedirs(worker_dir, exist_ok=True)
+        free_workers.put(worker_dir)
+
+    print(f"Running {sum(max(1, len(job.nodeids)) for job in jobs)} test items "
+          f"in {len(jobs)} shards on {jobs_count} workers.")
+    failed = []
+    log_lock = threading.Lock()
+    start = time.time()
+    with open(log_file, "w", encoding="utf-8") as f, \
+         ThreadPoolExecutor(max_workers=jobs_count) as pool:
+        futures = [pool.submit(run_job, job, free_workers, build_dir, env)
+                   for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            job, returncode, wall_time, output, worker_dir = future.result()
+            passed = returncode == 0
+            durations = parse_durations(output)
+            for nodeid in job.nodeids:
+                if nodeid in durations:
+                    timing[item_key(nodeid, job.flags)] = {
+                        "wall_time": round(durations[nodeid], 3),
+                        "worker": os.path.basename(worker_dir),
+                    }
+            if not passed:
+                failed.append(job)
+            header = f"\n{'='*80}\nExecuting: {job.key}\n{'='*80}\n"
+            if passed:
+                status = f"\nSUCCESS ({wall_time:.1f}s): {job.key}\n"
+            else:
+                status = f"\nFAILED (Exit Code {returncode}, {wall_time:.1f}s): {job.key}\n"
+            with log_lock:
+                f.write(header + output + status)
+                f.flush()
+            print(f"[{done}/{len(jobs)}] {status.strip()}")
+
+    with open(timing_file + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(timing, f, indent=2, sort_keys=True)
+    os.replace(timing_file + ".tmp", timing_file)
+
+    print(f"\n\nAll tests completed in {time.time() - start:.1f}s, "
+          f"{len(failed)} of {len(jobs)} shards failed.")
+    for job in failed:
+        print(f"  FAILED: {job.key}")
+    print(f"Log saved to: {log_file}")
+    print(f"Timing saved to: {timing_file}")
+    return 1 if failed else 0
 
-def run_tests():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    log_file = os.path.join(current_dir, "local_CI.log")
-    
-    commands = [
-        ["pytest", "..", "-v", "--tb=short"],
-        ["pytest", "../mem/ctrl/test/CtrlMemDynamicRTL_test.py", "-xvs"],
-        ["pytest", "../tile/test/TileRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../controller/test/ControllerRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../cgra/test/CgraTemplateRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../cgra/test/CgraRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../noc/PyOCN/pymtl3_net/ringnet/test/RingNetworkRTL_test.py"],
-        ["pytest", "../multi_cgra/test/RingMultiCgraRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_verilog_homo_2x2_4x4", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../mem/const/test/ConstQueueDynamicRTL_test.py", "-xvs"],
-        ["pytest", "../mem/data/test/DataMemControllerRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../multi_cgra/test/MeshMultiCgraTemplateRTL_test.py", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_multi_CGRA_fir_scalar_translation", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_multi_CGRA_fir_vector_global_reduce_translation", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"],
-        ["pytest", "../multi_cgra/test/MeshMultiCgraRTL_test.py::test_multi_CGRA_systolic_2x2_2x2_translation", "-xvs", "--test-verilog", "--dump-vtb", "--dump-vcd"]
-    ]
-
-    with open(log_file, "w", encoding="utf-8") as f:
-        for cmd in commands:
-            cmd_str = " ".join(cmd)
-            header = f"\n{'='*80}\nExecuting: {cmd_str}\n{'='*80}\n"
-            
-            print(header)
-            f.write(header)
-            f.flush()
-
-            try:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1
-                )
-
-                for line in process.stdout:
-                    print(line, end="")
-                    f.write(line)
-                
-                process.wait()
-                
-                if process.returncode == 0:
-                    status = f"\nSUCCESS: {cmd_str}\n"
-                else:
-                    status = f"\nFAILED (Exit Code {process.returncode}): {cmd_str}\n"
-                
-                print(status)
-                f.write(status)
-
-            except Exception as e:
-                error_msg = f"\nERROR executing {cmd_str}: {str(e)}\n"
-                print(error_msg)
-                f.write(error_msg)
-
-    print(f"\n\nAll tests completed. Log saved to: {os.path.abspath(log_file)}")
 
 if __name__ == "__main__":
-    run_tests()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of concurrent test workers")
+    args = parser.parse_args()
+    sys.exit(run_tests(max(1, args.jobs)))
@@ -4,6 +4,9 @@ ConstQueueDynamicRTL.py
 ==========================================================================
 Constant Queue with regs used for simulation.
 If queue is full, will stop receiving new data.
+With has_shadow_bank, the constants are written into a second (shadow)
+queue, which becomes the one read once `swap` is set; the queue read so
+far is then emptied to become the shadow one.
 
 Author : Yuqi Sun
   Date : Jan 11, 2025
@@ -17,7 +20,7 @@ from ...lib.opt_type import *
 
 
 class ConstQueueDynamicRTL(Component):
-  def construct(s, DataType, const_mem_size):
+  def construct(s, DataType, const_mem_size, has_shadow_bank = False):
     # Constant
     # addr type: number of bits to represent the address
     # 2^addr_size = const_mem_size
@@ -31,9 +34,20 @@ class ConstQueueDynamicRTL(Component):
     # otherwise, number will be back to 000 when 111 + 1 (given const_mem_size = 8)
     WrCurType = mk_bits(clog2(const_mem_size + 1))
 
+    # The shadow queue sits right after the read one in the regs.
+    num_banks = 2 if has_shadow_bank else 1
+    RegFileAddrType = mk_bits(max(1, clog2(const_mem_size * num_banks)))
+    bank_offset = const_mem_size * (num_banks - 1)
+
     # write cursor and read cursor
     s.wr_cur = Wire(WrCurType)
     s.rd_cur = Wire(AddrType)
+    # Write cursor of the shadow queue, and the queue being read.
+    s.shadow_wr_cur = Wire(WrCurType)
+    s.bank_sel = Wire(b1)
+    s.rd_base = Wire(RegFileAddrType)
+    s.fill_base = Wire(RegFileAddrType)
+    s.fill_cur = Wire(WrCurType)
 
     # Interface
     s.send_const = SendIfcRTL(DataType)
@@ -41,43 +55,64 @@ class ConstQueueDynamicRTL(Component):
 
     s.ctrl_proceed = InPort(b1)
     s.clear = InPort(b1)
+    s.swap = InPort(b1)
 
     # Component
     # 1 rd_port: number of read port is 0.
     # 1 wr_port: number of write port is 0.
     #                         Type,     nregs,          rd_ports, wr_ports
-    s.reg_file = RegisterFile(DataType, const_mem_size, 1,        1)
+    s.reg_file = RegisterFile(DataType, const_mem_size * num_banks, 1, 1)
 
     # Connections
     s.send_const.msg //= s.reg_file.rdata[0]
-    s.reg_file.raddr[0] //= s.rd_cur
 
+    @update
+    def update_banks():
+      s.rd_base @= RegFileAddrType(0)
+      s.fill_base @= RegFileAddrType(0)
+      if s.bank_sel:
+        s.rd_base @= RegFileAddrType(bank_offset)
+      s.fill_cur @= s.wr_cur
+      if has_shadow_bank:
+        if ~s.bank_sel:
+          s.fill_base @= RegFileAddrType(bank_offset)
+        s.fill_cur @= s.shadow_wr_cur
+      s.reg_file.raddr[0] @= zext(s.rd_cur, RegFileAddrType) + s.rd_base
 
     @update
     def load_const():
       # Initializes signals.
-      s.reg_file.waddr[0] @= AddrType()
+      s.reg_file.waddr[0] @= RegFileAddrType()
       s.reg_file.wdata[0] @= DataType()
       s.reg_file.wen[0] @= 0
 
-      not_full = s.wr_cur < const_mem_size
+      not_full = s.fill_cur < const_mem_size
       s.recv_const.rdy @= not_full
 
       if s.recv_const.val & not_full:
-        s.reg_file.waddr[0] @= trunc(s.wr_cur, AddrType)
+        s.reg_file.waddr[0] @= zext(trunc(s.fill_cur, AddrType), RegFileAddrType) + s.fill_base
         s.reg_file.wdata[0] @= s.recv_const.msg
         s.reg_file.wen[0] @= 1
 
 
     @update_ff
     def update_wr_cur():
-      not_full = (s.wr_cur < const_mem_size)
+      not_full = (s.fill_cur < const_mem_size)
       if s.reset | s.clear:
         s.wr_cur <<= 0
+        s.shadow_wr_cur <<= 0
+        s.bank_sel <<= 0
+      elif has_shadow_bank & s.swap:
+        s.wr_cur <<= s.shadow_wr_cur
+        s.shadow_wr_cur <<= 0
+        s.bank_sel <<= ~s.bank_sel
       # Checks if there's a valid const (from producer) to be written.
       else:
         if s.recv_const.val & not_full:
-          s.wr_cur <<= s.wr_cur + 1
+          if has_shadow_bank:
+            s.shadow_wr_cur <<= s.shadow_wr_cur + 1
+          else:
+            s.wr_cur <<= s.wr_cur + 1
 
 
     @update
@@ -91,7 +126,7 @@ class ConstQueueDynamicRTL(Component):
 
     @update_ff
     def update_rd_cur():
-      if s.reset | s.clear:
+      if s.reset | s.clear | (has_shadow_bank & s.swap):
         s.rd_cur <<= 0
       else:
         # Checks whether the "reader" successfully read the data at rd_cur,
@@ -13,6 +13,7 @@ from pymtl3.stdlib.primitive import RegisterFile
 from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.opt_type import *
+from ...lib.util import line_trace
 
 class CtrlMemCL(Component):
 
@@ -62,6 +63,9 @@ class CtrlMemCL(Component):
           s.cur <<= s.cur + AddrType(1)
 
   def line_trace(s):
-    out_str  = "||".join([str(data) for data in s.sram])
+    if line_trace.is_recording():
+      out_str  = line_trace.mem_diff_trace(s, s.sram)
+    else:
+      out_str  = "||".join([str(data) for data in s.sram])
     return f'[{out_str}] : {OPT_SYMBOL_DICT[s.send_ctrl.msg.ctrl]}'
 
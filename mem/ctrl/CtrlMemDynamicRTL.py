@@ -5,6 +5,17 @@ CtrlMemDynamicRTL.py
 Control memory with dynamic reconfigurability (e.g., receiving control
 signals, halt/terminate signals) for each CGRA tile.
 
+With has_shadow_ctrl_mem, the ctrl words, the prologue counts, the
+count-per-iter, the lower bound and the total ctrl count have a second
+(shadow) copy. All the configuration packets write the shadow copy, and
+CMD_SWAP_CONFIG exchanges it with the active one once the running kernel
+has completed, so the next kernel is configured in the background.
+
+A CMD_CONFIG_MULTICAST is written like a CMD_CONFIG if the bit of the
+tile is set in the mask of payload.data, and is then forwarded on the
+ring to the next tile of the mask, so a single packet configures all of
+them in one pass.
+
 Author : Cheng Tan
   Date : Dec 20, 2024
 """
@@ -19,6 +30,7 @@ from ...lib.cmd_type import *
 from ...lib.opt_type import *
 from ...lib.util.common import *
 from ...lib.util.data_struct_attr import *
+from ...lib.util import line_trace
 
 class CtrlMemDynamicRTL(Component):
 
@@ -26,10 +38,12 @@ class CtrlMemDynamicRTL(Component):
                 ctrl_mem_size, num_fu_inports, num_fu_outports,
                 num_tile_inports, num_tile_outports, num_cgras,
                 num_tiles, ctrl_count_per_iter = 4,
-                total_ctrl_steps = 4):
+                total_ctrl_steps = 4, has_shadow_ctrl_mem = False):
 
     CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
     CtrlType = CgraPayloadType.get_field_type(kAttrCtrl)
+    DataType = CgraPayloadType.get_field_type(kAttrData)
+    DataPayloadType = DataType.get_field_type(kAttrPayload)
     IntraPktTileIdType = IntraCgraPktType.get_field_type(kAttrSrc)
     # The total_ctrl_steps indicates the number of steps the ctrl
     # signals should proceed. For example, if the number of ctrl
@@ -47,6 +61,14 @@ class CtrlMemDynamicRTL(Component):
     TileInPortType = mk_bits(clog2(num_routing_xbar_inports))
     FuOutPortType = mk_bits(clog2(num_fu_outports))
     num_routing_outports = num_tile_outports + num_fu_inports
+    # The shadow copy of the ctrl words and prologue counts sits right
+    # after the active one, which starts at ctrl_rd_base.
+    num_ctrl_banks = 2 if has_shadow_ctrl_mem else 1
+    RegFileAddrType = mk_bits(clog2(ctrl_mem_size * num_ctrl_banks))
+    bank_offset = ctrl_mem_size * (num_ctrl_banks - 1)
+    s.has_shadow_ctrl_mem = has_shadow_ctrl_mem
+    TileMaskType = mk_bits(num_tiles)
+    mask_nbits = min(num_tiles, DataPayloadType.nbits)
 
     # Interfaces.
     # Stores ctrl signals into the control memory/registers.
@@ -63,9 +85,13 @@ class CtrlMemDynamicRTL(Component):
     s.cgra_id = InPort(mk_bits(max(1, clog2(num_cgras))))
     s.tile_id = InPort(mk_bits(clog2(num_tiles + 1)))
     s.ctrl_addr_outport = OutPort(CtrlAddrType)
+    # The swap of the configuration banks takes place in this cycle, and
+    # a CMD_SWAP_CONFIG is waiting to, for the const queue of the tile.
+    s.config_swap = OutPort(b1)
+    s.config_swap_pending = OutPort(b1)
 
     # Components.
-    s.reg_file = RegisterFile(CtrlType, ctrl_mem_size, 1, 1)
+    s.reg_file = RegisterFile(CtrlType, ctrl_mem_size * num_ctrl_banks, 1, 1)
     s.recv_pkt_from_controller_queue = NormalQueueRTL(IntraCgraPktType)
     s.recv_from_element_queue = NormalQueueRTL(CgraPayloadType)
     s.times = Wire(TimeType)
@@ -76,7 +102,36 @@ class CtrlMemDynamicRTL(Component):
     s.ctrl_count_upper_bound = Wire(UpperBoundType)
     s.total_ctrl_steps_val = Wire(TimeType)
 
-    s.prologue_count_reg_fu = [Wire(PrologueCountType) for _ in range(ctrl_mem_size)]
+    # Address of the current ctrl word within the active bank.
+    s.ctrl_pc = Wire(CtrlAddrType)
+    s.ctrl_bank_sel = Wire(b1)
+    s.ctrl_rd_base = Wire(RegFileAddrType)
+    s.ctrl_wr_base = Wire(RegFileAddrType)
+    s.ctrl_waddr = Wire(RegFileAddrType)
+    s.ctrl_swap_rdy = Wire(b1)
+    s.ctrl_swap = Wire(b1)
+    s.ctrl_pc_from_config = Wire(b1)
+    s.shadow_ctrl_count_per_iter_val = Wire(PCType)
+    s.shadow_ctrl_count_lower_bound = Wire(CtrlAddrType)
+    s.shadow_total_ctrl_steps_val = Wire(TimeType)
+    # CMD_SWAP_CONFIGs in the queue.
+    s.ctrl_swaps_queued = Wire(mk_bits(2))
+
+    # CMD_CONFIG_MULTICAST at the head of the queue: whether it configures
+    # this tile, the tiles of its mask after this one, and the next of
+    # them, which the packet is forwarded to.
+    s.multicast_mask = Wire(TileMaskType)
+    s.multicast_write = Wire(b1)
+    s.multicast_rest = Wire(TileMaskType)
+    s.multicast_next_dst = Wire(IntraPktTileIdType)
+    s.multicast_forward = Wire(b1)
+    s.multicast_forwarded = Wire(b1)
+    s.multicast_mask[0:mask_nbits] //= \
+        s.recv_pkt_from_controller_queue.send.msg.payload.data.payload[0:mask_nbits]
+    if mask_nbits < num_tiles:
+      s.multicast_mask[mask_nbits:num_tiles] //= 0
+
+    s.prologue_count_reg_fu = [Wire(PrologueCountType) for _ in range(ctrl_mem_size * num_ctrl_banks)]
     s.prologue_count_outport_fu = OutPort(PrologueCountType)
     s.prologue_count_outport_fu_crossbar = \
         [[OutPort(PrologueCountType) for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size)]
@@ -84,21 +139,82 @@ class CtrlMemDynamicRTL(Component):
         [[OutPort(PrologueCountType) for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size)]
 
     s.prologue_count_reg_fu_crossbar = \
-        [[Wire(PrologueCountType) for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size)]
+        [[Wire(PrologueCountType) for _ in range(num_fu_outports)] for _ in range(ctrl_mem_size * num_ctrl_banks)]
     s.prologue_count_reg_routing_crossbar = \
-        [[Wire(PrologueCountType) for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size)]
+        [[Wire(PrologueCountType) for _ in range(num_routing_xbar_inports)] for _ in range(ctrl_mem_size * num_ctrl_banks)]
 
     # Connections.
     s.recv_pkt_from_controller //= s.recv_pkt_from_controller_queue.recv
     s.recv_from_element //= s.recv_from_element_queue.recv
 
+    @update
+    def update_ctrl_banks():
+      s.ctrl_rd_base @= RegFileAddrType(0)
+      s.ctrl_wr_base @= RegFileAddrType(0)
+      if s.ctrl_bank_sel:
+        s.ctrl_rd_base @= RegFileAddrType(bank_offset)
+      else:
+        s.ctrl_wr_base @= RegFileAddrType(bank_offset)
+      s.reg_file.raddr[0] @= zext(s.ctrl_pc, RegFileAddrType) + s.ctrl_rd_base
+      s.ctrl_waddr @= zext(s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr, RegFileAddrType) + \
+                      s.ctrl_wr_base
+      # The banks are swapped once the running kernel has completed;
+      # without the shadow bank the command is dropped.
+      s.ctrl_swap_rdy @= 1
+      if has_shadow_ctrl_mem:
+        s.ctrl_swap_rdy @= ~s.start_iterate_ctrl | s.sent_complete
+      s.ctrl_swap @= has_shadow_ctrl_mem & s.recv_pkt_from_controller_queue.send.val & \
+                     (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_SWAP_CONFIG) & \
+                     s.ctrl_swap_rdy
+      # CMD_CONFIG_CTRL_LOWER_BOUND also sets the pc, unless it configures
+      # the shadow bank (the pc is then set by the swap).
+      s.ctrl_pc_from_config @= s.recv_pkt_from_controller_queue.send.val & \
+                               (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_CTRL_LOWER_BOUND)
+      if has_shadow_ctrl_mem:
+        s.ctrl_pc_from_config @= 0
+
+    @update
+    def update_multicast():
+      multicast = s.recv_pkt_from_controller_queue.send.val & \
+                  (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_MULTICAST)
+      s.multicast_write @= multicast & \
+          ((s.multicast_mask & (TileMaskType(1) << zext(s.tile_id, TileMaskType))) != TileMaskType(0))
+      s.multicast_next_dst @= IntraPktTileIdType(0)
+      s.multicast_forward @= 0
+      for i in range(num_tiles):
+        s.multicast_rest[i] @= s.multicast_mask[i] & (IntraPktTileIdType(i) > zext(s.tile_id, IntraPktTileIdType))
+      for i in range(num_tiles):
+        if s.multicast_rest[i] & ~s.multicast_forward:
+          s.multicast_next_dst @= IntraPktTileIdType(i)
+          s.multicast_forward @= multicast
+
+    @update_ff
+    def update_ctrl_bank_sel():
+      if s.reset:
+        s.ctrl_bank_sel <<= 0
+        s.ctrl_swaps_queued <<= 0
+      else:
+        if s.ctrl_swap:
+          s.ctrl_bank_sel <<= ~s.ctrl_bank_sel
+        swap_queued = has_shadow_ctrl_mem & s.recv_pkt_from_controller.val & s.recv_pkt_from_controller.rdy & \
+                      (s.recv_pkt_from_controller.msg.payload.cmd == CMD_SWAP_CONFIG)
+        if swap_queued & ~s.ctrl_swap:
+          s.ctrl_swaps_queued <<= s.ctrl_swaps_queued + 1
+        elif s.ctrl_swap & ~swap_queued:
+          s.ctrl_swaps_queued <<= s.ctrl_swaps_queued - 1
+
+    @update
+    def update_config_swap():
+      s.config_swap @= s.ctrl_swap
+      s.config_swap_pending @= s.ctrl_swaps_queued != 0
+
     @update
     def update_msg():
       s.recv_pkt_from_controller_queue.send.rdy @= 0
       s.send_to_element.msg @= CgraPayloadType(0, 0, 0, 0, 0)
       s.send_to_element.val @= 0
       s.reg_file.wen[0] @= 0
-      s.reg_file.waddr[0] @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr
+      s.reg_file.waddr[0] @= s.ctrl_waddr
       # Initializes the fields of the control signal.
       s.reg_file.wdata[0].operation @= 0
       for i in range(num_fu_inports):
@@ -113,9 +229,10 @@ class CtrlMemDynamicRTL(Component):
       s.reg_file.wdata[0].vector_factor_power @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.vector_factor_power
       s.reg_file.wdata[0].is_last_ctrl @= 0
 
-      if s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG):
+      if (s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG)) | \
+         s.multicast_write:
         s.reg_file.wen[0] @= 1
-        s.reg_file.waddr[0] @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr
+        s.reg_file.waddr[0] @= s.ctrl_waddr
         # Fills the fields of the control signal.
         s.reg_file.wdata[0].operation @= s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.operation
         for i in range(num_fu_inports):
@@ -164,13 +281,18 @@ class CtrlMemDynamicRTL(Component):
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_UPDATE_COUNTER_SHADOW_VALUE) | \
          (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_RESET_LEAF_COUNTER):
         s.recv_pkt_from_controller_queue.send.rdy @= 1
+      if (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_SWAP_CONFIG) & s.ctrl_swap_rdy:
+        s.recv_pkt_from_controller_queue.send.rdy @= 1
+      # Waits for the way out to the ring if the packet goes on.
+      if s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_MULTICAST:
+        s.recv_pkt_from_controller_queue.send.rdy @= ~s.multicast_forward | s.multicast_forwarded
       # TODO: Extend for the other commands. Maybe another queue to
       # handle complicated actions.
       # else:
 
     @update
     def update_ctrl_addr_outport():
-      s.ctrl_addr_outport @= s.reg_file.raddr[0]
+      s.ctrl_addr_outport @= s.ctrl_pc
 
     @update
     def update_send_pkt_to_controller():
@@ -191,6 +313,14 @@ class CtrlMemDynamicRTL(Component):
             s.send_pkt_to_controller.msg @= \
                 IntraCgraPktType(zext(s.tile_id, IntraPktTileIdType), num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE, 0, 0, 0, 0))
             s.send_pkt_to_controller.val @= 1
+      # A CMD_CONFIG_MULTICAST goes on to the next tile of its mask when
+      # nothing else is sent.
+      s.multicast_forwarded @= 0
+      if s.multicast_forward & ~s.send_pkt_to_controller.val:
+        s.send_pkt_to_controller.val @= 1
+        s.send_pkt_to_controller.msg @= s.recv_pkt_from_controller_queue.send.msg
+        s.send_pkt_to_controller.msg.dst @= s.multicast_next_dst
+        s.multicast_forwarded @= s.send_pkt_to_controller.rdy
 
     @update
     def update_send_ctrl_val():
@@ -258,17 +388,20 @@ class CtrlMemDynamicRTL(Component):
     def update_raddr_and_fu_prologue():
       if s.reset:
         s.times <<= 0
-        s.reg_file.raddr[0] <<= 0
-        for i in range(ctrl_mem_size):
+        s.ctrl_pc <<= 0
+        for i in range(ctrl_mem_size * num_ctrl_banks):
           s.prologue_count_reg_fu[i] <<= 0
-      elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_CTRL_LOWER_BOUND):
-        s.reg_file.raddr[0] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
+      elif s.ctrl_swap:
+        s.times <<= TimeType(0)
+        s.ctrl_pc <<= s.shadow_ctrl_count_lower_bound
+      elif s.ctrl_pc_from_config:
+        s.ctrl_pc <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_TERMINATE):
         s.times <<= TimeType(0)
       else:
         if s.recv_pkt_from_controller_queue.send.val & \
            (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU):
-          s.prologue_count_reg_fu[s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr] <<= \
+          s.prologue_count_reg_fu[s.ctrl_waddr] <<= \
               trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
 
         if s.start_iterate_ctrl == b1(1):
@@ -279,10 +412,10 @@ class CtrlMemDynamicRTL(Component):
 
           # Reads the next ctrl signal only when the current one is done.
           if s.send_ctrl.rdy & s.send_ctrl.val:
-            if zext(s.reg_file.raddr[0], UpperBoundType) == s.ctrl_count_upper_bound - UpperBoundType(1):
-              s.reg_file.raddr[0] <<= s.ctrl_count_lower_bound
+            if zext(s.ctrl_pc, UpperBoundType) == s.ctrl_count_upper_bound - UpperBoundType(1):
+              s.ctrl_pc <<= s.ctrl_count_lower_bound
             else:
-              s.reg_file.raddr[0] <<= s.reg_file.raddr[0] + CtrlAddrType(1)
+              s.ctrl_pc <<= s.ctrl_pc + CtrlAddrType(1)
             if s.prologue_count_reg_fu[s.reg_file.raddr[0]] > 0:
               s.prologue_count_reg_fu[s.reg_file.raddr[0]] <<= s.prologue_count_reg_fu[s.reg_file.raddr[0]] - 1
 
@@ -292,15 +425,15 @@ class CtrlMemDynamicRTL(Component):
       for addr in range(ctrl_mem_size):
         for i in range(num_routing_xbar_inports):
           s.prologue_count_outport_routing_crossbar[addr][i] @= \
-              s.prologue_count_reg_routing_crossbar[addr][i]
+              s.prologue_count_reg_routing_crossbar[s.ctrl_rd_base + RegFileAddrType(addr)][i]
         for i in range(num_fu_outports):
           s.prologue_count_outport_fu_crossbar[addr][i] @= \
-              s.prologue_count_reg_fu_crossbar[addr][i]
+              s.prologue_count_reg_fu_crossbar[s.ctrl_rd_base + RegFileAddrType(addr)][i]
 
     @update_ff
     def update_prologue_reg():
       if s.reset:
-        for addr in range(ctrl_mem_size):
+        for addr in range(ctrl_mem_size * num_ctrl_banks):
           for i in range(num_routing_xbar_inports):
             s.prologue_count_reg_routing_crossbar[addr][i] <<= 0
           for i in range(num_fu_outports):
@@ -311,25 +444,41 @@ class CtrlMemDynamicRTL(Component):
           temp_routing_crossbar_in = s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.routing_xbar_outport[0]
           # Subtract 1 to convert from TileInType(1-8) to array index (0-7), consistent with normal crossbar routing
           if temp_routing_crossbar_in > 0:
-            s.prologue_count_reg_routing_crossbar[s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr][trunc(temp_routing_crossbar_in - 1, TileInPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
+            s.prologue_count_reg_routing_crossbar[s.ctrl_waddr][trunc(temp_routing_crossbar_in - 1, TileInPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
         elif s.recv_pkt_from_controller_queue.send.val & \
            (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR):
           temp_fu_crossbar_in = s.recv_pkt_from_controller_queue.send.msg.payload.ctrl.fu_xbar_outport[0]
-          s.prologue_count_reg_fu_crossbar[s.recv_pkt_from_controller_queue.send.msg.payload.ctrl_addr][trunc(temp_fu_crossbar_in, FuOutPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
+          s.prologue_count_reg_fu_crossbar[s.ctrl_waddr][trunc(temp_fu_crossbar_in, FuOutPortType)] <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PrologueCountType)
 
+    # With the shadow bank, the configuration goes to the shadow_* copies
+    # below, which are exchanged with the active ones by the swap.
     @update_ff
     def update_ctrl_count_per_iter():
       if s.reset:
         s.ctrl_count_per_iter_val <<= PCType(ctrl_count_per_iter)
+        s.shadow_ctrl_count_per_iter_val <<= PCType(ctrl_count_per_iter)
+      elif s.ctrl_swap:
+        s.ctrl_count_per_iter_val <<= s.shadow_ctrl_count_per_iter_val
+        s.shadow_ctrl_count_per_iter_val <<= s.ctrl_count_per_iter_val
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_COUNT_PER_ITER):
-        s.ctrl_count_per_iter_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PCType)
+        if has_shadow_ctrl_mem:
+          s.shadow_ctrl_count_per_iter_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PCType)
+        else:
+          s.ctrl_count_per_iter_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, PCType)
 
     @update_ff
     def update_lower_bound():
       if s.reset:
         s.ctrl_count_lower_bound <<= CtrlAddrType(0)
+        s.shadow_ctrl_count_lower_bound <<= CtrlAddrType(0)
+      elif s.ctrl_swap:
+        s.ctrl_count_lower_bound <<= s.shadow_ctrl_count_lower_bound
+        s.shadow_ctrl_count_lower_bound <<= s.ctrl_count_lower_bound
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_CTRL_LOWER_BOUND):
-        s.ctrl_count_lower_bound <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
+        if has_shadow_ctrl_mem:
+          s.shadow_ctrl_count_lower_bound <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
+        else:
+          s.ctrl_count_lower_bound <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, CtrlAddrType)
 
     @update
     def update_upper_bound():
@@ -339,10 +488,20 @@ class CtrlMemDynamicRTL(Component):
     def update_total_ctrl_steps():
       if s.reset:
         s.total_ctrl_steps_val <<= TimeType(total_ctrl_steps)
+        s.shadow_total_ctrl_steps_val <<= TimeType(total_ctrl_steps)
+      elif s.ctrl_swap:
+        s.total_ctrl_steps_val <<= s.shadow_total_ctrl_steps_val
+        s.shadow_total_ctrl_steps_val <<= s.total_ctrl_steps_val
       elif s.recv_pkt_from_controller_queue.send.val & (s.recv_pkt_from_controller_queue.send.msg.payload.cmd == CMD_CONFIG_TOTAL_CTRL_COUNT):
-        s.total_ctrl_steps_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, TimeType)
+        if has_shadow_ctrl_mem:
+          s.shadow_total_ctrl_steps_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, TimeType)
+        else:
+          s.total_ctrl_steps_val <<= trunc(s.recv_pkt_from_controller_queue.send.msg.payload.data.payload, TimeType)
 
   def line_trace(s):
-    config_mem_str  = "|".join([str(data) for data in s.reg_file.regs])
+    if line_trace.is_recording():
+      config_mem_str  = line_trace.mem_diff_trace(s, s.reg_file.regs)
+    else:
+      config_mem_str  = "|".join([str(data) for data in s.reg_file.regs])
     return f'reg_file.raddr[0]: {s.reg_file.raddr[0]} || sent_complete: {s.sent_complete} || times: {s.times} || total_ctrl_steps_val: {s.total_ctrl_steps_val} || start_iterate_ctrl: {s.start_iterate_ctrl}|| recv_pkt: {s.recv_pkt_from_controller.msg}.recv_rdy:{s.recv_pkt_from_controller.rdy} || control signal content: [{config_mem_str}] || ctrl_out: {s.send_ctrl.msg}, send_ctrl.val: {s.send_ctrl.val}, send_ctrl.rdy: {s.send_ctrl.rdy}, send_pkt.msg.payload.cmd: {s.send_pkt_to_controller.msg.payload.cmd}, send_pkt.val: {s.send_pkt_to_controller.val}, ctrl_count_per_iter_val: {s.ctrl_count_per_iter_val}, ctrl_count_lower_bound: {s.ctrl_count_lower_bound}'
 
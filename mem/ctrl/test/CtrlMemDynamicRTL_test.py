@@ -26,7 +26,7 @@ class TestHarness(Component):
                 num_tile_inports, num_tile_outports, src0_msgs,
                 src1_msgs, ctrl_pkts, sink_msgs, num_tiles,
                 complete_signal_sink_out, ctrl_count_per_iter,
-                total_ctrl_steps_val, FuType):
+                total_ctrl_steps_val, FuType, has_shadow_ctrl_mem = False):
 
     CgraPayloadType = CtrlPktType.get_field_type(kAttrPayload)
     CtrlSignalType = CgraPayloadType.get_field_type(kAttrCtrl)
@@ -41,7 +41,8 @@ class TestHarness(Component):
     s.ctrl_mem = MemUnit(CtrlPktType,
                          ctrl_mem_size, num_fu_inports, num_fu_outports,
                          num_tile_inports, num_tile_outports, 1, num_tiles,
-                         ctrl_count_per_iter, total_ctrl_steps_val)
+                         ctrl_count_per_iter, total_ctrl_steps_val,
+                         has_shadow_ctrl_mem = has_shadow_ctrl_mem)
 
     # Connections.
     s.fu.send_to_ctrl_mem //= s.ctrl_mem.recv_from_element
@@ -332,3 +333,68 @@ def test_return():
                    total_ctrl_steps_val,
                    RetRTL)
   run_sim(th)
+
+def test_shadow_ctrl_mem():
+  MemUnit = CtrlMemDynamicRTL
+  DataType = mk_data(16, 1)
+  ctrl_mem_size = 4
+  num_fu_inports = 2
+  num_fu_outports = 2
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_tiles = 4
+  data_mem_size_global = 16
+  DataAddrType = mk_bits(clog2(data_mem_size_global))
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+  CtrlType = mk_ctrl(num_fu_inports, num_fu_outports, num_tile_inports,
+                     num_tile_outports, 16)
+  CgraPayloadType = mk_cgra_payload(DataType, DataAddrType, CtrlType,
+                                    CtrlAddrType)
+  IntraCgraPktType = mk_intra_cgra_pkt(1, 1, num_tiles, CgraPayloadType)
+
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  pick_register = [FuInType(x + 1) for x in range(num_fu_inports)]
+  def pkt(cmd, opt = OPT_NAH, addr = 0):
+    return IntraCgraPktType(0, 1, 0, 0, 0, 0, 0, 0, 0, 0,
+                            CgraPayloadType(cmd, ctrl = CtrlType(opt, pick_register),
+                                            ctrl_addr = addr))
+
+  # The second kernel is configured while the first one runs, and only
+  # takes over once the first one has completed.
+  src_ctrl_pkt = [pkt(CMD_CONFIG, OPT_ADD, 0),
+                  pkt(CMD_CONFIG, OPT_ADD, 1),
+                  pkt(CMD_SWAP_CONFIG),
+                  pkt(CMD_LAUNCH),
+                  pkt(CMD_CONFIG, OPT_SUB, 0),
+                  pkt(CMD_CONFIG, OPT_SUB, 1),
+                  pkt(CMD_SWAP_CONFIG),
+                  pkt(CMD_LAUNCH)]
+  src_data0 = [DataType(1, 1), DataType(5, 1), DataType(7, 1), DataType(6, 1),
+               DataType(9, 1), DataType(8, 1), DataType(7, 1), DataType(6, 1)]
+  src_data1 = [DataType(6, 1), DataType(1, 1), DataType(2, 1), DataType(3, 1),
+               DataType(1, 1), DataType(2, 1), DataType(3, 1), DataType(4, 1)]
+  sink_out = [DataType(7, 1), DataType(6, 1), DataType(9, 1), DataType(9, 1),
+              DataType(8, 1), DataType(6, 1), DataType(4, 1), DataType(2, 1)]
+  complete_signal_sink_out = [
+      IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE)),
+      IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, 0, 0, CgraPayloadType(CMD_COMPLETE))]
+
+  th = TestHarness(MemUnit,
+                   IntraCgraPktType,
+                   ctrl_mem_size,
+                   data_mem_size_global,
+                   num_fu_inports,
+                   num_fu_outports,
+                   num_tile_inports,
+                   num_tile_outports,
+                   src_data0,
+                   src_data1,
+                   src_ctrl_pkt,
+                   sink_out,
+                   num_tiles,
+                   complete_signal_sink_out,
+                   2,
+                   4,
+                   AdderRTL,
+                   has_shadow_ctrl_mem = True)
+  run_sim(th, max_cycles = 40)
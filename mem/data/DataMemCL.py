@@ -13,6 +13,7 @@ from pymtl3 import *
 from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.opt_type import *
+from ...lib.util import line_trace
 
 class DataMemCL(Component):
 
@@ -57,9 +58,12 @@ class DataMemCL(Component):
 
   def line_trace(s):
     recv_str = "|".join([str(data.msg) for data in s.recv_wdata])
-    out_str  = "|".join([str(data)     for data in s.sram])
     send_str = "|".join([str(data.msg) for data in s.send_rdata])
-    # return f'{recv_str} : [{out_str}] : {send_str}'
-    sram_trace =  f'{"|".join([str(x) for x in s.sram])}'
+    if line_trace.is_recording():
+      sram_trace = line_trace.mem_diff_trace(s, s.sram)
+    else:
+      out_str  = "|".join([str(data)     for data in s.sram])
+      # return f'{recv_str} : [{out_str}] : {send_str}'
+      sram_trace =  f'{"|".join([str(x) for x in s.sram])}'
     return f'{s.recv_waddr[0]}<{s.recv_wdata[0]}({sram_trace}){s.recv_raddr[0]}>{s.send_rdata[0]}'
 
@@ -14,12 +14,14 @@ which can be used for multi-CGRA fabric.
 In addition, it contains a crossbar to handle multi-bank conflicts.
  - Crossbar contains an arbitor, i.e., stall may happen on certain port.
    - Therefore, bypass queue is leveraged on the input port.
- - [ ] https://github.com/tancheng/VectorCGRA/issues/26:
-     Blocking vs. non-blocking should be configured/propagated here.
+ - [x] https://github.com/tancheng/VectorCGRA/issues/26:
+     Blocking vs. non-blocking remote loads is configured here
+     (`has_non_blocking_loads`).
    - Non-blocking:
-     - Immediate return data though it is not ready:
-       - Bank conflicted lower priority access.
-       - Remote accessed data.
+     - Remote loads are tracked in an outstanding-request table, one
+       entry per read port tagged by remote_src_port.
+     - Remote responses are buffered in the table and returned out of
+       order, so a port that is not ready does not hold back the others.
    - Blocking and non-blocking might be configurabled in a dynamic way.
 
 Author : Cheng Tan
@@ -33,6 +35,15 @@ from ...lib.messages import *
 from ...noc.PyOCN.pymtl3_net.xbar.XbarBypassQueueRTL import XbarBypassQueueRTL
 from ...lib.util.data_struct_attr import *
 from ...lib.util.common import CHAR_BIT
+from ...lib.util.common import (
+  BANK_MAPPING_BLOCK,
+  BANK_MAPPING_INTERLEAVE,
+  BANK_MAPPING_XOR,
+  BANK_STORAGE_REGISTER_FILE,
+  NUM_DATA_MEM_PERF_COUNTERS,
+  PERF_DATA_MEM_BANK_CONFLICT,
+  PERF_DATA_MEM_NOC_STALL,
+)
 
 class DataMemControllerRTL(Component):
   """
@@ -52,6 +63,47 @@ class DataMemControllerRTL(Component):
   - DMA-originated requests are treated as another master on the memory bus,
     competing with tiles and NoC traffic after they pass through the
     controller.
+  - With `num_dma_lanes` > 1 (wide DMA), each DMA lane gets its own
+    crossbar inport, so the words of a DMA beat reach different banks in
+    the same cycle and conflicting ones are serialized by the crossbar.
+  - With `has_perf_counters`, counts bank conflicts and NoC stalls on
+    `perf_counters` (indexed by PERF_DATA_MEM_*), which the controller
+    returns to the CPU.
+  - `bank_mapping` (BANK_MAPPING_* in lib/util/common.py) selects how the
+    local addresses are spread over the banks: in contiguous blocks, word
+    by word (interleaved), or interleaved with the bank index XOR-ed with
+    the next address bits, so that unit-stride and power-of-2 strided
+    accesses of neighbouring tiles hit different banks. The tile, NoC and
+    DMA requests all go through the same mapping.
+  - With `has_spm_double_buffer` (ping-pong SPM), the local SPM is split
+    into two halves. The tiles and the NoC access the half selected by
+    `spm_buffer_sel` and the DMA the other one, through the same local
+    addresses, so the DMA can fill the next tile of data while the kernel
+    runs on the current one. The controller flips `spm_buffer_sel` on
+    CMD_SPM_SWAP.
+  - `bank_storage` (BANK_STORAGE_* in lib/util/common.py) builds the banks
+    out of flops or out of SRAMs with a pipelined 1-cycle read port. With
+    an SRAM, `sram_macro` optionally holds the VerilogPlaceholderPass
+    options (src_file, top_module, port_map, ...) of a black-box macro
+    to instantiate instead of the behavioral model, see SramRTL.py.
+  - With `has_non_blocking_loads`, a remote load of read port i takes
+    entry i of the outstanding-request table when it leaves for the NoC,
+    and its response (matched by the remote_src_port tag) is written into
+    the entry whenever it arrives, so the NoC response port never waits on
+    a tile. Port i issues no other load until the entry is drained, which
+    keeps its responses in order, while the other ports keep loading from
+    the local banks.
+  - With `has_request_coalescing`, tiles reading the same local word in
+    the same cycle share one bank access: the lowest port goes through
+    the crossbar and its response is multicast to the others. Only ports
+    with no load in flight are coalesced, and they wait for the multicast
+    before loading again, so every port still sees its responses in
+    order. Of the tiles storing to the same local word in the same
+    cycle, the lowest port goes through the crossbar, combined with the
+    ports above it storing the same data; the others stay pending until
+    a later cycle, so that the stores are done in port order. The banks
+    are one word wide, so stores to adjacent words are not merged; the
+    interleaved bank mappings already send them to different banks.
   """
   def construct(s,
                 NocPktType,
@@ -67,7 +119,15 @@ class DataMemControllerRTL(Component):
                 idTo2d_map = {0: [0, 0]},
                 has_dma_ports = False,
                 DmaCmdType = mk_dma_cmd(),
-                DmaDataType = mk_dma_data()):
+                DmaDataType = mk_dma_data(),
+                has_perf_counters = False,
+                num_dma_lanes = 1,
+                has_spm_double_buffer = False,
+                bank_mapping = BANK_MAPPING_BLOCK,
+                bank_storage = BANK_STORAGE_REGISTER_FILE,
+                sram_macro = None,
+                has_non_blocking_loads = False,
+                has_request_coalescing = False):
 
     CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -92,12 +152,41 @@ class DataMemControllerRTL(Component):
     s.num_banks_per_cgra = num_banks_per_cgra
     s.has_dma_ports = has_dma_ports
     LocalBankIndexType = mk_bits(max(1, clog2(num_banks_per_cgra)))
+    if has_spm_double_buffer:
+      assert num_banks_per_cgra >= 2 and \
+             2 ** clog2(num_banks_per_cgra) == num_banks_per_cgra, \
+             "ping-pong SPM needs a power-of-2 number of banks"
+    spm_half_size = num_banks_per_cgra * data_mem_size_per_bank // 2
+    # The bank index is bank_shift bits up the local address, XOR-ed with
+    # the bank_hash_mask bits right above the interleaved ones. The
+    # memory wrappers skip the interleaved bits of the address.
+    bank_index_nbits = clog2(num_banks_per_cgra)
+    s.bank_mapping = bank_mapping
+    if bank_mapping == BANK_MAPPING_BLOCK:
+      bank_shift = per_bank_addr_nbits
+      bank_hash_mask = 0
+      interleave_nbits = 0
+    else:
+      assert bank_mapping in (BANK_MAPPING_INTERLEAVE, BANK_MAPPING_XOR), \
+             f"unknown bank mapping {bank_mapping}"
+      assert 2 ** bank_index_nbits == num_banks_per_cgra, \
+             f"{bank_mapping} bank mapping needs a power-of-2 number of banks"
+      bank_shift = 0
+      bank_hash_mask = num_banks_per_cgra - 1 if bank_mapping == BANK_MAPPING_XOR else 0
+      interleave_nbits = bank_index_nbits
     s.num_rd_tiles = num_rd_tiles
     s.num_wr_tiles = num_wr_tiles
     RdTileIdType = mk_bits(max(1, clog2(num_rd_tiles)))
+    WrTileIdType = mk_bits(max(1, clog2(num_wr_tiles)))
+    RdFollowerType = mk_bits(num_rd_tiles)
+    # Local loads in flight per read port, bounded by the queues between
+    # the crossbars and the banks.
+    RdInflightType = mk_bits(3)
+    max_rd_inflight = 2 ** RdInflightType.nbits - 1
+    DmaLaneType = mk_bits(max(1, clog2(num_dma_lanes)))
     # The additional port is for the request from inter-cgra NoC via controller.
-    # If DMA is enabled, we add one more port for the DMA engine.
-    dma_port_offset = 1 if has_dma_ports else 0
+    # If DMA is enabled, we add one more port per lane of the DMA engine.
+    dma_port_offset = num_dma_lanes if has_dma_ports else 0
     num_xbar_in_rd_ports = num_rd_tiles + 1 + dma_port_offset
     num_xbar_in_wr_ports = num_wr_tiles + 1 + dma_port_offset
     num_xbar_out_rd_ports = num_banks_per_cgra + 1
@@ -107,6 +196,7 @@ class DataMemControllerRTL(Component):
     XbarOutWrType = mk_bits(clog2(num_xbar_out_wr_ports))
     XbarInRdType = mk_bits(clog2(num_xbar_in_rd_ports))
     XbarInWrType = mk_bits(clog2(num_xbar_in_wr_ports))
+    ConflictCountType = mk_bits(clog2(num_xbar_in_rd_ports + num_xbar_in_wr_ports + 1))
     MemReadPktType = \
         mk_mem_access_pkt(DataType,
                           num_xbar_in_rd_ports,
@@ -156,14 +246,16 @@ class DataMemControllerRTL(Component):
     s.send_to_noc_load_request_pkt = SendIfcRTL(NocPktType)
     s.send_to_noc_store_pkt = SendIfcRTL(NocPktType)
 
-    s.recv_from_controller_spm_wr_req = RecvIfcRTL(DmaSpmWriteReqType)
-    s.recv_from_controller_spm_rd_req = RecvIfcRTL(DmaSpmReadReqType)
-    s.send_to_controller_spm_rd_resp = SendIfcRTL(DmaSpmReadRespType)
+    # One port of each kind per DMA lane.
+    s.recv_from_controller_spm_wr_req = [RecvIfcRTL(DmaSpmWriteReqType) for _ in range(num_dma_lanes)]
+    s.recv_from_controller_spm_rd_req = [RecvIfcRTL(DmaSpmReadReqType) for _ in range(num_dma_lanes)]
+    s.send_to_controller_spm_rd_resp = [SendIfcRTL(DmaSpmReadRespType) for _ in range(num_dma_lanes)]
 
     # Components.
     # A list of DataMemWrapperRTL instances. Each one is a single memory bank.
     s.memory_wrapper = [DataMemWrapperRTL(DataType, MemReadPktType, MemWritePktType, MemResponsePktType,
-                                          data_mem_size_global, data_mem_size_per_bank, mem_access_is_combinational)
+                                          data_mem_size_global, data_mem_size_per_bank, mem_access_is_combinational,
+                                          interleave_nbits, bank_storage, sram_macro)
                   for _ in range(num_banks_per_cgra)]
     # The additional 1 on inports indicates the read/write from NoC.
     # The additional 1 on outports indicates the request out of bound of
@@ -183,6 +275,60 @@ class DataMemControllerRTL(Component):
     s.address_lower = InPort(AddrType)
     s.address_upper = InPort(AddrType)
 
+    # Global address requested on each xbar inport, its bank (or
+    # num_banks_per_cgra for the NoC) and the address sent to the bank,
+    # i.e., address_lower plus the local address after the ping-pong flip.
+    s.rd_addr      = [Wire(AddrType) for _ in range(num_xbar_in_rd_ports)]
+    s.rd_bank      = [Wire(XbarOutRdType) for _ in range(num_xbar_in_rd_ports)]
+    s.rd_bank_addr = [Wire(AddrType) for _ in range(num_xbar_in_rd_ports)]
+    s.wr_addr      = [Wire(AddrType) for _ in range(num_xbar_in_wr_ports)]
+    s.wr_bank      = [Wire(XbarOutWrType) for _ in range(num_xbar_in_wr_ports)]
+    s.wr_bank_addr = [Wire(AddrType) for _ in range(num_xbar_in_wr_ports)]
+
+    # Half of the local SPM seen by the tiles and the NoC; the DMA sees
+    # the other one. The upper half is picked by flipping the top bit of
+    # the local address.
+    s.spm_buffer_sel = InPort(b1)
+    s.tile_addr_flip = Wire(AddrType)
+    s.dma_addr_flip = Wire(AddrType)
+    s.rd_addr_flip = [Wire(AddrType) for _ in range(num_xbar_in_rd_ports)]
+    s.wr_addr_flip = [Wire(AddrType) for _ in range(num_xbar_in_wr_ports)]
+
+    # Outstanding-request table of the remote loads, one entry per read
+    # port: the load is on the NoC (pending) and its response has come
+    # back with the data (arrived).
+    s.remote_load_pending = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.remote_load_arrived = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.remote_load_data = [Wire(DataType) for _ in range(num_rd_tiles)]
+    # Whether the NoC load response goes to the table, and its entry.
+    s.remote_load_hit = Wire(b1)
+    s.remote_load_port = Wire(RdTileIdType)
+
+    # Request coalescing. A read port is idle without any load in flight
+    # or waiting for a multicast. rd_followers[i] holds the ports sharing
+    # the load of port i (the leader) in this cycle, and
+    # rd_followers_reg[i] the ones still waiting for its response.
+    s.rd_inflight = [Wire(RdInflightType) for _ in range(num_rd_tiles)]
+    s.rd_blocked = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.rd_idle = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.rd_is_follower = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.rd_followers = [Wire(RdFollowerType) for _ in range(num_rd_tiles)]
+    s.rd_followers_reg = [Wire(RdFollowerType) for _ in range(num_rd_tiles)]
+    s.rd_followers_now = [Wire(RdFollowerType) for _ in range(num_rd_tiles)]
+    s.rd_attached = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.rd_multicast_rdy = [Wire(b1) for _ in range(num_rd_tiles)]
+    s.rd_multicast = [Wire(b1) for _ in range(num_rd_tiles)]
+    # Write port absorbed by the store of a lower port (wr_writer), or
+    # held back behind a lower port storing other data to the same word.
+    s.wr_absorbed = [Wire(b1) for _ in range(num_wr_tiles)]
+    s.wr_writer = [Wire(WrTileIdType) for _ in range(num_wr_tiles)]
+    s.wr_held = [Wire(b1) for _ in range(num_wr_tiles)]
+
+    # Performance counters, read through the controller.
+    s.perf_counters = [OutPort(PayloadType) for _ in range(NUM_DATA_MEM_PERF_COUNTERS)]
+    s.perf_bank_conflicts = Wire(ConflictCountType)
+    s.perf_noc_stalled = Wire(1)
+
     # Constructs the idTo2d lut.
     s.idTo2d_x_lut= [Wire(XType) for _ in range(multi_cgra_columns * multi_cgra_rows)]
     s.idTo2d_y_lut= [Wire(YType) for _ in range(multi_cgra_columns * multi_cgra_rows)]
@@ -197,6 +343,63 @@ class DataMemControllerRTL(Component):
       s.write_crossbar.send[i] //= s.memory_wrapper[i].recv_wr
       s.memory_wrapper[i].send //= s.response_crossbar.recv[i]
 
+    # Inports after the tiles' and the NoC's belong to the DMA lanes.
+    for i in range(num_xbar_in_rd_ports):
+      s.rd_addr_flip[i] //= s.dma_addr_flip if i > num_rd_tiles else s.tile_addr_flip
+    for i in range(num_xbar_in_wr_ports):
+      s.wr_addr_flip[i] //= s.dma_addr_flip if i > num_wr_tiles else s.tile_addr_flip
+
+    @update
+    def update_addr_flip():
+      s.tile_addr_flip @= AddrType(0)
+      s.dma_addr_flip @= AddrType(0)
+      if has_spm_double_buffer:
+        if s.spm_buffer_sel:
+          s.tile_addr_flip @= AddrType(spm_half_size)
+        else:
+          s.dma_addr_flip @= AddrType(spm_half_size)
+
+    @update
+    def update_req_addr():
+      for i in range(num_rd_tiles):
+        s.rd_addr[i] @= s.recv_raddr[i].msg
+      s.rd_addr[num_rd_tiles] @= s.recv_from_noc_load_request.msg.payload.data_addr
+
+      for i in range(num_wr_tiles):
+        s.wr_addr[i] @= s.recv_waddr[i].msg
+      s.wr_addr[num_wr_tiles] @= s.recv_from_noc_store_request.msg.payload.data_addr
+
+      if has_dma_ports:
+        # DMA lane i uses the xbar inports num_rd/wr_tiles + 1 + i.
+        for i in range(num_dma_lanes):
+          s.rd_addr[XbarInRdType(num_rd_tiles + 1 + i)] @= \
+              trunc(s.recv_from_controller_spm_rd_req[DmaLaneType(i)].msg.addr, AddrType)
+          s.wr_addr[XbarInWrType(num_wr_tiles + 1 + i)] @= \
+              trunc(s.recv_from_controller_spm_wr_req[DmaLaneType(i)].msg.addr, AddrType)
+
+    # Calculates the target bank of each request (see BANK_MAPPING_*).
+    @update
+    def update_bank_map():
+      for i in range(num_xbar_in_rd_ports):
+        s.rd_bank[i] @= XbarOutRdType(num_banks_per_cgra)
+        s.rd_bank_addr[i] @= s.rd_addr[i]
+        if (s.rd_addr[i] >= s.address_lower) & (s.rd_addr[i] <= s.address_upper):
+          local_addr = (s.rd_addr[i] - s.address_lower) ^ s.rd_addr_flip[i]
+          s.rd_bank[i] @= zext(trunc(local_addr >> bank_shift, LocalBankIndexType) ^
+                               (trunc(local_addr >> bank_index_nbits, LocalBankIndexType) &
+                                LocalBankIndexType(bank_hash_mask)), XbarOutRdType)
+          s.rd_bank_addr[i] @= local_addr + s.address_lower
+
+      for i in range(num_xbar_in_wr_ports):
+        s.wr_bank[i] @= XbarOutWrType(num_banks_per_cgra)
+        s.wr_bank_addr[i] @= s.wr_addr[i]
+        if (s.wr_addr[i] >= s.address_lower) & (s.wr_addr[i] <= s.address_upper):
+          local_addr = (s.wr_addr[i] - s.address_lower) ^ s.wr_addr_flip[i]
+          s.wr_bank[i] @= zext(trunc(local_addr >> bank_shift, LocalBankIndexType) ^
+                               (trunc(local_addr >> bank_index_nbits, LocalBankIndexType) &
+                                LocalBankIndexType(bank_hash_mask)), XbarOutWrType)
+          s.wr_bank_addr[i] @= local_addr + s.address_lower
+
     @update
     def assemble_xbar_pkt():
       for i in range(num_xbar_in_rd_ports):
@@ -206,98 +409,65 @@ class DataMemControllerRTL(Component):
         s.wr_pkt[i] @= MemWritePktType(i, 0, 0, DataType(0, 0, 0, 0), 0, 0, 0)
 
       for i in range(num_rd_tiles):
-        recv_raddr = s.recv_raddr[i].msg
-        # Calculates the target bank index for load.
-        if (recv_raddr >= s.address_lower) & (recv_raddr <= s.address_upper):
-          bank_index_load_local = trunc((recv_raddr - s.address_lower) >> per_bank_addr_nbits, XbarOutRdType)
-        else:
-          bank_index_load_local = XbarOutRdType(num_banks_per_cgra)
         # FIXME: change to exact tile id.
         s.rd_pkt[i] @= MemReadPktType(i,                       # src
-                                      bank_index_load_local,   # dst
-                                      recv_raddr,              # addr
+                                      s.rd_bank[i],            # dst
+                                      s.rd_bank_addr[i],       # addr
                                       DataType(0, 0, 0, 0),    # data
                                       s.cgra_id,               # src_cgra
                                       0,                       # src_tile
                                       i)                       # remote_src_port
 
-      recv_raddr_from_noc = s.recv_from_noc_load_request.msg.payload.data_addr
-      # Calculates the target bank index.
-      if (recv_raddr_from_noc >= s.address_lower) & (recv_raddr_from_noc <= s.address_upper):
-        bank_index_load_from_noc = trunc((recv_raddr_from_noc - s.address_lower) >> per_bank_addr_nbits, XbarOutRdType)
-      else:
-        bank_index_load_from_noc = XbarOutRdType(num_banks_per_cgra)
       s.rd_pkt[num_rd_tiles] @= MemReadPktType(num_rd_tiles,                                     # src
-                                               bank_index_load_from_noc,                         # dst
-                                               recv_raddr_from_noc,                              # addr
+                                               s.rd_bank[num_rd_tiles],                          # dst
+                                               s.rd_bank_addr[num_rd_tiles],                     # addr
                                                DataType(0, 0, 0, 0),                             # data
                                                s.recv_from_noc_load_request.msg.src,             # src_cgra
                                                s.recv_from_noc_load_request.msg.src_tile_id,     # src_tile
-                                               s.recv_from_noc_load_request.msg.remote_src_port) # remote_src_port   
+                                               s.recv_from_noc_load_request.msg.remote_src_port) # remote_src_port
 
       for i in range(num_wr_tiles):
-        recv_waddr = s.recv_waddr[i].msg
-        # Calculates the target bank index for store.
-        if (recv_waddr >= s.address_lower) & (recv_waddr <= s.address_upper):
-          bank_index_store_local = trunc((recv_waddr - s.address_lower) >> per_bank_addr_nbits, XbarOutWrType)
-        else:
-          bank_index_store_local = XbarOutWrType(num_banks_per_cgra)
         s.wr_pkt[i] @= MemWritePktType(i,                       # src
-                                       bank_index_store_local,  # dst
-                                       recv_waddr,              # addr
+                                       s.wr_bank[i],            # dst
+                                       s.wr_bank_addr[i],       # addr
                                        s.recv_wdata[i].msg,     # data
                                        0,                       # src_cgra
                                        0,                       # src_tile
                                        i)                       # remote_src_port
 
-      recv_waddr_from_noc = s.recv_from_noc_store_request.msg.payload.data_addr
-      recv_wdata_from_noc = s.recv_from_noc_store_request.msg.payload.data
-      if (recv_waddr_from_noc >= s.address_lower) & (recv_waddr_from_noc <= s.address_upper):
-        bank_index_store_from_noc = trunc((recv_waddr_from_noc - s.address_lower) >> per_bank_addr_nbits, XbarOutWrType)
-      else:
-        bank_index_store_from_noc = XbarOutWrType(num_banks_per_cgra)
-      s.wr_pkt[num_wr_tiles] @= MemWritePktType(num_wr_tiles,               # src
-                                                bank_index_store_from_noc,  # dst
-                                                recv_waddr_from_noc,        # addr
-                                                recv_wdata_from_noc,        # data
-                                                0,                          # src_cgra
-                                                0,                          # src_tile
-                                                num_wr_tiles)               # remote_src_port
+      s.wr_pkt[num_wr_tiles] @= MemWritePktType(num_wr_tiles,                                  # src
+                                                s.wr_bank[num_wr_tiles],                       # dst
+                                                s.wr_bank_addr[num_wr_tiles],                  # addr
+                                                s.recv_from_noc_store_request.msg.payload.data, # data
+                                                0,                                             # src_cgra
+                                                0,                                             # src_tile
+                                                num_wr_tiles)                                  # remote_src_port
 
       if has_dma_ports:
 
-        # When `has_dma_ports` is True, num_xbar_in_wr_ports = num_wr_tiles + 1 + 1(dma_port_offset).
-        # Use dma_wr_idx = num_wr_tiles + 1 = num_xbar_in_wr_ports - 1
-        # NOTE Don't use `dma_wr_idx = num_wr_tiles + 1` here since it will cause the bit mismatch error 
+        # When `has_dma_ports` is True, num_xbar_in_wr_ports = num_wr_tiles + 1 + num_dma_lanes(dma_port_offset).
+        # DMA lane i uses dma_wr_idx = num_wr_tiles + 1 + i.
+        # NOTE The index is casted to the xbar inport type to avoid the bit mismatch error
         # between `dma_wr_idx` and `num_xbar_in_wr_ports`.
-        dma_rd_idx = XbarInRdType(num_xbar_in_rd_ports - 1)
-        dma_wr_idx = XbarInWrType(num_xbar_in_wr_ports - 1)
-
-        recv_raddr_from_dma = trunc(s.recv_from_controller_spm_rd_req.msg.addr, AddrType)
-        if (recv_raddr_from_dma >= s.address_lower) & (recv_raddr_from_dma <= s.address_upper):
-          bank_index_load_from_dma = trunc((recv_raddr_from_dma - s.address_lower) >> per_bank_addr_nbits, XbarOutRdType)
-        else:
-          bank_index_load_from_dma = XbarOutRdType(num_banks_per_cgra)
-        s.rd_pkt[dma_rd_idx] @= MemReadPktType(dma_rd_idx,                  # src
-                                               bank_index_load_from_dma,    # dst
-                                               recv_raddr_from_dma,         # addr
-                                               DataType(0, 0, 0, 0),        # data
-                                               s.cgra_id,                   # src_cgra
-                                               0,                           # src_tile
-                                               0)                           # remote_src_port
-
-        recv_waddr_from_dma = trunc(s.recv_from_controller_spm_wr_req.msg.addr, AddrType)
-        if (recv_waddr_from_dma >= s.address_lower) & (recv_waddr_from_dma <= s.address_upper):
-          bank_index_store_from_dma = trunc((recv_waddr_from_dma - s.address_lower) >> per_bank_addr_nbits, XbarOutWrType)
-        else:
-          bank_index_store_from_dma = XbarOutWrType(num_banks_per_cgra)
-        s.wr_pkt[dma_wr_idx] @= MemWritePktType(dma_wr_idx,                 # src
-                                                bank_index_store_from_dma,  # dst
-                                                recv_waddr_from_dma,        # addr
-                                                DataType(zext(s.recv_from_controller_spm_wr_req.msg.data, PayloadType), 1, 0, 0),
-                                                0,                          # src_cgra
-                                                0,                          # src_tile
-                                                0)                          # remote_src_port
+        for i in range(num_dma_lanes):
+          dma_rd_idx = XbarInRdType(num_rd_tiles + 1 + i)
+          dma_wr_idx = XbarInWrType(num_wr_tiles + 1 + i)
+
+          s.rd_pkt[dma_rd_idx] @= MemReadPktType(dma_rd_idx,                  # src
+                                                 s.rd_bank[dma_rd_idx],       # dst
+                                                 s.rd_bank_addr[dma_rd_idx],  # addr
+                                                 DataType(0, 0, 0, 0),        # data
+                                                 s.cgra_id,                   # src_cgra
+                                                 0,                           # src_tile
+                                                 0)                           # remote_src_port
+
+          s.wr_pkt[dma_wr_idx] @= MemWritePktType(dma_wr_idx,                 # src
+                                                  s.wr_bank[dma_wr_idx],      # dst
+                                                  s.wr_bank_addr[dma_wr_idx], # addr
+                                                  DataType(zext(s.recv_from_controller_spm_wr_req[DmaLaneType(i)].msg.data, PayloadType), 1, 0, 0),
+                                                  0,                          # src_cgra
+                                                  0,                          # src_tile
+                                                  0)                          # remote_src_port
 
     # Connects xbar with the memory wrapper.
     @update
@@ -362,10 +532,11 @@ class DataMemControllerRTL(Component):
         s.write_crossbar.recv[i].val @= 0
         s.write_crossbar.recv[i].msg @= MemWritePktType(0, 0, 0, DataType(0, 0, 0, 0), 0, 0, 0)
 
-      s.recv_from_controller_spm_wr_req.rdy          @= 0
-      s.recv_from_controller_spm_rd_req.rdy           @= 0
-      s.send_to_controller_spm_rd_resp.val      @= 0
-      s.send_to_controller_spm_rd_resp.msg      @= DmaSpmReadRespType(DmaSpmDataType(0))
+      for i in range(num_dma_lanes):
+        s.recv_from_controller_spm_wr_req[i].rdy  @= 0
+        s.recv_from_controller_spm_rd_req[i].rdy  @= 0
+        s.send_to_controller_spm_rd_resp[i].val   @= 0
+        s.send_to_controller_spm_rd_resp[i].msg   @= DmaSpmReadRespType(DmaSpmDataType(0))
 
       s.send_to_noc_load_request_pkt.msg @= \
           NocPktType(0, # src
@@ -384,51 +555,69 @@ class DataMemControllerRTL(Component):
       s.send_to_noc_load_request_pkt.val @= 0
 
       # Connects the load request ports (from tiles and NoC) to the xbar targetting memory and NoC.
+      # A port waiting for a remote load or a multicast issues nothing else (see the
+      # outstanding-request table and the request coalescing), and the ports sharing
+      # the load of a lower one are accepted along with it.
       for i in range(num_rd_tiles):
-          s.read_crossbar.recv[i].val @= s.recv_raddr[i].val
+          s.read_crossbar.recv[i].val @= s.recv_raddr[i].val & ~s.rd_blocked[i] & ~s.rd_is_follower[i]
           s.read_crossbar.recv[i].msg @= s.rd_pkt[i]
-          s.recv_raddr[i].rdy @= s.read_crossbar.recv[i].rdy
+          s.recv_raddr[i].rdy @= s.read_crossbar.recv[i].rdy & ~s.rd_blocked[i]
+      for j in range(num_rd_tiles):
+        for i in range(j):
+          if s.rd_followers[i][j]:
+            s.recv_raddr[j].rdy @= s.read_crossbar.recv[i].val & s.read_crossbar.recv[i].rdy
       s.read_crossbar.recv[num_rd_tiles].val @= s.recv_from_noc_load_request.val
       s.read_crossbar.recv[num_rd_tiles].msg @= s.rd_pkt[num_rd_tiles]
       s.recv_from_noc_load_request.rdy @= s.read_crossbar.recv[num_rd_tiles].rdy
 
       if has_dma_ports:
-        # When `has_dma_ports` is True, num_xbar_in_rd_ports = num_rd_tiles + 1 + 1(dma_port_offset).
-        # Use dma_rd_idx = num_rd_tiles + 1 = num_xbar_in_rd_ports - 1
-        # NOTE Don't use `dma_rd_idx = num_rd_tiles + 1` here since it will cause the bit mismatch error 
+        # When `has_dma_ports` is True, num_xbar_in_rd_ports = num_rd_tiles + 1 + num_dma_lanes(dma_port_offset).
+        # DMA lane i uses dma_rd_idx = num_rd_tiles + 1 + i.
+        # NOTE The index is casted to the xbar inport type to avoid the bit mismatch error
         # between `dma_rd_idx` and `num_xbar_in_rd_ports`.
-        dma_rd_idx = XbarInRdType(num_xbar_in_rd_ports - 1)
-        s.read_crossbar.recv[dma_rd_idx].val @= s.recv_from_controller_spm_rd_req.val
-        s.read_crossbar.recv[dma_rd_idx].msg @= s.rd_pkt[dma_rd_idx]
-        s.recv_from_controller_spm_rd_req.rdy @= s.read_crossbar.recv[dma_rd_idx].rdy
+        for i in range(num_dma_lanes):
+          dma_rd_idx = XbarInRdType(num_rd_tiles + 1 + i)
+          s.read_crossbar.recv[dma_rd_idx].val @= s.recv_from_controller_spm_rd_req[DmaLaneType(i)].val
+          s.read_crossbar.recv[dma_rd_idx].msg @= s.rd_pkt[dma_rd_idx]
+          s.recv_from_controller_spm_rd_req[DmaLaneType(i)].rdy @= s.read_crossbar.recv[dma_rd_idx].rdy
       
       # Connects the store request ports (from tiles and NoC) to the xbar targetting memory and NoC.
       for i in range(num_wr_tiles):
-        s.write_crossbar.recv[i].val @= s.recv_waddr[i].val
+        s.write_crossbar.recv[i].val @= s.recv_waddr[i].val & ~s.wr_absorbed[i] & ~s.wr_held[i]
         s.write_crossbar.recv[i].msg @= s.wr_pkt[i]
-        s.recv_waddr[i].rdy @= s.write_crossbar.recv[i].rdy
-        s.recv_wdata[i].rdy @= s.write_crossbar.recv[i].rdy
+        s.recv_waddr[i].rdy @= s.write_crossbar.recv[i].rdy & ~s.wr_held[i]
+        s.recv_wdata[i].rdy @= s.write_crossbar.recv[i].rdy & ~s.wr_held[i]
+      # Stores combined into a lower port's one complete along with it.
+      for i in range(num_wr_tiles):
+        for j in range(i):
+          if s.wr_absorbed[i] & (s.wr_writer[i] == WrTileIdType(j)):
+            s.recv_waddr[i].rdy @= s.write_crossbar.recv[j].val & s.write_crossbar.recv[j].rdy
+            s.recv_wdata[i].rdy @= s.write_crossbar.recv[j].val & s.write_crossbar.recv[j].rdy
       s.write_crossbar.recv[num_wr_tiles].val @= s.recv_from_noc_store_request.val
       s.write_crossbar.recv[num_wr_tiles].msg @= s.wr_pkt[num_wr_tiles]
       s.recv_from_noc_store_request.rdy @= s.write_crossbar.recv[num_wr_tiles].rdy
 
       if has_dma_ports:
-        # When `has_dma_ports` is True, num_xbar_in_wr_ports = num_wr_tiles + 1 + 1(dma_port_offset).
-        # Use dma_wr_idx = num_wr_tiles + 1 = num_xbar_in_wr_ports - 1
-        # NOTE Don't use `dma_wr_idx = num_wr_tiles + 1` here since it will cause the bit mismatch error 
-        # between `dma_wr_idx` and `num_xbar_in_wr_ports`.
-        dma_wr_idx = XbarInWrType(num_xbar_in_wr_ports - 1)
-        s.write_crossbar.recv[dma_wr_idx].val @= s.recv_from_controller_spm_wr_req.val
-        s.write_crossbar.recv[dma_wr_idx].msg @= s.wr_pkt[dma_wr_idx]
-        s.recv_from_controller_spm_wr_req.rdy @= s.write_crossbar.recv[dma_wr_idx].rdy
+        # DMA lane i uses dma_wr_idx = num_wr_tiles + 1 + i, see above.
+        for i in range(num_dma_lanes):
+          dma_wr_idx = XbarInWrType(num_wr_tiles + 1 + i)
+          s.write_crossbar.recv[dma_wr_idx].val @= s.recv_from_controller_spm_wr_req[DmaLaneType(i)].val
+          s.write_crossbar.recv[dma_wr_idx].msg @= s.wr_pkt[dma_wr_idx]
+          s.recv_from_controller_spm_wr_req[DmaLaneType(i)].rdy @= s.write_crossbar.recv[dma_wr_idx].rdy
 
       # Connects the response ports to tiles and NoC from the xbar.
       # Number of load responses is expected to be the same as the number of load requests.
       for i in range(num_xbar_in_rd_ports):
         if i < num_rd_tiles:
+          # A bank response to a coalesced load goes to all its ports at once.
           s.send_rdata[RdTileIdType(i)].msg @= s.response_crossbar.send[i].msg.data
-          s.send_rdata[RdTileIdType(i)].val @= s.response_crossbar.send[i].val
-          s.response_crossbar.send[i].rdy @= s.send_rdata[RdTileIdType(i)].rdy
+          s.send_rdata[RdTileIdType(i)].val @= s.response_crossbar.send[i].val & s.rd_multicast_rdy[i]
+          s.response_crossbar.send[i].rdy @= s.send_rdata[RdTileIdType(i)].rdy & s.rd_multicast_rdy[i]
+          # The remote response buffered in the table goes after any
+          # older local one.
+          if ~s.response_crossbar.send[i].val & s.remote_load_arrived[i]:
+            s.send_rdata[RdTileIdType(i)].msg @= s.remote_load_data[i]
+            s.send_rdata[RdTileIdType(i)].val @= 1
         elif i == num_rd_tiles:
           from_cgra_id = s.response_crossbar.send[i].msg.src_cgra
           from_tile_id = s.response_crossbar.send[i].msg.src_tile
@@ -448,15 +637,25 @@ class DataMemControllerRTL(Component):
                     CgraPayloadType(
                         CMD_LOAD_RESPONSE,
                         s.response_crossbar.send[i].msg.data,
-                        s.response_crossbar.send[i].msg.addr, 0, 0))
+                        # Returns the address as requested, before the ping-pong flip.
+                        ((s.response_crossbar.send[i].msg.addr - s.address_lower) ^ s.tile_addr_flip) +
+                        s.address_lower, 0, 0))
 
           s.send_to_noc_load_response_pkt.val @= s.response_crossbar.send[i].val
           s.response_crossbar.send[i].rdy @= s.send_to_noc_load_response_pkt.rdy
         elif has_dma_ports:
-          s.send_to_controller_spm_rd_resp.msg      @= DmaSpmReadRespType(
+          # Responses to DMA lane (i - num_rd_tiles - 1).
+          s.send_to_controller_spm_rd_resp[DmaLaneType(i - num_rd_tiles - 1)].msg @= DmaSpmReadRespType(
             trunc(s.response_crossbar.send[i].msg.data.payload, DmaSpmDataType))
-          s.send_to_controller_spm_rd_resp.val      @= s.response_crossbar.send[i].val
-          s.response_crossbar.send[i].rdy @= s.send_to_controller_spm_rd_resp.rdy
+          s.send_to_controller_spm_rd_resp[DmaLaneType(i - num_rd_tiles - 1)].val @= s.response_crossbar.send[i].val
+          s.response_crossbar.send[i].rdy @= s.send_to_controller_spm_rd_resp[DmaLaneType(i - num_rd_tiles - 1)].rdy
+
+      for j in range(num_rd_tiles):
+        if s.rd_multicast[j]:
+          for i in range(j):
+            if s.rd_followers_now[i][j]:
+              s.send_rdata[RdTileIdType(j)].msg @= s.response_crossbar.send[i].msg.data
+              s.send_rdata[RdTileIdType(j)].val @= 1
 
       # Handles the request (not response) towards the others via the NoC. The dst would be
       # updated in the controller.
@@ -478,10 +677,15 @@ class DataMemControllerRTL(Component):
                           s.read_crossbar.send[num_banks_per_cgra].msg.addr, 0, 0))
 
       s.send_to_noc_load_request_pkt.val @= s.read_crossbar.send[num_banks_per_cgra].val 
-      # TODO: https://github.com/tancheng/VectorCGRA/issues/26 -- Modify this part for non-blocking access.
-      # 'val` indicates the data is arbitrated successfully.
+      # 'val` indicates the data is arbitrated successfully. With
+      # non-blocking loads, the responses to the tiles go into the
+      # outstanding-request table instead, see update_remote_loads().
       s.recv_from_noc_load_response_pkt.rdy @= s.response_crossbar.recv[num_banks_per_cgra].rdy
       s.response_crossbar.recv[num_banks_per_cgra].val @= s.recv_from_noc_load_response_pkt.val
+      if s.remote_load_hit:
+        s.recv_from_noc_load_response_pkt.rdy @= s.remote_load_pending[s.remote_load_port] & \
+                                                 ~s.remote_load_arrived[s.remote_load_port]
+        s.response_crossbar.recv[num_banks_per_cgra].val @= 0
       s.response_crossbar.recv[num_banks_per_cgra].msg @= \
           MemResponsePktType(num_banks_per_cgra,
                              zext(s.recv_from_noc_load_response_pkt.msg.remote_src_port, XbarInRdType),
@@ -491,8 +695,9 @@ class DataMemControllerRTL(Component):
                              s.recv_from_noc_load_response_pkt.msg.src_tile_id,
                              0)
 
-      # Allows other load request towards NoC when the previous one is not responded. There
-      # could be out-of-order load response, i.e., potential consistency issue.
+      # Allows other load request towards NoC when the previous one is not responded. Without
+      # non-blocking loads, there could be out-of-order load response on the same port, i.e.,
+      # potential consistency issue.
       s.read_crossbar.send[num_banks_per_cgra].rdy @= s.send_to_noc_load_request_pkt.rdy
 
       # Handles the write port towards the NoC.
@@ -516,6 +721,167 @@ class DataMemControllerRTL(Component):
       s.send_to_noc_store_pkt.val @= s.write_crossbar.send[num_banks_per_cgra].val
       s.write_crossbar.send[num_banks_per_cgra].rdy @= s.send_to_noc_store_pkt.rdy
 
+    @update
+    def update_remote_load_hit():
+      s.remote_load_hit @= 0
+      s.remote_load_port @= trunc(s.recv_from_noc_load_response_pkt.msg.remote_src_port, RdTileIdType)
+      if has_non_blocking_loads:
+        s.remote_load_hit @= s.recv_from_noc_load_response_pkt.msg.remote_src_port < \
+                             NocRemoteSrcPortType(num_rd_tiles)
+
+    # Outstanding-request table: entry i is taken by the remote load of
+    # read port i, filled by its response and drained into send_rdata[i].
+    @update_ff
+    def update_remote_loads():
+      if s.reset:
+        for i in range(num_rd_tiles):
+          s.remote_load_pending[i] <<= 0
+          s.remote_load_arrived[i] <<= 0
+          s.remote_load_data[i] <<= DataType(0, 0, 0, 0)
+      elif has_non_blocking_loads:
+        for i in range(num_rd_tiles):
+          if s.read_crossbar.send[num_banks_per_cgra].val & \
+             s.read_crossbar.send[num_banks_per_cgra].rdy & \
+             (s.read_crossbar.send[num_banks_per_cgra].msg.src == XbarInRdType(i)):
+            s.remote_load_pending[i] <<= 1
+          if s.recv_from_noc_load_response_pkt.val & s.recv_from_noc_load_response_pkt.rdy & \
+             s.remote_load_hit & (s.remote_load_port == RdTileIdType(i)):
+            s.remote_load_arrived[i] <<= 1
+            s.remote_load_data[i] <<= s.recv_from_noc_load_response_pkt.msg.payload.data
+          if s.remote_load_arrived[i] & ~s.response_crossbar.send[i].val & \
+             s.send_rdata[RdTileIdType(i)].rdy:
+            s.remote_load_pending[i] <<= 0
+            s.remote_load_arrived[i] <<= 0
+
+    @update
+    def update_rd_coalescing():
+      for i in range(num_rd_tiles):
+        s.rd_blocked[i] @= s.remote_load_pending[i] | s.rd_attached[i] | \
+                           (s.rd_followers_reg[i] != RdFollowerType(0)) | \
+                           (s.rd_inflight[i] == RdInflightType(max_rd_inflight))
+        s.rd_idle[i] @= ~s.rd_blocked[i] & (s.rd_inflight[i] == RdInflightType(0))
+        s.rd_is_follower[i] @= 0
+        s.rd_followers[i] @= RdFollowerType(0)
+      if has_request_coalescing:
+        # Port j follows the lowest leader loading the same local word.
+        for j in range(num_rd_tiles):
+          for i in range(j):
+            if ~s.rd_is_follower[j] & ~s.rd_is_follower[i] & \
+               s.recv_raddr[i].val & s.rd_idle[i] & \
+               s.recv_raddr[j].val & s.rd_idle[j] & \
+               (s.rd_bank[i] < XbarOutRdType(num_banks_per_cgra)) & \
+               (s.rd_bank[i] == s.rd_bank[j]) & (s.rd_bank_addr[i] == s.rd_bank_addr[j]):
+              s.rd_is_follower[j] @= 1
+              s.rd_followers[i] @= s.rd_followers[i] | RdFollowerType(1 << j)
+
+      # The followers of port i waiting for the response on its way, which
+      # may come back in the cycle the load is accepted.
+      for i in range(num_rd_tiles):
+        s.rd_followers_now[i] @= s.rd_followers_reg[i]
+        if s.read_crossbar.recv[i].val & s.read_crossbar.recv[i].rdy:
+          s.rd_followers_now[i] @= s.rd_followers_reg[i] | s.rd_followers[i]
+
+      # All the ports of a multicast take the response in the same cycle,
+      # once none of the followers is busy with another response.
+      for i in range(num_rd_tiles):
+        s.rd_multicast_rdy[i] @= 1
+        s.rd_multicast[i] @= 0
+      for i in range(num_rd_tiles):
+        if s.response_crossbar.send[i].msg.src < XbarOutRdType(num_banks_per_cgra):
+          for j in range(i + 1, num_rd_tiles):
+            if s.rd_followers_now[i][j]:
+              s.rd_multicast_rdy[i] @= s.rd_multicast_rdy[i] & s.send_rdata[RdTileIdType(j)].rdy & \
+                                       ~s.response_crossbar.send[j].val & ~s.remote_load_arrived[j]
+          if s.rd_followers_now[i] != RdFollowerType(0):
+            s.rd_multicast_rdy[i] @= s.rd_multicast_rdy[i] & s.send_rdata[RdTileIdType(i)].rdy
+      for i in range(num_rd_tiles):
+        if (s.response_crossbar.send[i].msg.src < XbarOutRdType(num_banks_per_cgra)) & \
+           s.response_crossbar.send[i].val & s.rd_multicast_rdy[i]:
+          for j in range(i + 1, num_rd_tiles):
+            if s.rd_followers_now[i][j]:
+              s.rd_multicast[j] @= 1
+
+    @update
+    def update_wr_coalescing():
+      for i in range(num_wr_tiles):
+        s.wr_absorbed[i] @= 0
+        s.wr_writer[i] @= WrTileIdType(0)
+        s.wr_held[i] @= 0
+      if has_request_coalescing:
+        # The lowest port storing to the same local word writes it, for
+        # the ports above storing the same data too, until one stores
+        # other data.
+        for i in range(num_wr_tiles):
+          for j in range(i):
+            if s.recv_waddr[i].val & s.recv_waddr[j].val & \
+               (s.wr_bank[i] < XbarOutWrType(num_banks_per_cgra)) & \
+               (s.wr_bank[i] == s.wr_bank[j]) & (s.wr_bank_addr[i] == s.wr_bank_addr[j]):
+              if s.recv_wdata[i].msg != s.recv_wdata[j].msg:
+                s.wr_held[i] @= 1
+              elif ~s.wr_absorbed[i]:
+                s.wr_absorbed[i] @= 1
+                s.wr_writer[i] @= WrTileIdType(j)
+          if s.wr_held[i]:
+            s.wr_absorbed[i] @= 0
+
+    @update_ff
+    def update_rd_inflight():
+      if s.reset:
+        for i in range(num_rd_tiles):
+          s.rd_inflight[i] <<= RdInflightType(0)
+          s.rd_followers_reg[i] <<= RdFollowerType(0)
+          s.rd_attached[i] <<= 0
+      elif has_request_coalescing:
+        for i in range(num_rd_tiles):
+          issued = s.read_crossbar.recv[i].val & s.read_crossbar.recv[i].rdy & \
+                   (s.rd_bank[i] < XbarOutRdType(num_banks_per_cgra))
+          returned = s.response_crossbar.send[i].val & s.response_crossbar.send[i].rdy & \
+                     (s.response_crossbar.send[i].msg.src < XbarOutRdType(num_banks_per_cgra))
+          if issued & ~returned:
+            s.rd_inflight[i] <<= s.rd_inflight[i] + RdInflightType(1)
+          elif returned & ~issued:
+            s.rd_inflight[i] <<= s.rd_inflight[i] - RdInflightType(1)
+          if returned:
+            s.rd_followers_reg[i] <<= RdFollowerType(0)
+          elif issued:
+            s.rd_followers_reg[i] <<= s.rd_followers[i]
+          if s.rd_multicast[i]:
+            s.rd_attached[i] <<= 0
+          elif s.rd_is_follower[i] & s.recv_raddr[i].val & s.recv_raddr[i].rdy:
+            s.rd_attached[i] <<= 1
+
+    # Events sampled by the performance counters.
+    @update
+    def update_perf_events():
+      # Requests towards a local bank that the crossbars hold back.
+      conflicts = ConflictCountType(0)
+      for i in range(num_xbar_in_rd_ports):
+        if s.read_crossbar.recv[i].val & ~s.read_crossbar.recv[i].rdy & \
+           (s.rd_pkt[i].dst < XbarOutRdType(num_banks_per_cgra)):
+          conflicts = conflicts + ConflictCountType(1)
+      for i in range(num_xbar_in_wr_ports):
+        if s.write_crossbar.recv[i].val & ~s.write_crossbar.recv[i].rdy & \
+           (s.wr_pkt[i].dst < XbarOutWrType(num_banks_per_cgra)):
+          conflicts = conflicts + ConflictCountType(1)
+      s.perf_bank_conflicts @= conflicts
+
+      s.perf_noc_stalled @= \
+          (s.send_to_noc_load_request_pkt.val & ~s.send_to_noc_load_request_pkt.rdy) | \
+          (s.send_to_noc_store_pkt.val & ~s.send_to_noc_store_pkt.rdy) | \
+          (s.send_to_noc_load_response_pkt.val & ~s.send_to_noc_load_response_pkt.rdy)
+
+    @update_ff
+    def update_perf_counters():
+      if s.reset:
+        for i in range(NUM_DATA_MEM_PERF_COUNTERS):
+          s.perf_counters[i] <<= PayloadType(0)
+      elif has_perf_counters:
+        s.perf_counters[PERF_DATA_MEM_BANK_CONFLICT] <<= \
+            s.perf_counters[PERF_DATA_MEM_BANK_CONFLICT] + zext(s.perf_bank_conflicts, PayloadType)
+        if s.perf_noc_stalled:
+          s.perf_counters[PERF_DATA_MEM_NOC_STALL] <<= \
+              s.perf_counters[PERF_DATA_MEM_NOC_STALL] + PayloadType(1)
+
   def line_trace(s):
     recv_raddr_str = "recv_from_tile_read_addr: {"
     recv_waddr_str = "recv_from_tile_write_addr: {"
@@ -533,7 +899,7 @@ class DataMemControllerRTL(Component):
       recv_raddr_str += " bank[" + str(b) + "]: " + "|".join([str(data.msg) for data in s.recv_raddr]) + ";"
       recv_waddr_str += " bank[" + str(b) + "]: " + "|".join([str(data.msg) for data in s.recv_waddr]) + ";"
       recv_wdata_str += " bank[" + str(b) + "]: " + "|".join([str(data.msg) for data in s.recv_wdata]) + ";"
-      content_str +=  " bank[" + str(b) + "]: " + "|".join([str(data) for data in s.memory_wrapper[b].memory.regs]) + ";"
+      content_str +=  " bank[" + str(b) + "]: " + "|".join([str(data) for data in getattr(s.memory_wrapper[b].memory, 'regs', [])]) + ";"
       send_rdata_str += " bank[" + str(b) + "]: " + "|".join([str(data.msg) for data in s.send_rdata]) + ";"
 
     send_to_noc_load_request_pkt_str += str(s.send_to_noc_load_request_pkt.msg) + ";"
@@ -2,7 +2,8 @@
 ==========================================================================
 DataMemWrapperRTL.py
 ==========================================================================
-Data memory for CGRA.
+Data memory for CGRA, i.e., one bank of the data SPM. The bank is either
+a register file or an SRAM with a pipelined read port (`bank_storage`).
 
 Author : Cheng Tan
   Date : Aug 27, 2025
@@ -14,7 +15,14 @@ from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.common import (
+  BANK_STORAGE_REGISTER_FILE,
+  BANK_STORAGE_SRAM_1R1W,
+  BANK_STORAGE_SRAM_1RW,
+)
+from ...lib.util import line_trace
 from ...noc.PyOCN.pymtl3_net.channel.ChannelRTL import ChannelRTL
+from .SramRTL import SramMacroRTL, SramRTL
 
 class DataMemWrapperRTL(Component):
 
@@ -25,9 +33,14 @@ class DataMemWrapperRTL(Component):
                 MemResponseType,
                 global_data_mem_size,
                 per_bank_data_mem_size,
-                is_combinational = True):
+                is_combinational = True,
+                interleave_nbits = 0,
+                bank_storage = BANK_STORAGE_REGISTER_FILE,
+                sram_macro = None):
 
     # Constant.
+    # The lowest interleave_nbits of the address select the bank (see
+    # DataMemControllerRTL's bank_mapping), the next ones the word in it.
     GlobalAddrType = mk_bits(clog2(global_data_mem_size))
     PerBankAddrType = mk_bits(clog2(per_bank_data_mem_size))
 
@@ -36,72 +49,130 @@ class DataMemWrapperRTL(Component):
     s.recv_wr = RecvIfcRTL(MemWriteType)
     s.send    = SendIfcRTL(MemResponseType)
 
-    # Component.
-    # As we include xbar and multi-bank for the memory hierarchy,
-    # we prefer as few as possible number of ports.
-    rd_ports_per_bank = 1
-    wr_ports_per_bank = 1
-    s.memory = RegisterFile(DataType, per_bank_data_mem_size,
-                            rd_ports_per_bank, wr_ports_per_bank)
-    # TODO: We need to replace channel (normal queue) with bypass
-    # queue when replacing register file with SRAM. This channel
-    # here is used to mimic the SRAM 1 cycle latency. Bypass queue
-    # can still queue up the load requests, facilitating streaming.
-    latency = 0 if is_combinational else 1
-    s.channel_rd = ChannelRTL(MemReadType, latency = latency)
-    s.channel_wr = ChannelRTL(MemWriteType, latency = latency)
-
-    # Connection.
-    s.recv_rd //= s.channel_rd.recv
-    s.recv_wr //= s.channel_wr.recv
-
-    @update
-    def compose_send_msg():
-      s.send.msg @= MemResponseType(0, 0, 0, DataType(0, 0, 0, 0), 0, 0, 0)
-      # TODO: change to pipe's out's wen.
-      if s.channel_rd.send.val:
-        s.send.msg.src                @= s.channel_rd.send.msg.dst
-        s.send.msg.dst                @= s.channel_rd.send.msg.src
-        s.send.msg.addr               @= s.channel_rd.send.msg.addr
-        s.send.msg.data               @= s.memory.rdata[0]
-        s.send.msg.src_cgra           @= s.channel_rd.send.msg.src_cgra
-        s.send.msg.src_tile           @= s.channel_rd.send.msg.src_tile
-        s.send.msg.remote_src_port    @= s.channel_rd.send.msg.remote_src_port
-
-    @update
-    def request_memory():
-      # Default values.
-      s.memory.wen[0]   @= 0
-      s.memory.raddr[0] @= PerBankAddrType(0)
-      s.memory.waddr[0] @= PerBankAddrType(0)
-      s.memory.wdata[0] @= DataType(0, 0, 0, 0)
-
-      if s.channel_rd.send.val:
-        s.memory.raddr[0] @= \
-          trunc(s.channel_rd.send.msg.addr % per_bank_data_mem_size, PerBankAddrType)
-      if s.channel_wr.send.val:
-        s.memory.waddr[0] @= \
-          trunc(s.channel_wr.send.msg.addr % per_bank_data_mem_size, PerBankAddrType)
-        s.memory.wdata[0] @= s.channel_wr.send.msg.data
-        s.memory.wen[0]   @= 1
-
-    @update
-    def notify_channel_rdy():
-      # TODO: change to SRAM's rdy when replacing register file
-      # with SRAM.
-      s.channel_rd.send.rdy @= s.send.rdy
-      s.channel_wr.send.rdy @= 1
-
-    @update
-    def notify_send_val():
-      # TODO: change to SRAM's valid when replacing register file
-      # with SRAM.
-      s.send.val @= s.channel_rd.send.val
+    if bank_storage == BANK_STORAGE_REGISTER_FILE:
+
+      # Component.
+      # As we include xbar and multi-bank for the memory hierarchy,
+      # we prefer as few as possible number of ports.
+      rd_ports_per_bank = 1
+      wr_ports_per_bank = 1
+      s.memory = RegisterFile(DataType, per_bank_data_mem_size,
+                              rd_ports_per_bank, wr_ports_per_bank)
+      # This channel mimics the SRAM 1 cycle latency, see the SRAM
+      # storage below for the pipelined version.
+      latency = 0 if is_combinational else 1
+      s.channel_rd = ChannelRTL(MemReadType, latency = latency)
+      s.channel_wr = ChannelRTL(MemWriteType, latency = latency)
+
+      # Connection.
+      s.recv_rd //= s.channel_rd.recv
+      s.recv_wr //= s.channel_wr.recv
+
+      @update
+      def compose_send_msg():
+        s.send.msg @= MemResponseType(0, 0, 0, DataType(0, 0, 0, 0), 0, 0, 0)
+        if s.channel_rd.send.val:
+          s.send.msg.src                @= s.channel_rd.send.msg.dst
+          s.send.msg.dst                @= s.channel_rd.send.msg.src
+          s.send.msg.addr               @= s.channel_rd.send.msg.addr
+          s.send.msg.data               @= s.memory.rdata[0]
+          s.send.msg.src_cgra           @= s.channel_rd.send.msg.src_cgra
+          s.send.msg.src_tile           @= s.channel_rd.send.msg.src_tile
+          s.send.msg.remote_src_port    @= s.channel_rd.send.msg.remote_src_port
+
+      @update
+      def request_memory():
+        # Default values.
+        s.memory.wen[0]   @= 0
+        s.memory.raddr[0] @= PerBankAddrType(0)
+        s.memory.waddr[0] @= PerBankAddrType(0)
+        s.memory.wdata[0] @= DataType(0, 0, 0, 0)
+
+        if s.channel_rd.send.val:
+          s.memory.raddr[0] @= \
+            trunc((s.channel_rd.send.msg.addr >> interleave_nbits) % per_bank_data_mem_size, PerBankAddrType)
+        if s.channel_wr.send.val:
+          s.memory.waddr[0] @= \
+            trunc((s.channel_wr.send.msg.addr >> interleave_nbits) % per_bank_data_mem_size, PerBankAddrType)
+          s.memory.wdata[0] @= s.channel_wr.send.msg.data
+          s.memory.wen[0]   @= 1
+
+      @update
+      def notify_channel_rdy():
+        s.channel_rd.send.rdy @= s.send.rdy
+        s.channel_wr.send.rdy @= 1
+
+      @update
+      def notify_send_val():
+        s.send.val @= s.channel_rd.send.val
+
+    else:
+      assert bank_storage in (BANK_STORAGE_SRAM_1RW, BANK_STORAGE_SRAM_1R1W), \
+             f"unknown bank storage {bank_storage}"
+      is_single_port = bank_storage == BANK_STORAGE_SRAM_1RW
+
+      # Component.
+      # The read data always comes one cycle later, whatever
+      # is_combinational says.
+      if sram_macro is None:
+        s.memory = SramRTL(DataType, per_bank_data_mem_size)
+      else:
+        s.memory = SramMacroRTL(DataType, per_bank_data_mem_size, **sram_macro)
+
+      # The read whose data is on the SRAM output. It leaves the stage in
+      # the same cycle as the next read enters, so back-to-back reads go
+      # at full rate.
+      s.rd_pending     = Wire(b1)
+      s.rd_pending_msg = Wire(MemReadType)
+
+      @update
+      def request_memory():
+        # Writes never stall; on a single port they take precedence over
+        # the reads.
+        s.recv_wr.rdy @= 1
+        s.memory.wen @= s.recv_wr.val
+        s.memory.waddr @= \
+          trunc((s.recv_wr.msg.addr >> interleave_nbits) % per_bank_data_mem_size, PerBankAddrType)
+        s.memory.wdata @= s.recv_wr.msg.data
+
+        s.recv_rd.rdy @= ~s.rd_pending | s.send.rdy
+        if is_single_port:
+          s.recv_rd.rdy @= (~s.rd_pending | s.send.rdy) & ~s.recv_wr.val
+        s.memory.ren @= s.recv_rd.val & s.recv_rd.rdy
+        s.memory.raddr @= \
+          trunc((s.recv_rd.msg.addr >> interleave_nbits) % per_bank_data_mem_size, PerBankAddrType)
+
+      @update
+      def compose_send_msg():
+        s.send.val @= s.rd_pending
+        s.send.msg @= MemResponseType(s.rd_pending_msg.dst,
+                                      s.rd_pending_msg.src,
+                                      s.rd_pending_msg.addr,
+                                      s.memory.rdata,
+                                      s.rd_pending_msg.src_cgra,
+                                      s.rd_pending_msg.src_tile,
+                                      s.rd_pending_msg.remote_src_port)
+
+      @update_ff
+      def update_rd_pending():
+        if s.reset:
+          s.rd_pending <<= 0
+          s.rd_pending_msg <<= MemReadType(0, 0, 0, DataType(0, 0, 0, 0), 0, 0, 0)
+        elif s.recv_rd.val & s.recv_rd.rdy:
+          s.rd_pending <<= 1
+          s.rd_pending_msg <<= s.recv_rd.msg
+        elif s.send.val & s.send.rdy:
+          s.rd_pending <<= 0
 
   def line_trace(s):
     recv_rd_str = "recv_rd_msg: " + str(s.recv_rd.msg)
     recv_wr_str = "recv_wr_msg: " + str(s.recv_wr.msg)
-    content_str = "content: " + "|".join([str(data) for data in s.memory.regs])
+    # A black-box SRAM macro has no words to show.
+    words = getattr(s.memory, 'regs', [])
+    if line_trace.is_recording():
+      content_str = "content: " + line_trace.mem_diff_trace(s, words)
+    else:
+      content_str = "content: " + "|".join([str(data) for data in words])
     send_str = "send_msg: " + str(s.send.msg)
     return f'{recv_rd_str} || {recv_wr_str} || [{content_str}] || {send_str}'
 
@@ -0,0 +1,84 @@
+"""
+==========================================================================
+SramRTL.py
+==========================================================================
+SRAM bank of the data SPM, used by DataMemWrapperRTL in place of the
+flop-based register file (see BANK_STORAGE_* in lib/util/common.py).
+
+The read port is synchronous: the word addressed while `ren` is high
+shows up on `rdata` in the next cycle and stays there until the next
+read, so one read can be issued every cycle. A read and a write to the
+same address in the same cycle return the old word. A single-port (1RW)
+SRAM uses the same ports, and the user never enables both in a cycle.
+
+SramRTL is the behavioral model. SramMacroRTL has the same ports and is
+a black box for synthesis: the Verilog module given as `top_module`
+(typically a thin adapter around the SRAM compiler's macro) is
+instantiated instead of generating flops.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3 import *
+from pymtl3.passes.backends.verilog import VerilogPlaceholder, VerilogPlaceholderPass
+
+
+class SramRTL(Component):
+
+  def construct(s, DataType, num_words):
+
+    # Constant
+    AddrType = mk_bits(max(1, clog2(num_words)))
+
+    # Interface
+    s.ren   = InPort(b1)
+    s.raddr = InPort(AddrType)
+    s.rdata = OutPort(DataType)
+    s.wen   = InPort(b1)
+    s.waddr = InPort(AddrType)
+    s.wdata = InPort(DataType)
+
+    # Storage, named like RegisterFile's so that backdoor accesses (e.g.,
+    # lib/util/spm_bulk.py) see no difference.
+    s.regs = [Wire(DataType) for _ in range(num_words)]
+    s.rdata_reg = Wire(DataType)
+
+    s.rdata //= s.rdata_reg
+
+    @update_ff
+    def up_sram():
+      if s.ren:
+        s.rdata_reg <<= s.regs[s.raddr]
+      if s.wen:
+        s.regs[s.waddr] <<= s.wdata
+
+  def line_trace(s):
+    return f"{'rd' if s.ren else '  '}:{s.raddr}|{'wr' if s.wen else '  '}:{s.waddr}"
+
+
+class SramMacroRTL(VerilogPlaceholder, Component):
+
+  def construct(s, DataType, num_words, src_file, top_module,
+                port_map = None, params = None, v_libs = None):
+
+    # Constant
+    AddrType = mk_bits(max(1, clog2(num_words)))
+
+    # Interface, same as SramRTL.
+    s.ren   = InPort(b1)
+    s.raddr = InPort(AddrType)
+    s.rdata = OutPort(DataType)
+    s.wen   = InPort(b1)
+    s.waddr = InPort(AddrType)
+    s.wdata = InPort(DataType)
+
+    s.set_metadata(VerilogPlaceholderPass.src_file, src_file)
+    s.set_metadata(VerilogPlaceholderPass.top_module, top_module)
+    s.set_metadata(VerilogPlaceholderPass.has_reset, False)
+    if port_map is not None:
+      s.set_metadata(VerilogPlaceholderPass.port_map, port_map)
+    if params is not None:
+      s.set_metadata(VerilogPlaceholderPass.params, params)
+    if v_libs is not None:
+      s.set_metadata(VerilogPlaceholderPass.v_libs, v_libs)
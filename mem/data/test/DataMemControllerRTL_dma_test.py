@@ -9,6 +9,7 @@ from pymtl3 import *
 from ..DataMemControllerRTL import DataMemControllerRTL
 from ....lib.messages import *
 from ....lib.opt_type import *
+from ....lib.util.common import BANK_MAPPING_INTERLEAVE, BANK_MAPPING_XOR
 
 
 def make_types(data_mem_size_global, ctrl_mem_size, num_tiles, num_rd_tiles):
@@ -21,7 +22,8 @@ def make_types(data_mem_size_global, ctrl_mem_size, num_tiles, num_rd_tiles):
   return DataType, DataAddrType, NocPktType
 
 
-def drive_defaults(dut, DataAddrType, DataType, NocPktType, num_rd_tiles, num_wr_tiles):
+def drive_defaults(dut, DataAddrType, DataType, NocPktType, num_rd_tiles, num_wr_tiles,
+                   num_dma_lanes = 1):
   for i in range(num_rd_tiles):
     dut.recv_raddr[i].val @= 0
     dut.recv_raddr[i].msg @= DataAddrType(0)
@@ -44,17 +46,19 @@ def drive_defaults(dut, DataAddrType, DataType, NocPktType, num_rd_tiles, num_wr
   dut.send_to_noc_store_pkt.rdy @= 1
 
   DmaSpmAddrType = mk_dma_cmd().get_field_type(kAttrSpmAddr)
-  dut.recv_from_controller_spm_wr_req.val @= 0
-  dut.recv_from_controller_spm_wr_req.msg.addr @= DmaSpmAddrType(0)
-  dut.recv_from_controller_spm_wr_req.msg.data @= 0
-  dut.recv_from_controller_spm_wr_req.msg.mask @= 0
-  dut.recv_from_controller_spm_rd_req.val @= 0
-  dut.recv_from_controller_spm_rd_req.msg.addr @= DmaSpmAddrType(0)
-  dut.send_to_controller_spm_rd_resp.rdy @= 1
+  for i in range(num_dma_lanes):
+    dut.recv_from_controller_spm_wr_req[i].val @= 0
+    dut.recv_from_controller_spm_wr_req[i].msg.addr @= DmaSpmAddrType(0)
+    dut.recv_from_controller_spm_wr_req[i].msg.data @= 0
+    dut.recv_from_controller_spm_wr_req[i].msg.mask @= 0
+    dut.recv_from_controller_spm_rd_req[i].val @= 0
+    dut.recv_from_controller_spm_rd_req[i].msg.addr @= DmaSpmAddrType(0)
+    dut.send_to_controller_spm_rd_resp[i].rdy @= 1
 
   dut.cgra_id @= 0
   dut.address_lower @= DataAddrType(0)
   dut.address_upper @= DataAddrType(15)
+  dut.spm_buffer_sel @= 0
 
 
 def test_dma_ports_write_then_read():
@@ -91,27 +95,186 @@ def test_dma_ports_write_then_read():
   drive_defaults(dut, DataAddrType, DataType, NocPktType, num_rd_tiles, num_wr_tiles)
 
   DmaSpmAddrType = mk_dma_cmd().get_field_type(kAttrSpmAddr)
-  dut.recv_from_controller_spm_wr_req.val @= 1
-  dut.recv_from_controller_spm_wr_req.msg.addr @= DmaSpmAddrType(3)
-  dut.recv_from_controller_spm_wr_req.msg.data @= 0xaaaabbbb
-  dut.recv_from_controller_spm_wr_req.msg.mask @= 0xf
+  dut.recv_from_controller_spm_wr_req[0].val @= 1
+  dut.recv_from_controller_spm_wr_req[0].msg.addr @= DmaSpmAddrType(3)
+  dut.recv_from_controller_spm_wr_req[0].msg.data @= 0xaaaabbbb
+  dut.recv_from_controller_spm_wr_req[0].msg.mask @= 0xf
   dut.sim_eval_combinational()
-  assert dut.recv_from_controller_spm_wr_req.rdy
+  assert dut.recv_from_controller_spm_wr_req[0].rdy
   dut.sim_tick()
-  dut.recv_from_controller_spm_wr_req.val @= 0
+  dut.recv_from_controller_spm_wr_req[0].val @= 0
 
-  dut.recv_from_controller_spm_rd_req.val @= 1
-  dut.recv_from_controller_spm_rd_req.msg.addr @= DmaSpmAddrType(3)
+  dut.recv_from_controller_spm_rd_req[0].val @= 1
+  dut.recv_from_controller_spm_rd_req[0].msg.addr @= DmaSpmAddrType(3)
 
   seen_response = False
   for _ in range(10):
     dut.sim_eval_combinational()
-    if dut.recv_from_controller_spm_rd_req.val & dut.recv_from_controller_spm_rd_req.rdy:
-      dut.recv_from_controller_spm_rd_req.val @= 0
-    if dut.send_to_controller_spm_rd_resp.val:
-      assert int(dut.send_to_controller_spm_rd_resp.msg.data) == 0xaaaabbbb
+    if dut.recv_from_controller_spm_rd_req[0].val & dut.recv_from_controller_spm_rd_req[0].rdy:
+      dut.recv_from_controller_spm_rd_req[0].val @= 0
+    if dut.send_to_controller_spm_rd_resp[0].val:
+      assert int(dut.send_to_controller_spm_rd_resp[0].msg.data) == 0xaaaabbbb
       seen_response = True
       break
     dut.sim_tick()
 
   assert seen_response
+
+
+def test_wide_dma_ports_access_banks_in_parallel():
+  """
+  Verifies the wide DMA ports: lanes targeting different banks are all
+  accepted in the same cycle, while lanes conflicting on a bank are
+  serialized by the crossbar.
+  """
+  data_mem_size_global = 64
+  data_mem_size_per_bank = 16
+  num_banks = 4
+  num_rd_tiles = 2
+  num_wr_tiles = 2
+  num_tiles = 4
+  ctrl_mem_size = 16
+  num_dma_lanes = 4
+
+  DataType, DataAddrType, NocPktType = make_types(
+      data_mem_size_global, ctrl_mem_size, num_tiles, num_rd_tiles)
+
+  dut = DataMemControllerRTL(NocPktType,
+                             data_mem_size_global,
+                             data_mem_size_per_bank,
+                             num_banks,
+                             num_rd_tiles,
+                             num_wr_tiles,
+                             1,
+                             1,
+                             num_tiles,
+                             True,
+                             {0: [0, 0]},
+                             has_dma_ports = True,
+                             num_dma_lanes = num_dma_lanes)
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+  drive_defaults(dut, DataAddrType, DataType, NocPktType, num_rd_tiles, num_wr_tiles,
+                 num_dma_lanes)
+
+  DmaSpmAddrType = mk_dma_cmd().get_field_type(kAttrSpmAddr)
+  # One word per bank.
+  for i in range(num_dma_lanes):
+    dut.recv_from_controller_spm_wr_req[i].val @= 1
+    dut.recv_from_controller_spm_wr_req[i].msg.addr @= DmaSpmAddrType(i * data_mem_size_per_bank + 1)
+    dut.recv_from_controller_spm_wr_req[i].msg.data @= 0x1000 + i
+    dut.recv_from_controller_spm_wr_req[i].msg.mask @= 0xf
+  dut.sim_eval_combinational()
+  for i in range(num_dma_lanes):
+    assert dut.recv_from_controller_spm_wr_req[i].rdy
+  dut.sim_tick()
+
+  # Lanes 0 and 1 hit the same bank.
+  dut.recv_from_controller_spm_wr_req[0].msg.addr @= DmaSpmAddrType(2)
+  dut.recv_from_controller_spm_wr_req[1].msg.addr @= DmaSpmAddrType(3)
+  dut.recv_from_controller_spm_wr_req[2].val @= 0
+  dut.recv_from_controller_spm_wr_req[3].val @= 0
+  dut.sim_eval_combinational()
+  assert int(dut.recv_from_controller_spm_wr_req[0].rdy) + \
+         int(dut.recv_from_controller_spm_wr_req[1].rdy) == 1
+  for _ in range(4):
+    for i in range(2):
+      if dut.recv_from_controller_spm_wr_req[i].val & dut.recv_from_controller_spm_wr_req[i].rdy:
+        dut.recv_from_controller_spm_wr_req[i].val @= 0
+    dut.sim_tick()
+    dut.sim_eval_combinational()
+  assert not dut.recv_from_controller_spm_wr_req[0].val
+  assert not dut.recv_from_controller_spm_wr_req[1].val
+
+  # Reads back one word per bank on all lanes at once.
+  for i in range(num_dma_lanes):
+    dut.recv_from_controller_spm_rd_req[i].val @= 1
+    dut.recv_from_controller_spm_rd_req[i].msg.addr @= DmaSpmAddrType(i * data_mem_size_per_bank + 1)
+  responses = {}
+  for _ in range(10):
+    dut.sim_eval_combinational()
+    for i in range(num_dma_lanes):
+      if dut.recv_from_controller_spm_rd_req[i].val & dut.recv_from_controller_spm_rd_req[i].rdy:
+        dut.recv_from_controller_spm_rd_req[i].val @= 0
+      if dut.send_to_controller_spm_rd_resp[i].val:
+        responses[i] = int(dut.send_to_controller_spm_rd_resp[i].msg.data)
+    if len(responses) == num_dma_lanes:
+      break
+    dut.sim_tick()
+
+  assert responses == {i: 0x1000 + i for i in range(num_dma_lanes)}
+
+
+def write_lanes_in_one_cycle(bank_mapping, addrs):
+  """
+  Writes one word per DMA lane to `addrs` and returns whether all lanes
+  were accepted in the same cycle, together with the DUT.
+  """
+  data_mem_size_global = 64
+  data_mem_size_per_bank = 16
+  num_banks = 4
+  num_rd_tiles = 2
+  num_wr_tiles = 2
+  num_tiles = 4
+  ctrl_mem_size = 16
+  num_dma_lanes = len(addrs)
+
+  DataType, DataAddrType, NocPktType = make_types(
+      data_mem_size_global, ctrl_mem_size, num_tiles, num_rd_tiles)
+
+  dut = DataMemControllerRTL(NocPktType,
+                             data_mem_size_global,
+                             data_mem_size_per_bank,
+                             num_banks,
+                             num_rd_tiles,
+                             num_wr_tiles,
+                             1,
+                             1,
+                             num_tiles,
+                             True,
+                             {0: [0, 0]},
+                             has_dma_ports = True,
+                             num_dma_lanes = num_dma_lanes,
+                             bank_mapping = bank_mapping)
+  dut.apply(DefaultPassGroup())
+  dut.sim_reset()
+  drive_defaults(dut, DataAddrType, DataType, NocPktType, num_rd_tiles, num_wr_tiles,
+                 num_dma_lanes)
+  dut.address_upper @= DataAddrType(data_mem_size_global - 1)
+
+  DmaSpmAddrType = mk_dma_cmd().get_field_type(kAttrSpmAddr)
+  for i, addr in enumerate(addrs):
+    dut.recv_from_controller_spm_wr_req[i].val @= 1
+    dut.recv_from_controller_spm_wr_req[i].msg.addr @= DmaSpmAddrType(addr)
+    dut.recv_from_controller_spm_wr_req[i].msg.data @= 0x100 + addr
+    dut.recv_from_controller_spm_wr_req[i].msg.mask @= 0xf
+  dut.sim_eval_combinational()
+  all_accepted = all(dut.recv_from_controller_spm_wr_req[i].rdy
+                     for i in range(num_dma_lanes))
+  dut.sim_tick()
+  return all_accepted, dut
+
+
+def test_interleaved_banks_take_consecutive_words_in_parallel():
+  """
+  With word interleaving, 4 consecutive words sit in the 4 banks, at the
+  same offset.
+  """
+  all_accepted, dut = write_lanes_in_one_cycle(BANK_MAPPING_INTERLEAVE, [8, 9, 10, 11])
+  assert all_accepted
+  for bank in range(4):
+    assert int(dut.memory_wrapper[bank].memory.regs[2].payload) == 0x108 + bank
+
+
+def test_xor_banks_take_strided_words_in_parallel():
+  """
+  A stride of num_banks words hits a single bank when interleaved, but
+  spreads over all of them once the bank index is XOR-hashed.
+  """
+  all_accepted, _ = write_lanes_in_one_cycle(BANK_MAPPING_INTERLEAVE, [0, 4, 8, 12])
+  assert not all_accepted
+
+  all_accepted, dut = write_lanes_in_one_cycle(BANK_MAPPING_XOR, [0, 4, 8, 12])
+  assert all_accepted
+  for i in range(4):
+    assert int(dut.memory_wrapper[i].memory.regs[i].payload) == 0x100 + 4 * i
@@ -29,7 +29,9 @@ class TestHarness(Component):
                 num_tiles,
                 read_addr, read_data, write_addr,
                 write_data, noc_recv_load,
-                send_to_noc_load_request_pkt, send_to_noc_store_pkt):
+                send_to_noc_load_request_pkt, send_to_noc_store_pkt,
+                has_non_blocking_loads = False, rdata_initial_delay = None,
+                has_request_coalescing = False):
 
     CgraPayloadType = NocPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
@@ -39,7 +41,8 @@ class TestHarness(Component):
     s.wr_tiles = wr_tiles
     s.recv_raddr = [TestSrcRTL(DataAddrType, read_addr[i])
                     for i in range(rd_tiles)]
-    s.send_rdata = [TestSinkRTL(DataType, read_data[i])
+    rdata_initial_delay = rdata_initial_delay or [0] * rd_tiles
+    s.send_rdata = [TestSinkRTL(DataType, read_data[i], rdata_initial_delay[i])
                     for i in range(rd_tiles)]
 
     s.recv_waddr = [TestSrcRTL(DataAddrType, write_addr[i])
@@ -61,7 +64,9 @@ class TestHarness(Component):
                                         num_cgra_rows,
                                         num_cgra_columns,
                                         num_tiles,
-                                        mem_access_is_combinational = True)
+                                        mem_access_is_combinational = True,
+                                        has_non_blocking_loads = has_non_blocking_loads,
+                                        has_request_coalescing = has_request_coalescing)
 
     for i in range(rd_tiles):
       s.mem_controller.recv_raddr[i] //= s.recv_raddr[i].send
@@ -77,6 +82,7 @@ class TestHarness(Component):
 
     s.mem_controller.address_lower //= 0
     s.mem_controller.address_upper //= 31
+    s.mem_controller.spm_buffer_sel //= 0
 
     s.cgra_id = 0
 
@@ -120,20 +126,17 @@ def run_sim(test_harness, max_cycles = 40):
   test_harness.sim_tick()
   test_harness.sim_tick()
 
-def test_mem_controller(cmdline_opts):
+def mk_pkt_types():
   data_nbits = 32
   predicate_nbits = 1
   DataType = mk_data(data_nbits, predicate_nbits)
   data_mem_size_global = 64
-  data_mem_size_per_bank = 16
-  num_banks = 2
 
   num_registers_per_reg_bank = 16
   num_cgra_columns = 1
   num_cgra_rows = 1
   num_tiles = 4
   rd_tiles = 4
-  wr_tiles = 4
   ctrl_mem_size = 6
   num_tile_inports  = 4
   num_tile_outports =4
@@ -160,6 +163,19 @@ def test_mem_controller(cmdline_opts):
                                        rd_tiles,
                                        CgraPayloadType)
 
+  return DataType, DataAddrType, CgraPayloadType, InterCgraPktType
+
+def test_mem_controller(cmdline_opts):
+  data_mem_size_global = 64
+  data_mem_size_per_bank = 16
+  num_banks = 2
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+  num_tiles = 4
+  rd_tiles = 4
+  wr_tiles = 4
+  DataType, DataAddrType, CgraPayloadType, InterCgraPktType = mk_pkt_types()
+
   # test_meta_data = [
   #     # addr:  0     1     2     3     4     5     6     7     8     9    10    11    12    13    14    15
   #          [0x00, 0x00, 0xa8, 0xa9, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],
@@ -235,3 +251,225 @@ def test_mem_controller(cmdline_opts):
 
   run_sim(th)
 
+
+def test_non_blocking_remote_loads(cmdline_opts):
+  data_mem_size_global = 64
+  data_mem_size_per_bank = 16
+  num_banks = 2
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+  num_tiles = 4
+  rd_tiles = 4
+  wr_tiles = 4
+  DataType, DataAddrType, CgraPayloadType, InterCgraPktType = mk_pkt_types()
+
+  # Addresses above 31 are remote. Port 0 is not ready to take its
+  # response for a while, which must not hold back port 1.
+  read_addr = [
+               [DataAddrType(42), DataAddrType(3)],
+               [DataAddrType(2),  DataAddrType(40), DataAddrType(5)],
+               [],
+               []
+              ]
+  read_data = [
+               [DataType(0xbbbb, 1), DataType(0x0000, 0)],
+               [DataType(0x0000, 0), DataType(0xcccc, 1), DataType(0x0000, 0)],
+               [],
+               []
+              ]
+  rdata_initial_delay = [10, 0, 0, 0]
+
+  send_to_noc_load_request_pkt = [
+                     # src  dst src_x src_y dst_x dst_y src_tile dst_tile remote_src_port opq vc
+      InterCgraPktType(0,   0,  0,    0,    0,    0,    0,       0,       0,              0,  0, CgraPayloadType(CMD_LOAD_REQUEST, data_addr = 42)),
+      InterCgraPktType(0,   0,  0,    0,    0,    0,    0,       0,       1,              0,  0, CgraPayloadType(CMD_LOAD_REQUEST, data_addr = 40)),
+  ]
+
+  # Responses are matched to their port by the remote_src_port tag.
+  noc_recv_load = [
+      InterCgraPktType(0,   0,  0,    0,    0,    0,    0,       0,       0,              0,  0, CgraPayloadType(CMD_LOAD_RESPONSE, DataType(0xbbbb, 1), 42)),
+      InterCgraPktType(0,   0,  0,    0,    0,    0,    0,       0,       1,              0,  0, CgraPayloadType(CMD_LOAD_RESPONSE, DataType(0xcccc, 1), 40)),
+  ]
+
+  th = TestHarness(InterCgraPktType,
+                   data_mem_size_global,
+                   data_mem_size_per_bank,
+                   num_banks,
+                   rd_tiles,
+                   wr_tiles,
+                   num_cgra_rows,
+                   num_cgra_columns,
+                   num_tiles,
+                   read_addr,
+                   read_data,
+                   [[] for _ in range(wr_tiles)],
+                   [[] for _ in range(wr_tiles)],
+                   noc_recv_load,
+                   send_to_noc_load_request_pkt,
+                   [],
+                   has_non_blocking_loads = True,
+                   rdata_initial_delay = rdata_initial_delay)
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts=['mem_controller'])
+  th.apply(DefaultPassGroup())
+  th.sim_reset()
+
+  for _ in range(8):
+    th.sim_tick()
+  # Port 1 is done while port 0 still holds its remote response.
+  assert th.send_rdata[1].done()
+  assert not th.send_rdata[0].done()
+  assert th.mem_controller.remote_load_arrived[0]
+
+  ncycles = 8
+  while not th.done() and ncycles < 40:
+    th.sim_tick()
+    ncycles += 1
+  assert ncycles < 40
+
+def test_request_coalescing(cmdline_opts):
+  data_mem_size_global = 64
+  data_mem_size_per_bank = 16
+  num_banks = 2
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+  num_tiles = 4
+  rd_tiles = 4
+  wr_tiles = 4
+  DataType, DataAddrType, CgraPayloadType, InterCgraPktType = mk_pkt_types()
+
+  # Ports 0, 1 and 2 read word 7 in the same cycles (a broadcast
+  # operand); port 3 reads another word of the same bank.
+  read_addr = [
+               [DataAddrType(7), DataAddrType(7)],
+               [DataAddrType(7), DataAddrType(7)],
+               [DataAddrType(7), DataAddrType(7)],
+               [DataAddrType(8)]
+              ]
+  read_data = [
+               [DataType(0x0000, 0), DataType(0x0000, 0)],
+               [DataType(0x0000, 0), DataType(0x0000, 0)],
+               [DataType(0x0000, 0), DataType(0x0000, 0)],
+               [DataType(0x0000, 0)]
+              ]
+  # Ports 0, 1 and 3 store to word 5 in the same cycle, which ends up
+  # holding the value of port 3.
+  write_addr = [
+                [DataAddrType(5)],
+                [DataAddrType(5)],
+                [DataAddrType(9)],
+                [DataAddrType(5)]
+               ]
+  write_data = [
+                [DataType(0x000a, 1)],
+                [DataType(0x000b, 1)],
+                [DataType(0x000c, 1)],
+                [DataType(0x000d, 1)]
+               ]
+
+  th = TestHarness(InterCgraPktType,
+                   data_mem_size_global,
+                   data_mem_size_per_bank,
+                   num_banks,
+                   rd_tiles,
+                   wr_tiles,
+                   num_cgra_rows,
+                   num_cgra_columns,
+                   num_tiles,
+                   read_addr,
+                   read_data,
+                   write_addr,
+                   write_data,
+                   [],
+                   [],
+                   [],
+                   has_request_coalescing = True)
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts=['mem_controller'])
+  th.apply(DefaultPassGroup())
+  th.sim_reset()
+
+  # The three reads of word 7 go to the bank as one request.
+  th.sim_eval_combinational()
+  assert th.mem_controller.rd_followers[0] == 0b0110
+
+  ncycles = 0
+  while not th.done() and ncycles < 40:
+    th.sim_tick()
+    ncycles += 1
+  assert ncycles < 40
+
+  regs = th.mem_controller.memory_wrapper[0].memory.regs
+  assert regs[5] == DataType(0x000d, 1)
+  assert regs[9] == DataType(0x000c, 1)
+
+def test_same_word_stores_in_one_cycle(cmdline_opts):
+  data_mem_size_global = 64
+  data_mem_size_per_bank = 16
+  num_banks = 2
+  num_cgra_columns = 1
+  num_cgra_rows = 1
+  num_tiles = 4
+  rd_tiles = 4
+  wr_tiles = 4
+  DataType, DataAddrType, CgraPayloadType, InterCgraPktType = mk_pkt_types()
+
+  # Ports 0 and 1 store other data to word 5 (bank 0) in the same cycle,
+  # ports 2 and 3 the same data to word 21 (bank 1).
+  write_addr = [
+                [DataAddrType(5)],
+                [DataAddrType(5)],
+                [DataAddrType(21)],
+                [DataAddrType(21)]
+               ]
+  write_data = [
+                [DataType(0x000a, 1)],
+                [DataType(0x000b, 1)],
+                [DataType(0x000c, 1)],
+                [DataType(0x000c, 1)]
+               ]
+
+  th = TestHarness(InterCgraPktType,
+                   data_mem_size_global,
+                   data_mem_size_per_bank,
+                   num_banks,
+                   rd_tiles,
+                   wr_tiles,
+                   num_cgra_rows,
+                   num_cgra_columns,
+                   num_tiles,
+                   [[] for _ in range(rd_tiles)],
+                   [[] for _ in range(rd_tiles)],
+                   write_addr,
+                   write_data,
+                   [],
+                   [],
+                   [],
+                   has_request_coalescing = True)
+
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts=['mem_controller'])
+  th.apply(DefaultPassGroup())
+  th.sim_reset()
+
+  # Port 0 writes word 5 first, while port 1 is held back rather than
+  # dropped; port 3 completes along with port 2.
+  th.sim_eval_combinational()
+  ncycles = 0
+  while not th.mem_controller.recv_waddr[0].val and ncycles < 4:
+    th.sim_tick()
+    ncycles += 1
+  assert th.mem_controller.wr_held[1]
+  assert th.mem_controller.wr_absorbed[3]
+  th.sim_tick()
+  assert th.recv_waddr[3].done()
+  assert not th.recv_waddr[1].done()
+
+  # Word 5 goes through both values, in port order.
+  word5 = [DataType()]
+  for _ in range(8):
+    if th.mem_controller.memory_wrapper[0].memory.regs[5] != word5[-1]:
+      word5.append(th.mem_controller.memory_wrapper[0].memory.regs[5].clone())
+    th.sim_tick()
+  assert th.done()
+  assert word5 == [DataType(), DataType(0x000a, 1), DataType(0x000b, 1)]
+  assert th.mem_controller.memory_wrapper[1].memory.regs[5] == DataType(0x000c, 1)
@@ -14,6 +14,11 @@ from ....lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ....lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ....lib.messages import *
 from ....lib.opt_type import *
+from ....lib.util.common import (
+  BANK_STORAGE_REGISTER_FILE,
+  BANK_STORAGE_SRAM_1R1W,
+  BANK_STORAGE_SRAM_1RW,
+)
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -23,7 +28,8 @@ class TestHarness(Component):
 
   def construct(s, DataType, MemReadType, MemWriteType, MemResponseType,
                 global_data_mem_size, per_bank_data_mem_size,
-                mem_rd_request, mem_wr_request, mem_response):
+                mem_rd_request, mem_wr_request, mem_response,
+                bank_storage = BANK_STORAGE_REGISTER_FILE):
 
     s.mem_rd_request = TestSrcRTL(MemReadType, mem_rd_request)
     s.mem_wr_request = TestSrcRTL(MemWriteType, mem_wr_request)
@@ -36,7 +42,8 @@ class TestHarness(Component):
                                            MemResponseType,
                                            global_data_mem_size,
                                            per_bank_data_mem_size,
-                                           False)
+                                           False,
+                                           bank_storage = bank_storage)
 
     s.data_mem_wrapper.recv_rd //= s.mem_rd_request.send
     s.data_mem_wrapper.recv_wr //= s.mem_wr_request.send
@@ -68,6 +75,7 @@ def run_sim(test_harness, max_cycles = 20):
   test_harness.sim_tick()
   test_harness.sim_tick()
   test_harness.sim_tick()
+  return ncycles
 
 def test_const_queue():
   DataType = mk_data(16, 1)
@@ -109,3 +117,41 @@ def test_const_queue():
                    global_data_mem_size, per_bank_data_mem_size,
                    mem_rd_request, mem_wr_request, mem_response)
   run_sim(th)
+
+def mk_sram_test(bank_storage, rd_data):
+  DataType = mk_data(16, 1)
+  global_data_mem_size = 32
+  per_bank_data_mem_size = 8
+  num_ports = 4
+  num_cgras = 4
+  num_tiles = 4
+
+  MemReadType = mk_mem_access_pkt(DataType, num_ports, num_ports, global_data_mem_size, num_cgras, num_tiles)
+  MemWriteType = mk_mem_access_pkt(DataType, num_ports, num_ports, global_data_mem_size, num_cgras, num_tiles)
+  MemResponseType = mk_mem_access_pkt(DataType, num_ports, num_ports, global_data_mem_size, num_cgras, num_tiles)
+
+  rd_addrs = [6, 6, 6, 6, 4, 2]
+                                     # dst addr data
+  mem_wr_request = [MemWriteType   (0, 0,  2,   DataType(0xc, 1), 0, 0, 0),
+                    MemWriteType   (0, 0,  4,   DataType(0xb, 1), 0, 0, 0),
+                    MemWriteType   (0, 0,  6,   DataType(0xa, 1), 0, 0, 0)
+                   ]
+  mem_rd_request = [MemReadType(i % 3 + 1, 0, addr, DataType(0x0, 0), 0, 0, 0)
+                    for i, addr in enumerate(rd_addrs)]
+  mem_response = [MemResponseType(0, i % 3 + 1, addr, DataType(data, int(data != 0)), 0, 0, 0)
+                  for i, (addr, data) in enumerate(zip(rd_addrs, rd_data))]
+
+  return TestHarness(DataType, MemReadType, MemWriteType, MemResponseType,
+                     global_data_mem_size, per_bank_data_mem_size,
+                     mem_rd_request, mem_wr_request, mem_response,
+                     bank_storage)
+
+def test_dual_port_sram_streams_reads():
+  # One read per cycle next to the writes; a read and a write of the same
+  # word in the same cycle return the old word.
+  th = mk_sram_test(BANK_STORAGE_SRAM_1R1W, [0, 0, 0, 0xa, 0xb, 0xc])
+  assert run_sim(th) <= 6 + 2
+
+def test_single_port_sram_writes_first():
+  th = mk_sram_test(BANK_STORAGE_SRAM_1RW, [0xa, 0xa, 0xa, 0xa, 0xb, 0xc])
+  run_sim(th)
@@ -11,7 +11,7 @@ from pymtl3 import *
 from ...lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ...lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ...lib.messages import *
-from ...lib.util.common import DMA_MVIN, DMA_MVOUT, CHAR_BIT, StateType, STATE_DMA_IDLE, STATE_DMA_MVIN_REQ, STATE_DMA_MVIN_RESP, STATE_DMA_MVIN_WRITE, STATE_DMA_MVOUT_READ, STATE_DMA_MVOUT_RESP, STATE_DMA_MVOUT_WRITE, STATE_DMA_MVOUT_WAIT, STATE_DMA_DONE
+from ...lib.util.common import DMA_MVIN, DMA_MVOUT, DMA_MVIN_LIST, DMA_MVOUT_LIST, CHAR_BIT, StateType, STATE_DMA_IDLE, STATE_DMA_MVIN, STATE_DMA_MVOUT, STATE_DMA_DONE, STATE_DMA_FETCH
 
 
 class DmaEngineRTL( Component ):
@@ -28,13 +28,33 @@ class DmaEngineRTL( Component ):
   - DRAM is byte-addressed which means each unique address points to a byte(8 bits).
   - SPM is word-addressed which means each unique address points to a word(32 bits).
   - The engine uses a 128-bit interface to external memory (4 words per beat)
-    and a 32-bit interface to the dataSPM (1 word per cycle).
-  - A finite state machine (FSM) manages the command execution flow, including
-    requesting memory, waiting for responses, and performing SPM accesses.
-  - MVIN logic: Requests 128-bit beats from DRAM, then unpacks them into four
-    sequential 32-bit SPM writes.
-  - MVOUT logic: Reads four 32-bit words from SPM, packs them into a 128-bit
-    beat, and issues a single write request to DRAM.
+    and `num_dma_lanes` 32-bit interfaces to the dataSPM. Each cycle, lane i
+    accesses word i of the current group of `num_dma_lanes` consecutive
+    words, so with more than one lane (wide DMA mode) a group reaches
+    several SPM banks in parallel. A group only advances once every lane
+    has been accepted, so lanes stalled by bank conflicts are serialized
+    by the data memory crossbar.
+  - Both directions are pipelined around a beat FIFO of `num_inflight_beats`
+    entries, and each beat in the FIFO or still in flight holds a credit,
+    so responses are always accepted without overflowing the FIFO.
+  - MVIN logic: Keeps up to `num_inflight_beats` 128-bit reads outstanding
+    in DRAM, buffers the returned beats and unpacks the head beat into
+    one group of SPM writes per cycle.
+  - MVOUT logic: Streams one group of SPM reads per cycle, packs the words
+    into 128-bit beats and issues the DRAM writes of the buffered beats
+    while later SPM reads and earlier DRAM write responses are pending.
+  - A command moves `row_count` x `plane_count` rows of `nbytes` each,
+    stepping by its row/plane strides on both sides, so a whole tile of a
+    matrix or feature map is a single command. Every row is moved like a
+    1D command (its DRAM address is expected to be beat aligned), and the
+    next row starts as soon as the previous one has drained.
+  - DMA_MVIN_LIST/DMA_MVOUT_LIST read the transfers (scatter-gather) one
+    element at a time from a linked list in DRAM (see mk_dma_list_elem)
+    and move each of them with the shape of the command.
+  - Commands are accepted into a queue of `num_queued_cmds` descriptors
+    while an earlier one is running, and the `dma_tag` of every finished
+    command is queued on `dma_done`, so neither side waits for the other
+    between commands.
   """
 
   def construct( s,
@@ -43,11 +63,25 @@ class DmaEngineRTL( Component ):
                  dram_addr_nbits = 64, # Bitwidth of DRAM addresses
                  spm_addr_nbits = 32,  # Bitwidth of SPM addresses
                  bytes_nbits = 32,     # Bitwidth for transfer size in bytes
-                 tag_nbits = 8 ):      # Bitwidth for command tracking tags
+                 tag_nbits = 8,        # Bitwidth for command tracking tags
+                 num_inflight_beats = 4, # Depth of the beat FIFO / max outstanding requests
+                 num_dma_lanes = 1,    # SPM words accessed per cycle
+                 num_queued_cmds = 2,  # Depth of the command and completion queues
+                 count_nbits = 16 ):   # Bitwidth of the row/plane counts
 
     assert dram_data_nbits == spm_data_nbits * 4
+    # The FIFO pointers wrap around by overflowing.
+    assert num_inflight_beats >= 2 and \
+           ( num_inflight_beats & ( num_inflight_beats - 1 ) ) == 0
+    words_per_beat = dram_data_nbits // spm_data_nbits
+    # A group of lanes never straddles two beats.
+    assert words_per_beat % num_dma_lanes == 0
+    assert num_queued_cmds >= 2 and \
+           ( num_queued_cmds & ( num_queued_cmds - 1 ) ) == 0
+    # The list elements hold one field per word of a beat.
+    assert spm_addr_nbits <= spm_data_nbits <= dram_addr_nbits
+    assert bytes_nbits <= spm_data_nbits
 
-    OpcodeType   = mk_bits( 3 )
     DramAddrType = mk_bits( dram_addr_nbits )
     SpmAddrType  = mk_bits( spm_addr_nbits )
     BytesType    = mk_bits( bytes_nbits )
@@ -57,7 +91,18 @@ class DmaEngineRTL( Component ):
     # Byte mask for SPM write
     SpmMaskType  = mk_bits( spm_data_nbits // CHAR_BIT )
     MemMaskType  = mk_bits( dram_data_nbits // CHAR_BIT )
-    DmaCmdType = mk_dma_cmd(dram_addr_nbits, spm_addr_nbits, bytes_nbits, tag_nbits)
+    # Beat FIFO pointers and counters of outstanding requests.
+    PtrType      = mk_bits( clog2( num_inflight_beats ) )
+    CountType    = mk_bits( clog2( num_inflight_beats + 1 ) )
+    # Command and completion queue pointers and occupancy.
+    CmdPtrType   = mk_bits( clog2( num_queued_cmds ) )
+    CmdCountType = mk_bits( clog2( num_queued_cmds + 1 ) )
+    # Index of a word within a beat and number of valid words of a beat.
+    WordIdxType  = mk_bits( clog2( words_per_beat ) )
+    NumWordsType = mk_bits( clog2( words_per_beat + 1 ) )
+    RowCountType = mk_bits( count_nbits )
+    DmaCmdType = mk_dma_cmd(dram_addr_nbits, spm_addr_nbits, bytes_nbits, tag_nbits, count_nbits)
+    DmaListElemType = mk_dma_list_elem(spm_data_nbits)
     DmaDoneType = mk_dma_done(tag_nbits)
     DmaSpmWriteReqType = mk_dma_spm_write_req(spm_addr_nbits, spm_data_nbits)
     DmaSpmReadReqType = mk_dma_spm_read_req(spm_addr_nbits)
@@ -81,49 +126,153 @@ class DmaEngineRTL( Component ):
     s.send_to_dram_wr_req = SendIfcRTL(DmaDramWrReqType)
     s.recv_from_dram_wr_resp = RecvIfcRTL(mk_bits(1))
 
+    # SPM interface, one port of each kind per lane.
     # Send write request to SPM.
-    s.send_to_spm_wr_req = SendIfcRTL(DmaSpmWriteReqType)
+    s.send_to_spm_wr_req = [ SendIfcRTL(DmaSpmWriteReqType) for _ in range( num_dma_lanes ) ]
     # Send read request to SPM.
-    s.send_to_spm_rd_req = SendIfcRTL(DmaSpmReadReqType)
+    s.send_to_spm_rd_req = [ SendIfcRTL(DmaSpmReadReqType) for _ in range( num_dma_lanes ) ]
     # Receive read response from SPM.
-    s.recv_from_spm_rd_resp = RecvIfcRTL(DmaSpmReadRespType)
+    s.recv_from_spm_rd_resp = [ RecvIfcRTL(DmaSpmReadRespType) for _ in range( num_dma_lanes ) ]
 
     # State machine definitions
 
     s.state             = Wire( StateType )
-    s.state_next        = Wire( StateType )
 
     # Combinational logic
-    s.opcode_reg        = Wire( OpcodeType )   # Current operation (MVIN/MVOUT)
-    s.dram_addr_reg     = Wire( DramAddrType ) # Current DRAM byte address
-    s.spm_addr_reg      = Wire( SpmAddrType )  # Current SPM word address
-    s.words_left_reg    = Wire( BytesType )    # Number of 32-bit words remaining to transfer
+    s.dram_addr_reg     = Wire( DramAddrType ) # DRAM byte address of the next DRAM request
+    s.spm_addr_reg      = Wire( SpmAddrType )  # SPM word address of the next SPM group
+    s.words_left_reg    = Wire( BytesType )    # Number of 32-bit SPM requests remaining
+    s.beats_left_reg    = Wire( BytesType )    # MVIN: number of DRAM reads remaining
+    s.pack_left_reg     = Wire( BytesType )    # MVOUT: number of SPM read responses remaining
     s.tag_reg           = Wire( TagType )      # Tag of the active command
-    s.beat_reg          = Wire( MemDataType )  # Buffer for 128-bit DRAM beat
-    s.word_idx_reg      = Wire( Bits2 )        # Index (0-3) of the word within a beat
-    s.wr_mask_reg       = Wire( MemMaskType )  # Byte mask for DRAM write
+    s.word_idx_reg      = Wire( WordIdxType )  # Index of the first word of the group within the head/packed beat
+    s.rd_inflight_reg   = Wire( CountType )    # Outstanding DRAM reads (MVIN) / SPM read groups (MVOUT)
+    s.wr_inflight_reg   = Wire( CountType )    # Outstanding DRAM writes
 
     # Sequential logic
     s.state_ff          = Wire( StateType )
-    s.opcode_ff         = Wire( OpcodeType )
     s.dram_addr_ff      = Wire( DramAddrType )
     s.spm_addr_ff       = Wire( SpmAddrType )
     s.words_left_ff     = Wire( BytesType )
+    s.beats_left_ff     = Wire( BytesType )
+    s.pack_left_ff      = Wire( BytesType )
     s.tag_ff            = Wire( TagType )
-    s.beat_ff           = Wire( MemDataType )
-    s.word_idx_ff       = Wire( Bits2 )
-    s.wr_mask_ff        = Wire( MemMaskType )
+    s.word_idx_ff       = Wire( WordIdxType )
+    s.rd_inflight_ff    = Wire( CountType )
+    s.wr_inflight_ff    = Wire( CountType )
 
     # Connections
     s.state             //= s.state_ff
-    s.opcode_reg        //= s.opcode_ff
     s.dram_addr_reg     //= s.dram_addr_ff
     s.spm_addr_reg      //= s.spm_addr_ff
     s.words_left_reg    //= s.words_left_ff
+    s.beats_left_reg    //= s.beats_left_ff
+    s.pack_left_reg     //= s.pack_left_ff
     s.tag_reg           //= s.tag_ff
-    s.beat_reg          //= s.beat_ff
     s.word_idx_reg      //= s.word_idx_ff
-    s.wr_mask_reg       //= s.wr_mask_ff
+    s.rd_inflight_reg   //= s.rd_inflight_ff
+    s.wr_inflight_reg   //= s.wr_inflight_ff
+
+    # Shape of the active command and position of the current row.
+    s.desc_reg          = Wire( DmaCmdType )   # Active command (opcode, shape and strides)
+    s.desc_ff           = Wire( DmaCmdType )
+    s.desc_reg          //= s.desc_ff
+    s.row_nbytes_reg    = Wire( BytesType )    # Bytes of every row of the current block
+    s.row_nbytes_ff     = Wire( BytesType )
+    s.row_nbytes_reg    //= s.row_nbytes_ff
+    s.rows_left_reg     = Wire( RowCountType ) # Rows of the current plane, including the current one
+    s.rows_left_ff      = Wire( RowCountType )
+    s.rows_left_reg     //= s.rows_left_ff
+    s.planes_left_reg   = Wire( RowCountType ) # Planes, including the current one
+    s.planes_left_ff    = Wire( RowCountType )
+    s.planes_left_reg   //= s.planes_left_ff
+    s.dram_row_reg      = Wire( DramAddrType ) # First DRAM byte of the current row
+    s.dram_row_ff       = Wire( DramAddrType )
+    s.dram_row_reg      //= s.dram_row_ff
+    s.dram_plane_reg    = Wire( DramAddrType ) # First DRAM byte of the current plane
+    s.dram_plane_ff     = Wire( DramAddrType )
+    s.dram_plane_reg    //= s.dram_plane_ff
+    s.spm_row_reg       = Wire( SpmAddrType )  # First SPM word of the current row
+    s.spm_row_ff        = Wire( SpmAddrType )
+    s.spm_row_reg       //= s.spm_row_ff
+    s.spm_plane_reg     = Wire( SpmAddrType )  # First SPM word of the current plane
+    s.spm_plane_ff      = Wire( SpmAddrType )
+    s.spm_plane_reg     //= s.spm_plane_ff
+    s.next_elem_reg     = Wire( DramAddrType ) # List mode: address of the next element
+    s.next_elem_ff      = Wire( DramAddrType )
+    s.next_elem_reg     //= s.next_elem_ff
+
+    # Transitions between rows, planes and blocks (a command or an element
+    # of a list).
+    s.row_end           = Wire( Bits1 )        # Last word of the current row moved
+    s.block_start       = Wire( Bits1 )        # A block starts with the rows below
+    s.block_end         = Wire( Bits1 )        # Last row of the current block moved
+    s.next_plane        = Wire( Bits1 )        # The next row starts a new plane
+    s.row_start         = Wire( Bits1 )        # A row starts at the addresses below
+    s.row_dram_addr     = Wire( DramAddrType )
+    s.row_spm_addr      = Wire( SpmAddrType )
+    s.row_nbytes        = Wire( BytesType )
+    s.start_desc        = Wire( DmaCmdType )   # Shape of the block that starts
+    s.fetch_elem        = Wire( DmaListElemType )
+    s.fetch_elem.dram_addr //= s.recv_from_dram_rd_resp.msg[0:spm_data_nbits]
+    s.fetch_elem.spm_addr  //= s.recv_from_dram_rd_resp.msg[spm_data_nbits:2*spm_data_nbits]
+    s.fetch_elem.nbytes    //= s.recv_from_dram_rd_resp.msg[2*spm_data_nbits:3*spm_data_nbits]
+    s.fetch_elem.next      //= s.recv_from_dram_rd_resp.msg[3*spm_data_nbits:4*spm_data_nbits]
+    s.elem_dram_addr    = Wire( DramAddrType )
+    s.elem_next_addr    = Wire( DramAddrType )
+    s.next_block_addr   = Wire( DramAddrType ) # List mode: element after the ending block
+
+    # Queued commands, the head one being the next to run, and the tags of
+    # the finished commands not yet reported on dma_done.
+    s.cmd_buf           = [ Wire( DmaCmdType ) for _ in range( num_queued_cmds ) ]
+    s.cmd_head          = Wire( CmdPtrType )
+    s.cmd_tail          = Wire( CmdPtrType )
+    s.cmd_count         = Wire( CmdCountType )
+    s.cur_cmd           = Wire( DmaCmdType )
+    s.cmd_start         = Wire( Bits1 )        # The head command starts running
+    s.done_buf          = [ Wire( TagType ) for _ in range( num_queued_cmds ) ]
+    s.done_head         = Wire( CmdPtrType )
+    s.done_tail         = Wire( CmdPtrType )
+    s.done_count        = Wire( CmdCountType )
+    s.done_push         = Wire( Bits1 )        # The running command finishes
+
+    # Beat FIFO shared by both directions: DRAM read responses waiting to
+    # be unpacked (MVIN) or packed beats waiting to be written (MVOUT).
+    s.beat_buf          = [ Wire( MemDataType ) for _ in range( num_inflight_beats ) ]
+    s.mask_buf          = [ Wire( MemMaskType ) for _ in range( num_inflight_beats ) ]
+    s.fifo_head         = Wire( PtrType )
+    s.fifo_tail         = Wire( PtrType )
+    s.fifo_count        = Wire( CountType )
+
+    # Words of the head beat (MVIN) and of the beat being packed (MVOUT).
+    s.head_beat         = Wire( MemDataType )
+    s.head_words        = [ Wire( SpmDataType ) for _ in range( words_per_beat ) ]
+    s.pack_words        = [ Wire( SpmDataType ) for _ in range( words_per_beat ) ]
+    s.packed_words      = [ Wire( SpmDataType ) for _ in range( words_per_beat ) ]
+    # Returned SPM word of the lane that reads each slot of a beat.
+    s.resp_words        = [ Wire( SpmDataType ) for _ in range( words_per_beat ) ]
+    for i in range( words_per_beat ):
+      s.head_words[i] //= s.head_beat[i*spm_data_nbits:(i+1)*spm_data_nbits]
+      s.resp_words[i] //= s.recv_from_spm_rd_resp[i % num_dma_lanes].msg.data
+
+    # Lanes of the current SPM group that were already accepted.
+    s.lane_done         = [ Wire( Bits1 ) for _ in range( num_dma_lanes ) ]
+    s.lane_fire         = [ Wire( Bits1 ) for _ in range( num_dma_lanes ) ]
+
+    # Handshakes of the current cycle.
+    s.group_start       = Wire( Bits1 )        # First lane of an SPM read group (MVOUT) accepted
+    s.group_done        = Wire( Bits1 )        # Last lane of the SPM group accepted
+    s.group_words       = Wire( BytesType )    # Words in the current SPM group
+    s.pack_group_words  = Wire( BytesType )    # Words in the SPM read group being packed
+    s.rd_issue          = Wire( Bits1 )        # DRAM read (MVIN) or SPM read group (MVOUT) sent
+    s.rd_return         = Wire( Bits1 )        # DRAM read (MVIN) or SPM read group (MVOUT) returned
+    s.wr_issue          = Wire( Bits1 )        # DRAM write sent
+    s.wr_return         = Wire( Bits1 )        # DRAM write acknowledged
+    s.fifo_push         = Wire( Bits1 )
+    s.fifo_pop          = Wire( Bits1 )
+    s.push_beat         = Wire( MemDataType )
+    s.push_mask         = Wire( MemMaskType )
+    s.push_nwords       = Wire( NumWordsType ) # Valid words of a packed beat
 
     # Precompute commonly used values at construct time (not inside any
     # @update block) to avoid PyMTL3 AST translation limitations on the
@@ -134,175 +283,383 @@ class DmaEngineRTL( Component ):
     # needed in the current design.
     spm_word_mask = SpmMaskType( (1 << spm_word_nbytes) - 1 )
     dram_beat_nbytes = (dram_data_nbits // CHAR_BIT)
+    # Upper DRAM address bits of a list element, taken from the list itself.
+    list_hi_mask = DramAddrType( ( ( 1 << dram_addr_nbits ) - 1 ) ^ ( ( 1 << spm_data_nbits ) - 1 ) )
+    fifo_depth = CountType( num_inflight_beats )
+    cmd_depth = CmdCountType( num_queued_cmds )
+    lanes = BytesType( num_dma_lanes )
+    # Advances the word index by a group, wrapping around at the beat end.
+    word_idx_step = WordIdxType( num_dma_lanes % words_per_beat )
+    last_group_idx = WordIdxType( words_per_beat - num_dma_lanes )
+
+    # DRAM write byte masks by the number of valid words in the beat, e.g.,
+    # 0x000f for 1 word, 0x00ff for 2 words, 0x0fff for 3 words and 0xffff
+    # for 4 words.
+    s.word_masks = [ Wire( MemMaskType ) for _ in range( words_per_beat + 1 ) ]
+    for i in range( words_per_beat + 1 ):
+      s.word_masks[i] //= MemMaskType( (1 << (i * spm_word_nbytes)) - 1 )
 
     @update
     def comb_outputs():
-      s.dma_cmd.rdy        @= s.state == STATE_DMA_IDLE
-      s.dma_done.val       @= s.state == STATE_DMA_DONE
-      s.dma_done.msg       @= DmaDoneType(s.tag_reg)
-
-      s.send_to_dram_rd_req.val    @= s.state == STATE_DMA_MVIN_REQ
+      s.dma_cmd.rdy        @= s.cmd_count < cmd_depth
+      s.dma_done.val       @= s.done_count > CmdCountType( 0 )
+      s.dma_done.msg       @= DmaDoneType(s.done_buf[s.done_head])
+
+      s.cur_cmd            @= s.cmd_buf[s.cmd_head]
+      s.cmd_start          @= ( s.state == STATE_DMA_IDLE ) & ( s.cmd_count > CmdCountType( 0 ) )
+      # A command only finishes if its tag can be queued.
+      s.done_push          @= ( s.state == STATE_DMA_DONE ) & ( s.done_count < cmd_depth )
+
+      # A new read is only issued if its beat (MVIN) or the beat its group
+      # may complete (MVOUT) is guaranteed a FIFO entry.
+      # A list element is fetched with a single read.
+      s.send_to_dram_rd_req.val    @= ( ( s.state == STATE_DMA_MVIN ) &
+                                        ( s.beats_left_reg > BytesType( 0 ) ) &
+                                        ( s.rd_inflight_reg + s.fifo_count < fifo_depth ) ) | \
+                                      ( ( s.state == STATE_DMA_FETCH ) &
+                                        ( s.rd_inflight_reg == CountType( 0 ) ) )
       s.send_to_dram_rd_req.msg    @= s.dram_addr_reg
-      s.recv_from_dram_rd_resp.rdy   @= s.state == STATE_DMA_MVIN_RESP
+      s.recv_from_dram_rd_resp.rdy   @= ( ( s.state == STATE_DMA_MVIN ) |
+                                          ( s.state == STATE_DMA_FETCH ) ) & \
+                                        ( s.rd_inflight_reg > CountType( 0 ) )
 
-      s.send_to_dram_wr_req.val    @= s.state == STATE_DMA_MVOUT_WRITE
+      s.send_to_dram_wr_req.val    @= ( s.state == STATE_DMA_MVOUT ) & \
+                                      ( s.fifo_count > CountType( 0 ) ) & \
+                                      ( s.wr_inflight_reg < fifo_depth )
       s.send_to_dram_wr_req.msg.addr   @= s.dram_addr_reg
-      s.send_to_dram_wr_req.msg.data   @= s.beat_reg
-      s.send_to_dram_wr_req.msg.mask   @= s.wr_mask_reg
+      s.send_to_dram_wr_req.msg.data   @= s.beat_buf[s.fifo_head]
+      s.send_to_dram_wr_req.msg.mask   @= s.mask_buf[s.fifo_head]
+
+      s.recv_from_dram_wr_resp.rdy   @= ( s.state == STATE_DMA_MVOUT ) & \
+                                        ( s.wr_inflight_reg > CountType( 0 ) )
+
+      s.head_beat @= s.beat_buf[s.fifo_head]
+
+      group_started = b1( 0 )
+      for i in range( num_dma_lanes ):
+        group_started = group_started | s.lane_done[i]
+
+      # Lane i writes word (word_idx + i) of the head beat to SPM.
+      for i in range( num_dma_lanes ):
+        s.send_to_spm_wr_req[i].val @= ( s.state == STATE_DMA_MVIN ) & \
+                                       ( s.fifo_count > CountType( 0 ) ) & \
+                                       ( BytesType( i ) < s.words_left_reg ) & \
+                                       ~s.lane_done[i]
+        s.send_to_spm_wr_req[i].msg @= DmaSpmWriteReqType(
+          s.spm_addr_reg + SpmAddrType( i ),
+          s.head_words[s.word_idx_reg + WordIdxType( i )],
+          spm_word_mask )
+
+        # Once a group is started, its credit is already taken.
+        s.send_to_spm_rd_req[i].val @= ( s.state == STATE_DMA_MVOUT ) & \
+                                       ( BytesType( i ) < s.words_left_reg ) & \
+                                       ~s.lane_done[i] & \
+                                       ( group_started |
+                                         ( s.rd_inflight_reg + s.fifo_count < fifo_depth ) )
+        s.send_to_spm_rd_req[i].msg @= DmaSpmReadReqType(s.spm_addr_reg + SpmAddrType( i ))
+
+      # The responses of a read group are accepted together, once every
+      # lane of the group has returned its word.
+      resp_all = ( s.state == STATE_DMA_MVOUT ) & ( s.rd_inflight_reg > CountType( 0 ) )
+      for i in range( num_dma_lanes ):
+        resp_all = resp_all & ( s.recv_from_spm_rd_resp[i].val |
+                                ( BytesType( i ) >= s.pack_left_reg ) )
+      for i in range( num_dma_lanes ):
+        s.recv_from_spm_rd_resp[i].rdy @= resp_all & ( BytesType( i ) < s.pack_left_reg )
 
-      s.recv_from_dram_wr_resp.rdy   @= s.state == STATE_DMA_MVOUT_WAIT
+    @update
+    def comb_pipeline():
+      s.group_words @= s.words_left_reg
+      if s.words_left_reg > lanes:
+        s.group_words @= lanes
+      s.pack_group_words @= s.pack_left_reg
+      if s.pack_left_reg > lanes:
+        s.pack_group_words @= lanes
+
+      group_started = b1( 0 )
+      lane_fired = b1( 0 )
+      group_done = ( s.state == STATE_DMA_MVIN ) | ( s.state == STATE_DMA_MVOUT )
+      for i in range( num_dma_lanes ):
+        s.lane_fire[i] @= ( s.send_to_spm_wr_req[i].val & s.send_to_spm_wr_req[i].rdy ) | \
+                          ( s.send_to_spm_rd_req[i].val & s.send_to_spm_rd_req[i].rdy )
+        group_started = group_started | s.lane_done[i]
+        lane_fired = lane_fired | s.lane_fire[i]
+        group_done = group_done & ( s.lane_done[i] | s.lane_fire[i] |
+                                    ( BytesType( i ) >= s.words_left_reg ) )
+      s.group_done  @= group_done & lane_fired
+      s.group_start @= ( s.state == STATE_DMA_MVOUT ) & ~group_started & lane_fired
+
+      s.rd_issue  @= ( s.send_to_dram_rd_req.val & s.send_to_dram_rd_req.rdy ) | \
+                     s.group_start
+      s.rd_return @= ( s.recv_from_dram_rd_resp.val & s.recv_from_dram_rd_resp.rdy ) | \
+                     ( s.recv_from_spm_rd_resp[0].val & s.recv_from_spm_rd_resp[0].rdy )
+      s.wr_issue  @= s.send_to_dram_wr_req.val & s.send_to_dram_wr_req.rdy
+      s.wr_return @= s.recv_from_dram_wr_resp.val & s.recv_from_dram_wr_resp.rdy
+
+      # Inserts the returned words of the group into the beat being packed.
+      for i in range( words_per_beat ):
+        s.packed_words[i] @= s.pack_words[i]
+        if ( s.word_idx_reg == WordIdxType( i - i % num_dma_lanes ) ) & \
+           ( BytesType( i % num_dma_lanes ) < s.pack_left_reg ):
+          s.packed_words[i] @= s.resp_words[i]
+      s.push_nwords @= zext( s.word_idx_reg, NumWordsType ) + trunc( s.pack_group_words, NumWordsType )
+
+      s.push_beat @= concat( s.packed_words[3], s.packed_words[2],
+                             s.packed_words[1], s.packed_words[0] )
+      s.push_mask @= s.word_masks[s.push_nwords]
+      if s.state == STATE_DMA_MVIN:
+        # Every DRAM read response is a full beat.
+        s.fifo_push @= s.rd_return
+        s.push_beat @= s.recv_from_dram_rd_resp.msg
+        s.push_mask @= s.word_masks[words_per_beat]
+        # The head beat is popped once its last group is written to SPM.
+        s.fifo_pop  @= s.group_done & ( ( s.word_idx_reg == last_group_idx ) |
+                                        ( s.words_left_reg <= lanes ) )
+      elif s.state == STATE_DMA_MVOUT:
+        # A packed beat is pushed once it is full or holds the last word.
+        s.fifo_push @= s.rd_return & ( ( s.word_idx_reg == last_group_idx ) |
+                                       ( s.pack_left_reg <= lanes ) )
+        s.fifo_pop  @= s.wr_issue
+      else:
+        s.fifo_push @= 0
+        s.fifo_pop  @= 0
 
-      spm_wdata = SpmDataType(0)
+    @update
+    def comb_rows():
+      # A MVOUT row ends once every beat is packed, written and acknowledged.
+      s.row_end @= ( ( s.state == STATE_DMA_MVIN ) & s.group_done &
+                     ( s.words_left_reg <= lanes ) ) | \
+                   ( ( s.state == STATE_DMA_MVOUT ) &
+                     ( s.pack_left_reg == BytesType( 0 ) ) &
+                     ( s.fifo_count == CountType( 0 ) ) &
+                     ( s.wr_inflight_reg == CountType( 0 ) ) )
+
+      s.elem_dram_addr @= ( s.desc_reg.dram_addr & list_hi_mask ) | \
+                          zext( s.fetch_elem.dram_addr, DramAddrType )
+      # A null next pointer ends the list whatever the upper bits are.
+      s.elem_next_addr @= DramAddrType( 0 )
+      if s.fetch_elem.next != SpmDataType( 0 ):
+        s.elem_next_addr @= ( s.desc_reg.dram_addr & list_hi_mask ) | \
+                            zext( s.fetch_elem.next, DramAddrType )
+
+      s.next_block_addr @= s.next_elem_reg
+      if s.state == STATE_DMA_FETCH:
+        s.next_block_addr @= s.elem_next_addr
+
+      # By default, the next row of the current plane.
+      s.start_desc    @= s.desc_reg
+      s.block_start   @= 0
+      s.next_plane    @= 0
+      s.row_dram_addr @= s.dram_row_reg + zext( s.desc_reg.dram_row_stride, DramAddrType )
+      s.row_spm_addr  @= s.spm_row_reg + s.desc_reg.spm_row_stride
+      s.row_nbytes    @= s.row_nbytes_reg
+
+      if s.cmd_start & ~s.cur_cmd.opcode[1]:
+        # A strided command is a single block.
+        s.start_desc    @= s.cur_cmd
+        s.block_start   @= 1
+        s.row_dram_addr @= s.cur_cmd.dram_addr
+        s.row_spm_addr  @= s.cur_cmd.spm_addr
+        s.row_nbytes    @= s.cur_cmd.nbytes
+      elif ( s.state == STATE_DMA_FETCH ) & s.rd_return:
+        s.block_start   @= 1
+        s.row_dram_addr @= s.elem_dram_addr
+        s.row_spm_addr  @= trunc( s.fetch_elem.spm_addr, SpmAddrType )
+        s.row_nbytes    @= trunc( s.fetch_elem.nbytes, BytesType )
+      elif s.row_end & ( s.rows_left_reg <= RowCountType( 1 ) ) & \
+           ( s.planes_left_reg > RowCountType( 1 ) ):
+        s.next_plane    @= 1
+        s.row_dram_addr @= s.dram_plane_reg + zext( s.desc_reg.dram_plane_stride, DramAddrType )
+        s.row_spm_addr  @= s.spm_plane_reg + s.desc_reg.spm_plane_stride
+
+      # Empty blocks end right away.
+      s.row_start @= ( s.block_start & ( s.row_nbytes != BytesType( 0 ) ) ) | \
+                     ( s.row_end & ( ( s.rows_left_reg > RowCountType( 1 ) ) |
+                                     ( s.planes_left_reg > RowCountType( 1 ) ) ) )
+      s.block_end @= ( s.block_start & ( s.row_nbytes == BytesType( 0 ) ) ) | \
+                     ( s.row_end & ( s.rows_left_reg <= RowCountType( 1 ) ) &
+                       ( s.planes_left_reg <= RowCountType( 1 ) ) )
 
-      if s.word_idx_reg == b2( 0 ): # Writes the first word of the beat to SPM
-        spm_wdata = s.beat_reg[0:spm_data_nbits]
-      elif s.word_idx_reg == b2( 1 ): # Writes the second word of the beat to SPM
-        spm_wdata = s.beat_reg[spm_data_nbits:spm_data_nbits*2]
-      elif s.word_idx_reg == b2( 2 ): # 3rd word
-        spm_wdata = s.beat_reg[spm_data_nbits*2:spm_data_nbits*3]
-      else: # 4th word
-        spm_wdata = s.beat_reg[spm_data_nbits*3:spm_data_nbits*4]
+    @update_ff
+    def seq_fifo():
+      if s.reset | ( s.state == STATE_DMA_IDLE ):
+        s.fifo_head  <<= PtrType( 0 )
+        s.fifo_tail  <<= PtrType( 0 )
+        s.fifo_count <<= CountType( 0 )
+      else:
+        if s.fifo_push:
+          s.beat_buf[s.fifo_tail] <<= s.push_beat
+          s.mask_buf[s.fifo_tail] <<= s.push_mask
+          s.fifo_tail <<= s.fifo_tail + PtrType( 1 )
+        if s.fifo_pop:
+          s.fifo_head <<= s.fifo_head + PtrType( 1 )
+        if s.fifo_push & ~s.fifo_pop:
+          s.fifo_count <<= s.fifo_count + CountType( 1 )
+        elif ~s.fifo_push & s.fifo_pop:
+          s.fifo_count <<= s.fifo_count - CountType( 1 )
 
-      s.send_to_spm_wr_req.val @= s.state == STATE_DMA_MVIN_WRITE
-      s.send_to_spm_wr_req.msg @= DmaSpmWriteReqType(
-        s.spm_addr_reg,
-        spm_wdata,
-        spm_word_mask )
+    @update_ff
+    def seq_cmd_queues():
+      if s.reset:
+        s.cmd_head   <<= CmdPtrType( 0 )
+        s.cmd_tail   <<= CmdPtrType( 0 )
+        s.cmd_count  <<= CmdCountType( 0 )
+        s.done_head  <<= CmdPtrType( 0 )
+        s.done_tail  <<= CmdPtrType( 0 )
+        s.done_count <<= CmdCountType( 0 )
+      else:
+        if s.dma_cmd.val & s.dma_cmd.rdy:
+          s.cmd_buf[s.cmd_tail] <<= s.dma_cmd.msg
+          s.cmd_tail <<= s.cmd_tail + CmdPtrType( 1 )
+        if s.cmd_start:
+          s.cmd_head <<= s.cmd_head + CmdPtrType( 1 )
+        if ( s.dma_cmd.val & s.dma_cmd.rdy ) & ~s.cmd_start:
+          s.cmd_count <<= s.cmd_count + CmdCountType( 1 )
+        elif ~( s.dma_cmd.val & s.dma_cmd.rdy ) & s.cmd_start:
+          s.cmd_count <<= s.cmd_count - CmdCountType( 1 )
+
+        if s.done_push:
+          s.done_buf[s.done_tail] <<= s.tag_reg
+          s.done_tail <<= s.done_tail + CmdPtrType( 1 )
+        if s.dma_done.val & s.dma_done.rdy:
+          s.done_head <<= s.done_head + CmdPtrType( 1 )
+        if s.done_push & ~( s.dma_done.val & s.dma_done.rdy ):
+          s.done_count <<= s.done_count + CmdCountType( 1 )
+        elif ~s.done_push & ( s.dma_done.val & s.dma_done.rdy ):
+          s.done_count <<= s.done_count - CmdCountType( 1 )
 
-      s.send_to_spm_rd_req.val       @= s.state == STATE_DMA_MVOUT_READ
-      s.send_to_spm_rd_req.msg       @= DmaSpmReadReqType(s.spm_addr_reg)
-      s.recv_from_spm_rd_resp.rdy  @= s.state == STATE_DMA_MVOUT_RESP
+    @update_ff
+    def seq_lanes():
+      for i in range( num_dma_lanes ):
+        if s.reset | s.group_done:
+          s.lane_done[i] <<= 0
+        else:
+          s.lane_done[i] <<= s.lane_done[i] | s.lane_fire[i]
+
+      for i in range( words_per_beat ):
+        if s.reset | ( s.state == STATE_DMA_IDLE ) | s.fifo_push:
+          s.pack_words[i] <<= SpmDataType( 0 )
+        elif s.rd_return & ( s.state == STATE_DMA_MVOUT ):
+          s.pack_words[i] <<= s.packed_words[i]
 
     @update_ff
     def seq_state():
       if s.reset:
-        s.state_ff      <<= STATE_DMA_IDLE
-        s.opcode_ff     <<= OpcodeType( 0 )
-        s.dram_addr_ff  <<= DramAddrType( 0 )
-        s.spm_addr_ff   <<= SpmAddrType( 0 )
-        s.words_left_ff <<= BytesType( 0 )
-        s.tag_ff        <<= TagType( 0 )
-        s.beat_ff       <<= MemDataType( 0 )
-        s.word_idx_ff   <<= b2( 0 )
-        s.wr_mask_ff    <<= MemMaskType( 0 )
+        s.state_ff       <<= STATE_DMA_IDLE
+        s.dram_addr_ff   <<= DramAddrType( 0 )
+        s.spm_addr_ff    <<= SpmAddrType( 0 )
+        s.words_left_ff  <<= BytesType( 0 )
+        s.beats_left_ff  <<= BytesType( 0 )
+        s.pack_left_ff   <<= BytesType( 0 )
+        s.tag_ff         <<= TagType( 0 )
+        s.word_idx_ff    <<= WordIdxType( 0 )
+        s.rd_inflight_ff <<= CountType( 0 )
+        s.wr_inflight_ff <<= CountType( 0 )
       else:
         if s.state == STATE_DMA_IDLE:
-          if s.dma_cmd.val & s.dma_cmd.rdy: # Receives a new DMA command.
-            # Note: the nbytes % 4 check is omitted from the update block
-            # because PyMTL3's AST translator does not support assert
-            # statements. It is enforced in construct() instead.
-            s.opcode_ff     <<= s.dma_cmd.msg.opcode
-            s.dram_addr_ff  <<= s.dma_cmd.msg.dram_addr
-            s.spm_addr_ff   <<= s.dma_cmd.msg.spm_addr
-            # Converts the transfer size from bytes to words.
-            # NOTE We only support nbytes that are multiples of 4 now.
-            # If nbytes is not a multiple of 4, we will add 1 to the number of words to transfer.
-            s.words_left_ff <<= (s.dma_cmd.msg.nbytes >> 2)
-            s.tag_ff        <<= s.dma_cmd.msg.dma_tag
-            s.beat_ff       <<= MemDataType( 0 )
-            s.word_idx_ff   <<= b2( 0 )
-            s.wr_mask_ff    <<= MemMaskType( 0 )
-
-            if s.dma_cmd.msg.nbytes == BytesType( 0 ): # No more bytes to transfer.
-              s.state_ff    <<= STATE_DMA_DONE
-            # Still has bytes to transfer.
-            elif s.dma_cmd.msg.opcode == OpcodeType( DMA_MVIN ):
-              s.state_ff    <<= STATE_DMA_MVIN_REQ # Move to the next state: to issue a read request to DRAM.
-            else: # DMA_MVOUT
-              s.state_ff    <<= STATE_DMA_MVOUT_READ # Move to the next state: to issue a read request to SPM.
-
-        elif s.state == STATE_DMA_MVIN_REQ: # Issues a read request to DRAM.
-          if s.send_to_dram_rd_req.val & s.send_to_dram_rd_req.rdy:
-            s.dram_addr_ff  <<= s.dram_addr_reg + DramAddrType( dram_beat_nbytes )
-            s.state_ff      <<= STATE_DMA_MVIN_RESP
-
-        elif s.state == STATE_DMA_MVIN_RESP: # Receives a response from DRAM.
-          if s.recv_from_dram_rd_resp.val & s.recv_from_dram_rd_resp.rdy:
-            s.beat_ff       <<= s.recv_from_dram_rd_resp.msg
-            s.word_idx_ff   <<= b2( 0 )
-            s.state_ff      <<= STATE_DMA_MVIN_WRITE # Move to the next state: to write to SPM.
-
-        elif s.state == STATE_DMA_MVIN_WRITE: # Writes to SPM.
-          if s.send_to_spm_wr_req.val & s.send_to_spm_wr_req.rdy:
-            # Update the SPM address where write next cycle(+1)
-            s.spm_addr_ff   <<= s.spm_addr_reg + SpmAddrType( 1 )
+          if s.cmd_start: # Starts the next queued DMA command.
+            s.desc_ff        <<= s.cur_cmd
+            s.tag_ff         <<= s.cur_cmd.dma_tag
+            s.next_elem_ff   <<= DramAddrType( 0 )
+            # The blocks of a list start once their element is fetched.
+            if s.cur_cmd.opcode[1]:
+              s.dram_addr_ff   <<= s.cur_cmd.dram_addr
+              s.rd_inflight_ff <<= CountType( 0 )
+              s.state_ff       <<= STATE_DMA_FETCH
+
+        elif s.state == STATE_DMA_MVIN:
+          if s.rd_issue: # Issues a read request to DRAM.
+            s.dram_addr_ff   <<= s.dram_addr_reg + DramAddrType( dram_beat_nbytes )
+            s.beats_left_ff  <<= s.beats_left_reg - BytesType( 1 )
+          if s.rd_issue & ~s.rd_return:
+            s.rd_inflight_ff <<= s.rd_inflight_reg + CountType( 1 )
+          elif ~s.rd_issue & s.rd_return:
+            s.rd_inflight_ff <<= s.rd_inflight_reg - CountType( 1 )
+
+          if s.group_done: # Writes a group of words to SPM.
+            # Update the SPM address where write next cycle(+lanes)
+            s.spm_addr_ff    <<= s.spm_addr_reg + SpmAddrType( num_dma_lanes )
             # Update the number of words remaining to write to SPM.
-            s.words_left_ff <<= s.words_left_reg - BytesType( 1 )
-
-            if s.words_left_reg == BytesType( 1 ):
-              s.state_ff    <<= STATE_DMA_DONE
-            elif s.word_idx_reg == b2( 3 ):
-              s.word_idx_ff <<= b2( 0 )
-              s.state_ff    <<= STATE_DMA_MVIN_REQ
-            else:
-              s.word_idx_ff <<= s.word_idx_reg + b2( 1 )
-
-        elif s.state == STATE_DMA_MVOUT_READ:
-          if s.send_to_spm_rd_req.val & s.send_to_spm_rd_req.rdy:
-            s.state_ff      <<= STATE_DMA_MVOUT_RESP # Move to the next state: to receive a response from SPM.
-
-        elif s.state == STATE_DMA_MVOUT_RESP:
-          if s.recv_from_spm_rd_resp.val & s.recv_from_spm_rd_resp.rdy:
-            # Pack the response from SPM into a 128-bit beat by left-shifting.
-            if s.word_idx_reg == b2( 0 ): # 1st word
-              s.beat_ff <<= concat( s.beat_reg[spm_data_nbits : spm_data_nbits<<2],
-                                    s.recv_from_spm_rd_resp.msg.data )
-            elif s.word_idx_reg == b2( 1 ):
-              s.beat_ff <<= concat( s.beat_reg[spm_data_nbits<<1 : spm_data_nbits<<2],
-                                    s.recv_from_spm_rd_resp.msg.data,
-                                    s.beat_reg[0:spm_data_nbits] )
-            elif s.word_idx_reg == b2( 2 ):
-              s.beat_ff <<= concat( s.beat_reg[(spm_data_nbits<<1)+spm_data_nbits : spm_data_nbits<<2],
-                                    s.recv_from_spm_rd_resp.msg.data,
-                                    s.beat_reg[0:spm_data_nbits<<1] )
-            else:
-              s.beat_ff <<= concat( s.recv_from_spm_rd_resp.msg.data,
-                                    s.beat_reg[0 : (spm_data_nbits<<1)+spm_data_nbits] )
-
-            s.spm_addr_ff   <<= s.spm_addr_reg + SpmAddrType( 1 )
-            s.words_left_ff <<= s.words_left_reg - BytesType( 1 )
-
-            if s.words_left_reg == BytesType( 1 ):
-              # Compute the byte mask based on the number of valid words in the beat.
-              # If DMA moves 1 word from SPM to DRAM, the mask is 0x000f.
-              # 0x00ff for 2 words, 0x0fff for 3 words, 0xffff for 4 words.
-              if s.word_idx_reg == b2( 0 ):
-                s.wr_mask_ff <<= MemMaskType( 0x000f )  # 1 word  (bytes 0-3)
-              elif s.word_idx_reg == b2( 1 ):
-                s.wr_mask_ff <<= MemMaskType( 0x00ff )  # 2 words (bytes 0-7)
-              elif s.word_idx_reg == b2( 2 ):
-                s.wr_mask_ff <<= MemMaskType( 0x0fff )  # 3 words (bytes 0-11)
-              else:
-                s.wr_mask_ff <<= MemMaskType( 0xffff )  # 4 words (bytes 0-15)
-              s.state_ff    <<= STATE_DMA_MVOUT_WRITE
-            elif s.word_idx_reg == b2( 3 ):
-              # Full beat (4 words): all 16 bytes are valid.
-              s.wr_mask_ff  <<= MemMaskType( 0xffff )
-              s.state_ff    <<= STATE_DMA_MVOUT_WRITE
-            else:
-              s.word_idx_ff <<= s.word_idx_reg + b2( 1 )
-              s.state_ff    <<= STATE_DMA_MVOUT_READ
-
-        elif s.state == STATE_DMA_MVOUT_WRITE:
-          if s.send_to_dram_wr_req.val & s.send_to_dram_wr_req.rdy:
-            s.state_ff    <<= STATE_DMA_MVOUT_WAIT
-
-        elif s.state == STATE_DMA_MVOUT_WAIT:
-          if s.recv_from_dram_wr_resp.val & s.recv_from_dram_wr_resp.rdy:
+            s.words_left_ff  <<= s.words_left_reg - s.group_words
+            s.word_idx_ff    <<= s.word_idx_reg + word_idx_step
+
+        elif s.state == STATE_DMA_MVOUT:
+          if s.group_done: # Reads a group of words from SPM.
+            s.spm_addr_ff    <<= s.spm_addr_reg + SpmAddrType( num_dma_lanes )
+            s.words_left_ff  <<= s.words_left_reg - s.group_words
+          if s.rd_issue & ~s.rd_return:
+            s.rd_inflight_ff <<= s.rd_inflight_reg + CountType( 1 )
+          elif ~s.rd_issue & s.rd_return:
+            s.rd_inflight_ff <<= s.rd_inflight_reg - CountType( 1 )
+
+          if s.rd_return: # Packs the SPM responses.
+            s.pack_left_ff   <<= s.pack_left_reg - s.pack_group_words
+            s.word_idx_ff    <<= s.word_idx_reg + word_idx_step
+
+          if s.wr_issue: # Writes a packed beat to DRAM.
             # Turn to the +16 address after writing 16 bytes data.
-            s.dram_addr_ff  <<= s.dram_addr_reg + DramAddrType( dram_beat_nbytes )
-            s.beat_ff       <<= MemDataType( 0 )
-            s.word_idx_ff   <<= b2( 0 )
-            s.wr_mask_ff    <<= MemMaskType( 0 )
-
-            if s.words_left_reg == BytesType( 0 ):
-              s.state_ff    <<= STATE_DMA_DONE
-            else:
-              s.state_ff    <<= STATE_DMA_MVOUT_READ
+            s.dram_addr_ff   <<= s.dram_addr_reg + DramAddrType( dram_beat_nbytes )
+          if s.wr_issue & ~s.wr_return:
+            s.wr_inflight_ff <<= s.wr_inflight_reg + CountType( 1 )
+          elif ~s.wr_issue & s.wr_return:
+            s.wr_inflight_ff <<= s.wr_inflight_reg - CountType( 1 )
+
+        elif s.state == STATE_DMA_FETCH:
+          if s.rd_issue:
+            s.rd_inflight_ff <<= CountType( 1 )
+          if s.rd_return:
+            s.next_elem_ff   <<= s.elem_next_addr
 
         elif s.state == STATE_DMA_DONE:
-          if s.dma_done.val & s.dma_done.rdy:
-            s.state_ff      <<= STATE_DMA_IDLE
+          if s.done_push: # Queues the tag of the finished command.
+            s.state_ff       <<= STATE_DMA_IDLE
+
+        if s.block_start: # Restarts the row and plane counters (0 counts as 1).
+          s.row_nbytes_ff    <<= s.row_nbytes
+          s.rows_left_ff     <<= s.start_desc.row_count
+          s.planes_left_ff   <<= s.start_desc.plane_count
+          s.dram_plane_ff    <<= s.row_dram_addr
+          s.spm_plane_ff     <<= s.row_spm_addr
+        elif s.row_end:
+          if s.next_plane:
+            s.rows_left_ff   <<= s.desc_reg.row_count
+            s.planes_left_ff <<= s.planes_left_reg - RowCountType( 1 )
+            s.dram_plane_ff  <<= s.row_dram_addr
+            s.spm_plane_ff   <<= s.row_spm_addr
+          else:
+            s.rows_left_ff   <<= s.rows_left_reg - RowCountType( 1 )
+
+        if s.row_start: # Moves the next row like a 1D command.
+          # Note: the nbytes % 4 check is omitted from the update block
+          # because PyMTL3's AST translator does not support assert
+          # statements.
+          s.dram_addr_ff     <<= s.row_dram_addr
+          s.spm_addr_ff      <<= s.row_spm_addr
+          s.dram_row_ff      <<= s.row_dram_addr
+          s.spm_row_ff       <<= s.row_spm_addr
+          # Converts the transfer size from bytes to words.
+          # NOTE We only support nbytes that are multiples of 4 now.
+          s.words_left_ff    <<= (s.row_nbytes >> 2)
+          s.pack_left_ff     <<= (s.row_nbytes >> 2)
+          # One DRAM read per (possibly partial) beat.
+          s.beats_left_ff    <<= ((s.row_nbytes >> 2) + BytesType( 3 )) >> 2
+          s.word_idx_ff      <<= WordIdxType( 0 )
+          s.rd_inflight_ff   <<= CountType( 0 )
+          s.wr_inflight_ff   <<= CountType( 0 )
+          if s.start_desc.opcode[0]:
+            s.state_ff       <<= STATE_DMA_MVOUT
+          else:
+            s.state_ff       <<= STATE_DMA_MVIN
+        elif s.block_end:
+          # Goes on with the next element of a list, if any.
+          if s.start_desc.opcode[1] & ( s.next_block_addr != DramAddrType( 0 ) ):
+            s.dram_addr_ff   <<= s.next_block_addr
+            s.rd_inflight_ff <<= CountType( 0 )
+            s.state_ff       <<= STATE_DMA_FETCH
+          else:
+            s.state_ff       <<= STATE_DMA_DONE
 
   def line_trace( s ):
-    return f"dma(state={int(s.state)},tag={int(s.tag_reg)},left={int(s.words_left_reg)})"
+    return f"dma(state={int(s.state)},tag={int(s.tag_reg)},left={int(s.words_left_reg)}," \
+           f"rd={int(s.rd_inflight_reg)},wr={int(s.wr_inflight_reg)},fifo={int(s.fifo_count)}," \
+           f"cmds={int(s.cmd_count)},dones={int(s.done_count)})"
@@ -6,11 +6,16 @@ DmaEngineRTL_test.py
 
 from pymtl3 import *
 
-from ..DmaEngineRTL import DmaEngineRTL, DMA_MVIN, DMA_MVOUT
+from ..DmaEngineRTL import DmaEngineRTL, DMA_MVIN, DMA_MVOUT, DMA_MVIN_LIST
+from ....lib.messages import mk_dma_list_elem
 
 
-def make_dut():
-  dut = DmaEngineRTL()
+SHAPE_FIELDS = ['row_count', 'plane_count', 'dram_row_stride',
+                'dram_plane_stride', 'spm_row_stride', 'spm_plane_stride']
+
+
+def make_dut(num_dma_lanes = 1):
+  dut = DmaEngineRTL(num_dma_lanes = num_dma_lanes)
   dut.apply(DefaultPassGroup())
   dut.sim_reset()
 
@@ -29,24 +34,28 @@ def make_dut():
   dut.recv_from_dram_wr_resp.val @= 1
   dut.recv_from_dram_wr_resp.msg @= 0
 
-  dut.send_to_spm_wr_req.rdy @= 1
-  dut.send_to_spm_rd_req.rdy @= 1
-  dut.recv_from_spm_rd_resp.val @= 0
-  dut.recv_from_spm_rd_resp.msg.data @= 0
+  for i in range(num_dma_lanes):
+    dut.send_to_spm_wr_req[i].rdy @= 1
+    dut.send_to_spm_rd_req[i].rdy @= 1
+    dut.recv_from_spm_rd_resp[i].val @= 0
+    dut.recv_from_spm_rd_resp[i].msg.data @= 0
   dut.sim_eval_combinational()
   return dut
 
 
-def issue_cmd(dut, opcode, dram_addr, spm_addr, nbytes, tag):
+def issue_cmd(dut, opcode, dram_addr, spm_addr, nbytes, tag, **shape):
   """
   Issues a DMA command to the DUT.
   Args:
     dut: The DUT instance.
-    opcode: The opcode of the DMA command. DMA_MVIN or DMA_MVOUT.
+    opcode: The opcode of the DMA command. DMA_MVIN or DMA_MVOUT, or
+            their _LIST variants.
     dram_addr: The DRAM address of the DMA command.
     spm_addr: The SPM address of the DMA command.
-    nbytes: The number of bytes to transfer.
+    nbytes: The number of bytes to transfer (per row).
     tag: The tag of the DMA command.
+    shape: Row/plane counts and strides of a strided command, e.g.,
+           row_count = 4, dram_row_stride = 64.
   """
   # NOTE nbytes is the number of bytes to transfer.
   # Currently, only nbytes that are multiples of 4 are supported.
@@ -58,6 +67,9 @@ def issue_cmd(dut, opcode, dram_addr, spm_addr, nbytes, tag):
   dut.dma_cmd.msg.spm_addr @= spm_addr
   dut.dma_cmd.msg.nbytes @= nbytes
   dut.dma_cmd.msg.dma_tag @= tag
+  for field in SHAPE_FIELDS:
+    signal = getattr(dut.dma_cmd.msg, field)
+    signal @= shape.get(field, 0)
   dut.sim_eval_combinational()
   assert dut.dma_cmd.rdy
   dut.sim_tick()
@@ -101,8 +113,8 @@ def test_dma_mvin_one_beat():
     else:
       pending_resp = None
 
-    if dut.send_to_spm_wr_req.val & dut.send_to_spm_wr_req.rdy:
-      spm_writes.append((int(dut.send_to_spm_wr_req.msg.addr), int(dut.send_to_spm_wr_req.msg.data)))
+    if dut.send_to_spm_wr_req[0].val & dut.send_to_spm_wr_req[0].rdy:
+      spm_writes.append((int(dut.send_to_spm_wr_req[0].msg.addr), int(dut.send_to_spm_wr_req[0].msg.data)))
 
     if dut.dma_done.val:
       assert int(dut.dma_done.msg.dma_tag) == 0x5a
@@ -148,15 +160,15 @@ def test_dma_mvout_partial_beat():
   mem_writes = []
 
   for _ in range(30):
-    dut.recv_from_spm_rd_resp.val @= 0
+    dut.recv_from_spm_rd_resp[0].val @= 0
     if pending_rresp is not None:
-      dut.recv_from_spm_rd_resp.val @= 1
-      dut.recv_from_spm_rd_resp.msg.data @= pending_rresp
+      dut.recv_from_spm_rd_resp[0].val @= 1
+      dut.recv_from_spm_rd_resp[0].msg.data @= pending_rresp
 
     dut.sim_eval_combinational()
 
-    if dut.send_to_spm_rd_req.val & dut.send_to_spm_rd_req.rdy:
-      pending_rresp = spm[int(dut.send_to_spm_rd_req.msg.addr)]
+    if dut.send_to_spm_rd_req[0].val & dut.send_to_spm_rd_req[0].rdy:
+      pending_rresp = spm[int(dut.send_to_spm_rd_req[0].msg.addr)]
     else:
       pending_rresp = None
 
@@ -205,15 +217,15 @@ def test_dma_mvout_full_beat():
   mem_writes = []
 
   for _ in range(30):
-    dut.recv_from_spm_rd_resp.val @= 0
+    dut.recv_from_spm_rd_resp[0].val @= 0
     if pending_rresp is not None:
-      dut.recv_from_spm_rd_resp.val @= 1
-      dut.recv_from_spm_rd_resp.msg.data @= pending_rresp
+      dut.recv_from_spm_rd_resp[0].val @= 1
+      dut.recv_from_spm_rd_resp[0].msg.data @= pending_rresp
 
     dut.sim_eval_combinational()
 
-    if dut.send_to_spm_rd_req.val & dut.send_to_spm_rd_req.rdy:
-      pending_rresp = spm[int(dut.send_to_spm_rd_req.msg.addr)]
+    if dut.send_to_spm_rd_req[0].val & dut.send_to_spm_rd_req[0].rdy:
+      pending_rresp = spm[int(dut.send_to_spm_rd_req[0].msg.addr)]
     else:
       pending_rresp = None
 
@@ -242,4 +254,415 @@ def test_dma_mvout_full_beat():
       int(concat(Bits32(0xffff0000), Bits32(0xddddeeee),
                 Bits32(0xbbbbcccc), Bits32(0x9999aaaa))),
      0xffff),
-  ]
\ No newline at end of file
+  ]
+
+def test_dma_mvin_pipelined_dram_latency():
+  """
+  Tests that MVIN keeps several DRAM reads in flight under a 6-cycle DRAM
+  latency and, once the first beat arrives, writes one word per cycle
+  into SPM.
+  """
+  dut = make_dut()
+  issue_cmd(dut, DMA_MVIN, 0x1000, 0, 64, 0x11)
+
+  latency = 6
+  # Beat i holds the words 4*i .. 4*i+3.
+  dram = {0x1000 + 16 * i: concat(*[Bits32(4 * i + j) for j in reversed(range(4))])
+          for i in range(4)}
+  inflight = [] # [(ready cycle, beat)]
+  max_inflight = 0
+  spm_write_cycles = []
+  spm_writes = []
+
+  for cycle in range(60):
+    dut.recv_from_dram_rd_resp.val @= 0
+    if inflight and inflight[0][0] <= cycle:
+      dut.recv_from_dram_rd_resp.val @= 1
+      dut.recv_from_dram_rd_resp.msg @= inflight[0][1]
+
+    dut.sim_eval_combinational()
+
+    if dut.recv_from_dram_rd_resp.val & dut.recv_from_dram_rd_resp.rdy:
+      inflight.pop(0)
+    if dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy:
+      inflight.append((cycle + latency, dram[int(dut.send_to_dram_rd_req.msg)]))
+    max_inflight = max(max_inflight, len(inflight))
+
+    if dut.send_to_spm_wr_req[0].val & dut.send_to_spm_wr_req[0].rdy:
+      spm_write_cycles.append(cycle)
+      spm_writes.append((int(dut.send_to_spm_wr_req[0].msg.addr), int(dut.send_to_spm_wr_req[0].msg.data)))
+
+    if dut.dma_done.val:
+      assert int(dut.dma_done.msg.dma_tag) == 0x11
+      break
+
+    dut.sim_tick()
+
+  assert dut.dma_done.val
+  assert spm_writes == [(i, i) for i in range(16)]
+  assert max_inflight == 4
+  # Sustained one word per cycle, with no bubble between beats.
+  assert spm_write_cycles == list(range(spm_write_cycles[0], spm_write_cycles[0] + 16))
+
+
+def test_dma_mvout_overlaps_dram_write_resp():
+  """
+  Tests that MVOUT keeps reading SPM one word per cycle while the DRAM
+  write responses come back 5 cycles after their requests.
+  """
+  dut = make_dut()
+  issue_cmd(dut, DMA_MVOUT, 0x3000, 16, 40, 0x22)
+
+  latency = 5
+  spm = {16 + i: 0x100 + i for i in range(10)}
+  pending_rresp = None
+  wr_acks = [] # ready cycles of the outstanding DRAM writes
+  spm_read_cycles = []
+  mem_writes = []
+
+  for cycle in range(60):
+    dut.recv_from_spm_rd_resp[0].val @= 0
+    if pending_rresp is not None:
+      dut.recv_from_spm_rd_resp[0].val @= 1
+      dut.recv_from_spm_rd_resp[0].msg.data @= pending_rresp
+    dut.recv_from_dram_wr_resp.val @= int(bool(wr_acks) and wr_acks[0] <= cycle)
+
+    dut.sim_eval_combinational()
+
+    if dut.send_to_spm_rd_req[0].val & dut.send_to_spm_rd_req[0].rdy:
+      spm_read_cycles.append(cycle)
+      pending_rresp = spm[int(dut.send_to_spm_rd_req[0].msg.addr)]
+    else:
+      pending_rresp = None
+
+    if dut.recv_from_dram_wr_resp.val & dut.recv_from_dram_wr_resp.rdy:
+      wr_acks.pop(0)
+    if dut.send_to_dram_wr_req.val & dut.send_to_dram_wr_req.rdy:
+      if not mem_writes:
+        first_wr_cycle = cycle
+      wr_acks.append(cycle + latency)
+      mem_writes.append((int(dut.send_to_dram_wr_req.msg.addr),
+                         int(dut.send_to_dram_wr_req.msg.data),
+                         int(dut.send_to_dram_wr_req.msg.mask)))
+
+    if dut.dma_done.val:
+      assert int(dut.dma_done.msg.dma_tag) == 0x22
+      break
+
+    dut.sim_tick()
+
+  assert dut.dma_done.val
+  assert not wr_acks
+  beat = lambda *words: int(concat(*[Bits32(w) for w in reversed(words)]))
+  assert mem_writes == [
+    (0x3000, beat(0x100, 0x101, 0x102, 0x103), 0xffff),
+    (0x3010, beat(0x104, 0x105, 0x106, 0x107), 0xffff),
+    (0x3020, beat(0x108, 0x109, 0, 0),         0x00ff),
+  ]
+  assert spm_read_cycles == list(range(spm_read_cycles[0], spm_read_cycles[0] + 10))
+  # The first beat is written to DRAM while SPM reads are still going on.
+  assert first_wr_cycle < spm_read_cycles[-1]
+
+
+def test_dma_wide_mvin_with_lane_stalls():
+  """
+  Tests the wide DMA mode: MVIN with 4 lanes writes a whole beat into
+  SPM per cycle, and a lane stalled by a bank conflict holds back its
+  group until it is accepted.
+  """
+  dut = make_dut(num_dma_lanes = 4)
+  issue_cmd(dut, DMA_MVIN, 0x1000, 8, 56, 0x33)
+
+  dram = {0x1000 + 16 * i: concat(*[Bits32(0x100 + 4 * i + j) for j in reversed(range(4))])
+          for i in range(4)}
+  pending_resp = None
+  spm_writes = []
+  write_cycles = []
+
+  for cycle in range(40):
+    dut.recv_from_dram_rd_resp.val @= 0
+    if pending_resp is not None:
+      dut.recv_from_dram_rd_resp.val @= 1
+      dut.recv_from_dram_rd_resp.msg @= pending_resp
+    # Lane 2 loses the bank arbitration once.
+    dut.send_to_spm_wr_req[2].rdy @= int(len(write_cycles) != 1 or cycle != write_cycles[0] + 1)
+
+    dut.sim_eval_combinational()
+
+    if dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy:
+      pending_resp = dram[int(dut.send_to_dram_rd_req.msg)]
+    else:
+      pending_resp = None
+
+    fired = [(int(dut.send_to_spm_wr_req[i].msg.addr), int(dut.send_to_spm_wr_req[i].msg.data))
+             for i in range(4)
+             if dut.send_to_spm_wr_req[i].val & dut.send_to_spm_wr_req[i].rdy]
+    if fired:
+      write_cycles.append(cycle)
+      spm_writes.extend(fired)
+
+    if dut.dma_done.val:
+      assert int(dut.dma_done.msg.dma_tag) == 0x33
+      break
+
+    dut.sim_tick()
+
+  assert dut.dma_done.val
+  # 14 words: 3 full groups and a partial one of 2 words.
+  assert sorted(spm_writes) == [(8 + i, 0x100 + i) for i in range(14)]
+  # The stalled lane takes one extra cycle.
+  assert len(write_cycles) == 5
+  assert write_cycles == list(range(write_cycles[0], write_cycles[0] + 5))
+
+
+def test_dma_wide_mvout_joins_lane_responses():
+  """
+  Tests the wide DMA mode: MVOUT with 2 lanes packs the words of both
+  lanes into the same beat even when one lane returns them later.
+  """
+  dut = make_dut(num_dma_lanes = 2)
+  issue_cmd(dut, DMA_MVOUT, 0x4000, 0, 40, 0x44)
+
+  spm = {i: 0x200 + i for i in range(10)}
+  # Lane 1 responds one cycle later than lane 0.
+  pending = [[], []] # per lane: [(ready cycle, data)]
+  mem_writes = []
+
+  for cycle in range(60):
+    for lane in range(2):
+      dut.recv_from_spm_rd_resp[lane].val @= 0
+      if pending[lane] and pending[lane][0][0] <= cycle:
+        dut.recv_from_spm_rd_resp[lane].val @= 1
+        dut.recv_from_spm_rd_resp[lane].msg.data @= pending[lane][0][1]
+
+    dut.sim_eval_combinational()
+
+    for lane in range(2):
+      if dut.recv_from_spm_rd_resp[lane].val & dut.recv_from_spm_rd_resp[lane].rdy:
+        pending[lane].pop(0)
+      if dut.send_to_spm_rd_req[lane].val & dut.send_to_spm_rd_req[lane].rdy:
+        pending[lane].append((cycle + 1 + lane, spm[int(dut.send_to_spm_rd_req[lane].msg.addr)]))
+
+    if dut.send_to_dram_wr_req.val & dut.send_to_dram_wr_req.rdy:
+      mem_writes.append((int(dut.send_to_dram_wr_req.msg.addr),
+                         int(dut.send_to_dram_wr_req.msg.data),
+                         int(dut.send_to_dram_wr_req.msg.mask)))
+
+    if dut.dma_done.val:
+      assert int(dut.dma_done.msg.dma_tag) == 0x44
+      break
+
+    dut.sim_tick()
+
+  assert dut.dma_done.val
+  beat = lambda *words: int(concat(*[Bits32(w) for w in reversed(words)]))
+  assert mem_writes == [
+    (0x4000, beat(0x200, 0x201, 0x202, 0x203), 0xffff),
+    (0x4010, beat(0x204, 0x205, 0x206, 0x207), 0xffff),
+    (0x4020, beat(0x208, 0x209, 0, 0),         0x00ff),
+  ]
+
+
+def test_dma_queued_cmds_report_tags():
+  """
+  Tests the command queue: an MVIN, an MVOUT of the words it brings in
+  and an empty command are issued back to back while the first one is
+  running, and their tags are reported on dma_done in order once the
+  completions are taken.
+  """
+  dut = make_dut()
+  dut.dma_done.rdy @= 0
+
+  cmds = [(DMA_MVIN,  0x1000, 0, 32, 0x71),
+          (DMA_MVOUT, 0x2000, 2, 16, 0x72),
+          (DMA_MVIN,  0x3000, 0,  0, 0x73)]
+  dram = {
+    0x1000: concat(Bits32(0x04), Bits32(0x03), Bits32(0x02), Bits32(0x01)),
+    0x1010: concat(Bits32(0x08), Bits32(0x07), Bits32(0x06), Bits32(0x05)),
+  }
+  spm = {}
+  pending_rd_resp = None
+  pending_spm_resp = None
+  accept_cycles = []
+  dones = []
+
+  for cycle in range(60):
+    dut.dma_cmd.val @= 0
+    if cmds:
+      opcode, dram_addr, spm_addr, nbytes, tag = cmds[0]
+      dut.dma_cmd.val @= 1
+      dut.dma_cmd.msg.opcode @= opcode
+      dut.dma_cmd.msg.dram_addr @= dram_addr
+      dut.dma_cmd.msg.spm_addr @= spm_addr
+      dut.dma_cmd.msg.nbytes @= nbytes
+      dut.dma_cmd.msg.dma_tag @= tag
+    dut.recv_from_dram_rd_resp.val @= pending_rd_resp is not None
+    if pending_rd_resp is not None:
+      dut.recv_from_dram_rd_resp.msg @= pending_rd_resp
+    dut.recv_from_spm_rd_resp[0].val @= pending_spm_resp is not None
+    if pending_spm_resp is not None:
+      dut.recv_from_spm_rd_resp[0].msg.data @= pending_spm_resp
+
+    dut.sim_eval_combinational()
+
+    if dut.dma_cmd.val & dut.dma_cmd.rdy:
+      cmds.pop(0)
+      accept_cycles.append(cycle)
+    if dut.recv_from_dram_rd_resp.val & dut.recv_from_dram_rd_resp.rdy:
+      pending_rd_resp = None
+    if dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy:
+      pending_rd_resp = dram[int(dut.send_to_dram_rd_req.msg)]
+    if dut.send_to_dram_wr_req.val & dut.send_to_dram_wr_req.rdy:
+      dram[int(dut.send_to_dram_wr_req.msg.addr)] = int(dut.send_to_dram_wr_req.msg.data)
+    if dut.send_to_spm_wr_req[0].val & dut.send_to_spm_wr_req[0].rdy:
+      spm[int(dut.send_to_spm_wr_req[0].msg.addr)] = int(dut.send_to_spm_wr_req[0].msg.data)
+    if dut.recv_from_spm_rd_resp[0].val & dut.recv_from_spm_rd_resp[0].rdy:
+      pending_spm_resp = None
+    if dut.send_to_spm_rd_req[0].val & dut.send_to_spm_rd_req[0].rdy:
+      pending_spm_resp = spm[int(dut.send_to_spm_rd_req[0].msg.addr)]
+
+    dut.sim_tick()
+
+  # The commands are queued back to back while the first one runs.
+  assert accept_cycles == [0, 1, 2]
+  assert [spm[i] for i in range(8)] == list(range(1, 9))
+  assert dram[0x2000] == int(concat(Bits32(0x06), Bits32(0x05),
+                                    Bits32(0x04), Bits32(0x03)))
+  # The tags are held until the completions are taken (the last command
+  # waits for room in the completion queue), then reported in order.
+  dut.dma_done.rdy @= 1
+  for _ in range(4):
+    dut.sim_eval_combinational()
+    if dut.dma_done.val:
+      dones.append(int(dut.dma_done.msg.dma_tag))
+    dut.sim_tick()
+  assert dones == [0x71, 0x72, 0x73]
+
+
+def run_with_memories(dut, dram, spm, tag, num_dma_lanes = 1, max_cycles = 200):
+  """
+  Runs the DUT against a DRAM ({beat address: 128-bit int}) and an SPM
+  ({word address: int}) that answer every request one cycle later, until
+  the command of `tag` is done. DRAM writes are applied under their mask.
+  Returns the DRAM read addresses.
+  """
+  pending_rd_resp = None
+  pending_spm_resp = [None] * num_dma_lanes
+  dram_reads = []
+
+  for _ in range(max_cycles):
+    dut.recv_from_dram_rd_resp.val @= pending_rd_resp is not None
+    if pending_rd_resp is not None:
+      dut.recv_from_dram_rd_resp.msg @= pending_rd_resp
+    for i in range(num_dma_lanes):
+      dut.recv_from_spm_rd_resp[i].val @= pending_spm_resp[i] is not None
+      if pending_spm_resp[i] is not None:
+        dut.recv_from_spm_rd_resp[i].msg.data @= pending_spm_resp[i]
+
+    dut.sim_eval_combinational()
+
+    if dut.dma_done.val:
+      assert int(dut.dma_done.msg.dma_tag) == tag
+      return dram_reads
+
+    if dut.recv_from_dram_rd_resp.val & dut.recv_from_dram_rd_resp.rdy:
+      pending_rd_resp = None
+    if dut.send_to_dram_rd_req.val & dut.send_to_dram_rd_req.rdy:
+      addr = int(dut.send_to_dram_rd_req.msg)
+      dram_reads.append(addr)
+      pending_rd_resp = dram.get(addr, 0)
+    if dut.send_to_dram_wr_req.val & dut.send_to_dram_wr_req.rdy:
+      addr = int(dut.send_to_dram_wr_req.msg.addr)
+      mask = int(dut.send_to_dram_wr_req.msg.mask)
+      bits = sum(0xff << (8 * i) for i in range(16) if (mask >> i) & 1)
+      dram[addr] = (dram.get(addr, 0) & ~bits) | (int(dut.send_to_dram_wr_req.msg.data) & bits)
+    for i in range(num_dma_lanes):
+      if dut.send_to_spm_wr_req[i].val & dut.send_to_spm_wr_req[i].rdy:
+        spm[int(dut.send_to_spm_wr_req[i].msg.addr)] = int(dut.send_to_spm_wr_req[i].msg.data)
+      if dut.recv_from_spm_rd_resp[i].val & dut.recv_from_spm_rd_resp[i].rdy:
+        pending_spm_resp[i] = None
+      if dut.send_to_spm_rd_req[i].val & dut.send_to_spm_rd_req[i].rdy:
+        pending_spm_resp[i] = spm[int(dut.send_to_spm_rd_req[i].msg.addr)]
+
+    dut.sim_tick()
+
+  assert False, "DMA command timed out"
+
+
+def beat(*words):
+  return int(concat(*[Bits32(w) for w in reversed(words)]))
+
+
+def test_dma_2d_mvin_matrix_tile():
+  """
+  Tests a 2D MVIN: a 3x6 tile of an 8-column row-major matrix is moved
+  into SPM rows padded to 8 words with a single command.
+  """
+  dut = make_dut()
+  # Element (r, c) of the matrix is 0x100 * r + c.
+  dram = {0x1000 + 32 * r + 16 * b: beat(*[0x100 * r + 4 * b + c for c in range(4)])
+          for r in range(4) for b in range(2)}
+  spm = {}
+  issue_cmd(dut, DMA_MVIN, 0x1020, 2, 24, 0x61,
+            row_count = 3, dram_row_stride = 32, spm_row_stride = 8)
+  dram_reads = run_with_memories(dut, dram, spm, 0x61)
+
+  assert dram_reads == [0x1020, 0x1030, 0x1040, 0x1050, 0x1060, 0x1070]
+  assert spm == {2 + 8 * r + c: 0x100 * (r + 1) + c
+                 for r in range(3) for c in range(6)}
+
+
+def test_dma_3d_mvout_wide():
+  """
+  Tests a 3D MVOUT with 2 lanes: 2 planes of 2 rows of 3 words, dense in
+  SPM, are scattered into a DRAM buffer with padded rows and planes.
+  """
+  dut = make_dut(num_dma_lanes = 2)
+  spm = {i: 0x300 + i for i in range(12)}
+  dram = {}
+  issue_cmd(dut, DMA_MVOUT, 0x2000, 0, 12, 0x62,
+            row_count = 2, plane_count = 2,
+            dram_row_stride = 16, dram_plane_stride = 64,
+            spm_row_stride = 3, spm_plane_stride = 6)
+  run_with_memories(dut, dram, spm, 0x62, num_dma_lanes = 2)
+
+  assert dram == {
+    0x2000: beat(0x300, 0x301, 0x302, 0),
+    0x2010: beat(0x303, 0x304, 0x305, 0),
+    0x2040: beat(0x306, 0x307, 0x308, 0),
+    0x2050: beat(0x309, 0x30a, 0x30b, 0),
+  }
+
+
+def test_dma_list_mvin_gathers_elements():
+  """
+  Tests a linked-list MVIN: every element of the list (one of which is
+  empty) is moved with the 2-row shape of the command, and the upper
+  DRAM address bits come from the address of the list.
+  """
+  dut = make_dut()
+  ElemType = mk_dma_list_elem(32)
+  hi = 0x1 << 32
+  dram = {
+    hi + 0x100: int(ElemType(0x140, 8, 0, 0x1000).to_bits()),
+    hi + 0x140: int(ElemType(0x180, 8, 10, 0x2000).to_bits()),
+    hi + 0x180: int(ElemType(0x1c0, 0, 30, 0x4000).to_bits()),
+    hi + 0x1c0: int(ElemType(0, 8, 20, 0x3000).to_bits()),
+  }
+  for base in [0x1000, 0x2000, 0x3000, 0x4000]:
+    for r in range(2):
+      dram[hi + base + 16 * r] = beat(base + 16 * r, base + 16 * r + 1, 0, 0)
+  spm = {}
+  issue_cmd(dut, DMA_MVIN_LIST, hi + 0x100, 0, 0, 0x63,
+            row_count = 2, dram_row_stride = 16, spm_row_stride = 4)
+  dram_reads = run_with_memories(dut, dram, spm, 0x63)
+
+  assert dram_reads == [hi + a for a in [0x100, 0x1000, 0x1010,
+                                         0x140, 0x2000, 0x2010,
+                                         0x180, 0x1c0, 0x3000, 0x3010]]
+  expected = {}
+  for spm_addr, base in [(0, 0x1000), (10, 0x2000), (20, 0x3000)]:
+    for r in range(2):
+      expected[spm_addr + 4 * r] = base + 16 * r
+      expected[spm_addr + 4 * r + 1] = base + 16 * r + 1
+  assert spm == expected
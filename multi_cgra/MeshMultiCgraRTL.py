@@ -13,6 +13,8 @@ from ..cgra.CgraWithContextSwitchRTL import CgraWithContextSwitchRTL
 from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ..lib.opt_type import *
+from ..lib.util import backdoor_config
+from ..lib.util.common import *
 from ..noc.PyOCN.pymtl3_net.meshnet.MeshNetworkRTL import MeshNetworkRTL
 from ..noc.PyOCN.pymtl3_net.ocnlib.ifcs.positions import mk_mesh_pos
 from ..lib.messages import *
@@ -29,7 +31,15 @@ class MeshMultiCgraRTL(Component):
                 mem_access_is_combinational,
                 FunctionUnit, FuList, per_cgra_topology,
                 controller2addr_map,
-                support_task_switching = False):
+                support_task_switching = False,
+                has_perf_counters = False,
+                has_non_blocking_loads = False,
+                has_remote_load_cache = False,
+                has_request_coalescing = False,
+                noc_arbitration = NOC_ARBITRATION_ROUND_ROBIN,
+                has_shadow_ctrl_mem = False,
+                has_launch_queue = False,
+                has_global_barrier = False):
 
     # Derives all types from CgraPayloadType.
     CgraDataType = CgraPayloadType.get_field_type(kAttrData)
@@ -89,7 +99,15 @@ class MeshMultiCgraRTL(Component):
                         mem_access_is_combinational,
                         FunctionUnit, FuList, per_cgra_topology,
                         controller2addr_map, idTo2d_map,
-                        has_ctrl_ring = True)
+                        has_ctrl_ring = True,
+                        has_perf_counters = has_perf_counters,
+                        has_non_blocking_loads = has_non_blocking_loads,
+                        has_remote_load_cache = has_remote_load_cache,
+                        has_request_coalescing = has_request_coalescing,
+                        noc_arbitration = noc_arbitration,
+                        has_shadow_ctrl_mem = has_shadow_ctrl_mem,
+                        has_launch_queue = has_launch_queue,
+                        has_global_barrier = has_global_barrier)
                 for cgra_id in range(s.num_cgras)]
 
     # Latency is 1.
@@ -156,6 +174,18 @@ class MeshMultiCgraRTL(Component):
             s.cgra[cgra_row * cgra_columns + cgra_col].recv_data_on_boundary_east[tile_row].val //= 0
             s.cgra[cgra_row * cgra_columns + cgra_col].recv_data_on_boundary_east[tile_row].msg //= CgraDataType()
 
+  # Backdoor configuration, see lib/util/backdoor_config.py. Tiles are
+  # keyed by (cgra id, tile id); CGRAs with task switching keep getting
+  # all their packets streamed.
+  def backdoor_tiles(s):
+    return {(cgra_id, tile_id): tile
+            for cgra_id, cgra in enumerate(s.cgra) if isinstance(cgra, CgraRTL)
+            for tile_id, tile in enumerate(cgra.tile)}
+
+  def backdoor_configure(s, pkts):
+    return backdoor_config.backdoor_configure(s.backdoor_tiles(), pkts,
+                                              backdoor_config.cgra_tile_key)
+
   def line_trace(s):
     res = "||\n".join([(("\n\n[cgra_"+str(i)+": ") + x.line_trace())
                        for (i,x) in enumerate(s.cgra)])
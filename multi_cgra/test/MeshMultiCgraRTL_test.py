@@ -13,8 +13,7 @@ from pymtl3.passes.backends.verilog import (
     VerilogPlaceholderPass,
 )
 from pymtl3.passes.backends.verilog.translation.VerilogTranslationPass import VerilogTranslationPass
-from pymtl3.stdlib.test_utils import (run_sim,
-                                      config_model_with_cmdline_opts)
+from pymtl3.stdlib.test_utils import run_sim
 
 from ..MeshMultiCgraRTL import MeshMultiCgraRTL
 from ...fu.double.SeqMulAdderRTL import SeqMulAdderRTL
@@ -38,6 +37,8 @@ from ...lib.basic.val_rdy.SinkRTL import SinkRTL as TestSinkRTL
 from ...lib.basic.val_rdy.SourceRTL import SourceRTL as TestSrcRTL
 from ...lib.messages import *
 from ...lib.opt_type import *
+from ...lib.util.build_cache import (config_model_with_build_cache,
+                                      translate_with_build_cache)
 from ...lib.util.common import *
 
 #-------------------------------------------------------------------------
@@ -77,6 +78,16 @@ class TestHarness(Component):
     # Connections
     s.expected_sink_out.recv //= s.dut.send_to_cpu_pkt
 
+    # Packets actually taken by the sink, in order.
+    s.received_pkts = []
+
+    @update_ff
+    def record_received_pkts():
+      if ~s.reset & s.expected_sink_out.recv.val & \
+         s.expected_sink_out.recv.rdy:
+        msg = s.expected_sink_out.recv.msg
+        s.received_pkts.append(msg.clone())
+
     complete_count_value = \
             sum(1 for pkt in expected_sink_out_pkt \
                 if pkt.payload.cmd == CMD_COMPLETE)
@@ -4155,6 +4166,35 @@ def initialize_test_harness(cmdline_opts,
                              a.dst_cgra_x == b.dst_cgra_x and \
                              a.dst_cgra_y == b.dst_cgra_y
 
+  elif test_name == 'test_global_barrier':
+      '''
+      CGRAs 0, 1 and 3 run a one-step kernel on their tile 0 for 3
+      generations of the global barrier, relaunched by its releases.
+      CGRA 2 doesn't participate and only relays. Only the end of the run
+      is reported.
+      '''
+      generations = 3
+      for cgra_id in range(num_cgras):
+          src_ctrl_pkt.extend([
+              IntraCgraPktType(0, 0, 0, cgra_id, payload = CgraPayloadType(CMD_CONFIG_TOTAL_CTRL_COUNT, data = DataType(1))),
+              IntraCgraPktType(0, 0, 0, cgra_id, payload = CgraPayloadType(CMD_CONFIG_COUNT_PER_ITER, data = DataType(1))),
+              IntraCgraPktType(0, 0, 0, cgra_id, payload = CgraPayloadType(CMD_CONFIG, ctrl = CtrlType(OPT_NAH))),
+          ])
+      # Configured in the order of the CGRA ids, i.e., parents first.
+      for cgra_id in range(num_cgras):
+          src_ctrl_pkt.extend([
+              IntraCgraPktType(0, num_tiles, 0, cgra_id, payload = CgraPayloadType(CMD_BARRIER_CONFIG_TILES, data = DataType(0b0001))),
+              IntraCgraPktType(0, num_tiles, 0, cgra_id, payload = CgraPayloadType(CMD_BARRIER_CONFIG_GENERATIONS, data = DataType(generations))),
+              IntraCgraPktType(0, num_tiles, 0, cgra_id, payload = CgraPayloadType(CMD_BARRIER_CONFIG_PARTICIPANTS, data = DataType(0b1011))),
+          ])
+      for cgra_id in [0, 1, 3]:
+          src_ctrl_pkt.append(IntraCgraPktType(0, 0, 0, cgra_id, payload = CgraPayloadType(CMD_LAUNCH)))
+
+      # Carries the number of generations that were released.
+      expected_sink_out_pkt = [IntraCgraPktType(num_tiles, num_tiles, payload = CgraPayloadType(CMD_COMPLETE, data = DataType(generations, 1)))]
+      ctrl_steps_per_iter = 1
+      ctrl_steps_total = 1
+
   th = TestHarness(DUT, FunctionUnit, FuList, IntraCgraPktType,
                    num_cgra_rows, num_cgra_columns,
                    num_x_tiles_per_cgra, num_y_tiles_per_cgra, ctrl_mem_size, data_mem_size_global,
@@ -4177,8 +4217,28 @@ def test_sim_homo_2x2_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
+  run_sim(th)
+
+def test_global_barrier_2x2_2x2(cmdline_opts):
+  th = initialize_test_harness(cmdline_opts,
+                               num_cgra_rows = 2,
+                               num_cgra_columns = 2,
+                               num_x_tiles_per_cgra = 2,
+                               num_y_tiles_per_cgra = 2,
+                               test_name = 'test_global_barrier')
+  th.set_param("top.dut.construct", has_global_barrier = True)
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
+  # The root reports once, after all the generations were released.
+  completes = [pkt for pkt in th.received_pkts
+               if pkt.payload.cmd == CMD_COMPLETE]
+  assert len(completes) == 1
+  assert completes[0].payload.data.payload == 3
 
 def _enable_translate_recursively(m):
   m.set_metadata(VerilogTranslationPass.enable, True)
@@ -4205,7 +4265,7 @@ def test_verilog_homo_2x2_4x4(cmdline_opts):
                                data_mem_size_per_bank = 256,
                                mem_access_is_combinational = False)
   th.elaborate()
-  translate_model(th, ['dut'])
+  translate_with_build_cache(th, 'dut', lambda top: translate_model(top, ['dut']))
 
 def test_tapeout_2x2_2x2(cmdline_opts):
   th = initialize_test_harness(cmdline_opts,
@@ -4217,7 +4277,7 @@ def test_tapeout_2x2_2x2(cmdline_opts):
                                data_mem_size_per_bank = 128,
                                mem_access_is_combinational = False)
   th.elaborate()
-  translate_model(th, ['dut'])
+  translate_with_build_cache(th, 'dut', lambda top: translate_model(top, ['dut']))
 
 def test_multi_CGRA_systolic_2x2_2x2(cmdline_opts):
   th = initialize_test_harness(cmdline_opts,
@@ -4234,7 +4294,7 @@ def test_multi_CGRA_systolic_2x2_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_systolic_2x2_2x2_translation(cmdline_opts):
@@ -4251,7 +4311,7 @@ def test_multi_CGRA_systolic_2x2_2x2_translation(cmdline_opts):
   th.elaborate()
   th.dut.set_metadata(VerilogTranslationPass.explicit_module_name, "MeshMultiCgraRTL__explicit_systolic_2x2_2x2__pickled")
   th.dut.set_metadata(VerilogTranslationPass.explicit_file_name, "MeshMultiCgraRTL__explicit_systolic_2x2_2x2__pickled.v")
-  translate_model(th, ['dut'])
+  translate_with_build_cache(th, 'dut', lambda top: translate_model(top, ['dut']))
 
 def test_multi_CGRA_systolic_2x2_2x2_non_combinational_mem_access(cmdline_opts):
   th = initialize_test_harness(cmdline_opts,
@@ -4268,7 +4328,7 @@ def test_multi_CGRA_systolic_2x2_2x2_non_combinational_mem_access(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_systolic_4x4_2x2(cmdline_opts):
@@ -4286,7 +4346,7 @@ def test_multi_CGRA_systolic_4x4_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th, 500)
 
 def test_multi_CGRA_fir_scalar(cmdline_opts):
@@ -4304,7 +4364,7 @@ def test_multi_CGRA_fir_scalar(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_fir_scalar_translation(cmdline_opts):
@@ -4321,7 +4381,7 @@ def test_multi_CGRA_fir_scalar_translation(cmdline_opts):
   th.elaborate()
   th.dut.set_metadata(VerilogTranslationPass.explicit_module_name, "MeshMultiCgraRTL__explicit")
   th.dut.set_metadata(VerilogTranslationPass.explicit_file_name, "MeshMultiCgraRTL__explicit__pickled.v")
-  translate_model(th, ['dut'])
+  translate_with_build_cache(th, 'dut', lambda top: translate_model(top, ['dut']))
 
 def test_multi_CGRA_fir_scalar_2x2_2x2(cmdline_opts):
   th = initialize_test_harness(cmdline_opts,
@@ -4338,7 +4398,7 @@ def test_multi_CGRA_fir_scalar_2x2_2x2(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th, 250)
 
 def test_multi_CGRA_fir_vector(cmdline_opts):
@@ -4356,7 +4416,7 @@ def test_multi_CGRA_fir_vector(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_fir_vector_global_reduce(cmdline_opts):
@@ -4374,7 +4434,7 @@ def test_multi_CGRA_fir_vector_global_reduce(cmdline_opts):
   th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
                       ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
                        'ALWCOMBORDER'])
-  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  th = config_model_with_build_cache(th, cmdline_opts, ['dut'])
   run_sim(th)
 
 def test_multi_CGRA_fir_vector_global_reduce_translation(cmdline_opts):
@@ -4391,4 +4451,4 @@ def test_multi_CGRA_fir_vector_global_reduce_translation(cmdline_opts):
   th.elaborate()
   th.dut.set_metadata(VerilogTranslationPass.explicit_module_name, "MeshMultiCgraRTL__explicit_vector_global_reduce")
   th.dut.set_metadata(VerilogTranslationPass.explicit_file_name, "MeshMultiCgraRTL__explicit_vector_global_reduce__pickled.v")
-  translate_model(th, ['dut'])
+  translate_with_build_cache(th, 'dut', lambda top: translate_model(top, ['dut']))
@@ -24,9 +24,9 @@ module cgra_test
   int  PASS         = 'd0;
   time pass_time_of = 'd0;
 
-  //   Packed dimension: the size of IntraCgraPacket_4_2x2_16_8_2_CgraPayload in bits (197).
+  //   Packed dimension: the size of IntraCgraPacket_4_2x2_16_8_2_CgraPayload in bits (198).
   // Unpacked dimension: unbounded queue SystemVerilog construct; dynamic queue limited by only available memory. (As opposed to bounded queue, e.g., q [$:256].)
-  logic [198-1:0] pkt_queue [$];
+  logic [199-1:0] pkt_queue [$];
 
   initial
   begin
@@ -1149,7 +1149,7 @@ typedef struct packed {
 */
 /*
 typedef struct packed {
-  logic [5:0] cmd;
+  logic [6:0] cmd;
   CgraData_32_1_1_1__payload_32__predicate_1__bypass_1__delay_1 data;
   logic [6:0] data_addr;
   CGRAConfig_7_4_2_4_4_3__49d22cda396bec88 ctrl;
@@ -11,11 +11,11 @@ module cgra_test
   logic [0:0] clk;
   logic [0:0] reset;
 
-  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 recv_from_cpu_pkt__msg;
+  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 recv_from_cpu_pkt__msg;
   logic [0:0] recv_from_cpu_pkt__rdy;
   logic [0:0] recv_from_cpu_pkt__val;
 
-  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 send_to_cpu_pkt__msg;
+  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 send_to_cpu_pkt__msg;
   logic [0:0] send_to_cpu_pkt__rdy;
   logic [0:0] send_to_cpu_pkt__val;
 
@@ -24,134 +24,134 @@ module cgra_test
   int  PASS         = 'd0;
   time pass_time_of = 'd0;
 
-  //   Packed dimension: the size of IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 in bits (229).
+  //   Packed dimension: the size of IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 in bits (230).
   // Unpacked dimension: unbounded queue SystemVerilog construct; dynamic queue limited by only available memory. (As opposed to bounded queue, e.g., q [$:256].)
-  logic [230-1:0] pkt_queue [$];
+  logic [231-1:0] pkt_queue [$];
 
   initial
   begin
-    pkt_queue.push_back( unpack_pkt(229'h0000000180002000200020003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000180002000200020003008000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h000000018001e001c001a0019010000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000180026002400220021018000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00000001800220020001e001d020000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h000000018002a002800260025028000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000180002000200020003030000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00000001a0000000000000007000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00000000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000060000000000000000004e8d100010000014000200000400000) );
-    pkt_queue.push_back( unpack_pkt(229'h000000006000000000000000000208d100000000040000800000100001) );
-    pkt_queue.push_back( unpack_pkt(229'h000000006000000000000000000018d100000000000000000000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h000000006000000000000000000018d100000000000000000000000003) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000220000000000000005000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000080000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00000000c0000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00000000a0000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000000000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0008000100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00080000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h000800006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h000800006000000000000000000108d100130000010000200000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h000800006000000000000000000238d100000000000000000000100002) );
-    pkt_queue.push_back( unpack_pkt(229'h000800006000000000000000000018d100000000000000000000000003) );
-    pkt_queue.push_back( unpack_pkt(229'h0008000080000000000000003000000000000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0008000080000000000000003000000000000000000000000000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h00080000c0000000000000003000000000000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h00080000c0000000000000003000000000000002000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h00080000a0000000000000003000000000000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0008000000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00200001a0000000000000005000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0020000100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00200000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002000006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002000006000000000000000000198d100010000010000200000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0020000060000000000000000000c8d100000000040000800000100002) );
-    pkt_queue.push_back( unpack_pkt(229'h002000006000000000000000000378d100010000000400000000400003) );
-    pkt_queue.push_back( unpack_pkt(229'h0020000000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00280001a0000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0028000100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00280000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002800006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002800006000000000000000000018d100000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0028000060000000000000000002e8d100010000010100200000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h0028000060000000000000000000b8d100000000000400000000100003) );
-    pkt_queue.push_back( unpack_pkt(229'h0028000000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00400001a0000000000000005000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00400001a0000000000000001000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0040000100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00400000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004000006000000000000000000208d100040000014400200000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004000006000000000000000000198d100000000040000800000100001) );
-    pkt_queue.push_back( unpack_pkt(229'h0040000060000000000000000000c00200000000000400000000400002) );
-    pkt_queue.push_back( unpack_pkt(229'h004000006000000000000000000018d100000000000000000000000003) );
-    pkt_queue.push_back( unpack_pkt(229'h00400000c0000000000000003000000000000003000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0040000000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00480001a0000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0048000100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00480000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004800006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004800006000000000000000000198d100030000040400800000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h004800006000000000000000000018d100000000000000000000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h0048000060000000000000000001000a00020000001000000000400003) );
-    pkt_queue.push_back( unpack_pkt(229'h0048000000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00009001a0000000000000007000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000900100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00009000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000900060000000000000000004e8d100010000014000200000400000) );
-    pkt_queue.push_back( unpack_pkt(229'h000090006000000000000000000208d100000000040000800000100001) );
-    pkt_queue.push_back( unpack_pkt(229'h000090006000000000000000000018d100000000000000000000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h000090006000000000000000000018d100000000000000000000000003) );
-    pkt_queue.push_back( unpack_pkt(229'h0000900080000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00009000c0000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00009000a0000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0000900000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0008900100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00089000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h000890006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h000890006000000000000000000108d100130000010000200000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h000890006000000000000000000238d100000000000000000000100002) );
-    pkt_queue.push_back( unpack_pkt(229'h000890006000000000000000000018d100000000000000000000000003) );
-    pkt_queue.push_back( unpack_pkt(229'h0008900080000000000000003000000000000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0008900080000000000000003000000000000000000000000000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h00089000c0000000000000003000000000000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h00089000c0000000000000003000000000000002000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h00089000a0000000000000003000000000000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0008900000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00209001a0000000000000005000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0020900100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00209000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002090006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002090006000000000000000000198d100010000010000200000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0020900060000000000000000000c8d100000000040000800000100002) );
-    pkt_queue.push_back( unpack_pkt(229'h002090006000000000000000000378d100010000000400000000400003) );
-    pkt_queue.push_back( unpack_pkt(229'h0020900000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00289001a0000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0028900100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00289000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002890006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h002890006000000000000000000018d100000000000000000000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h0028900060000000000000000002e8d100010000010100200000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h0028900060000000000000000000b8d100000000000400000000100003) );
-    pkt_queue.push_back( unpack_pkt(229'h0028900000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00409001a0000000000000005000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00409001a0000000000000001000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0040900100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00409000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004090006000000000000000000208d100040000014400200000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004090006000000000000000000198d100000000040000800000100001) );
-    pkt_queue.push_back( unpack_pkt(229'h0040900060000000000000000000c00200000000000400000000400002) );
-    pkt_queue.push_back( unpack_pkt(229'h004090006000000000000000000018d100000000000000000000000003) );
-    pkt_queue.push_back( unpack_pkt(229'h00409000c0000000000000003000000000000003000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0040900000000000000000000000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00489001a0000000000000003000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h0048900100000000000000009000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h00489000e000000000000004d000000000000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004890006000000000000000000018d100000000000000000000000000) );
-    pkt_queue.push_back( unpack_pkt(229'h004890006000000000000000000198d100030000040400800000000001) );
-    pkt_queue.push_back( unpack_pkt(229'h004890006000000000000000000018d100000000000000000000000002) );
-    pkt_queue.push_back( unpack_pkt(229'h0048900060000000000000000001000a00020000001000000000400003) );
-    pkt_queue.push_back( unpack_pkt(229'h0048900000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000180002000200020003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000180002000200020003008000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h000000018001e001c001a0019010000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000180026002400220021018000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00000001800220020001e001d020000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h000000018002a002800260025028000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000180002000200020003030000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00000001a0000000000000007000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00000000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000060000000000000000004e8d100010000014000200000400000) );
+    pkt_queue.push_back( unpack_pkt(230'h000000006000000000000000000208d100000000040000800000100001) );
+    pkt_queue.push_back( unpack_pkt(230'h000000006000000000000000000018d100000000000000000000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h000000006000000000000000000018d100000000000000000000000003) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000220000000000000005000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000080000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00000000c0000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00000000a0000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0000000000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0010000100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00100000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h001000006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h001000006000000000000000000108d100130000010000200000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h001000006000000000000000000238d100000000000000000000100002) );
+    pkt_queue.push_back( unpack_pkt(230'h001000006000000000000000000018d100000000000000000000000003) );
+    pkt_queue.push_back( unpack_pkt(230'h0010000080000000000000003000000000000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0010000080000000000000003000000000000000000000000000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h00100000c0000000000000003000000000000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h00100000c0000000000000003000000000000002000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h00100000a0000000000000003000000000000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0010000000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00400001a0000000000000005000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0040000100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00400000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h004000006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h004000006000000000000000000198d100010000010000200000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0040000060000000000000000000c8d100000000040000800000100002) );
+    pkt_queue.push_back( unpack_pkt(230'h004000006000000000000000000378d100010000000400000000400003) );
+    pkt_queue.push_back( unpack_pkt(230'h0040000000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00500001a0000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0050000100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00500000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h005000006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h005000006000000000000000000018d100000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0050000060000000000000000002e8d100010000010100200000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h0050000060000000000000000000b8d100000000000400000000100003) );
+    pkt_queue.push_back( unpack_pkt(230'h0050000000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00800001a0000000000000005000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00800001a0000000000000001000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0080000100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00800000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h008000006000000000000000000208d100040000014400200000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h008000006000000000000000000198d100000000040000800000100001) );
+    pkt_queue.push_back( unpack_pkt(230'h0080000060000000000000000000c00200000000000400000000400002) );
+    pkt_queue.push_back( unpack_pkt(230'h008000006000000000000000000018d100000000000000000000000003) );
+    pkt_queue.push_back( unpack_pkt(230'h00800000c0000000000000003000000000000003000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0080000000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00900001a0000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0090000100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00900000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h009000006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h009000006000000000000000000198d100030000040400800000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h009000006000000000000000000018d100000000000000000000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h0090000060000000000000000001000a00020000001000000000400003) );
+    pkt_queue.push_back( unpack_pkt(230'h0090000000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00012001a0000000000000007000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0001200100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00012000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0001200060000000000000000004e8d100010000014000200000400000) );
+    pkt_queue.push_back( unpack_pkt(230'h000120006000000000000000000208d100000000040000800000100001) );
+    pkt_queue.push_back( unpack_pkt(230'h000120006000000000000000000018d100000000000000000000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h000120006000000000000000000018d100000000000000000000000003) );
+    pkt_queue.push_back( unpack_pkt(230'h0001200080000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00012000c0000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00012000a0000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0001200000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0011200100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00112000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h001120006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h001120006000000000000000000108d100130000010000200000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h001120006000000000000000000238d100000000000000000000100002) );
+    pkt_queue.push_back( unpack_pkt(230'h001120006000000000000000000018d100000000000000000000000003) );
+    pkt_queue.push_back( unpack_pkt(230'h0011200080000000000000003000000000000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0011200080000000000000003000000000000000000000000000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h00112000c0000000000000003000000000000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h00112000c0000000000000003000000000000002000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h00112000a0000000000000003000000000000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0011200000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00412001a0000000000000005000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0041200100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00412000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h004120006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h004120006000000000000000000198d100010000010000200000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0041200060000000000000000000c8d100000000040000800000100002) );
+    pkt_queue.push_back( unpack_pkt(230'h004120006000000000000000000378d100010000000400000000400003) );
+    pkt_queue.push_back( unpack_pkt(230'h0041200000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00512001a0000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0051200100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00512000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h005120006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h005120006000000000000000000018d100000000000000000000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h0051200060000000000000000002e8d100010000010100200000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h0051200060000000000000000000b8d100000000000400000000100003) );
+    pkt_queue.push_back( unpack_pkt(230'h0051200000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00812001a0000000000000005000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00812001a0000000000000001000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0081200100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00812000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h008120006000000000000000000208d100040000014400200000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h008120006000000000000000000198d100000000040000800000100001) );
+    pkt_queue.push_back( unpack_pkt(230'h0081200060000000000000000000c00200000000000400000000400002) );
+    pkt_queue.push_back( unpack_pkt(230'h008120006000000000000000000018d100000000000000000000000003) );
+    pkt_queue.push_back( unpack_pkt(230'h00812000c0000000000000003000000000000003000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0081200000000000000000000000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00912001a0000000000000003000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h0091200100000000000000009000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h00912000e000000000000004d000000000000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h009120006000000000000000000018d100000000000000000000000000) );
+    pkt_queue.push_back( unpack_pkt(230'h009120006000000000000000000198d100030000040400800000000001) );
+    pkt_queue.push_back( unpack_pkt(230'h009120006000000000000000000018d100000000000000000000000002) );
+    pkt_queue.push_back( unpack_pkt(230'h0091200060000000000000000001000a00020000001000000000400003) );
+    pkt_queue.push_back( unpack_pkt(230'h0091200000000000000000000000000000000000000000000000000000) );
   end
 
   // --- DRIVER BLOCK ---
@@ -224,7 +224,7 @@ typedef struct packed {
 */
 /*
 typedef struct packed {
-  logic [5:0] cmd;
+  logic [6:0] cmd;
   CgraData_32_1_1_1__payload_32__predicate_1__bypass_1__delay_1 data;
   logic [6:0] data_addr;
   CGRAConfig_7_4_2_4_4_3__49d22cda396bec88 ctrl;
@@ -11,11 +11,11 @@ module cgra_test
   logic [0:0] clk;
   logic [0:0] reset;
 
-  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b recv_from_cpu_pkt__msg;
+  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e recv_from_cpu_pkt__msg;
   logic [0:0] recv_from_cpu_pkt__rdy;
   logic [0:0] recv_from_cpu_pkt__val;
 
-  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b send_to_cpu_pkt__msg;
+  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e send_to_cpu_pkt__msg;
   logic [0:0] send_to_cpu_pkt__rdy;
   logic [0:0] send_to_cpu_pkt__val;
 
@@ -24,117 +24,117 @@ module cgra_test
   int  PASS         = 'd0;
   time pass_time_of = 'd0;
 
-  //   Packed dimension: the size of IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b in bits (181).
+  //   Packed dimension: the size of IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e in bits (182).
   // Unpacked dimension: unbounded queue SystemVerilog construct; dynamic queue limited by only available memory. (As opposed to bounded queue, e.g., q [$:256].)
-  logic [182-1:0] pkt_queue [$];
+  logic [183-1:0] pkt_queue [$];
 
   initial
   begin
-    pkt_queue.push_back( unpack_pkt(181'h0110001800000003200000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110001800000005208000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110001800000007210000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010001800000009218000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h001000180000000b220000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h001000180000000d228000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h010000180000000f000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100001800000011008000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100001800000013010000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110001a00000081000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110001a00000083000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110001a00000085000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110000600000000001c8d100000000400000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0110000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010001a00000087000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010001a00000089000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010001a0000008b000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010000600000000001c8d100000000400000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0010000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100001a00000001000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100001a00000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100001a00000005000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100000600000000001c8d100000000400000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0100000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0190001a00000005000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0190001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0190000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0190000600000000001d8d100360000040000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0190000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0090001a00000009000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0090001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0090000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0090000600000000001e8d104360000040000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0090000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0180001a0000000d000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0180001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0180000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0180000600000000001e8d104360000040000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0180000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080001a00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080001a00000009000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080001a0000000b000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080001000000003000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080000600000000003a8d100100000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0080000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0118001a00000011000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0118001000000003000000000000000000000000000000,'h1,'h1,181'h0a42001c00000000000000000000000000000000000000,'h1,'h1) );
-    pkt_queue.push_back( unpack_pkt(181'h0118000e00000007000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0118000600000000001d8d100360000040000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0118000000000000000000000000000000000000000000,'h1,'h1,181'h0000000000000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0018001a00000015000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h1) );
-    pkt_queue.push_back( unpack_pkt(181'h0018001000000003000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0018000e00000007000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0018000600000000001e8d104360000040000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0018000000000000000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0108001a00000019000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0108001000000003000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0108000e00000007000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0108000600000000001e8d104360000040000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0108000000000000000000000000000000000000000000,'h1,'h1,181'h0242001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008001a00000041000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008001a00000043000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008001a00000045000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008001000000003000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008000e00000007000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008000600000000003a8d100100000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0008000000000000000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0198001a0000001d000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0198001000000003000000000000000000000000000000,'h1,'h1,181'h0a00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0198000e00000007000000000000000000000000000000,'h1,'h1,181'h0e42001c00000000000000000000000000000000000000,'h1,'h1) );
-    pkt_queue.push_back( unpack_pkt(181'h0198000600000000001d8d100300000040000000000000,'h1,'h1,181'h0600001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0198000000000000000000000000000000000000000000,'h1,'h1,181'h0600001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0098001a00000021000000000000000000000000000000,'h1,'h1,181'h0600001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0098001000000003000000000000000000000000000000,'h1,'h1,181'h0600001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0098000e00000007000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h1) );
-    pkt_queue.push_back( unpack_pkt(181'h0098000600000000001e8d104300000040000000000000,'h1,'h1,181'h0e42001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0098000000000000000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0188001a00000025000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0188001000000003000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0188000e00000007000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0188000600000000001e8d104300000040000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0188000000000000000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0088001a00000047000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0088001a00000049000000000000000000000000000000,'h1,'h1,181'h0642001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0088001a0000004b000000000000000000000000000000,'h1,'h1,181'h0224001c00000000000000000000000000000000000000,'h1,'h1) );
-    pkt_queue.push_back( unpack_pkt(181'h0088001000000003000000000000000000000000000000,'h1,'h1,181'h0e00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0088000e00000007000000000000000000000000000000,'h1,'h1,181'h0e00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0088000600000000003a8d100100000000000000000000,'h1,'h1,181'h0e00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0088000000000000000000000000000000000000000000,'h1,'h1,181'h0e00001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000018000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000020000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000028000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000100000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000108000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000110000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000118000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000120000000000000000000000000000,'h1,'h1,181'h0e24001c00000000000000000000000000000000000000,'h1,'h0) );
-    pkt_queue.push_back( unpack_pkt(181'h0000001400000000128000000000000000000000000000,'h1,'h1,181'h0200001600000079018000000000000000000000000000,'h1,'h1) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001800000003200000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001800000005208000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001800000007210000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020001800000009218000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h002000180000000b220000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h002000180000000d228000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h020000180000000f000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200001800000011008000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200001800000013010000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001a00000081000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001a00000083000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001a00000085000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220000600000000001c8d100000000400000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0220000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020001a00000087000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020001a00000089000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020001a0000008b000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020000600000000001c8d100000000400000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0020000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200001a00000001000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200001a00000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200001a00000005000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200000600000000001c8d100000000400000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0200000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0320001a00000005000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0320001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0320000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0320000600000000001d8d100360000040000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0320000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0120001a00000009000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0120001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0120000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0120000600000000001e8d104360000040000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0120000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0300001a0000000d000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0300001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0300000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0300000600000000001e8d104360000040000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0300000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100001a00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100001a00000009000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100001a0000000b000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100001000000003000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100000600000000003a8d100100000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0100000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0230001a00000011000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0230001000000003000000000000000000000000000000,'h1,'h1,182'h1484001c00000000000000000000000000000000000000,'h1,'h1) );
+    pkt_queue.push_back( unpack_pkt(182'h0230000e00000007000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0230000600000000001d8d100360000040000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0230000000000000000000000000000000000000000000,'h1,'h1,182'h0000000000000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0030001a00000015000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h1) );
+    pkt_queue.push_back( unpack_pkt(182'h0030001000000003000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0030000e00000007000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0030000600000000001e8d104360000040000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0030000000000000000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0210001a00000019000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0210001000000003000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0210000e00000007000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0210000600000000001e8d104360000040000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0210000000000000000000000000000000000000000000,'h1,'h1,182'h0484001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010001a00000041000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010001a00000043000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010001a00000045000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010001000000003000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010000e00000007000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010000600000000003a8d100100000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0010000000000000000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0330001a0000001d000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0330001000000003000000000000000000000000000000,'h1,'h1,182'h1400001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0330000e00000007000000000000000000000000000000,'h1,'h1,182'h1c84001c00000000000000000000000000000000000000,'h1,'h1) );
+    pkt_queue.push_back( unpack_pkt(182'h0330000600000000001d8d100300000040000000000000,'h1,'h1,182'h0c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0330000000000000000000000000000000000000000000,'h1,'h1,182'h0c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0130001a00000021000000000000000000000000000000,'h1,'h1,182'h0c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0130001000000003000000000000000000000000000000,'h1,'h1,182'h0c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0130000e00000007000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h1) );
+    pkt_queue.push_back( unpack_pkt(182'h0130000600000000001e8d104300000040000000000000,'h1,'h1,182'h1c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0130000000000000000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0310001a00000025000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0310001000000003000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0310000e00000007000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0310000600000000001e8d104300000040000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0310000000000000000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0110001a00000047000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0110001a00000049000000000000000000000000000000,'h1,'h1,182'h0c84001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0110001a0000004b000000000000000000000000000000,'h1,'h1,182'h0448001c00000000000000000000000000000000000000,'h1,'h1) );
+    pkt_queue.push_back( unpack_pkt(182'h0110001000000003000000000000000000000000000000,'h1,'h1,182'h1c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0110000e00000007000000000000000000000000000000,'h1,'h1,182'h1c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0110000600000000003a8d100100000000000000000000,'h1,'h1,182'h1c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0110000000000000000000000000000000000000000000,'h1,'h1,182'h1c00001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000018000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000020000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000028000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000100000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000108000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000110000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000118000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000120000000000000000000000000000,'h1,'h1,182'h1c48001c00000000000000000000000000000000000000,'h1,'h0) );
+    pkt_queue.push_back( unpack_pkt(182'h0000001400000000128000000000000000000000000000,'h1,'h1,182'h0400001600000079018000000000000000000000000000,'h1,'h1) );
   end
 
   // --- DRIVER BLOCK ---
@@ -203,11 +203,11 @@ typedef struct packed {
   logic [7:0] opaque;
   logic [0:0] vc_id;
   MultiCgraPayload_Cmd_Data_DataAddr_Ctrl_CtrlAddr__d9140faa89010e06 payload;
-} IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b;
+} IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e;
 */
 /*
 typedef struct packed {
-  logic [5:0] cmd;
+  logic [6:0] cmd;
   CgraData_32_1_1_1__payload_32__predicate_1__bypass_1__delay_1 data;
   logic [6:0] data_addr;
   CGRAConfig_7_4_2_4_4_3__49d22cda396bec88 ctrl;
@@ -238,10 +238,10 @@ typedef struct packed {
 */
 
 /*
-    input logic [180:0] inp_recv_from_cpu_pkt__msg,
+    input logic [181:0] inp_recv_from_cpu_pkt__msg,
     input logic [0:0] ref_recv_from_cpu_pkt__rdy,
     input logic [0:0] inp_recv_from_cpu_pkt__val,
-    input logic [180:0] ref_send_to_cpu_pkt__msg,
+    input logic [181:0] ref_send_to_cpu_pkt__msg,
     input logic [0:0] inp_send_to_cpu_pkt__rdy,
     input logic [0:0] ref_send_to_cpu_pkt__val,
 */
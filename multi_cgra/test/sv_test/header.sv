@@ -1,10 +1,10 @@
-typedef IntraCgraPacket_4_2x2_16_8_2_CgraPayload__a96b45c418e4c9d2 IntraCgraPacket_4_2x2_16_8_2_CgraPayload;
+typedef IntraCgraPacket_4_2x2_16_8_2_CgraPayload__81f63d23b862aef4 IntraCgraPacket_4_2x2_16_8_2_CgraPayload;
 
 function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload make_intra_cgra_pkt
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [31:0] data_payload,
   input logic       data_predicate,
   input logic [6:0] data_addr,
@@ -98,8 +98,8 @@ ADD 10 10 31
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -118,7 +118,7 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload make_intra_cgra_conf
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [6:0] operation,
   input logic [3:0][2:0] fu_in_code,
   input logic [7:0][3:0] routing_xbar_outport,
@@ -180,8 +180,8 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload make_intra_cgra_conf
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -200,7 +200,7 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload make_intra_cgra_conf
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [6:0] operation,
   input logic [3:0][2:0] fu_in_code,
   input logic [7:0][3:0] routing_xbar_outport,
@@ -269,8 +269,8 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload make_intra_cgra_conf
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -285,7 +285,7 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload make_intra_cgra_conf
   return pkt;
 endfunction
 
-function automatic logic [198-1:0] logic_pkt (IntraCgraPacket_4_2x2_16_8_2_CgraPayload p);
+function automatic logic [199-1:0] logic_pkt (IntraCgraPacket_4_2x2_16_8_2_CgraPayload p);
   logic_pkt = {
     // Header (MSB->LSB order)
     p.src,
@@ -1,14 +1,14 @@
-function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 make_intra_cgra_pkt
+function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 make_intra_cgra_pkt
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [63:0] data_payload,
   input logic       data_predicate,
   input logic [6:0] data_addr,
   input logic [6:0] ctrl_operation
 );
-  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 pkt;
+  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 pkt;
   integer file_handle;
 
   pkt.src         = src;
@@ -94,8 +94,8 @@ ADD 10 10 31
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -110,11 +110,11 @@ ADD 10 10 31
   return pkt;
 endfunction
 
-function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 make_intra_cgra_config_pkt
+function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 make_intra_cgra_config_pkt
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [6:0] operation,
   input logic [3:0][2:0] fu_in_code,
   input logic [7:0][3:0] routing_xbar_outport,
@@ -125,7 +125,7 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 ma
   input logic [3:0][3:0] read_reg_idx,
   input logic [3:0] ctrl_addr
 );
-  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 pkt;
+  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 pkt;
   integer file_handle;
 
   pkt.src         = src;
@@ -174,8 +174,8 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 ma
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -190,11 +190,11 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 ma
   return pkt;
 endfunction
 
-function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 make_intra_cgra_config_pkt_w_data
+function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 make_intra_cgra_config_pkt_w_data
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [6:0] operation,
   input logic [3:0][2:0] fu_in_code,
   input logic [7:0][3:0] routing_xbar_outport,
@@ -208,7 +208,7 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 ma
   input logic [0:0] pred,
   input logic [6:0] data_addr
 );
-  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 pkt;
+  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 pkt;
   integer file_handle;
 
   pkt.src         = src;
@@ -261,8 +261,8 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 ma
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -277,7 +277,7 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 ma
   return pkt;
 endfunction
 
-function automatic logic [230-1:0] logic_pkt (IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 p);
+function automatic logic [231-1:0] logic_pkt (IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 p);
   logic_pkt = {
     // Header (MSB->LSB order)
     p.src,
@@ -311,8 +311,8 @@ function automatic logic [230-1:0] logic_pkt (IntraCgraPacket_4_2x2_16_8_2_CgraP
   };
 endfunction
 
-function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 unpack_pkt (logic [230-1:0] v, int printHex = 1);
-  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 p;
+function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 unpack_pkt (logic [231-1:0] v, int printHex = 1);
+  IntraCgraPacket_4_2x2_16_8_2_CgraPayload__bce2307beca2dcd7 p;
   integer file_handle;
   // Use a running index from LSB upward for clarity
   int i = 0;
@@ -336,8 +336,8 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 un
   p.payload.data.bypass = v[i +: 1]; i += 1;
   p.payload.data.predicate = v[i +: 1]; i += 1;
   p.payload.data.payload = v[i +: 64]; i += 64;
-  // cmd (6)
-  p.payload.cmd = v[i +: 6]; i += 6;
+  // cmd (7)
+  p.payload.cmd = v[i +: 7]; i += 7;
   // header tail (27)
   p.vc_id = v[i +: 1]; i += 1;
   p.opaque = v[i +: 8]; i += 8;
@@ -351,8 +351,8 @@ function automatic IntraCgraPacket_4_2x2_16_8_2_CgraPayload__87b1add8a7413834 un
   p.src = v[i +: 5]; i += 5;
 
   // Consistency check.
-  if (i != 230)
-    $error("unpack index mismatch: %0d != %0d", i, 230);
+  if (i != 231)
+    $error("unpack index mismatch: %0d != %0d", i, 231);
 
 /*
 111103b7 lui x7
@@ -424,12 +424,12 @@ ADD 11 11 31
     $fdisplay( file_handle, "%hf8f93",  logic_pkt(p)[139:128] );
     $fdisplay( file_handle, "01f50533" );
     $fdisplay( file_handle, "00a0b823" );
-    //$fdisplay( file_handle, "%h", logic_pkt(p)[216:192] );
+    //$fdisplay( file_handle, "%h", logic_pkt(p)[217:192] );
     $fdisplay( file_handle, "%h5b7",   ({ {7{1'b0}}, 13'b0                } + 1'b0             ) );
     $fdisplay( file_handle, "%h58593", (             12'b0                  + 1'b0             ) );
     $fdisplay( file_handle, "01059593" );
     $fdisplay( file_handle, "01059593" );
-    $fdisplay( file_handle, "%hfb7",   ({ {7{1'b0}}, logic_pkt(p)[216:204]} + logic_pkt(p)[203]) );
+    $fdisplay( file_handle, "%hfb7",   ({ {6{1'b0}}, logic_pkt(p)[217:204]} + logic_pkt(p)[203]) );
     $fdisplay( file_handle, "%hf8f93",               logic_pkt(p)[203:192] );
     $fdisplay( file_handle, "01f585b3" );
     $fdisplay( file_handle, "00b0bc23" );
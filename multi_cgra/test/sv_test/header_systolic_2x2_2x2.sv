@@ -1,8 +1,8 @@
-function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b make_intra_cgra_pkt
+function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e make_intra_cgra_pkt
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [31:0] data_payload,
   input logic       data_predicate,
   input logic [6:0] data_addr,
@@ -10,7 +10,7 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   input logic [1:0] src_cgra_id = 2'd2,
   input logic [1:0] dst_cgra_id = 2'd2
 );
-  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b pkt;
+  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e pkt;
   integer file_handle;
 
   pkt.src         = src;
@@ -96,8 +96,8 @@ ADD 10 10 31
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -112,11 +112,11 @@ ADD 10 10 31
   return pkt;
 endfunction
 
-function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b make_intra_cgra_config_pkt
+function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e make_intra_cgra_config_pkt
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [6:0] operation,
   input logic [3:0][2:0] fu_in_code,
   input logic [7:0][2:0] routing_xbar_outport,
@@ -129,7 +129,7 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   input logic [1:0] src_cgra_id = 2'd2,
   input logic [1:0] dst_cgra_id = 2'd2
 );
-  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b pkt;
+  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e pkt;
   integer file_handle;
 
   pkt.src         = src;
@@ -178,8 +178,8 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -194,11 +194,11 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   return pkt;
 endfunction
 
-function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b make_intra_cgra_config_pkt_w_data
+function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e make_intra_cgra_config_pkt_w_data
 (
   input logic [4:0] src,
   input logic [4:0] dst,
-  input logic [5:0] cmd,
+  input logic [6:0] cmd,
   input logic [6:0] operation,
   input logic [3:0][2:0] fu_in_code,
   input logic [7:0][2:0] routing_xbar_outport,
@@ -214,7 +214,7 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   input logic [1:0] src_cgra_id = 2'd2,
   input logic [1:0] dst_cgra_id = 2'd2
 );
-  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b pkt;
+  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e pkt;
   integer file_handle;
 
   pkt.src         = src;
@@ -267,8 +267,8 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   $fdisplay( file_handle, "%hf8f93",  logic_pkt(pkt)[75:64] );
   $fdisplay( file_handle, "01f40433" );
   $fdisplay( file_handle, "0080b423" );
-  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[184:128] );
-  $fdisplay( file_handle, "%h537",   ({ {7{1'b0}}, logic_pkt(pkt)[184:172] } + logic_pkt(pkt)[171])  );
+  //$fdisplay( file_handle, "%h", logic_pkt(pkt)[185:128] );
+  $fdisplay( file_handle, "%h537",   ({ {6{1'b0}}, logic_pkt(pkt)[185:172] } + logic_pkt(pkt)[171])  );
   $fdisplay( file_handle, "%h50513", (             logic_pkt(pkt)[171:160]   + logic_pkt(pkt)[159]) );
   $fdisplay( file_handle, "01051513" );
   $fdisplay( file_handle, "01051513" );
@@ -283,7 +283,7 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b mak
   return pkt;
 endfunction
 
-function automatic logic [186-1:0] logic_pkt (IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b p);
+function automatic logic [187-1:0] logic_pkt (IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e p);
   logic_pkt = {
     // Header (MSB->LSB order)
     p.src,
@@ -318,8 +318,8 @@ function automatic logic [186-1:0] logic_pkt (IntraCgraPacket_4_2x2_4_8_2_CgraPa
 endfunction
 
 
-function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b unpack_pkt (logic [182-1:0] v, int printHex = 1, int ph0, logic [182-1:0] ph1, int ph2, int ph3);
-  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b p;
+function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e unpack_pkt (logic [183-1:0] v, int printHex = 1, int ph0, logic [183-1:0] ph1, int ph2, int ph3);
+  IntraCgraPacket_4_2x2_4_8_2_CgraPayload__9aa83796ff1f281e p;
   integer file_handle;
   // Use a running index from LSB upward for clarity
   int i = 0;
@@ -344,8 +344,8 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b unp
   p.payload.data.bypass = v[i +: 1]; i += 1;
   p.payload.data.predicate = v[i +: 1]; i += 1;
   p.payload.data.payload = v[i +: 32]; i += 32;
-  // cmd (6)
-  p.payload.cmd = v[i +: 6]; i += 6;
+  // cmd (7)
+  p.payload.cmd = v[i +: 7]; i += 7;
   // header tail (27)
   p.vc_id = v[i +: 1]; i += 1;
   p.opaque = v[i +: 8]; i += 8;
@@ -359,8 +359,8 @@ function automatic IntraCgraPacket_4_2x2_4_8_2_CgraPayload__7f11690546faea3b unp
   p.src = v[i +: 3]; i += 3;
 
   // Consistency check.
-  if (i != 182)
-    $error("unpack index mismatch: %0d != %0d", i, 182);
+  if (i != 183)
+    $error("unpack index mismatch: %0d != %0d", i, 183);
 
 /*
 111103b7 lui x7
@@ -432,12 +432,12 @@ ADD 11 11 31
     $fdisplay( file_handle, "%hf8f93",  logic_pkt(p)[139:128] );
     $fdisplay( file_handle, "01f50533" );
     $fdisplay( file_handle, "00a0b823" );
-    //$fdisplay( file_handle, "%h", logic_pkt(p)[216:192] );
+    //$fdisplay( file_handle, "%h", logic_pkt(p)[217:192] );
     $fdisplay( file_handle, "%h5b7",   ({ {7{1'b0}}, 13'b0                } + 1'b0             ) );
     $fdisplay( file_handle, "%h58593", (             12'b0                  + 1'b0             ) );
     $fdisplay( file_handle, "01059593" );
     $fdisplay( file_handle, "01059593" );
-    $fdisplay( file_handle, "%hfb7",   ({ {7{1'b0}}, logic_pkt(p)[216:204]} + logic_pkt(p)[203]) );
+    $fdisplay( file_handle, "%hfb7",   ({ {6{1'b0}}, logic_pkt(p)[217:204]} + logic_pkt(p)[203]) );
     $fdisplay( file_handle, "%hf8f93",               logic_pkt(p)[203:192] );
     $fdisplay( file_handle, "01f585b3" );
     $fdisplay( file_handle, "00b0bc23" );
@@ -24,6 +24,7 @@ from ..fu.single.PhiRTL import PhiRTL
 from ..lib.basic.val_rdy.ifcs import ValRdyRecvIfcRTL as RecvIfcRTL
 from ..lib.basic.val_rdy.ifcs import ValRdySendIfcRTL as SendIfcRTL
 from ..lib.cmd_type import *
+from ..lib.opt_type import *
 from ..lib.util.common import *
 from ..mem.const.ConstQueueDynamicRTL import ConstQueueDynamicRTL
 from ..mem.ctrl.CtrlMemDynamicRTL import CtrlMemDynamicRTL
@@ -43,7 +44,9 @@ class TileRTL(Component):
                 num_tile_inports, num_tile_outports, num_cgras, num_tiles,
                 num_registers_per_reg_bank = 16,
                 Fu = FlexibleFuRTL,
-                FuList = [PhiRTL, AdderRTL, CompRTL, MulRTL, GrantRTL, MemUnitRTL]):
+                FuList = [PhiRTL, AdderRTL, CompRTL, MulRTL, GrantRTL, MemUnitRTL],
+                has_perf_counters = False,
+                has_shadow_ctrl_mem = False):
 
     # Derives types from IntraCgraPktType.
     CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
@@ -62,6 +65,10 @@ class TileRTL(Component):
 
     CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
     DataAddrType = mk_bits(clog2(data_mem_size))
+    IntraPktTileIdType = CtrlPktType.get_field_type(kAttrSrc)
+    DataPayloadType = DataType.get_field_type(kAttrPayload)
+    PerfIdxType = mk_bits(clog2(NUM_TILE_PERF_COUNTERS))
+    RegAccessCountType = mk_bits(clog2(num_fu_inports + 1))
 
     # Interfaces.
     s.recv_data = [RecvIfcRTL(DataType)
@@ -83,7 +90,8 @@ class TileRTL(Component):
     # Components.
     s.element = FlexibleFuRTL(CtrlPktType, num_fu_inports, 
                               num_fu_outports, num_tiles, FuList)
-    s.const_mem = ConstQueueDynamicRTL(DataType, ctrl_mem_size)
+    s.const_mem = ConstQueueDynamicRTL(DataType, ctrl_mem_size,
+                                       has_shadow_bank = has_shadow_ctrl_mem)
     s.routing_crossbar = CrossbarRTL(DataType,
                                      CtrlSignalType,
                                      num_routing_xbar_inports,
@@ -112,7 +120,8 @@ class TileRTL(Component):
                                    num_cgras,
                                    num_tiles,
                                    num_ctrl,
-                                   total_steps)
+                                   total_steps,
+                                   has_shadow_ctrl_mem = has_shadow_ctrl_mem)
 
     # The `tile_in_channel` indicates the outport channels that are
     # connected to the next tiles.
@@ -132,6 +141,13 @@ class TileRTL(Component):
     s.cgra_id = InPort(mk_bits(max(1, clog2(num_cgras))))
     s.tile_id = InPort(mk_bits(clog2(num_tiles + 1)))
 
+    # Performance counters, indexed by PERF_TILE_*. They only count when
+    # `has_perf_counters` is set and are read by CMD_PERF_COUNTER_READ.
+    s.perf_counters = [Wire(DataPayloadType) for _ in range(NUM_TILE_PERF_COUNTERS)]
+    s.perf_xbar_stalled = Wire(1)
+    s.perf_reg_reads = Wire(RegAccessCountType)
+    s.perf_reg_writes = Wire(RegAccessCountType)
+
     # Propagates tile id.
     s.element.tile_id //= s.tile_id
     s.ctrl_mem.cgra_id //= s.cgra_id
@@ -147,6 +163,8 @@ class TileRTL(Component):
 
     # Constant queue.
     s.element.recv_const //= s.const_mem.send_const
+    # The const queue swaps along with the ctrl memory.
+    s.const_mem.swap //= s.ctrl_mem.config_swap
 
     # Fu data <-> ctrl memory (eventually towards/from CPU via controller).
     s.element.send_to_ctrl_mem //= s.ctrl_mem.recv_from_element
@@ -248,6 +266,7 @@ class TileRTL(Component):
 
         if s.recv_from_controller_pkt.val & \
            ((s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG) | \
+            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_MULTICAST) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR) | \
@@ -258,14 +277,24 @@ class TileRTL(Component):
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_LAUNCH) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_LOWER) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_UPPER) | \
-            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_STEP)):
+            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_LOOP_STEP) | \
+            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_SWAP_CONFIG)):
             s.ctrl_mem.recv_pkt_from_controller.val @= 1
             s.ctrl_mem.recv_pkt_from_controller.msg @= s.recv_from_controller_pkt.msg
             s.recv_from_controller_pkt.rdy @= s.ctrl_mem.recv_pkt_from_controller.rdy
-        elif s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONST):
+        # The consts following a CMD_SWAP_CONFIG wait for the swap, as
+        # they are meant for the configuration after it.
+        elif s.recv_from_controller_pkt.val & (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONST) & \
+             ~s.ctrl_mem.config_swap_pending:
             s.const_mem.recv_const.val @= 1
             s.const_mem.recv_const.msg @= s.recv_from_controller_pkt.msg.payload.data
             s.recv_from_controller_pkt.rdy @= s.const_mem.recv_const.rdy
+        elif has_perf_counters & s.recv_from_controller_pkt.val & \
+             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_PERF_COUNTER_READ):
+            # Answered by `update_send_out_signal` once the ctrl memory
+            # is not using the way back to the controller.
+            s.recv_from_controller_pkt.rdy @= s.send_to_controller_pkt.rdy & \
+                                              ~s.ctrl_mem.send_pkt_to_controller.val
 
     @update
     def update_send_out_signal():
@@ -274,6 +303,29 @@ class TileRTL(Component):
         if s.ctrl_mem.send_pkt_to_controller.val:
             s.send_to_controller_pkt.val @= 1
             s.send_to_controller_pkt.msg @= s.ctrl_mem.send_pkt_to_controller.msg
+        elif has_perf_counters & s.recv_from_controller_pkt.val & \
+             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_PERF_COUNTER_READ):
+            # Returns the counter to the requester (i.e., the CPU behind
+            # the controller of the source CGRA).
+            s.send_to_controller_pkt.val @= 1
+            s.send_to_controller_pkt.msg @= \
+                CtrlPktType(zext(s.tile_id, IntraPktTileIdType), # src
+                            num_tiles, # dst
+                            s.recv_from_controller_pkt.msg.dst_cgra_id, # src_cgra_id
+                            s.recv_from_controller_pkt.msg.src_cgra_id, # dst_cgra_id
+                            s.recv_from_controller_pkt.msg.dst_cgra_x, # src_cgra_x
+                            s.recv_from_controller_pkt.msg.dst_cgra_y, # src_cgra_y
+                            s.recv_from_controller_pkt.msg.src_cgra_x, # dst_cgra_x
+                            s.recv_from_controller_pkt.msg.src_cgra_y, # dst_cgra_y
+                            0, # opaque
+                            0, # vc_id
+                            CgraPayloadType(CMD_PERF_COUNTER_RESPONSE,
+                                            DataType(0, 1, 0, 0),
+                                            s.recv_from_controller_pkt.msg.payload.data_addr,
+                                            0, 0))
+            if s.recv_from_controller_pkt.msg.payload.data.payload < NUM_TILE_PERF_COUNTERS:
+                s.send_to_controller_pkt.msg.payload.data.payload @= \
+                    s.perf_counters[trunc(s.recv_from_controller_pkt.msg.payload.data.payload, PerfIdxType)]
         s.ctrl_mem.send_pkt_to_controller.rdy @= s.send_to_controller_pkt.rdy
 
     # Updates the configuration memory related signals.
@@ -321,6 +373,54 @@ class TileRTL(Component):
       s.routing_crossbar.compute_done @= s.element_done
       s.fu_crossbar.compute_done @= s.element_done
 
+    # Events sampled by the performance counters.
+    @update
+    def update_perf_events():
+      # A crossbar holding its ctrl because an outport it drives is not ready.
+      s.perf_xbar_stalled @= 0
+      if s.routing_crossbar.recv_opt.val & ~s.routing_crossbar.recv_opt.rdy:
+        for i in range(num_routing_xbar_outports):
+          if s.routing_crossbar.send_data[i].val & ~s.routing_crossbar.send_data[i].rdy:
+            s.perf_xbar_stalled @= 1
+      if s.fu_crossbar.recv_opt.val & ~s.fu_crossbar.recv_opt.rdy:
+        for i in range(num_fu_xbar_outports):
+          if s.fu_crossbar.send_data[i].val & ~s.fu_crossbar.send_data[i].rdy:
+            s.perf_xbar_stalled @= 1
+
+      # Register banks read by the ctrl signal being retired, and written
+      # by whichever crossbar the banks take their data from.
+      reg_reads = RegAccessCountType(0)
+      reg_writes = RegAccessCountType(0)
+      for i in range(num_fu_inports):
+        if s.ctrl_mem.send_ctrl.val & s.ctrl_mem.send_ctrl.rdy & \
+           (s.ctrl_mem.send_ctrl.msg.read_reg_towards[i] != READ_TOWARDS_NOTHING):
+          reg_reads = reg_reads + RegAccessCountType(1)
+        if ((s.ctrl_mem.send_ctrl.msg.write_reg_from[i] == PORT_ROUTING_CROSSBAR) & \
+            s.routing_crossbar.send_data[num_tile_outports + i].val) | \
+           ((s.ctrl_mem.send_ctrl.msg.write_reg_from[i] == PORT_FU_CROSSBAR) & \
+            s.fu_crossbar.send_data[num_tile_outports + i].val):
+          reg_writes = reg_writes + RegAccessCountType(1)
+      s.perf_reg_reads @= reg_reads
+      s.perf_reg_writes @= reg_writes
+
+    @update_ff
+    def update_perf_counters():
+      if s.reset:
+        for i in range(NUM_TILE_PERF_COUNTERS):
+          s.perf_counters[i] <<= DataPayloadType(0)
+      elif has_perf_counters:
+        if s.element.recv_opt.val & s.element.recv_opt.rdy & \
+           (s.element.recv_opt.msg.operation != OPT_NAH):
+          s.perf_counters[PERF_TILE_FU_BUSY] <<= s.perf_counters[PERF_TILE_FU_BUSY] + DataPayloadType(1)
+        if s.element.recv_opt.val & ~s.element.recv_opt.rdy:
+          s.perf_counters[PERF_TILE_FU_STALL] <<= s.perf_counters[PERF_TILE_FU_STALL] + DataPayloadType(1)
+        if s.perf_xbar_stalled:
+          s.perf_counters[PERF_TILE_XBAR_STALL] <<= s.perf_counters[PERF_TILE_XBAR_STALL] + DataPayloadType(1)
+        s.perf_counters[PERF_TILE_REG_READS] <<= \
+            s.perf_counters[PERF_TILE_REG_READS] + zext(s.perf_reg_reads, DataPayloadType)
+        s.perf_counters[PERF_TILE_REG_WRITES] <<= \
+            s.perf_counters[PERF_TILE_REG_WRITES] + zext(s.perf_reg_writes, DataPayloadType)
+
   # Line trace
   def line_trace(s):
     recv_str = "|".join(["(" + str(x.msg) + ", val: " + str(x.val) + ", rdy: " + str(x.rdy) + ")" for x in s.recv_data])
@@ -235,6 +235,7 @@ class TileWithStreamingLoadRTL(Component):
 
         if s.recv_from_controller_pkt.val & \
            ((s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG) | \
+            (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_MULTICAST) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_FU_CROSSBAR) | \
             (s.recv_from_controller_pkt.msg.payload.cmd == CMD_CONFIG_PROLOGUE_ROUTING_CROSSBAR) | \
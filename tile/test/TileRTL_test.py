@@ -48,14 +48,16 @@ class TestHarness(Component):
                 ctrl_mem_size, data_mem_size, num_fu_inports,
                 num_fu_outports, num_tile_inports,
                 num_tile_outports, num_registers_per_reg_bank, src_data,
-                src_ctrl_pkt, sink_out, num_tiles, complete_signal_sink_out, num_ctrl, total_steps):
+                src_ctrl_pkt, sink_out, num_tiles, complete_signal_sink_out, num_ctrl, total_steps,
+                src_ctrl_interval_delay = 0, has_perf_counters = False):
 
     CgraPayloadType = IntraCgraPktType.get_field_type(kAttrPayload)
     DataType = CgraPayloadType.get_field_type(kAttrData)
     s.num_tile_inports = num_tile_inports
     s.num_tile_outports = num_tile_outports
 
-    s.src_ctrl_pkt = TestSrcRTL(IntraCgraPktType, src_ctrl_pkt)
+    s.src_ctrl_pkt = TestSrcRTL(IntraCgraPktType, src_ctrl_pkt,
+                                interval_delay = src_ctrl_interval_delay)
     s.src_data = [TestSrcRTL(DataType, src_data[i])
                   for i in range(num_tile_inports)]
     s.sink_out = [TestSinkRTL(DataType, sink_out[i])
@@ -66,7 +68,8 @@ class TestHarness(Component):
                 num_fu_inports, num_fu_outports, num_tile_inports,
                 num_tile_outports, 1, num_tiles,
                 num_registers_per_reg_bank,
-                FunctionUnit, FuList)
+                FunctionUnit, FuList,
+                has_perf_counters = has_perf_counters)
 
     # Connects tile id.
     s.dut.cgra_id //= 0
@@ -733,3 +736,103 @@ def test_prologue_nah(cmdline_opts):
   th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
   run_sim(th)
 
+
+def test_tile_perf_counters(cmdline_opts):
+  num_tile_inports = 4
+  num_tile_outports = 4
+  num_fu_inports = 4
+  num_fu_outports = 2
+  ctrl_mem_size = 3
+  data_mem_size_global = 16
+  num_cgra_rows = 1
+  num_cgra_columns = 1
+  num_tiles = 4
+  num_registers_per_reg_bank = 16
+  TileInType = mk_bits(clog2(num_tile_inports + num_fu_inports + 1))
+  FuInType = mk_bits(clog2(num_fu_inports + 1))
+  FuOutType = mk_bits(clog2(num_fu_outports + 1))
+  DUT = TileRTL
+  FunctionUnit = FlexibleFuRTL
+  FuList = [AdderRTL, MulRTL, MemUnitRTL]
+  DataType = mk_data(32, 1)
+
+  CtrlType = mk_ctrl(num_fu_inports,
+                     num_fu_outports,
+                     num_tile_inports,
+                     num_tile_outports,
+                     num_registers_per_reg_bank)
+
+  CtrlAddrType = mk_bits(clog2(ctrl_mem_size))
+  DataAddrType = mk_bits(clog2(data_mem_size_global))
+
+  CgraPayloadType = mk_cgra_payload(DataType,
+                                    DataAddrType,
+                                    CtrlType,
+                                    CtrlAddrType)
+
+  IntraCgraPktType = mk_intra_cgra_pkt(num_cgra_columns,
+                                       num_cgra_rows,
+                                       num_tiles,
+                                       CgraPayloadType)
+
+  # Same kernel as test_tile_alu, with the counters read well after the
+  # two ctrl signals are done.
+  src_ctrl_pkt = [
+      IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0,
+                       payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 0,
+                                                 ctrl = CtrlType(OPT_ADD,
+                                                                 [FuInType(1), FuInType(2), FuInType(0), FuInType(0)],
+                                                                 [TileInType(0), TileInType(0), TileInType(0), TileInType(0),
+                                                                  TileInType(4), TileInType(3), TileInType(0), TileInType(0)],
+                                                                 [FuOutType(0), FuOutType(0), FuOutType(0), FuOutType(1),
+                                                                  FuOutType(0), FuOutType(0), FuOutType(0), FuOutType(0)]))),
+      IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0,
+                       payload = CgraPayloadType(CMD_CONFIG, ctrl_addr = 1,
+                                                 ctrl = CtrlType(OPT_SUB,
+                                                                 [FuInType(1), FuInType(2), FuInType(0), FuInType(0)],
+                                                                 [TileInType(0), TileInType(0), TileInType(0), TileInType(0),
+                                                                  TileInType(4), TileInType(1), TileInType(0), TileInType(0)],
+                                                                 [FuOutType(1), FuOutType(0), FuOutType(0), FuOutType(1),
+                                                                  FuOutType(0), FuOutType(0), FuOutType(0), FuOutType(0)]))),
+      IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, payload = CgraPayloadType(CMD_CONST, data = DataType(5, 1))),
+      IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, payload = CgraPayloadType(CMD_CONST, data = DataType(7, 1))),
+      IntraCgraPktType(0, 0, 0, 0, 0, 0, 0, 0, payload = CgraPayloadType(CMD_LAUNCH)),
+      IntraCgraPktType(num_tiles, 0, 0, 0, 0, 0, 0, 0,
+                       payload = CgraPayloadType(CMD_PERF_COUNTER_READ, data = DataType(PERF_TILE_FU_BUSY, 1))),
+      IntraCgraPktType(num_tiles, 0, 0, 0, 0, 0, 0, 0,
+                       payload = CgraPayloadType(CMD_PERF_COUNTER_READ, data = DataType(PERF_TILE_REG_WRITES, 1)))]
+
+  src_data = [[DataType(3, 1)],
+              [],
+              [DataType(4, 1)],
+              [DataType(5, 1), DataType(7, 1)]]
+
+  sink_out = [[DataType(4, 1)],
+              [],
+              [],
+              [DataType(9, 1), DataType(4, 1)]]
+
+  complete_signal_sink_out = [
+      IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0, payload = CgraPayloadType(CMD_COMPLETE)),
+      # Both ctrl signals kept the FU busy for one cycle, and nothing
+      # was written into the register banks.
+      IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0,
+                       payload = CgraPayloadType(CMD_PERF_COUNTER_RESPONSE, data = DataType(2, 1))),
+      IntraCgraPktType(0, num_tiles, 0, 0, 0, 0, 0, 0,
+                       payload = CgraPayloadType(CMD_PERF_COUNTER_RESPONSE, data = DataType(0, 1)))]
+
+  th = TestHarness(DUT, FunctionUnit, FuList,
+                   IntraCgraPktType,
+                   ctrl_mem_size,
+                   data_mem_size_global, num_fu_inports, num_fu_outports,
+                   num_tile_inports, num_tile_outports,
+                   num_registers_per_reg_bank, src_data,
+                   src_ctrl_pkt, sink_out, num_tiles, complete_signal_sink_out,
+                   num_ctrl = 2, total_steps = 2,
+                   src_ctrl_interval_delay = 10, has_perf_counters = True)
+  th.elaborate()
+  th.dut.set_metadata(VerilogVerilatorImportPass.vl_Wno_list,
+                      ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT',
+                       'ALWCOMBORDER'])
+  th = config_model_with_cmdline_opts(th, cmdline_opts, duts = ['dut'])
+  run_sim(th)